@@ -0,0 +1,78 @@
+"""Scaling of chunked parallel structural validation across worker counts
+
+Reports every schema violation in a large synthetic design with a sprinkling of
+broken signals, the work `--max-errors` does, with 1 worker (the serial path) up
+to the number of CPUs. Finding the first error with the jsonschema reference
+validator is timed the same way, on a copy of the design whose only broken signal
+is the last one, which is the worst case for the serial path.
+
+    python -m benchmarks.bench_parallel [--signals N] [--broken N] [--max-jobs N]
+"""
+
+import argparse
+import os
+import time
+
+from io_gen.validate import _validate_structural, clear_validator_cache, iter_diagnostics
+
+from .synthetic import make_design
+
+
+def _break(doc: dict, count: int) -> None:
+    """Give count evenly spaced signals an unknown key"""
+    signals = doc["signals"]
+    step = max(len(signals) // max(count, 1), 1)
+    for index in range(0, len(signals), step)[:count]:
+        signals[index]["slew"] = "fast"
+
+
+def _time(func, *args, **kwargs) -> float:
+    """Run func once and return its wall time in seconds"""
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def _first_error(doc: dict, jobs: int) -> None:
+    try:
+        _validate_structural(doc, reference=True, jobs=jobs)
+    except Exception:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signals", type=int, default=50000, help="signals in the design")
+    parser.add_argument("--broken", type=int, default=100, help="signals with errors")
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="largest worker count (default: number of CPUs)",
+    )
+    args = parser.parse_args()
+
+    doc = make_design(args.signals)
+    last_broken = make_design(args.signals)
+    _break(doc, args.broken)
+    last_broken["signals"][-1]["slew"] = "fast"
+    clear_validator_cache()
+    # Build the validators up front so that only validation is timed
+    list(iter_diagnostics({}))
+
+    print(f"{args.signals} signals, {args.broken} broken, {os.cpu_count()} CPUs")
+    print(f"{'jobs':>6} {'all errors':>12} {'speedup':>8} {'first error':>12} {'speedup':>8}")
+    serial = None
+    for jobs in range(1, args.max_jobs + 1):
+        collect = _time(lambda: list(iter_diagnostics(doc, jobs=jobs)))
+        reference = _time(_first_error, last_broken, jobs)
+        if serial is None:
+            serial = (collect, reference)
+        print(
+            f"{jobs:>6} {collect:>11.3f}s {serial[0] / collect:>7.2f}x"
+            f" {reference:>11.3f}s {serial[1] / reference:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
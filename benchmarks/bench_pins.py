@@ -0,0 +1,107 @@
+"""Time of validate-only and RTL-only runs with lazy and eager pin tables
+
+Runs the pipeline on a large synthetic design, once as it is and once with the pin
+table built and fully flattened up front while the design is loaded, the way it
+was before signals were flattened on first access. The output buses of the design
+infer their buffers, so the IO ring never needs their pins.
+
+    python -m benchmarks.bench_pins [--signals N] [--repeat N]
+"""
+
+import argparse
+import io
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Iterator
+
+import yaml
+
+import io_gen.pipeline as pipeline
+from io_gen.tables import build_pin_table
+
+from .synthetic import make_design
+
+
+def _eager_pin_table(signal_table: Any) -> Any:
+    pin_table = build_pin_table(signal_table)
+    for name in pin_table.signals:
+        pin_table.columns(name)
+    return pin_table
+
+
+@contextmanager
+def _eager() -> Iterator[None]:
+    """Build and flatten the pin table with the design, even in validate-only runs"""
+    load_design = pipeline._load_design
+    tables: list[Any] = []
+
+    def eager_load_design(*args: Any, **kwargs: Any) -> Any:
+        design = load_design(*args, **kwargs)
+        tables.append(_eager_pin_table(design.signal_table))
+        return design
+
+    pipeline._load_design = eager_load_design
+    pipeline.build_pin_table = lambda signal_table: tables[-1]
+    try:
+        yield
+    finally:
+        pipeline._load_design = load_design
+        pipeline.build_pin_table = build_pin_table
+
+
+def _time(yaml_path: Path, out: Path, repeat: int, **flags: bool) -> float:
+    """Returns the best wall time of repeat pipeline runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            pipeline.run_pipeline(
+                yaml_path,
+                "top",
+                "verilog",
+                out,
+                validate_only=flags.get("validate_only", False),
+                rtl_only=flags.get("rtl_only", False),
+                xdc_only=False,
+                use_cache=True,
+                cache_dir=out / "cache",
+            )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signals", type=int, default=20000, help="signals in the design")
+    parser.add_argument("--repeat", type=int, default=3, help="runs to take the best of")
+    args = parser.parse_args()
+
+    doc = make_design(args.signals)
+    for sig in doc["signals"]:
+        if sig["buffer"] == "obuf":
+            sig["infer"] = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        yaml_path = out / "board.yaml"
+        with open(yaml_path, "w", encoding="utf-8") as f:
+            yaml.safe_dump(doc, f, sort_keys=False)
+        # Fill the validation cache, so that the runs time the tables and generators
+        _time(yaml_path, out, 1, validate_only=True)
+
+        print(f"{args.signals} signals (best of {args.repeat}, validation cached)")
+        print(f"{'':16} {'eager':>9} {'lazy':>9}")
+        for label, flags in (
+            ("--validate-only", {"validate_only": True}),
+            ("--rtl-only", {"rtl_only": True}),
+        ):
+            with _eager():
+                eager = _time(yaml_path, out, args.repeat, **flags)
+            lazy = _time(yaml_path, out, args.repeat, **flags)
+            print(f"{label:16} {eager:>8.3f}s {lazy:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
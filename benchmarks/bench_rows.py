@@ -0,0 +1,97 @@
+"""Memory held by the signal and pin tables in each row layout
+
+Builds the signal and pin tables of a synthetic design and measures what they hold
+on the Python heap with tracemalloc, and how long building them takes, for:
+
+- dicts: every signal and pin row a plain dict (the original layout)
+- slotted rows: every row a slotted SignalRow or PinRow
+- columnar pins: slotted signal rows, with the pins of each signal stored in
+  PinColumns (the current layout)
+
+The older layouts are produced by converting the current one, so their times are
+an upper bound on what building them directly took.
+
+    python -m benchmarks.bench_rows [--signals N] [--bus-width N]
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from io_gen.tables import build_pin_table, build_signal_table
+
+from .synthetic import make_design
+
+
+def _traced(build: Callable[[], Any]) -> tuple[Any, float, float]:
+    """Returns what build() returns, how long it took and what it holds, in MiB"""
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current / 2**20
+
+
+def _build(doc: dict) -> tuple[Any, Any]:
+    signal_table = build_signal_table(doc)
+    pin_table = build_pin_table(signal_table)
+    # Signals are only flattened when first looked up, so look them all up
+    for name in pin_table.signals:
+        pin_table.columns(name)
+    return signal_table, pin_table
+
+
+def _as_rows(signal_table: Any, pin_table: Any) -> tuple[Any, dict]:
+    """The tables in the layout they had before pins were stored column-wise"""
+    return signal_table, {name: pin_table[name] for name in pin_table.signals}
+
+
+def _as_dicts(signal_table: Any, pin_table: Any) -> tuple[list, dict]:
+    """The tables in the layout they had before rows were slotted"""
+    signals = []
+    for sig in signal_table:
+        row = sig.to_dict()
+        if "pinset" in row:
+            row["pinset"] = dict(row["pinset"])
+        signals.append(row)
+    pins = {}
+    for name in pin_table.signals:
+        pins[name] = []
+        for pin in pin_table[name]:
+            row = pin.to_dict()
+            if "pinset" in row:
+                row["pinset"] = dict(row["pinset"])
+            pins[name].append(row)
+    return signals, pins
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signals", type=int, default=2000, help="signals in the design")
+    parser.add_argument("--bus-width", type=int, default=8, help="width of each bus")
+    args = parser.parse_args()
+
+    doc = make_design(args.signals, args.bus_width)
+    (_, pin_table), *columnar = _traced(lambda: _build(doc))
+    results = {
+        "dicts": _traced(lambda: _as_dicts(*_build(doc)))[1:],
+        "slotted rows": _traced(lambda: _as_rows(*_build(doc)))[1:],
+        "columnar pins": columnar,
+    }
+
+    dicts = results["dicts"][1]
+    print(f"{args.signals} signals, {pin_table.pin_count()} pin rows")
+    for label, (elapsed, memory) in results.items():
+        print(
+            f"  {label + ':':15} {memory:8.2f} MiB {100 * (1 - memory / dicts):6.1f} %"
+            f" saved  {elapsed * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
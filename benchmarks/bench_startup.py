@@ -0,0 +1,96 @@
+"""Cold start cost of the io-gen command line
+
+Imports io_gen.cli in fresh interpreters under `python -X importtime` and reports
+the best cumulative import time, along with any modules that should only be loaded
+once a run actually needs them (third party dependencies and the generators). Exits
+with a non-zero status if the import time is over budget or a deferred module was
+imported, so it can gate CI.
+
+    python -m benchmarks.bench_startup [--runs N] [--budget-ms MS]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Module imported by the io-gen entry point
+ENTRY_MODULE = "io_gen.cli"
+
+# Modules that `io-gen --help` and argument errors must not pay for
+DEFERRED_MODULES = ("jsonschema", "referencing", "yaml", "io_gen.generate")
+
+
+def measure(module: str = ENTRY_MODULE) -> tuple[float, list[str]]:
+    """Import module in a fresh interpreter
+
+    Returns its cumulative import time in milliseconds and the names of every module
+    imported along the way.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = None
+    imported = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        imported.append(name)
+        if name == module:
+            elapsed = int(cumulative) / 1000
+    if elapsed is None:
+        raise RuntimeError(f"no import time reported for {module}")
+    return elapsed, imported
+
+
+def _is_deferred(name: str) -> bool:
+    return any(
+        name == module or name.startswith(f"{module}.") for module in DEFERRED_MODULES
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=120.0,
+        help="maximum allowed import time of the best run (default: 120)",
+    )
+    args = parser.parse_args()
+
+    timings = []
+    deferred: set[str] = set()
+    for _ in range(args.runs):
+        elapsed, imported = measure()
+        timings.append(elapsed)
+        deferred.update(name for name in imported if _is_deferred(name))
+
+    best = min(timings)
+    print(f"import {ENTRY_MODULE}: best {best:.1f} ms, worst {max(timings):.1f} ms")
+    print(f"  budget: {args.budget_ms:.1f} ms")
+
+    failed = False
+    if best > args.budget_ms:
+        print(f"FAIL: import time over budget by {best - args.budget_ms:.1f} ms")
+        failed = True
+    if deferred:
+        print(f"FAIL: imported at startup: {', '.join(sorted(deferred))}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Peak memory of validating a large design whole and streamed
+
+Writes one large synthetic board description and measures the peak Python heap
+(with tracemalloc) and the wall time of getting from the file to a validated
+signal table: validate() followed by build_signal_table(), the default, and
+validate_stream(), which parses, validates and tabulates one signal at a time.
+The signal table itself is the floor both have to pay for.
+
+    python -m benchmarks.bench_stream [--signals N]
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from io_gen.tables import build_signal_table
+from io_gen.validate import get_validator, validate, validate_stream
+
+from .synthetic import write_design
+
+
+def _whole(path: Path) -> Any:
+    return build_signal_table(validate(path))
+
+
+def _streamed(path: Path) -> Any:
+    return validate_stream(path)[1]
+
+
+def _measure(func: Callable[[Path], Any], path: Path) -> tuple[float, float, float]:
+    """Returns the wall time, peak heap and retained heap (MiB) of func(path)"""
+    start = time.perf_counter()
+    func(path)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = func(path)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak / 2**20, retained / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signals", type=int, default=20000, help="signals in the design")
+    args = parser.parse_args()
+
+    # Load the schema up front so that it isn't counted against either approach
+    get_validator()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_design(Path(tmp) / "board.yaml", args.signals)
+        size = path.stat().st_size / 2**20
+        results = {
+            "validate() + build_signal_table()": _measure(_whole, path),
+            "validate_stream()": _measure(_streamed, path),
+        }
+
+    print(f"{args.signals} signals, {size:.1f} MiB of YAML")
+    print(f"{'':36} {'time':>9} {'peak':>10} {'table':>10}")
+    for label, (elapsed, peak, retained) in results.items():
+        print(f"{label:36} {elapsed:>8.3f}s {peak:>6.1f} MiB {retained:>6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Per-file validation cost with and without the shared validator
+
+Validates a batch of synthetic board descriptions twice: once rebuilding the
+schema validator for every file (the behavior before the validator was cached)
+and once reusing the process-wide validator from get_validator(). Structural
+validation of the already parsed documents is reported separately, since YAML
+parsing is a cost the validator cache does not touch.
+
+    python -m benchmarks.bench_validate [--files N] [--signals N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from io_gen.validate import _validate_structural, clear_validator_cache, validate
+
+from .synthetic import write_design
+
+
+def _run(paths: list[Path], cached: bool) -> float:
+    """Validate every path and return the mean wall time per file in milliseconds"""
+    clear_validator_cache()
+    start = time.perf_counter()
+    for path in paths:
+        if not cached:
+            clear_validator_cache()
+        validate(path)
+    return (time.perf_counter() - start) * 1000 / len(paths)
+
+
+def _run_structural(docs: list[dict], cached: bool) -> float:
+    """Structurally validate every document and return the mean time in milliseconds"""
+    clear_validator_cache()
+    start = time.perf_counter()
+    for doc in docs:
+        if not cached:
+            clear_validator_cache()
+        _validate_structural(doc)
+    return (time.perf_counter() - start) * 1000 / len(docs)
+
+
+def _report(label: str, uncached: float, cached: float) -> None:
+    print(label)
+    print(f"  rebuild validator per file: {uncached:8.3f} ms/file")
+    print(f"  shared validator:           {cached:8.3f} ms/file")
+    print(f"  speedup:                    {uncached / cached:8.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50, help="number of input files")
+    parser.add_argument("--signals", type=int, default=4, help="signals per file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [
+            write_design(Path(tmp) / f"board_{index}.yaml", args.signals)
+            for index in range(args.files)
+        ]
+        docs = [yaml.safe_load(path.read_text(encoding="utf-8")) for path in paths]
+        full = (_run(paths, cached=False), _run(paths, cached=True))
+        structural = (
+            _run_structural(docs, cached=False),
+            _run_structural(docs, cached=True),
+        )
+
+    print(f"{args.files} files, {args.signals} signals each")
+    _report("validate()", *full)
+    _report("structural validation only", *structural)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Peak memory of writing the output files whole and streamed
+
+Builds the tables of a large synthetic design and writes each of the five output
+files twice, measuring the peak Python heap (with tracemalloc) and the wall time of
+each: once by writing the string its generate_*() function returns, and once by
+handing an open file to its write_*() function, which writes a line or a buffer
+at a time. The tables are built and flattened up front so that neither pays for
+them.
+
+    python -m benchmarks.bench_write [--pins N] [--repeat N]
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+import io_gen.generate as gen
+from io_gen.tables import (
+    build_constraints_table,
+    build_meta_table,
+    build_pin_table,
+    build_signal_table,
+)
+
+from .synthetic import make_design
+
+# Each group of four synthetic signals (with 8 bit buses) has this many pins
+_PINS_PER_GROUP = 1 + 8 + 16 + 1
+
+
+def _outputs(design: dict[str, Any]) -> dict[str, tuple[Callable, Callable, tuple]]:
+    """Returns the string and streaming generator of each file and their arguments"""
+    signal_table = build_signal_table(design)
+    pin_table = build_pin_table(signal_table)
+    for name in pin_table.signals:
+        pin_table.columns(name)
+    port_table = gen.build_port_table(signal_table)
+    meta_table = build_meta_table(design)
+    constraints_table = build_constraints_table(design)
+    return {
+        "board.xdc": (
+            gen.generate_xdc,
+            gen.write_xdc,
+            (signal_table, pin_table, constraints_table),
+        ),
+        "board.v": (
+            gen.generate_verilog_top,
+            gen.write_verilog_top,
+            (signal_table, "board", port_table),
+        ),
+        "board_io.v": (
+            gen.generate_verilog_ioring,
+            gen.write_verilog_ioring,
+            (signal_table, pin_table, "board", port_table),
+        ),
+        "board.vhd": (
+            gen.generate_vhdl_top,
+            gen.write_vhdl_top,
+            (signal_table, meta_table, "board", port_table),
+        ),
+        "board_io.vhd": (
+            gen.generate_vhdl_ioring,
+            gen.write_vhdl_ioring,
+            (signal_table, pin_table, meta_table, "board", port_table),
+        ),
+    }
+
+
+def _measure(
+    func: Callable[[Path], None], path: Path, repeat: int
+) -> tuple[float, float]:
+    """Returns the best wall time and the peak heap (MiB) of func(path)"""
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pins", type=int, default=50000, help="pins in the design")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs of each")
+    args = parser.parse_args()
+
+    design = make_design(4 * -(-args.pins // _PINS_PER_GROUP))
+    outputs = _outputs(design)
+
+    print(f"{len(design['signals'])} signals, {args.pins} pins (or just over)")
+    print(f"{'':14} {'size':>9} {'whole':>22} {'streamed':>22}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (generate, write, gen_args) in outputs.items():
+            path = Path(tmp) / name
+
+            def whole(path: Path) -> None:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(generate(*gen_args))
+
+            def streamed(path: Path) -> None:
+                with open(path, "w", encoding="utf-8") as f:
+                    write(f, *gen_args)
+
+            whole_time, whole_peak = _measure(whole, path, args.repeat)
+            stream_time, stream_peak = _measure(streamed, path, args.repeat)
+            size = path.stat().st_size / 2**20
+            print(
+                f"{name:14} {size:>5.1f} MiB"
+                f" {whole_time:>8.3f}s {whole_peak:>7.2f} MiB"
+                f" {stream_time:>8.3f}s {stream_peak:>7.2f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
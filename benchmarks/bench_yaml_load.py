@@ -0,0 +1,78 @@
+"""YAML ingestion cost with the pure Python and libyaml loaders
+
+Writes one large synthetic board description and times the steps validate()
+performs before schema validation: reading the file, checking it for non-ASCII
+characters and parsing it. The previous approach (reading the file line by line
+for the ASCII check, then again for yaml.safe_load) is timed alongside.
+
+    python -m benchmarks.bench_yaml_load [--signals N] [--repeat N]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import yaml
+
+from io_gen.checks import check_non_ascii_bytes
+
+from .synthetic import write_design
+
+
+def _two_reads(path: Path) -> None:
+    with open(path, "r", encoding="utf-8") as lines:
+        for line in lines:
+            line.isascii()
+    with open(path, "r", encoding="utf-8") as f:
+        yaml.safe_load(f)
+
+
+def _single_read(loader: type) -> Callable[[Path], None]:
+    def run(path: Path) -> None:
+        data = path.read_bytes()
+        check_non_ascii_bytes(data)
+        yaml.load(data, Loader=loader)
+
+    return run
+
+
+def _time(step: Callable[[Path], None], path: Path, repeat: int) -> float:
+    """Best wall time of repeat runs in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        step(path)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signals", type=int, default=2000, help="signals in the file")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    args = parser.parse_args()
+
+    cases = [
+        ("two reads, yaml.safe_load", _two_reads),
+        ("single read, SafeLoader", _single_read(yaml.SafeLoader)),
+    ]
+    if hasattr(yaml, "CSafeLoader"):
+        cases.append(("single read, CSafeLoader", _single_read(yaml.CSafeLoader)))
+    else:
+        print("PyYAML was built without libyaml, CSafeLoader is not available")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_design(Path(tmp) / "board.yaml", args.signals)
+        size = path.stat().st_size
+        results = [(label, _time(step, path, args.repeat)) for label, step in cases]
+
+    baseline = results[0][1]
+    print(f"{args.signals} signals, {size / 1024:.0f} KiB")
+    for label, elapsed in results:
+        print(f"  {label:28s} {elapsed:9.2f} ms  {baseline / elapsed:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Synthetic pin descriptions of arbitrary size for the benchmarks"""
+
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+
+def make_design(num_signals: int, bus_width: int = 8) -> dict[str, Any]:
+    """Build a valid document with num_signals signals of mixed shapes
+
+    Cycles through scalar inputs, single-ended output buses, differential input
+    buses and tristate scalars so that every branch of the schema, the checks and
+    the generators gets exercised. Package pins are numbered sequentially, so every
+    pin name is unique and well formed.
+    """
+    pin_count = 0
+
+    def next_pins(count: int) -> list[str]:
+        nonlocal pin_count
+        pins = [f"P{pin_count + offset}" for offset in range(count)]
+        pin_count += count
+        return pins
+
+    signals: list[dict[str, Any]] = []
+    for index in range(num_signals):
+        kind = index % 4
+        if kind == 0:
+            signals.append(
+                {
+                    "name": f"clk_{index}",
+                    "pins": next_pins(1)[0],
+                    "direction": "in",
+                    "buffer": "ibuf",
+                    "iostandard": "LVCMOS18",
+                }
+            )
+        elif kind == 1:
+            signals.append(
+                {
+                    "name": f"led_{index}",
+                    "pins": next_pins(bus_width),
+                    "width": bus_width,
+                    "direction": "out",
+                    "buffer": "obuf",
+                    "iostandard": "LVCMOS33",
+                    "comment": {"xdc": "LED bank", "hdl": "LEDs"},
+                }
+            )
+        elif kind == 2:
+            signals.append(
+                {
+                    "name": f"lvds_{index}",
+                    "pinset": {"p": next_pins(bus_width), "n": next_pins(bus_width)},
+                    "width": bus_width,
+                    "direction": "in",
+                    "buffer": "ibufds",
+                    "iostandard": "LVDS_25",
+                }
+            )
+        else:
+            signals.append(
+                {
+                    "name": f"gpio_{index}",
+                    "pins": next_pins(1)[0],
+                    "direction": "inout",
+                    "buffer": "iobuf",
+                    "iostandard": "LVCMOS18",
+                }
+            )
+
+    return {
+        "title": f"Synthetic design with {num_signals} signals",
+        "part": "xc7k325tffg900-2",
+        "architecture": "rtl",
+        "constraints": {"cfgbvs": "GND", "config_voltage": 1.8},
+        "signals": signals,
+    }
+
+
+def write_design(path: Path, num_signals: int, bus_width: int = 8) -> Path:
+    """Write a synthetic design to path as YAML and return the path"""
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(make_design(num_signals, bus_width), f, sort_keys=False)
+    return path
@@ -1,5 +1,7 @@
 from .exceptions import ValidationError
+from .validate import get_validator
+from .validate import iter_diagnostics
 from .validate import validate
+from .validate import validate_stream
 from .validate import validate_verilog
 from .validate import validate_vhdl
-
@@ -0,0 +1,171 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .schema import schema_digest
+from .tables import ConstraintsTable, MetaTable, SignalTable
+
+# Default limits on how much the cache may hold before old entries are evicted
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bump whenever a change to ValidatedDesign or the table classes means entries
+# pickled by an earlier build can no longer be used as they are
+CACHE_FORMAT = 9
+
+# Cached entries are pickled with this suffix, everything else in the directory is
+# left alone
+_ENTRY_SUFFIX = ".pickle"
+
+
+@dataclass
+class ValidatedDesign:
+    """A validated document together with the tables built from it
+
+    A document validated with validate_stream() doesn't include its signals. The pin
+    table isn't included either: it is built from the signal table as the
+    generators need it.
+    """
+
+    doc: dict[str, Any]
+    meta_table: MetaTable
+    constraints_table: ConstraintsTable
+    signal_table: SignalTable
+
+
+def default_cache_dir() -> Path:
+    """Returns the io-gen directory under $XDG_CACHE_HOME (or ~/.cache)"""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "io-gen"
+
+
+def _io_gen_version() -> str:
+    # importlib.metadata is slow to import and only needed once there is a cache
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("io-gen")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class ValidationCache:
+    """Persistent cache of validated designs keyed by the contents of the YAML
+
+    Entries are keyed by a hash of the raw YAML bytes, the io-gen version, the
+    digest of the packaged schema and CACHE_FORMAT, so a new release or a schema
+    change never reuses an entry validated under different rules. Only successful
+    validations are stored. Entry files are replaced atomically, so concurrent runs
+    sharing a cache directory at worst redo the work.
+
+    The cache is bounded by both entry count and total size. Reading an entry marks
+    it as recently used, and the least recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._salt = (
+            f"{CACHE_FORMAT}\0{_io_gen_version()}\0{schema_digest()}\0".encode()
+        )
+
+    def key(self, data: bytes) -> str:
+        """Returns the cache key for the raw contents of a YAML file"""
+
+        return hashlib.sha256(self._salt + data).hexdigest()
+
+    def key_file(self, path: str | Path) -> str:
+        """Returns the same key as key(), reading the file a block at a time"""
+
+        digest = hashlib.sha256(self._salt)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_ENTRY_SUFFIX}"
+
+    def load(self, key: str) -> ValidatedDesign | None:
+        """Returns the cached design for key, or None if there isn't a usable one"""
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                design = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or written by an incompatible io-gen - just drop it
+            path.unlink(missing_ok=True)
+            return None
+        if not isinstance(design, ValidatedDesign):
+            path.unlink(missing_ok=True)
+            return None
+        # The modification time doubles as the last use time for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return design
+
+    def store(self, key: str, design: ValidatedDesign) -> None:
+        """Adds a design to the cache and evicts entries beyond the size limits"""
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(design, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """Returns (last use, size, path) for every entry, least recently used first"""
+        entries = []
+        for path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self) -> int:
+        """Removes least recently used entries until the cache is within its limits
+
+        Returns the number of entries removed.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if len(entries) - removed <= self.max_entries and total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Removes every entry from the cache and returns how many were removed"""
+        if not self.directory.is_dir():
+            return 0
+        entries = self._entries()
+        for _, _, path in entries:
+            path.unlink(missing_ok=True)
+        return len(entries)
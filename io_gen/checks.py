@@ -1,33 +1,28 @@
 import re
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
-from typing import Any
+from time import perf_counter
+from typing import Any, NamedTuple
 
 from .exceptions import ValidationError
+from .tables.enums import Buffer
 
 _PIN_NAME_PATTERN = re.compile(r"^[A-Z]+[0-9]+$")
+# Space separated list of pin names, each matching _PIN_NAME_PATTERN
+_PIN_LIST_PATTERN = re.compile(r"^[A-Z]+[0-9]+( [A-Z]+[0-9]+)*$")
+_NON_ASCII_BYTE = re.compile(rb"[^\x00-\x7f]")
+
+# The checks run on the document before any table is built, so they look the
+# buffers up by their strings. The attributes come from the Buffer enum.
 
 # Pair supported buffers with their directions
-BUFFER_DIRECTIONS = {
-    "ibuf": "in",
-    "obuf": "out",
-    "ibufds": "in",
-    "obufds": "out",
-    "iobuf": "inout",
-    "iobufds": "inout",
-}
+BUFFER_DIRECTIONS = {buffer.value: buffer.direction.value for buffer in Buffer}
 
 # Pair buffer with whether they are single or differential
-BUFFER_STRATEGIES = {
-    "ibuf": "pins",
-    "obuf": "pins",
-    "ibufds": "pinset",
-    "obufds": "pinset",
-    "iobuf": "pins",
-    "iobufds": "pinset",
-}
+BUFFER_STRATEGIES = {buffer.value: buffer.strategy for buffer in Buffer}
 
 # Inference only supported for certain buffer types
-BUFFER_INFERABLE = ["ibuf", "obuf"]
+BUFFER_INFERABLE = frozenset(buffer.value for buffer in Buffer if buffer.inferable)
 
 
 def _get_pin_names_from_signal(sig: dict) -> list[str]:
@@ -51,6 +46,460 @@ def _get_pin_names_from_signal(sig: dict) -> list[str]:
     return pins
 
 
+def _get_pinset_legs(sig: dict) -> tuple[Any, Any] | None:
+    """Get the p and n legs of a differential signal (None if single-ended)"""
+    if "pinset" not in sig:
+        return None
+    return sig["pinset"]["p"], sig["pinset"]["n"]
+
+
+def _get_pin_strategy(sig: dict) -> str:
+    """Whether the signal is assigned single-ended 'pins' or a differential 'pinset'"""
+    return "pins" if "pins" in sig else "pinset"
+
+
+def _signal_is_array(sig: dict) -> bool:
+    """Whether the signal's pins (or the p leg of its pinset) are an array"""
+    if "pins" in sig:
+        return isinstance(sig["pins"], list)
+    return isinstance(sig["pinset"]["p"], list)
+
+
+# Facts that have to be computed from the signal, and how. These are only derived
+# when a rule in the engine needs them.
+_DERIVE_FACT: dict[str, Callable[[dict], Any]] = {
+    "pins": _get_pin_names_from_signal,
+    "legs": _get_pinset_legs,
+    "strategy": _get_pin_strategy,
+    "is_array": _signal_is_array,
+}
+
+class FactDerivers(NamedTuple):
+    """How to derive each fact of _DERIVE_FACT, or None where no rule needs it"""
+
+    pins: Callable[[dict], Any] | None
+    legs: Callable[[dict], Any] | None
+    strategy: Callable[[dict], Any] | None
+    is_array: Callable[[dict], Any] | None
+
+
+class SignalFacts:
+    """Values derived from one signal and shared by every rule that visits it
+
+    The signal name and the plain reads of the signal (with the same defaults as
+    the schema) are always available, since taking them costs less than deciding
+    whether to. Derived facts nobody asked for are simply left unset.
+    """
+
+    __slots__ = (
+        "sig",
+        "name",
+        "width",
+        "buffer",
+        "direction",
+        "generate",
+        "bypass",
+        "infer",
+        "pins",
+        "legs",
+        "strategy",
+        "is_array",
+    )
+
+    sig: dict[str, Any]
+    name: str
+    width: int | None
+    buffer: str | None
+    direction: str | None
+    generate: bool
+    bypass: bool
+    infer: bool
+    # Derived, only when a rule needs them
+    pins: list[str]
+    legs: tuple[Any, Any] | None
+    strategy: str
+    is_array: bool
+
+    def __init__(self, sig: dict[str, Any], derivers: FactDerivers) -> None:
+        self.sig = sig
+        self.name = sig["name"]
+        get = sig.get
+        self.width = get("width")
+        self.buffer = get("buffer")
+        self.direction = get("direction")
+        self.generate = get("generate", True)
+        self.bypass = get("bypass", False)
+        self.infer = get("infer", False)
+        if derivers.pins is not None:
+            self.pins = derivers.pins(sig)
+        if derivers.legs is not None:
+            self.legs = derivers.legs(sig)
+        if derivers.strategy is not None:
+            self.strategy = derivers.strategy(sig)
+        if derivers.is_array is not None:
+            self.is_array = derivers.is_array(sig)
+
+
+class Rule:
+    """A semantic check run by the RuleEngine
+
+    Subclasses list the facts they need in `needs` and implement visit(), which is
+    called once per signal in document order. Rules that need to see every signal
+    (e.g., uniqueness) keep state between visits - reset() is called before each
+    traversal and finish() after the last signal. Each method raises ValidationError
+    to report a problem.
+
+    Rules with `per_signal = True` only ever look at one signal at a time. They are
+    the rules that used to run inside the per-signal loop of the semantic validation,
+    and the engine uses the distinction to decide which error to report first.
+    """
+
+    name = ""
+    needs: tuple[str, ...] = ()
+    per_signal = False
+
+    def reset(self) -> None:
+        pass
+
+    def visit(self, facts: SignalFacts) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+class PinNameFormat(Rule):
+    name = "pin_name_format"
+    needs = ("pins",)
+
+    def visit(self, facts: SignalFacts) -> None:
+        # One regex match over the whole list is much cheaper than one per pin on
+        # wide buses - only go looking for the culprit when it fails. Counting the
+        # separators keeps a pin that itself contains a space from sneaking through.
+        joined = " ".join(facts.pins)
+        if joined.count(" ") == len(facts.pins) - 1 and _PIN_LIST_PATTERN.match(joined):
+            return
+        for pin in facts.pins:
+            if not _PIN_NAME_PATTERN.match(pin):
+                raise ValidationError(
+                    f"signal '{facts.name}' has pin '{pin}': is malformed"
+                )
+
+
+class UniqueSignalNames(Rule):
+    name = "unique_signal_names"
+
+    def reset(self) -> None:
+        self.names: set[str] = set()
+
+    def visit(self, facts: SignalFacts) -> None:
+        if facts.name in self.names:
+            raise ValidationError(f"signal '{facts.name}': duplicate names")
+        self.names.add(facts.name)
+
+
+class UniquePins(Rule):
+    name = "unique_pins"
+    needs = ("pins",)
+
+    def reset(self) -> None:
+        self.pins: set[str] = set()
+
+    def visit(self, facts: SignalFacts) -> None:
+        for pin in facts.pins:
+            if pin in self.pins:
+                raise ValidationError(
+                    f"signal '{facts.name}' has pin '{pin}': duplicate pins"
+                )
+            self.pins.add(pin)
+
+
+class MinimumPortsGenerated(Rule):
+    name = "minimum_ports_generated"
+    needs = ("generate",)
+
+    def reset(self) -> None:
+        self.generated = False
+
+    def visit(self, facts: SignalFacts) -> None:
+        self.generated = self.generated or facts.generate
+
+    def finish(self) -> None:
+        if not self.generated:
+            raise ValidationError(
+                "no signals with generate: true - nothing to generate"
+            )
+
+
+class PinsetArrayMismatch(Rule):
+    name = "pinset_array_mismatch"
+    needs = ("legs",)
+    per_signal = True
+
+    def visit(self, facts: SignalFacts) -> None:
+        if facts.legs is None:
+            return
+        p_pins, n_pins = facts.legs
+        if isinstance(p_pins, str) and isinstance(n_pins, str):
+            return
+        if isinstance(p_pins, list) and isinstance(n_pins, list):
+            if len(p_pins) != len(n_pins):
+                raise ValidationError(f"signal '{facts.name}': pinset array mismatch")
+        else:
+            raise ValidationError(f"signal '{facts.name}': pinset type mismatch")
+
+
+class PinsArrayWidthMatch(Rule):
+    name = "pins_array_width_match"
+    needs = ("strategy", "is_array", "pins", "width")
+    per_signal = True
+
+    def visit(self, facts: SignalFacts) -> None:
+        # Recall, from the schema that width is only required for arrays
+        if facts.strategy == "pins" and facts.is_array:
+            if len(facts.pins) != facts.width:
+                raise ValidationError(
+                    f"signal '{facts.name}': pins array width mismatch"
+                )
+
+
+class PinsetArrayWidthMatch(Rule):
+    name = "pinset_array_width_match"
+    needs = ("legs", "width")
+    per_signal = True
+
+    def visit(self, facts: SignalFacts) -> None:
+        if facts.legs is None:
+            return
+        p_pins, n_pins = facts.legs
+        # Recall, from the schema that width is only required for arrays
+        if isinstance(p_pins, list) and isinstance(n_pins, list):
+            if len(p_pins) != facts.width or len(n_pins) != facts.width:
+                raise ValidationError(
+                    f"signal '{facts.name}': pinset array width mismatch"
+                )
+
+
+class BufferDirection(Rule):
+    name = "buffer_direction"
+    needs = ("generate", "bypass", "buffer", "direction")
+    per_signal = True
+
+    def visit(self, facts: SignalFacts) -> None:
+        # The schema requires a buffer unless the signal is bypassed
+        if not facts.generate or facts.bypass or facts.buffer is None:
+            return
+        if BUFFER_DIRECTIONS[facts.buffer] != facts.direction:
+            raise ValidationError(
+                f"signal '{facts.name}': buffer {facts.buffer} direction is {facts.direction}"
+            )
+
+
+class BufferStrategyMatch(Rule):
+    name = "buffer_strategy_match"
+    needs = ("generate", "bypass", "buffer", "strategy")
+    per_signal = True
+
+    def visit(self, facts: SignalFacts) -> None:
+        if not facts.generate or facts.bypass or facts.buffer is None:
+            return
+        if BUFFER_STRATEGIES[facts.buffer] != facts.strategy:
+            raise ValidationError(
+                f"signal '{facts.name}': buffer {facts.buffer} incompatible with '{facts.strategy}'"
+            )
+
+
+class BufferInferBypassMismatch(Rule):
+    name = "buffer_infer_bypass_mismatch"
+    needs = ("bypass", "infer")
+    per_signal = True
+
+    def visit(self, facts: SignalFacts) -> None:
+        if facts.bypass and facts.infer:
+            raise ValidationError(
+                f"signal '{facts.name}': cannot infer buffer and bypass IO ring"
+            )
+
+
+class BufferInferable(Rule):
+    name = "buffer_inferable"
+    needs = ("infer", "buffer")
+    per_signal = True
+
+    def visit(self, facts: SignalFacts) -> None:
+        if facts.infer and facts.buffer not in BUFFER_INFERABLE:
+            raise ValidationError(
+                f"signal '{facts.name}': buffer {facts.buffer} not inferable"
+            )
+
+
+def default_rules() -> list[Rule]:
+    """Fresh instances of every semantic rule, in the order they are reported"""
+    return [
+        PinNameFormat(),
+        UniqueSignalNames(),
+        UniquePins(),
+        MinimumPortsGenerated(),
+        PinsetArrayMismatch(),
+        PinsArrayWidthMatch(),
+        PinsetArrayWidthMatch(),
+        BufferDirection(),
+        BufferStrategyMatch(),
+        BufferInferBypassMismatch(),
+        BufferInferable(),
+    ]
+
+
+class RuleEngine:
+    """Runs a set of rules over a signal list in a single traversal
+
+    The facts every rule needs are derived once per signal and shared. The error that
+    is reported is the one the rules would have raised first had they each made their
+    own pass over the signals in order (with consecutive per-signal rules sharing one
+    pass, signal by signal). That keeps messages stable no matter how many problems a
+    document has, at the cost of finishing the traversal after a later rule fails.
+
+    With timed=True, the time spent in each rule accumulates in `timings` (seconds,
+    keyed by rule name) and the number of signals each rule visited in `visits`.
+
+    Signals can be fed one at a time with begin(), feed(), and end(), or all at once
+    with run(). check() is the non-raising alternative to run() - it keeps going
+    after a failure and yields every error found - and check_signal() and
+    check_finish() are the non-raising alternatives to feed() and end().
+    """
+
+    def __init__(self, rules: list[Rule] | None = None, timed: bool = False) -> None:
+        self.rules = default_rules() if rules is None else rules
+        self.timed = timed
+        self.timings: dict[str, float] = {rule.name: 0.0 for rule in self.rules}
+        self.visits: dict[str, int] = {rule.name: 0 for rule in self.rules}
+        # Union of the facts needed by every rule, derived once per signal
+        self.needs = tuple(dict.fromkeys(f for rule in self.rules for f in rule.needs))
+        self._derivers = FactDerivers(
+            *(
+                _DERIVE_FACT[fact] if fact in self.needs else None
+                for fact in FactDerivers._fields
+            )
+        )
+        # Index of the (virtual) pass each rule belongs to
+        self.passes: list[int] = []
+        for index, rule in enumerate(self.rules):
+            if index and rule.per_signal and self.rules[index - 1].per_signal:
+                self.passes.append(self.passes[-1])
+            else:
+                self.passes.append(len(set(self.passes)))
+        self.begin()
+
+    def begin(self) -> None:
+        """Reset every rule before a new traversal"""
+        self.errors: dict[int, ValidationError] = {}
+        # Rules still visiting signals, i.e., whose pass hasn't failed yet
+        self._visiting = list(zip(self.rules, self.passes))
+        for rule in self.rules:
+            rule.reset()
+
+    def feed(self, sig: dict[str, Any]) -> None:
+        """Visit one signal with every rule whose pass hasn't failed yet"""
+        facts = SignalFacts(sig, self._derivers)
+        failed = False
+        if self.timed:
+            failed = self._feed_timed(facts)
+        else:
+            for rule, rule_pass in self._visiting:
+                try:
+                    rule.visit(facts)
+                except ValidationError as e:
+                    # Only the first error of each pass counts
+                    self.errors.setdefault(rule_pass, e)
+                    failed = True
+
+        if failed:
+            # Nothing can be reported ahead of a failure in the very first pass, so
+            # there is no point visiting anything else
+            if 0 in self.errors:
+                self._visiting = []
+            else:
+                self._visiting = [v for v in self._visiting if v[1] not in self.errors]
+
+    def _feed_timed(self, facts: SignalFacts) -> bool:
+        """Same as the loop in feed(), but accumulating the time spent in each rule"""
+        failed = False
+        for rule, rule_pass in self._visiting:
+            start = perf_counter()
+            try:
+                rule.visit(facts)
+            except ValidationError as e:
+                self.errors.setdefault(rule_pass, e)
+                failed = True
+            self.timings[rule.name] += perf_counter() - start
+            self.visits[rule.name] += 1
+        return failed
+
+    def end(self) -> None:
+        """Finish the traversal and raise the first error, if there is one"""
+        for rule, rule_pass in zip(self.rules, self.passes):
+            if rule_pass in self.errors:
+                continue
+            start = perf_counter() if self.timed else 0.0
+            try:
+                rule.finish()
+            except ValidationError as e:
+                self.errors[rule_pass] = e
+            if self.timed:
+                self.timings[rule.name] += perf_counter() - start
+        if self.errors:
+            raise self.errors[min(self.errors)]
+
+    def run(self, signals: Iterable[dict[str, Any]]) -> None:
+        """Check a complete list of signals, raising ValidationError on failure"""
+        self.begin()
+        for sig in signals:
+            self.feed(sig)
+        self.end()
+
+    def check(
+        self, signals: Iterable[dict[str, Any]], finish: bool = True
+    ) -> Iterator[ValidationError]:
+        """Check a list of signals, yielding every error instead of raising the first
+
+        Errors come out signal by signal as the traversal reaches them, followed by
+        those only known at the end (e.g., that no ports are generated), so a caller
+        that stops early never pays for the rest of the list. Pass finish=False when
+        signals is known to be incomplete, since conclusions about the whole design
+        would be wrong.
+        """
+        self.begin()
+        for sig in signals:
+            yield from self.check_signal(sig)
+        if finish:
+            yield from self.check_finish()
+
+    def check_signal(self, sig: dict[str, Any]) -> Iterator[ValidationError]:
+        """Visit one signal with every rule, yielding the errors instead of raising them
+
+        With check_finish(), this lets signals be checked one at a time as they
+        arrive. Call begin() before the first signal.
+        """
+        facts = SignalFacts(sig, self._derivers)
+        for rule in self.rules:
+            start = perf_counter() if self.timed else 0.0
+            try:
+                rule.visit(facts)
+            except ValidationError as e:
+                yield e
+            if self.timed:
+                self.timings[rule.name] += perf_counter() - start
+                self.visits[rule.name] += 1
+
+    def check_finish(self) -> Iterator[ValidationError]:
+        """Yield the errors only known once every signal has been checked"""
+        for rule in self.rules:
+            try:
+                rule.finish()
+            except ValidationError as e:
+                yield e
+
+
 def check_pin_name_format(signals: list[dict]) -> None:
     """Check that every pin name in the design contains only uppercase letters and digits.
 
@@ -61,12 +510,7 @@ def check_pin_name_format(signals: list[dict]) -> None:
 
     Raises ValidationError identifying the first malformed pin name found.
     """
-    for sig in signals:
-        name = sig["name"]
-        pins = _get_pin_names_from_signal(sig)
-        for pin in pins:
-            if not _PIN_NAME_PATTERN.match(pin):
-                raise ValidationError(f"signal '{name}' has pin '{pin}': is malformed")
+    RuleEngine([PinNameFormat()]).run(signals)
 
 
 def check_unique_signal_names(signals: list[dict]) -> None:
@@ -75,12 +519,7 @@ def check_unique_signal_names(signals: list[dict]) -> None:
     Raises ValidationError identifying the first duplicate name found.
     Applies to all signals, including those with generate: false.
     """
-    uniq_names = set()
-    for sig in signals:
-        name = sig["name"]
-        if name in uniq_names:
-            raise ValidationError(f"signal '{name}': duplicate names")
-        uniq_names.add(name)
+    RuleEngine([UniqueSignalNames()]).run(signals)
 
 
 def check_unique_pins(signals: list[dict]) -> None:
@@ -90,12 +529,7 @@ def check_unique_pins(signals: list[dict]) -> None:
     Applies to all signals, including those with generate: false.
     Raises ValidationError identifying the first duplicate pin found.
     """
-    pins = set()
-    for sig in signals:
-        for pin in _get_pin_names_from_signal(sig):
-            if pin in pins:
-                raise ValidationError(f"Pin '{pin}': duplicate pins")
-            pins.add(pin)
+    RuleEngine([UniquePins()]).run(signals)
 
 
 def check_pinset_array_mismatch(sig: dict[str, Any]) -> None:
@@ -106,18 +540,7 @@ def check_pinset_array_mismatch(sig: dict[str, Any]) -> None:
     Raises ValidationError identifying the signal and the mismatch.
     Skips signals that do not use pinset.
     """
-    if "pinset" in sig:
-        name = sig["name"]
-        p_pins = sig["pinset"]["p"]
-        n_pins = sig["pinset"]["n"]
-
-        if isinstance(p_pins, str) and isinstance(n_pins, str):
-            return
-        if isinstance(p_pins, list) and isinstance(n_pins, list):
-            if len(p_pins) != len(n_pins):
-                raise ValidationError(f"signal '{name}': pinset array mismatch")
-        else:
-            raise ValidationError(f"signal '{name}': pinset type mismatch")
+    RuleEngine([PinsetArrayMismatch()]).run([sig])
 
 
 def check_pins_array_width_match(sig: dict[str, Any]) -> None:
@@ -127,16 +550,7 @@ def check_pins_array_width_match(sig: dict[str, Any]) -> None:
     the signal, the declared width, and the actual pin count.
     Skips signals that use scalar pins, pinset, or generate: false.
     """
-    if "pins" in sig:
-        name = sig["name"]
-        pins = sig["pins"]
-        if isinstance(pins, str):
-            return
-        elif isinstance(pins, list):
-            # Recall, from the schema that width is only required for arrays
-            width = sig["width"]
-            if len(pins) != width:
-                raise ValidationError(f"signal '{name}': pins array width mismatch")
+    RuleEngine([PinsArrayWidthMatch()]).run([sig])
 
 
 def check_pinset_array_width_match(sig: dict[str, Any]) -> None:
@@ -146,21 +560,7 @@ def check_pinset_array_width_match(sig: dict[str, Any]) -> None:
     the signal, the declared width, and the actual pin count.
     Skips signals that use scalar pinset, pins, or generate: false.
     """
-
-    if "pinset" in sig:
-        name = sig["name"]
-        p_pins = sig["pinset"]["p"]
-        n_pins = sig["pinset"]["n"]
-
-        if isinstance(p_pins, str) and isinstance(n_pins, str):
-            return
-        elif isinstance(p_pins, list) and isinstance(n_pins, list):
-            # Recall, from the schema that width is only required for arrays
-            width = sig["width"]
-            if len(p_pins) != width:
-                raise ValidationError(f"signal '{name}': pinset array width mismatch")
-            elif len(n_pins) != width:
-                raise ValidationError(f"signal '{name}': pinset array width mismatch")
+    RuleEngine([PinsetArrayWidthMatch()]).run([sig])
 
 
 def check_buffer_direction(sig: dict[str, Any]) -> None:
@@ -170,17 +570,7 @@ def check_buffer_direction(sig: dict[str, Any]) -> None:
     iobufds->inout. Raises ValidationError identifying the signal, buffer, and direction.
     Skips signals with generate: false or bypass: true (no buffer required).
     """
-    if not sig.get("generate", True) or sig.get("bypass", False):
-        return
-
-    name = sig["name"]
-    buffer = sig["buffer"]
-    direction = sig["direction"]
-
-    if BUFFER_DIRECTIONS[buffer] != direction:
-        raise ValidationError(
-            f"signal '{name}': buffer {buffer} direction is {direction}"
-        )
+    RuleEngine([BufferDirection()]).run([sig])
 
 
 def check_buffer_strategy_match(sig: dict[str, Any]) -> None:
@@ -190,21 +580,7 @@ def check_buffer_strategy_match(sig: dict[str, Any]) -> None:
     Raises ValidationError identifying the signal, buffer, and pin strategy used.
     Skips signals with generate: false or bypass: true (no buffer required).
     """
-
-    if not sig.get("generate", True) or sig.get("bypass", False):
-        return
-
-    name = sig["name"]
-    buffer = sig["buffer"]
-    if "pins" in sig:
-        strategy = "pins"
-    else:
-        strategy = "pinset"
-
-    if BUFFER_STRATEGIES[buffer] != strategy:
-        raise ValidationError(
-            f"signal '{name}': buffer {buffer} incompatible with '{strategy}'"
-        )
+    RuleEngine([BufferStrategyMatch()]).run([sig])
 
 
 def check_buffer_infer_bypass_mismatch(sig: dict[str, Any]) -> None:
@@ -214,11 +590,7 @@ def check_buffer_infer_bypass_mismatch(sig: dict[str, Any]) -> None:
     the buffer, while infer asks the synthesis tool to infer one.
     Raises ValidationError identifying the signal.
     """
-    name = sig["name"]
-    if sig.get("bypass", False) and sig.get("infer", False):
-        raise ValidationError(
-            f"signal '{name}': cannot infer buffer and bypass IO ring"
-        )
+    RuleEngine([BufferInferBypassMismatch()]).run([sig])
 
 
 def check_buffer_inferable(sig: dict[str, Any]) -> None:
@@ -229,13 +601,7 @@ def check_buffer_inferable(sig: dict[str, Any]) -> None:
     Raises ValidationError identifying the signal and buffer type.
     Skips signals where infer is false or not set.
     """
-    if not sig.get("infer", False):
-        return
-
-    name = sig["name"]
-    buffer = sig["buffer"]
-    if buffer not in BUFFER_INFERABLE:
-        raise ValidationError(f"signal '{name}': buffer {buffer} not inferable")
+    RuleEngine([BufferInferable()]).run([sig])
 
 
 def check_minimum_ports_generated(signals: list[dict[str, Any]]) -> None:
@@ -244,8 +610,7 @@ def check_minimum_ports_generated(signals: list[dict[str, Any]]) -> None:
     Raises ValidationError if all signals have generate: false, which would
     produce no usable output.
     """
-    if not any(sig.get("generate", True) for sig in signals):
-        raise ValidationError("no signals with generate: true - nothing to generate")
+    RuleEngine([MinimumPortsGenerated()]).run(signals)
 
 
 def check_non_ascii(path: Path) -> None:
@@ -254,7 +619,21 @@ def check_non_ascii(path: Path) -> None:
     Raises ValidationError identifying the location of the first non-ASCII character
     in the provided path.
     """
-    with open(path, "r", encoding="utf-8") as lines:
-        for index, line in enumerate(lines, 1):
-            if not line.isascii():
-                raise ValidationError(f"found non-ASCII encoded string at line {index}")
+    check_non_ascii_bytes(Path(path).read_bytes())
+
+
+def check_non_ascii_bytes(data: bytes, first_line: int = 1) -> None:
+    """Checks the raw contents of a file for non-ASCII characters
+
+    The whole buffer is tested at once and only scanned for the offending byte if it
+    fails. Raises ValidationError identifying the line of the first non-ASCII
+    character, counting from first_line (the line data starts on, for a chunk of a
+    larger file).
+    """
+    if data.isascii():
+        return
+    match = _NON_ASCII_BYTE.search(data)
+    if match is None:
+        return
+    line = data.count(b"\n", 0, match.start()) + first_line
+    raise ValidationError(f"found non-ASCII encoded string at line {line}")
@@ -3,10 +3,128 @@ import sys
 
 from io_gen.exceptions import ValidationError
 
-from io_gen.pipeline import run_pipeline
+from io_gen.pipeline import parse_languages, run_pipeline, run_query
+from io_gen.tables import IOStandard
+
+
+def _error_limit(value: str) -> int:
+    """argparse type for --max-errors"""
+    limit = int(value)
+    if limit < 0:
+        raise argparse.ArgumentTypeError("must be 0 or more")
+    return limit
+
+
+def _job_count(value: str) -> int:
+    """argparse type for --jobs"""
+    jobs = int(value)
+    if jobs < 1:
+        raise argparse.ArgumentTypeError("must be 1 or more")
+    return jobs
+
+
+def _languages(value: str) -> str:
+    """argparse type for --lang"""
+    try:
+        parse_languages(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value.lower()
+
+
+def cache_main(argv: list[str]) -> None:
+    """Handles `io-gen cache <command>` for managing the validation cache"""
+    parser = argparse.ArgumentParser(
+        prog="io-gen cache",
+        description="Manage the cache of previously validated YAML files.",
+    )
+    parser.add_argument(
+        "command",
+        choices=["clear"],
+        help="clear: remove every entry from the cache.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "clear":
+        from io_gen.cache import ValidationCache
+
+        cache = ValidationCache()
+        try:
+            removed = cache.clear()
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Info: Removed {removed} cached entries from {cache.directory}")
+
+
+def query_main(argv: list[str]) -> None:
+    """Handles `io-gen query` for looking up package pins in a design"""
+    parser = argparse.ArgumentParser(
+        prog="io-gen query",
+        description="List the package pins of a YAML pin description and the signals that use them.",
+    )
+    parser.add_argument(
+        "--pin",
+        action="append",
+        dest="pins",
+        metavar="PIN",
+        help="Look up a package pin (may be given more than once). Default: every pin.",
+    )
+    parser.add_argument(
+        "--iostandard",
+        type=str.upper,
+        choices=[iostandard.value for iostandard in IOStandard],
+        metavar="STD",
+        help="Only list pins of signals with this IO standard (e.g. LVDS).",
+    )
+    parser.add_argument(
+        "--direction",
+        type=str.lower,
+        choices=["in", "out", "inout"],
+        metavar="DIR",
+        help="Only list pins of signals with this direction: in, out or inout.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always validate the input YAML instead of reusing the result of a previous run.",
+    )
+    parser.add_argument(
+        "input_yaml",
+        metavar="input.yaml",
+        help="Path to the YAML pin description file.",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        lines = run_query(
+            yaml_path=args.input_yaml,
+            pins=args.pins,
+            iostandard=args.iostandard,
+            direction=args.direction,
+            use_cache=not args.no_cache,
+        )
+    except ValidationError as e:
+        for diagnostic in e.diagnostics:
+            print(f"Error: {diagnostic}", file=sys.stderr)
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    for line in lines:
+        print(line)
 
 
 def main() -> None:
+    # Subcommands are dispatched before the generator's own argument parsing
+    if sys.argv[1:2] == ["cache"]:
+        cache_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["query"]:
+        query_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         prog="io-gen",
         description="Generate XDC constraints and HDL from a YAML pin description.",
@@ -20,11 +138,10 @@ def main() -> None:
     )
     parser.add_argument(
         "--lang",
-        type=str.lower,
-        choices=["verilog", "vhdl"],
+        type=_languages,
         default="verilog",
         metavar="LANG",
-        help="Output HDL language: verilog or vhdl (default: verilog). Ignored with --xdc-only.",
+        help="Output HDL language: verilog, vhdl, verilog,vhdl or both (default: verilog). Ignored with --xdc-only.",
     )
     parser.add_argument(
         "--output",
@@ -33,6 +150,59 @@ def main() -> None:
         help="Directory to write output files into (default: current directory).",
     )
 
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always validate the input YAML instead of reusing the result of a previous run.",
+    )
+
+    parser.add_argument(
+        "--max-errors",
+        type=_error_limit,
+        default=None,
+        metavar="N",
+        help="Report up to N validation errors instead of stopping at the first (0 for no limit).",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_job_count,
+        default=1,
+        metavar="N",
+        help="Validate very large signal lists on N worker processes (default: 1).",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Validate the input YAML one signal at a time to bound memory use on very large files.",
+    )
+
+    parser.add_argument(
+        "--emit-ir",
+        metavar="FILE",
+        help="Also write the validated tables to an IR file that --from-ir can load.",
+    )
+
+    parser.add_argument(
+        "--from-ir",
+        action="store_true",
+        help="Read the tables from an IR file written with --emit-ir instead of a YAML file.",
+    )
+
+    parser.add_argument(
+        "--bus-loops",
+        action="store_true",
+        help="Instantiate the buffers of each bus in one generate loop instead of one per bit.",
+    )
+
+    parser.add_argument(
+        "--compact-xdc",
+        action="store_true",
+        help="Set IO standards and directions once per value over a port list instead of per port.",
+    )
+
     mode = parser.add_mutually_exclusive_group()
     mode.add_argument(
         "--validate-only",
@@ -54,7 +224,7 @@ def main() -> None:
     parser.add_argument(
         "input_yaml",
         metavar="input.yaml",
-        help="Path to the YAML pin description file.",
+        help="Path to the YAML pin description file (or the IR file with --from-ir).",
     )
 
     args = parser.parse_args()
@@ -68,10 +238,24 @@ def main() -> None:
             validate_only=args.validate_only,
             rtl_only=args.rtl_only,
             xdc_only=args.xdc_only,
+            use_cache=not args.no_cache,
+            max_errors=args.max_errors,
+            jobs=args.jobs,
+            stream=args.stream,
+            from_ir=args.from_ir,
+            emit_ir=args.emit_ir,
+            bus_loops=args.bus_loops,
+            compact_xdc=args.compact_xdc,
         )
     except PermissionError as e:
         print(f"Error: {e.strerror}: {e.filename}", file=sys.stderr)
         sys.exit(1)
-    except (ValidationError, OSError, ValueError) as e:
+    except ValidationError as e:
+        # Every problem found when collecting more than one, then the summary
+        for diagnostic in e.diagnostics:
+            print(f"Error: {diagnostic}", file=sys.stderr)
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except (OSError, ValueError) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
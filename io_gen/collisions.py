@@ -0,0 +1,201 @@
+from collections.abc import Iterator
+
+from .exceptions import ValidationError
+from .generate.common import (
+    get_signal_bus_loop,
+    get_signal_ioring_ports,
+    get_signal_nets,
+    get_signal_top_ports,
+)
+from .identifiers import VERILOG_KEYWORDS, VHDL_KEYWORDS
+from .tables import SignalTable, buffer_instances, default_instance
+
+# Primitives the IO ring instantiates. As design units they share a namespace with
+# the generated modules, and in VHDL the IO ring makes them visible with a use
+# clause, so a declaration with the same name would hide them.
+PRIMITIVES = ("IBUF", "OBUF", "IBUFDS", "OBUFDS", "IOBUF", "IOBUFDS")
+
+# Names made visible in every generated VHDL design unit by its context clause (and
+# `work`, which the top level uses to instantiate the IO ring)
+_VHDL_VISIBLE = ("std_logic", "std_logic_vector", "work")
+
+
+class IdentifierIndex:
+    """Every identifier the generators will emit, grouped by the scope declaring it
+
+    Identifiers are hashed by the form the language compares them in (lower case for
+    VHDL), so adding one and finding whatever it collides with are both constant
+    time. Collisions with an earlier identifier in the same scope and with reserved
+    words are recorded in `collisions` rather than raised, so that every one of them
+    can be reported.
+    """
+
+    def __init__(self, lang: str) -> None:
+        if lang == "verilog":
+            self.case_sensitive = True
+            self.language = "Verilog"
+            self.unit = "module"
+            keywords = VERILOG_KEYWORDS
+        else:
+            self.case_sensitive = False
+            self.language = "VHDL"
+            self.unit = "entity"
+            keywords = VHDL_KEYWORDS
+        # Normalized name -> description of why it is off limits
+        self._reserved = {name: f"a {self.language} keyword" for name in keywords}
+        # Scope -> normalized name -> (name as written, owner)
+        self.scopes: dict[str, dict[str, tuple[str, str]]] = {}
+        self.collisions: list[str] = []
+
+    def _key(self, name: str) -> str:
+        return name if self.case_sensitive else name.lower()
+
+    def add(self, scope: str, name: str, owner: str) -> None:
+        """Record that owner declares name in scope, noting any collision"""
+        key = self._key(name)
+        reason = self._reserved.get(key)
+        if reason is not None:
+            self.collisions.append(f"{scope}: '{name}' from {owner} is {reason}")
+            return
+        declared = self.scopes.setdefault(scope, {})
+        if key in declared:
+            other_name, other_owner = declared[key]
+            self.collisions.append(
+                f"{scope}: '{name}' from {owner} collides with '{other_name}' "
+                f"from {other_owner}"
+            )
+            return
+        declared[key] = (name, owner)
+
+
+def build_identifier_index(
+    signal_table: SignalTable, top: str, lang: str, bus_loops: bool = False
+) -> IdentifierIndex:
+    """Index every identifier the generators will emit for lang
+
+    The names come from the same helpers the generators use, so the index can't
+    disagree with the output. Three scopes are indexed: the design units (the top
+    level and the IO ring), the top level (pad ports, fabric nets, and the IO ring
+    instance), and the IO ring (its ports and buffer instances). With bus_loops,
+    a bus declares the label of its generate loop (and in Verilog, its genvar) in
+    the IO ring instead of one instance per bit, and the one buffer instance in the
+    scope of the loop (see buffer_instances() for the cells that results in).
+    """
+    index = IdentifierIndex(lang)
+    ring = f"{top}_io"
+    unit = index.unit
+
+    units = "design units"
+    for primitive in PRIMITIVES:
+        index.add(units, primitive, "the IO buffer primitives")
+    index.add(units, top, f"the top level {unit}")
+    index.add(units, ring, f"the IO ring {unit}")
+
+    top_scope = f"{unit} '{top}'"
+    ring_scope = f"{unit} '{ring}'"
+    if lang == "vhdl":
+        for name in _VHDL_VISIBLE:
+            index.add(top_scope, name, "the VHDL context clause")
+            index.add(ring_scope, name, "the VHDL context clause")
+        for primitive in PRIMITIVES:
+            index.add(ring_scope, primitive, "the unisim library")
+
+    index.add(top_scope, f"{ring}_i0", "the IO ring instance")
+    for sig in signal_table:
+        owner = f"signal '{sig.name}'"
+        for port in get_signal_top_ports(sig):
+            index.add(top_scope, port["name"], f"{owner} (port)")
+        for net in get_signal_nets(sig):
+            index.add(top_scope, net["name"], f"{owner} (net)")
+        for port in get_signal_ioring_ports(sig):
+            index.add(ring_scope, port["name"], f"{owner} (IO ring port)")
+        loop = get_signal_bus_loop(sig) if bus_loops else None
+        if loop is not None:
+            index.add(ring_scope, loop.label, f"{owner} (generate loop)")
+            if lang == "verilog":
+                index.add(ring_scope, loop.variable, f"{owner} (genvar)")
+            # The buffer is named inside the loop, where nothing else is, but its
+            # name still can't be a keyword
+            loop_scope = f"generate loop '{loop.label}'"
+            index.add(loop_scope, loop.instance, f"{owner} (buffer instance)")
+            continue
+        # Only instantiated buffers get an instance name
+        for instance in buffer_instances(sig):
+            index.add(ring_scope, instance, f"{owner} (buffer instance)")
+
+    return index
+
+
+def check_identifier_collisions(
+    signal_table: SignalTable, top: str, lang: str, bus_loops: bool = False
+) -> None:
+    """Raise ValidationError if any generated identifiers collide
+
+    A single collision is raised on its own. When there are several, the exception
+    lists every one of them in its diagnostics.
+    """
+    collisions = build_identifier_index(signal_table, top, lang, bus_loops).collisions
+    if len(collisions) == 1:
+        raise ValidationError(collisions[0])
+    if collisions:
+        raise ValidationError(
+            f"found {len(collisions)} identifier collisions", collisions
+        )
+
+
+def _bus_loop_renames(
+    signal_table: SignalTable,
+) -> Iterator[tuple[bool, str, str, str]]:
+    """Yields (named in the YAML, signal, old cell, new cell) for every looped bus
+
+    A generate loop can't give the buffer of each bit a name of its own, so bit N
+    of a looped bus is the cell `<instance>_i[N].<instance>` instead of
+    `<instance>_i<N>`, whether the instance is named in the YAML or not. The cells
+    of the first bit stand for the rest.
+    """
+    for sig in signal_table:
+        if get_signal_bus_loop(sig) is None or sig.buffer is None:
+            continue
+        named = sig.instance != default_instance(sig.buffer, sig.name)
+        before = buffer_instances(sig)[0]
+        after = buffer_instances(sig, bus_loops=True)[0]
+        yield named, sig.name, before, after
+
+
+def check_bus_loops(signal_table: SignalTable) -> None:
+    """Raise ValidationError if bus loops would rename buffers named in the YAML
+
+    A bus whose instance name is given in the YAML presumably has its cells
+    referenced elsewhere (constraints, floorplans, debug probes), which the loop
+    would silently break, so it is rejected. As with collisions, a single bus is
+    raised on its own and several are listed in the diagnostics. The other buses
+    are renamed all the same, see bus_loop_warnings().
+    """
+    renamed = [
+        f"signal '{name}': bus loops would rename its named buffers "
+        f"('{before}' would become '{after}')"
+        for named, name, before, after in _bus_loop_renames(signal_table)
+        if named
+    ]
+    if len(renamed) == 1:
+        raise ValidationError(renamed[0])
+    if renamed:
+        raise ValidationError(
+            f"bus loops would rename the named buffers of {len(renamed)} signals",
+            renamed,
+        )
+
+
+def bus_loop_warnings(signal_table: SignalTable) -> list[str]:
+    """Returns a warning for every bus with default buffer names that bus loops rename
+
+    check_bus_loops() rejects the buses with named buffers. The rest are looped, but
+    any reference to their per-bit cells by the old names stops resolving, so each
+    one is reported.
+    """
+    return [
+        f"signal '{name}': bus loops rename its buffers "
+        f"('{before}' is now '{after}')"
+        for named, name, before, after in _bus_loop_renames(signal_table)
+        if not named
+    ]
@@ -1,2 +1,11 @@
 class ValidationError(Exception):
-    """Raised when input YAML fails structural or semantic validation."""
\ No newline at end of file
+    """Raised when input YAML fails structural or semantic validation.
+
+    When validation collects every problem instead of stopping at the first one,
+    `diagnostics` holds a message for each problem found and the exception message
+    summarizes them.
+    """
+
+    def __init__(self, message: str, diagnostics: list[str] | None = None) -> None:
+        super().__init__(message)
+        self.diagnostics: list[str] = diagnostics or []
@@ -0,0 +1,50 @@
+import functools
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+
+def create_temporary(path: Path) -> tuple[int, Path]:
+    """Create an empty temporary file next to path, to atomically replace it with
+
+    Returns an open descriptor and the path of the file, which already has the
+    permissions path should end up with (see output_mode()). The caller writes it,
+    then moves it into place with os.replace() or removes it.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        # mkstemp() makes the file private, but outputs are meant to be shared
+        os.fchmod(fd, output_mode(path))
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp)
+        raise
+    return fd, Path(tmp)
+
+
+def output_mode(path: Path) -> int:
+    """The permissions a file replacing path should have
+
+    Those of path if it exists, so that replacing a file doesn't change who can
+    read or write it, and otherwise those of a newly created file.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return new_file_mode()
+
+
+@functools.cache
+def new_file_mode() -> int:
+    """The permissions open() gives a new file, 0o666 less the umask
+
+    Found once by creating a file and looking, as reading the umask with os.umask()
+    means changing it for the whole process, under any other thread creating files.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        fd = os.open(os.path.join(directory, "probe"), os.O_WRONLY | os.O_CREAT, 0o666)
+        try:
+            return stat.S_IMODE(os.fstat(fd).st_mode)
+        finally:
+            os.close(fd)
@@ -1,5 +1,60 @@
-from .verilog_top import generate_verilog_top
-from .verilog_ioring import generate_verilog_ioring
-from .vhdl_top import generate_vhdl_top
-from .vhdl_ioring import generate_vhdl_ioring
-from .xdc import generate_xdc
+from typing import TYPE_CHECKING
+
+# Each generator is imported on first use, so that importing one backend (e.g., the
+# XDC generator) doesn't load the others. Every generator comes in two forms, a
+# write_*() that streams the file to a TextIO and a generate_*() that returns it. The
+# port table the HDL generators share is loaded the same way.
+_GENERATORS = {
+    "generate_verilog_top": ".verilog_top",
+    "generate_verilog_ioring": ".verilog_ioring",
+    "generate_vhdl_top": ".vhdl_top",
+    "generate_vhdl_ioring": ".vhdl_ioring",
+    "generate_xdc": ".xdc",
+    "write_verilog_top": ".verilog_top",
+    "write_verilog_ioring": ".verilog_ioring",
+    "write_vhdl_top": ".vhdl_top",
+    "write_vhdl_ioring": ".vhdl_ioring",
+    "write_xdc": ".xdc",
+    "PortTable": ".port_table",
+    "build_port_table": ".port_table",
+}
+
+# Spelled out for static analysis, which can't follow a computed __all__, and
+# checked against _GENERATORS by tests/test_startup.py
+__all__ = [
+    "generate_verilog_top",
+    "generate_verilog_ioring",
+    "generate_vhdl_top",
+    "generate_vhdl_ioring",
+    "generate_xdc",
+    "write_verilog_top",
+    "write_verilog_ioring",
+    "write_vhdl_top",
+    "write_vhdl_ioring",
+    "write_xdc",
+    "PortTable",
+    "build_port_table",
+]
+
+if TYPE_CHECKING:
+    from .port_table import PortTable, build_port_table
+    from .verilog_ioring import generate_verilog_ioring, write_verilog_ioring
+    from .verilog_top import generate_verilog_top, write_verilog_top
+    from .vhdl_ioring import generate_vhdl_ioring, write_vhdl_ioring
+    from .vhdl_top import generate_vhdl_top, write_vhdl_top
+    from .xdc import generate_xdc, write_xdc
+
+
+def __getattr__(name: str):
+    if name in _GENERATORS:
+        from importlib import import_module
+
+        generator = getattr(import_module(_GENERATORS[name], __name__), name)
+        # Later lookups find it directly without coming back through here
+        globals()[name] = generator
+        return generator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_GENERATORS])
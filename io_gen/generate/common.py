@@ -1,13 +1,14 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
 from typing import Any
 
-from io_gen.tables import signal_is_differential, signal_is_scalar
-
-# Set of tristate buffers that will require '_i', '_o', and '_t' in the signal
-# block and IO ring instances
-TRISTATE_BUFFERS = {"iobuf", "iobufds"}
-
-VLOG_DIRECTIONS = {"in": "input", "out": "output", "inout": "inout"}
-VHDL_DIRECTIONS = {"in": "in", "out": "out", "inout": "inout"}
+from io_gen.tables import (
+    Direction,
+    PinRow,
+    SignalRow,
+    signal_is_differential,
+    signal_is_scalar,
+)
 
 
 def get_header() -> list[str]:
@@ -20,99 +21,164 @@ def get_header() -> list[str]:
     ]
 
 
-def get_signal_top_ports(sig: dict[str, Any]) -> list[dict]:
+def get_signal_top_ports(sig: SignalRow) -> list[dict]:
     """Language-agnostic list of ports for the top level RTL for a given signal"""
 
     port_base = {
-        "direction": sig["direction"],
-        "width": sig["width"],
+        "direction": sig.direction,
+        "width": sig.width,
         "is_bus": not signal_is_scalar(sig),
     }
 
     port_list = []
     if signal_is_differential(sig):
-        port_list.append({**port_base, "name": f"{sig['name']}_p"})
-        port_list.append({**port_base, "name": f"{sig['name']}_n"})
+        port_list.append({**port_base, "name": f"{sig.name}_p"})
+        port_list.append({**port_base, "name": f"{sig.name}_n"})
     else:
-        port_list.append({**port_base, "name": f"{sig['name']}_pad"})
+        port_list.append({**port_base, "name": f"{sig.name}_pad"})
 
     return port_list
 
 
-def get_signal_nets(sig: dict[str, Any]) -> list[dict]:
+def get_signal_nets(sig: SignalRow) -> list[dict]:
     """Language-agnostic list of nets from the IO ring to fabric-facing logic for a given signal"""
 
-    if sig["bypass"]:
+    if sig.bypass or sig.buffer is None:
         return []
 
     net_base = {
-        "width": sig["width"],
+        "width": sig.width,
         "is_bus": not signal_is_scalar(sig),
     }
 
     net_list = []
-    if sig["buffer"] not in TRISTATE_BUFFERS:
-        net_list.append({**net_base, "name": sig["name"]})
+    if not sig.buffer.tristate:
+        net_list.append({**net_base, "name": sig.name})
     else:
-        net_list.append({**net_base, "name": f"{sig['name']}_i"})
-        net_list.append({**net_base, "name": f"{sig['name']}_o"})
-        net_list.append({**net_base, "name": f"{sig['name']}_t"})
+        net_list.append({**net_base, "name": f"{sig.name}_i"})
+        net_list.append({**net_base, "name": f"{sig.name}_o"})
+        net_list.append({**net_base, "name": f"{sig.name}_t"})
 
     return net_list
 
 
-def get_signal_ioring_ports(sig: dict[str, Any]) -> list[dict]:
+def get_signal_ioring_ports(sig: SignalRow) -> list[dict]:
     """Language-agnostic list of ports for IO ring RTL for a given signal"""
 
     port_base = {
-        "direction": sig["direction"],
-        "width": sig["width"],
+        "direction": sig.direction,
+        "width": sig.width,
         "is_bus": not signal_is_scalar(sig),
     }
 
     # No bypassed signals in the IO ring.
-    if sig["bypass"]:
+    if sig.bypass:
         return []
 
     port_list = []
     if signal_is_differential(sig):
-        if sig["direction"] == "in":
-            port_list.append({**port_base, "name": f"{sig['name']}_p"})
-            port_list.append({**port_base, "name": f"{sig['name']}_n"})
-            port_list.append({**port_base, "name": sig["name"], "direction": "out"})
-        elif sig["direction"] == "out":
-            port_list.append({**port_base, "name": f"{sig['name']}_p"})
-            port_list.append({**port_base, "name": f"{sig['name']}_n"})
-            port_list.append({**port_base, "name": sig["name"], "direction": "in"})
+        if sig.direction == Direction.IN:
+            port_list.append({**port_base, "name": f"{sig.name}_p"})
+            port_list.append({**port_base, "name": f"{sig.name}_n"})
+            port_list.append(
+                {**port_base, "name": sig.name, "direction": Direction.OUT}
+            )
+        elif sig.direction == Direction.OUT:
+            port_list.append({**port_base, "name": f"{sig.name}_p"})
+            port_list.append({**port_base, "name": f"{sig.name}_n"})
+            port_list.append(
+                {**port_base, "name": sig.name, "direction": Direction.IN}
+            )
         else:
-            port_list.append({**port_base, "name": f"{sig['name']}_p"})
-            port_list.append({**port_base, "name": f"{sig['name']}_n"})
+            port_list.append({**port_base, "name": f"{sig.name}_p"})
+            port_list.append({**port_base, "name": f"{sig.name}_n"})
             port_list.append(
-                {**port_base, "name": f"{sig['name']}_i", "direction": "out"}
+                {**port_base, "name": f"{sig.name}_i", "direction": Direction.OUT}
             )
             port_list.append(
-                {**port_base, "name": f"{sig['name']}_o", "direction": "in"}
+                {**port_base, "name": f"{sig.name}_o", "direction": Direction.IN}
             )
             port_list.append(
-                {**port_base, "name": f"{sig['name']}_t", "direction": "in"}
+                {**port_base, "name": f"{sig.name}_t", "direction": Direction.IN}
             )
     else:
-        if sig["direction"] == "in":
-            port_list.append({**port_base, "name": f"{sig['name']}_pad"})
-            port_list.append({**port_base, "name": sig["name"], "direction": "out"})
-        elif sig["direction"] == "out":
-            port_list.append({**port_base, "name": f"{sig['name']}_pad"})
-            port_list.append({**port_base, "name": sig["name"], "direction": "in"})
+        if sig.direction == Direction.IN:
+            port_list.append({**port_base, "name": f"{sig.name}_pad"})
+            port_list.append(
+                {**port_base, "name": sig.name, "direction": Direction.OUT}
+            )
+        elif sig.direction == Direction.OUT:
+            port_list.append({**port_base, "name": f"{sig.name}_pad"})
+            port_list.append(
+                {**port_base, "name": sig.name, "direction": Direction.IN}
+            )
         else:
-            port_list.append({**port_base, "name": f"{sig['name']}_pad"})
+            port_list.append({**port_base, "name": f"{sig.name}_pad"})
             port_list.append(
-                {**port_base, "name": f"{sig['name']}_i", "direction": "out"}
+                {**port_base, "name": f"{sig.name}_i", "direction": Direction.OUT}
             )
             port_list.append(
-                {**port_base, "name": f"{sig['name']}_o", "direction": "in"}
+                {**port_base, "name": f"{sig.name}_o", "direction": Direction.IN}
             )
             port_list.append(
-                {**port_base, "name": f"{sig['name']}_t", "direction": "in"}
+                {**port_base, "name": f"{sig.name}_t", "direction": Direction.IN}
             )
 
     return port_list
+
+
+@dataclass(slots=True, frozen=True)
+class BusLoop:
+    """The generate loop that instantiates every buffer of a bus at once
+
+    The loop is labelled `<instance>_i` and runs `variable` over the bits, and the
+    buffer inside it is named after the signal's instance, so bit N of the bus is
+    the cell `<instance>_i[N].<instance>`: neither language lets the iterations of
+    a loop name their instances `<instance>_i<N>`. Validation therefore rejects
+    bus loops for buses whose buffers are named in the YAML. instance,
+    index and is_bus mirror the pin row fields the buffer templates read, so the
+    same templates render the body of the loop with the variable as the index.
+    """
+
+    label: str
+    variable: str
+    width: int
+    instance: str
+
+    @property
+    def index(self) -> str:
+        return self.variable
+
+    @property
+    def is_bus(self) -> bool:
+        return True
+
+
+# What the buffer templates instantiate: one pin, or every bit of a bus in a loop
+BufferRow = PinRow | BusLoop | Mapping[str, Any]
+
+
+def get_signal_bus_loop(sig: SignalRow) -> BusLoop | None:
+    """The generate loop for the buffers of a signal, or None if it doesn't get one
+
+    Only buses with instantiated buffers are looped. Inferred buffers are a single
+    assignment already, and bypassed signals have no buffers.
+    """
+    if sig.bypass or sig.infer or sig.instance is None or signal_is_scalar(sig):
+        return None
+    return BusLoop(
+        label=f"{sig.instance}_i",
+        variable=f"{sig.instance}_n",
+        width=sig.width,
+        instance=sig.instance,
+    )
+
+
+def get_buffer_row(row: BufferRow) -> PinRow | BusLoop:
+    """The row a buffer template reads: a pin row, or the loop over a bus
+
+    Pin rows in dict form are still accepted, and converted to PinRow.
+    """
+    if isinstance(row, BusLoop):
+        return row
+    return PinRow.from_mapping(row)
@@ -1,3 +1,7 @@
+from collections.abc import Iterable
+from typing import TextIO
+
+
 def indent_join(lines: list[str], level: int = 1, char: str = "\n") -> str:
     """Indents a list of lines and joins them together (default to newline)"""
     return char.join(indent_strings(lines, level))
@@ -7,3 +11,16 @@ def indent_strings(lines: list[str], level: int = 1) -> list[str]:
     """Indents a list of strings and returns without joining"""
     indent = level * "    "
     return [f"{indent}{line}" for line in lines]
+
+
+def write_joined(out: TextIO, chunks: Iterable[str], char: str = "\n") -> None:
+    """Writes chunks separated by char and followed by a newline, one at a time
+
+    Gives the same text as writing char.join(chunks) as a line of its own (an empty
+    line if there are no chunks), without ever holding all of it.
+    """
+    separator = ""
+    for chunk in chunks:
+        out.write(f"{separator}{chunk}")
+        separator = char
+    out.write("\n")
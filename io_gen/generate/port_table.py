@@ -0,0 +1,100 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from io_gen.tables import SignalChange, SignalRow, SignalTable
+
+from .common import get_signal_ioring_ports, get_signal_nets, get_signal_top_ports
+
+
+@dataclass(slots=True, frozen=True)
+class SignalPorts:
+    """The ports and nets generated for one signal
+
+    nets and ioring_ports are empty for bypassed signals.
+    """
+
+    top_ports: tuple[dict, ...]
+    nets: tuple[dict, ...]
+    ioring_ports: tuple[dict, ...]
+
+
+class PortTable:
+    """The ports and nets of every signal, derived once for all the HDL generators
+
+    Holds what get_signal_top_ports(), get_signal_nets() and
+    get_signal_ioring_ports() return for each signal, by signal name, along with
+    every net and IO ring port in table order and the length of the longest name of
+    each kind, which the generators use to align their declarations.
+    """
+
+    def __init__(self) -> None:
+        self.table: dict[str, SignalPorts] = {}
+        self.nets: list[dict] = []
+        self.ioring_ports: list[dict] = []
+        self.max_top_port_len = 0
+        self.max_net_len = 0
+        self.max_ioring_port_len = 0
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, sig_name: str) -> SignalPorts:
+        if sig_name in self.table:
+            return self.table[sig_name]
+        else:
+            raise KeyError(f"'{sig_name}' not found in port table")
+
+    def add(self, sig: SignalRow) -> None:
+        ports = _signal_ports(sig)
+        self.table[sig.name] = ports
+        self.nets.extend(ports.nets)
+        self.ioring_ports.extend(ports.ioring_ports)
+        self.max_top_port_len = max(self.max_top_port_len, _longest(ports.top_ports))
+        self.max_net_len = max(self.max_net_len, _longest(ports.nets))
+        self.max_ioring_port_len = max(
+            self.max_ioring_port_len, _longest(ports.ioring_ports)
+        )
+
+    def update(
+        self, signal_table: SignalTable, changes: Iterable[SignalChange]
+    ) -> None:
+        """Apply changes, as logged by signal_table, to the port table
+
+        Only the ports of the signals that changed are derived again. The flat lists
+        and longest names are then collected from what the table already holds.
+        """
+        for change in changes:
+            if change.kind == "removed":
+                self.table.pop(change.name, None)
+            elif change.kind != "moved":
+                self.table[change.name] = _signal_ports(signal_table[change.name])
+
+        self.table = {sig.name: self.table[sig.name] for sig in signal_table}
+        self.nets = [net for ports in self.table.values() for net in ports.nets]
+        self.ioring_ports = [
+            port for ports in self.table.values() for port in ports.ioring_ports
+        ]
+        self.max_top_port_len = max(
+            (_longest(ports.top_ports) for ports in self.table.values()), default=0
+        )
+        self.max_net_len = _longest(self.nets)
+        self.max_ioring_port_len = _longest(self.ioring_ports)
+
+
+def _signal_ports(sig: SignalRow) -> SignalPorts:
+    return SignalPorts(
+        top_ports=tuple(get_signal_top_ports(sig)),
+        nets=tuple(get_signal_nets(sig)),
+        ioring_ports=tuple(get_signal_ioring_ports(sig)),
+    )
+
+
+def _longest(ports: Iterable[dict]) -> int:
+    return max((len(port["name"]) for port in ports), default=0)
+
+
+def build_port_table(signal_table: SignalTable) -> PortTable:
+    port_table = PortTable()
+    for sig in signal_table:
+        port_table.add(sig)
+    return port_table
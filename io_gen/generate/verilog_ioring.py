@@ -1,74 +1,136 @@
-from typing import Any
+import io
+from collections.abc import Iterator
+from typing import TextIO
 
 from io_gen.tables import SignalTable
-from io_gen.tables import PinTable
+from io_gen.tables import Buffer, PinTable, code_table
 
-from .formatting import indent_join
-from .common import get_header, get_signal_ioring_ports, VLOG_DIRECTIONS
+from .formatting import indent_join, write_joined
+from .common import (
+    BufferRow,
+    BusLoop,
+    get_buffer_row,
+    get_header,
+    get_signal_bus_loop,
+)
+from .port_table import PortTable, build_port_table
 
 
 def generate_verilog_ioring(
-    signal_table: SignalTable, pin_table: PinTable, top: str
+    signal_table: SignalTable,
+    pin_table: PinTable,
+    top: str,
+    port_table: PortTable | None = None,
+    bus_loops: bool = False,
 ) -> str:
     """Generate the complete Verilog IO ring as a string
 
-    Assembles the module declaration, port list, inferred and instantiated buffers
-    by calling private helpers in order.
+    See write_verilog_ioring(), which this collects the output of.
     """
+    out = io.StringIO()
+    write_verilog_ioring(out, signal_table, pin_table, top, port_table, bus_loops)
+    return out.getvalue()
+
+
+def write_verilog_ioring(
+    out: TextIO,
+    signal_table: SignalTable,
+    pin_table: PinTable,
+    top: str,
+    port_table: PortTable | None = None,
+    bus_loops: bool = False,
+) -> None:
+    """Write the complete Verilog IO ring to out
+
+    Writes the module declaration, port list, inferred and instantiated buffers from
+    private helpers in order, one port or buffer at a time. The port table is built
+    from signal_table if not provided. With bus_loops, the buffers of each bus are
+    instantiated by one generate loop rather than one by one.
+    """
+    if port_table is None:
+        port_table = build_port_table(signal_table)
 
-    rtl = []
     for line in get_header():
         if line:
-            rtl.append(f"// {line}")
+            out.write(f"// {line}\n")
         else:
-            rtl.append("//")
-    rtl.append(f"module {top}_io //#(")
-    rtl.append("//)")
-    rtl.append("(")
-    rtl.append(_generate_verilog_ioring_ports(signal_table))
-    rtl.append(");")
-    rtl.append("")
-    rtl.append(_generate_verilog_ioring_body(signal_table, pin_table))
-    rtl.append("")
-    # Add a newline here so that the file ends appropriately
-    rtl.append(f"endmodule\n")
-
-    return "\n".join(rtl)
-
-
-def _generate_verilog_ioring_ports(signal_table: SignalTable) -> str:
+            out.write("//\n")
+    out.write(f"module {top}_io //#(\n")
+    out.write("//)\n")
+    out.write("(\n")
+    write_joined(out, _verilog_ioring_port_lines(port_table), ",\n")
+    out.write(");\n")
+    out.write("\n")
+    body = _verilog_ioring_body_chunks(signal_table, pin_table, bus_loops)
+    write_joined(out, body, "\n\n")
+    out.write("\n")
+    out.write("endmodule\n")
+
+
+def _generate_verilog_ioring_ports(port_table: PortTable) -> str:
     """Generate the indented port declaration list for the IO ring in Verilog"""
-    ports = []
-    for sig in signal_table.active():
-        for port in get_signal_ioring_ports(sig):
-            direction = VLOG_DIRECTIONS[port["direction"]]
-            if port["is_bus"]:
-                width = f"[{port['width'] - 1}:0]"
-            else:
-                width = ""
-            dim = f"wire {width}"
-            line = f"{direction:<8}{dim:<16}{port['name']}"
-            ports.append(line)
+    return ",\n".join(_verilog_ioring_port_lines(port_table))
 
-    return indent_join(ports, 1, ",\n")
+
+def _verilog_ioring_port_lines(port_table: PortTable) -> Iterator[str]:
+    """Yields the port declarations of _generate_verilog_ioring_ports()"""
+    for port in port_table.ioring_ports:
+        direction = port["direction"].verilog
+        if port["is_bus"]:
+            width = f"[{port['width'] - 1}:0]"
+        else:
+            width = ""
+        dim = f"wire {width}"
+        yield f"    {direction:<8}{dim:<16}{port['name']}"
 
 
 def _generate_verilog_ioring_body(
-    signal_table: SignalTable, pin_table: PinTable
+    signal_table: SignalTable, pin_table: PinTable, bus_loops: bool = False
 ) -> str:
     """Generate the buffer instantiation body for the Verilog IO ring"""
-    body = []
+    return "\n\n".join(
+        _verilog_ioring_body_chunks(signal_table, pin_table, bus_loops)
+    )
+
+
+def _verilog_ioring_body_chunks(
+    signal_table: SignalTable, pin_table: PinTable, bus_loops: bool
+) -> Iterator[str]:
+    """Yields the buffers of _generate_verilog_ioring_body()"""
     for sig in signal_table.active():
+        # Only bypassed signals have no buffer, and they aren't active
+        if sig.buffer is None:
+            continue
         # Already checked during validation that this entire signal will be inferable, so
         # look up the function to call an call it
-        if sig["infer"]:
-            body.append(_INFER_BUFFERS[sig["buffer"]](sig["name"]))
+        if sig.infer:
+            yield _INFER_BUFFERS[sig.buffer.code](sig.name)
         # Otherwise, for direct instantiation, we have to iterate the pins
         else:
-            for pin_row in pin_table[sig["name"]]:
-                body.append(_INSTANTIATE_BUFFERS[sig["buffer"]](sig["name"], pin_row))
+            instantiate = _INSTANTIATE_BUFFERS[sig.buffer.code]
+            loop = get_signal_bus_loop(sig) if bus_loops else None
+            if loop is not None:
+                yield _generate_verilog_bus_loop(loop, instantiate(sig.name, loop))
+            else:
+                for pin_row in pin_table[sig.name]:
+                    yield instantiate(sig.name, pin_row)
+
 
-    return indent_join(body, 0, "\n\n")
+def _generate_verilog_bus_loop(loop: BusLoop, buffer: str) -> str:
+    """Wrap the buffer instantiated for every bit of a bus in a generate loop"""
+    var = loop.variable
+    inst = []
+    inst.append(f"genvar {var};")
+    inst.append("generate")
+    inst.append(
+        f"    for ({var} = 0; {var} < {loop.width}; {var} = {var} + 1)"
+        f" begin : {loop.label}"
+    )
+    # The buffer comes indented for the module body, and goes in two levels deeper
+    inst.extend(f"    {line}" for line in buffer.split("\n"))
+    inst.append("    end")
+    inst.append("endgenerate")
+    return indent_join(inst, 1)
 
 
 def _infer_ibuf(name: str) -> str:
@@ -81,15 +143,16 @@ def _infer_obuf(name: str) -> str:
     return f"    assign {name}_pad = {name};"
 
 
-def _instantiate_ibuf(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_ibuf(name: str, pin_row: BufferRow) -> str:
     """Instantiate an IBUF"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
     inst.append(f"IBUF //#(")
     inst.append(f"//)")
-    inst.append(f"{pin_row['instance']} (")
-    if pin_row["is_bus"]:
-        inst.append(f"    .O      ({name}[{pin_row['index']}]),")
-        inst.append(f"    .I      ({name}_pad[{pin_row['index']}])")
+    inst.append(f"{pin_row.instance} (")
+    if pin_row.is_bus:
+        inst.append(f"    .O      ({name}[{pin_row.index}]),")
+        inst.append(f"    .I      ({name}_pad[{pin_row.index}])")
     else:
         inst.append(f"    .O      ({name}),")
         inst.append(f"    .I      ({name}_pad)")
@@ -97,15 +160,16 @@ def _instantiate_ibuf(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-def _instantiate_obuf(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_obuf(name: str, pin_row: BufferRow) -> str:
     """Instantiate an OBUF"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
     inst.append(f"OBUF //#(")
     inst.append(f"//)")
-    inst.append(f"{pin_row['instance']} (")
-    if pin_row["is_bus"]:
-        inst.append(f"    .O      ({name}_pad[{pin_row['index']}]),")
-        inst.append(f"    .I      ({name}[{pin_row['index']}])")
+    inst.append(f"{pin_row.instance} (")
+    if pin_row.is_bus:
+        inst.append(f"    .O      ({name}_pad[{pin_row.index}]),")
+        inst.append(f"    .I      ({name}[{pin_row.index}])")
     else:
         inst.append(f"    .O      ({name}_pad),")
         inst.append(f"    .I      ({name})")
@@ -113,16 +177,17 @@ def _instantiate_obuf(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-def _instantiate_ibufds(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_ibufds(name: str, pin_row: BufferRow) -> str:
     """Instantiate an IBUFDS"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
     inst.append(f"IBUFDS //#(")
     inst.append(f"//)")
-    inst.append(f"{pin_row['instance']} (")
-    if pin_row["is_bus"]:
-        inst.append(f"    .O      ({name}[{pin_row['index']}]),")
-        inst.append(f"    .I      ({name}_p[{pin_row['index']}]),")
-        inst.append(f"    .IB     ({name}_n[{pin_row['index']}])")
+    inst.append(f"{pin_row.instance} (")
+    if pin_row.is_bus:
+        inst.append(f"    .O      ({name}[{pin_row.index}]),")
+        inst.append(f"    .I      ({name}_p[{pin_row.index}]),")
+        inst.append(f"    .IB     ({name}_n[{pin_row.index}])")
     else:
         inst.append(f"    .O      ({name}),")
         inst.append(f"    .I      ({name}_p),")
@@ -131,16 +196,17 @@ def _instantiate_ibufds(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-def _instantiate_obufds(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_obufds(name: str, pin_row: BufferRow) -> str:
     """Instantiate an OBUFDS"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
     inst.append(f"OBUFDS //#(")
     inst.append(f"//)")
-    inst.append(f"{pin_row['instance']} (")
-    if pin_row["is_bus"]:
-        inst.append(f"    .O      ({name}_p[{pin_row['index']}]),")
-        inst.append(f"    .OB     ({name}_n[{pin_row['index']}]),")
-        inst.append(f"    .I      ({name}[{pin_row['index']}])")
+    inst.append(f"{pin_row.instance} (")
+    if pin_row.is_bus:
+        inst.append(f"    .O      ({name}_p[{pin_row.index}]),")
+        inst.append(f"    .OB     ({name}_n[{pin_row.index}]),")
+        inst.append(f"    .I      ({name}[{pin_row.index}])")
     else:
         inst.append(f"    .O      ({name}_p),")
         inst.append(f"    .OB     ({name}_n),")
@@ -149,17 +215,18 @@ def _instantiate_obufds(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-def _instantiate_iobuf(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_iobuf(name: str, pin_row: BufferRow) -> str:
     """Instantiate an IOBUF"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
     inst.append(f"IOBUF //#(")
     inst.append(f"//)")
-    inst.append(f"{pin_row['instance']} (")
-    if pin_row["is_bus"]:
-        inst.append(f"    .O      ({name}_i[{pin_row['index']}]),")
-        inst.append(f"    .I      ({name}_o[{pin_row['index']}]),")
-        inst.append(f"    .IO     ({name}_pad[{pin_row['index']}]),")
-        inst.append(f"    .T      ({name}_t[{pin_row['index']}])")
+    inst.append(f"{pin_row.instance} (")
+    if pin_row.is_bus:
+        inst.append(f"    .O      ({name}_i[{pin_row.index}]),")
+        inst.append(f"    .I      ({name}_o[{pin_row.index}]),")
+        inst.append(f"    .IO     ({name}_pad[{pin_row.index}]),")
+        inst.append(f"    .T      ({name}_t[{pin_row.index}])")
     else:
         inst.append(f"    .O      ({name}_i),")
         inst.append(f"    .I      ({name}_o),")
@@ -169,18 +236,19 @@ def _instantiate_iobuf(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-def _instantiate_iobufds(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_iobufds(name: str, pin_row: BufferRow) -> str:
     """Instantiate an IOBUFDS"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
     inst.append(f"IOBUFDS //#(")
     inst.append(f"//)")
-    inst.append(f"{pin_row['instance']} (")
-    if pin_row["is_bus"]:
-        inst.append(f"    .O      ({name}_i[{pin_row['index']}]),")
-        inst.append(f"    .I      ({name}_o[{pin_row['index']}]),")
-        inst.append(f"    .IO     ({name}_p[{pin_row['index']}]),")
-        inst.append(f"    .IOB    ({name}_n[{pin_row['index']}]),")
-        inst.append(f"    .T      ({name}_t[{pin_row['index']}])")
+    inst.append(f"{pin_row.instance} (")
+    if pin_row.is_bus:
+        inst.append(f"    .O      ({name}_i[{pin_row.index}]),")
+        inst.append(f"    .I      ({name}_o[{pin_row.index}]),")
+        inst.append(f"    .IO     ({name}_p[{pin_row.index}]),")
+        inst.append(f"    .IOB    ({name}_n[{pin_row.index}]),")
+        inst.append(f"    .T      ({name}_t[{pin_row.index}])")
     else:
         inst.append(f"    .O      ({name}_i),")
         inst.append(f"    .I      ({name}_o),")
@@ -191,16 +259,23 @@ def _instantiate_iobufds(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-_INFER_BUFFERS = {
-    "ibuf": _infer_ibuf,
-    "obuf": _infer_obuf,
-}
-
-_INSTANTIATE_BUFFERS = {
-    "ibuf": _instantiate_ibuf,
-    "obuf": _instantiate_obuf,
-    "ibufds": _instantiate_ibufds,
-    "obufds": _instantiate_obufds,
-    "iobuf": _instantiate_iobuf,
-    "iobufds": _instantiate_iobufds,
-}
+# Indexed by the code of the buffer
+_INFER_BUFFERS = code_table(
+    Buffer,
+    {
+        Buffer.IBUF: _infer_ibuf,
+        Buffer.OBUF: _infer_obuf,
+    },
+)
+
+_INSTANTIATE_BUFFERS = code_table(
+    Buffer,
+    {
+        Buffer.IBUF: _instantiate_ibuf,
+        Buffer.OBUF: _instantiate_obuf,
+        Buffer.IBUFDS: _instantiate_ibufds,
+        Buffer.OBUFDS: _instantiate_obufds,
+        Buffer.IOBUF: _instantiate_iobuf,
+        Buffer.IOBUFDS: _instantiate_iobufds,
+    },
+)
@@ -1,39 +1,54 @@
+import io
+from collections.abc import Iterator
+from typing import TextIO
+
 from io_gen.tables import SignalTable
 
-from .formatting import indent_join, indent_strings
+from .formatting import write_joined
 
-from .common import (
-    get_signal_top_ports,
-    get_signal_nets,
-    get_signal_ioring_ports,
-    VLOG_DIRECTIONS,
-)
+from .port_table import PortTable, build_port_table
 
 
-def generate_verilog_top(signal_table: SignalTable, top: str) -> str:
+def generate_verilog_top(
+    signal_table: SignalTable, top: str, port_table: PortTable | None = None
+) -> str:
     """Generate the complete Verilog top-level module as a string.
 
-    Assembles the module declaration, port list, internal wire declarations,
-    and IO ring instantiation by calling private helpers in order.
+    See write_verilog_top(), which this collects the output of.
+    """
+    out = io.StringIO()
+    write_verilog_top(out, signal_table, top, port_table)
+    return out.getvalue()
+
+
+def write_verilog_top(
+    out: TextIO,
+    signal_table: SignalTable,
+    top: str,
+    port_table: PortTable | None = None,
+) -> None:
+    """Write the complete Verilog top-level module to out.
+
+    Writes the module declaration, port list, internal wire declarations, and IO
+    ring instantiation a line at a time, from private helpers in order. The port
+    table is built from signal_table if not provided.
     """
-    rtl = []
-    rtl.append(f"module {top} //#(")
-    rtl.append(f"//)")
-    rtl.append(f"(")
-    rtl.append(_generate_verilog_ports(signal_table))
-    rtl.append(f");")
-    rtl.append("")
-    rtl.append(_generate_verilog_wires(signal_table))
-    rtl.append("")
-    rtl.append(_generate_verilog_ioring_inst(signal_table, top))
-    rtl.append("")
-    # Add a newline here so that the file ends appropriately
-    rtl.append(f"endmodule\n")
-
-    return "\n".join(rtl)
-
-
-def _generate_verilog_ports(signal_table: SignalTable) -> str:
+    if port_table is None:
+        port_table = build_port_table(signal_table)
+    out.write(f"module {top} //#(\n")
+    out.write("//)\n")
+    out.write("(\n")
+    write_joined(out, _verilog_port_lines(signal_table, port_table))
+    out.write(");\n")
+    out.write("\n")
+    write_joined(out, _verilog_wire_lines(port_table))
+    out.write("\n")
+    write_joined(out, _verilog_ioring_inst_lines(port_table, top))
+    out.write("\n")
+    out.write("endmodule\n")
+
+
+def _generate_verilog_ports(signal_table: SignalTable, port_table: PortTable) -> str:
     """Generate the indented port declaration list for a Verilog module.
 
     Returns a string of indented, comma-terminated port declarations suitable
@@ -42,41 +57,41 @@ def _generate_verilog_ports(signal_table: SignalTable) -> str:
     An optional comment.hdl string is emitted as a // line before each signal's
     port(s). The last port declaration has no trailing comma.
     """
-    ports = []
-    for sig_index, sig in enumerate(signal_table):
-        # The strategy here is to create the entire list of ports and comments without any indent, then once it's
-        # finished, iterate the result, add commas at the end of all but the last one and indent everything along the
-        # way (use the fact that comments start with # before indenting, and then add the commas).
+    return "\n".join(_verilog_port_lines(signal_table, port_table))
+
 
+def _verilog_port_lines(
+    signal_table: SignalTable, port_table: PortTable
+) -> Iterator[str]:
+    """Yields the lines of _generate_verilog_ports()"""
+    last_sig_index = len(signal_table) - 1
+    for sig_index, sig in enumerate(signal_table):
         # HDL comments if present
-        comment_str = sig["comment"].get("hdl", None)
+        comment_str = sig.comment.get("hdl", None)
         if comment_str:
-            ports.append(f"// {comment_str}")
+            yield f"    // {comment_str}"
 
         # Get all the ports for this signal
-        sig_ports = get_signal_top_ports(sig)
+        sig_ports = port_table[sig.name].top_ports
         # Need to keep track of the last item so that on the last signal in the
         # table and the last port, we can omit the comma
         last_index = len(sig_ports) - 1
         for port_index, port in enumerate(sig_ports):
-            direction = VLOG_DIRECTIONS[port["direction"]]
+            direction = port["direction"].verilog
             if port["is_bus"]:
                 width = f"[{port['width'] - 1}:0]"
             else:
                 width = ""
             dim = f"wire {width}"
             # Every port but the last port of the last signal gets a comma
-            if last_index == port_index and sig_index == len(signal_table) - 1:
+            if last_index == port_index and sig_index == last_sig_index:
                 suffix = ""
             else:
                 suffix = ","
-            line = f"{direction:<8}{dim:<16}{port['name']}{suffix}"
-            ports.append(line)
-
-    return indent_join(ports)
+            yield f"    {direction:<8}{dim:<16}{port['name']}{suffix}"
 
 
-def _generate_verilog_wires(signal_table: SignalTable) -> str:
+def _generate_verilog_wires(port_table: PortTable) -> str:
     """Generate the internal wire declarations for a Verilog top-level module.
 
     Returns a string of indented wire declarations for fabric-facing signals.
@@ -84,65 +99,65 @@ def _generate_verilog_wires(signal_table: SignalTable) -> str:
     Tristate signals (iobuf) expand to three wires: <name>_i, <name>_o, <name>_t.
     All other signals use the bare signal name regardless of buffer type.
     """
-    wires = []
-    for sig in signal_table.active():
-        # The IO ring might be empty, which is handled transparently
-        for net in get_signal_nets(sig):
-            name = net["name"]
-            width = net["width"]
-
-            # Can get this now and then we'll pad to 8 columns later
-            if net["is_bus"]:
-                width = f"[{width - 1}:0]"
-            else:
-                width = ""
-            dim = f"wire {width}"
-            # Formatting is simple - 4 space indent, 8 columsn for the net type,
-            # 8 columns for the net dimension, then the port name
-            wires.append(f"{dim:<16}{name};")
+    return "\n".join(_verilog_wire_lines(port_table))
+
 
-    return indent_join(wires)
+def _verilog_wire_lines(port_table: PortTable) -> Iterator[str]:
+    """Yields the lines of _generate_verilog_wires()"""
+    # The IO ring might be empty, which is handled transparently
+    for net in port_table.nets:
+        name = net["name"]
+        width = net["width"]
 
+        # Can get this now and then we'll pad to 8 columns later
+        if net["is_bus"]:
+            width = f"[{width - 1}:0]"
+        else:
+            width = ""
+        dim = f"wire {width}"
+        # Formatting is simple - 4 space indent, 8 columsn for the net type,
+        # 8 columns for the net dimension, then the port name
+        yield f"    {dim:<16}{name};"
 
-def _generate_verilog_ioring_inst(signal_table: SignalTable, top: str) -> str:
+
+def _generate_verilog_ioring_inst(port_table: PortTable, top: str) -> str:
     """Generate the IO ring module instantiation for a Verilog top-level module.
 
     Returns a string containing the IO ring instance with port connections
     mapping pad-facing top-level ports and internal wires to the IO ring ports.
     Signals with generate: false are excluded.
     """
-    inst = []
-    inst.append(f"{top}_io //#(")
-    inst.append("//)")
-    inst.append(f"{top}_io_i0 (")
-
-    inst = indent_strings(inst, 1)
-
-    # Need to collect all the ports in the instance and find the longest name, then
-    # round it up so that there is always space between the last character of longest
-    # name plus 1 for the '.' character and also such that the open parenthesis in
-    # the port assignment lands on a 4 space tab stop
-    ioring_ports = []
-    for sig in signal_table.active():
-        for port in get_signal_ioring_ports(sig):
-            ioring_ports.append(port["name"])
+    return "\n".join(_verilog_ioring_inst_lines(port_table, top))
+
+
+def _verilog_ioring_inst_lines(port_table: PortTable, top: str) -> Iterator[str]:
+    """Yields the lines of _generate_verilog_ioring_inst()"""
+    ioring_ports = port_table.ioring_ports
 
     # Empty IO ring is possible
     if not ioring_ports:
-        return ""
+        return
+
+    yield f"    {top}_io //#("
+    yield "    //)"
+    yield f"    {top}_io_i0 ("
 
+    # The longest name of all the ports in the instance gets rounded up so that there
+    # is always space between the last character of longest name plus 1 for the '.'
+    # character and also such that the open parenthesis in the port assignment lands
+    # on a 4 space tab stop.
     # Note that we're adding an extra character to the name length because Verilog
     # adds a '.' to the port name in instantiations of modules, and then rounding up
     # to the nearest 4 space boundary.
-    longest_name = len(max(ioring_ports, key=len))
+    longest_name = port_table.max_ioring_port_len
     name_len = (((longest_name + 1) // 4 + 1) * 4) - 1
 
     # Now iterate the list of ports in the IO ring and format them with the calculated
-    # amount of whitespace, join the port map itself into one already indented string,
-    # and then add to the instantiation string
-    port_strings = [f".{name:<{name_len}}({name})" for name in ioring_ports]
-    inst.append(indent_join(port_strings, 2, ",\n"))
-
-    inst.append(f"    );")
-
-    return "\n".join(inst)
+    # amount of whitespace, with a comma after all but the last one
+    last_index = len(ioring_ports) - 1
+    for index, port in enumerate(ioring_ports):
+        name = port["name"]
+        suffix = "," if index != last_index else ""
+        yield f"        .{name:<{name_len}}({name}){suffix}"
+
+    yield "    );"
@@ -1,103 +1,159 @@
-from typing import Any
+import io
+from collections.abc import Iterator
+from typing import TextIO
 
 from io_gen.tables import SignalTable
-from io_gen.tables import PinTable
+from io_gen.tables import Buffer, PinTable, code_table
 from io_gen.tables import MetaTable
 
-from .formatting import indent_join
-from .common import get_header, get_signal_ioring_ports, VHDL_DIRECTIONS
+from .formatting import indent_join, write_joined
+from .common import (
+    BufferRow,
+    BusLoop,
+    get_buffer_row,
+    get_header,
+    get_signal_bus_loop,
+)
+from .port_table import PortTable, build_port_table
 
 
 def generate_vhdl_ioring(
-    signal_table: SignalTable, pin_table: PinTable, meta_table: MetaTable, top: str
+    signal_table: SignalTable,
+    pin_table: PinTable,
+    meta_table: MetaTable,
+    top: str,
+    port_table: PortTable | None = None,
+    bus_loops: bool = False,
 ) -> str:
     """Generate the complete VHDL IO ring entity and architecture as a string.
 
-    Assembles the library clauses, entity declaration, port list, inferred and
-    instantiated buffers by calling private helpers in order.
+    See write_vhdl_ioring(), which this collects the output of.
     """
+    out = io.StringIO()
+    write_vhdl_ioring(
+        out, signal_table, pin_table, meta_table, top, port_table, bus_loops
+    )
+    return out.getvalue()
+
+
+def write_vhdl_ioring(
+    out: TextIO,
+    signal_table: SignalTable,
+    pin_table: PinTable,
+    meta_table: MetaTable,
+    top: str,
+    port_table: PortTable | None = None,
+    bus_loops: bool = False,
+) -> None:
+    """Write the complete VHDL IO ring entity and architecture to out.
+
+    Writes the library clauses, entity declaration, port list, inferred and
+    instantiated buffers from private helpers in order, one port or buffer at a
+    time. The port table is built from signal_table if not provided. With
+    bus_loops, the buffers of each bus are instantiated by one for ... generate
+    rather than one by one.
+    """
+    if port_table is None:
+        port_table = build_port_table(signal_table)
     arch = meta_table.architecture
-    rtl = []
     for line in get_header():
         if line:
-            rtl.append(f"-- {line}")
+            out.write(f"-- {line}\n")
         else:
-            rtl.append("--")
-    rtl.append("library ieee;")
-    rtl.append("use ieee.std_logic_1164.all;")
-    rtl.append("")
-    rtl.append("library unisim;")
-    rtl.append("use unisim.vcomponents.all;")
-    rtl.append("")
-    rtl.append(f"entity {top}_io is")
-    rtl.append("    -- generic (")
-    rtl.append("    -- )")
-    rtl.append("    port (")
-    rtl.append(_generate_vhdl_ioring_ports(signal_table))
-    rtl.append("    );")
-    rtl.append(f"end entity {top}_io;")
-    rtl.append("")
-    rtl.append(f"architecture {arch} of {top}_io is")
-    rtl.append("")
-    rtl.append("begin")
-    rtl.append("")
-    rtl.append(_generate_vhdl_ioring_body(signal_table, pin_table))
-    rtl.append("")
-    rtl.append(f"end architecture {arch};\n")
-
-    return "\n".join(rtl)
-
-
-def _generate_vhdl_ioring_ports(signal_table: SignalTable) -> str:
+            out.write("--\n")
+    out.write("library ieee;\n")
+    out.write("use ieee.std_logic_1164.all;\n")
+    out.write("\n")
+    out.write("library unisim;\n")
+    out.write("use unisim.vcomponents.all;\n")
+    out.write("\n")
+    out.write(f"entity {top}_io is\n")
+    out.write("    -- generic (\n")
+    out.write("    -- )\n")
+    out.write("    port (\n")
+    write_joined(out, _vhdl_ioring_port_lines(port_table))
+    out.write("    );\n")
+    out.write(f"end entity {top}_io;\n")
+    out.write("\n")
+    out.write(f"architecture {arch} of {top}_io is\n")
+    out.write("\n")
+    out.write("begin\n")
+    out.write("\n")
+    body = _vhdl_ioring_body_chunks(signal_table, pin_table, bus_loops)
+    write_joined(out, body, "\n\n")
+    out.write("\n")
+    out.write(f"end architecture {arch};\n")
+
+
+def _generate_vhdl_ioring_ports(port_table: PortTable) -> str:
     """Generate the indented port declaration list for the IO ring in VHDL."""
-    port_names = []
-    for sig in signal_table.active():
-        for port in get_signal_ioring_ports(sig):
-            port_names.append(port["name"])
+    return "\n".join(_vhdl_ioring_port_lines(port_table))
 
-    if not port_names:
-        return ""
 
-    longest_name = len(max(port_names, key=len))
-    name_len = ((longest_name // 4) + 1) * 4
+def _vhdl_ioring_port_lines(port_table: PortTable) -> Iterator[str]:
+    """Yields the lines of _generate_vhdl_ioring_ports()"""
+    all_ports = port_table.ioring_ports
 
-    all_ports = []
-    for sig in signal_table.active():
-        all_ports.extend(get_signal_ioring_ports(sig))
+    longest_name = port_table.max_ioring_port_len
+    name_len = ((longest_name // 4) + 1) * 4
 
-    ports = []
+    last_index = len(all_ports) - 1
     for port_index, port in enumerate(all_ports):
         # Craft the string to go on the LHS of the colon
         lhs_line = f"{port['name']:<{name_len}}"
 
         # Create the string for the RHS of the colon
-        direction = VHDL_DIRECTIONS[port["direction"]]
+        direction = port["direction"].vhdl
         if port["is_bus"]:
             rhs_line = f"{direction:<6}std_logic_vector({port['width'] - 1} downto 0)"
         else:
             rhs_line = f"{direction:<6}std_logic"
 
         # Append a semicolon to all but the last port in the port list
-        if port_index != len(all_ports) - 1:
+        if port_index != last_index:
             rhs_line = f"{rhs_line};"
 
         # Assemble the actual line
-        ports.append(f"{lhs_line}: {rhs_line}")
-
-    return indent_join(ports, 2)
+        yield f"        {lhs_line}: {rhs_line}"
 
 
-def _generate_vhdl_ioring_body(signal_table: SignalTable, pin_table: PinTable) -> str:
+def _generate_vhdl_ioring_body(
+    signal_table: SignalTable, pin_table: PinTable, bus_loops: bool = False
+) -> str:
     """Generate the buffer instantiation body for the VHDL IO ring"""
-    body = []
+    return "\n\n".join(_vhdl_ioring_body_chunks(signal_table, pin_table, bus_loops))
+
+
+def _vhdl_ioring_body_chunks(
+    signal_table: SignalTable, pin_table: PinTable, bus_loops: bool
+) -> Iterator[str]:
+    """Yields the buffers of _generate_vhdl_ioring_body()"""
     for sig in signal_table.active():
-        if sig["infer"]:
-            body.append(_INFER_BUFFERS[sig["buffer"]](sig["name"]))
+        # Only bypassed signals have no buffer, and they aren't active
+        if sig.buffer is None:
+            continue
+        if sig.infer:
+            yield _INFER_BUFFERS[sig.buffer.code](sig.name)
         else:
-            for pin_row in pin_table[sig["name"]]:
-                body.append(_INSTANTIATE_BUFFERS[sig["buffer"]](sig["name"], pin_row))
+            instantiate = _INSTANTIATE_BUFFERS[sig.buffer.code]
+            loop = get_signal_bus_loop(sig) if bus_loops else None
+            if loop is not None:
+                yield _generate_vhdl_bus_loop(loop, instantiate(sig.name, loop))
+            else:
+                for pin_row in pin_table[sig.name]:
+                    yield instantiate(sig.name, pin_row)
+
 
-    return indent_join(body, 0, "\n\n")
+def _generate_vhdl_bus_loop(loop: BusLoop, buffer: str) -> str:
+    """Wrap the buffer instantiated for every bit of a bus in a for ... generate"""
+    inst = []
+    inst.append(
+        f"{loop.label} : for {loop.variable} in 0 to {loop.width - 1} generate"
+    )
+    # The buffer comes indented for the architecture body, and goes in one deeper
+    inst.extend(buffer.split("\n"))
+    inst.append(f"end generate {loop.label};")
+    return indent_join(inst, 1)
 
 
 def _infer_ibuf(name: str) -> str:
@@ -110,16 +166,17 @@ def _infer_obuf(name: str) -> str:
     return f"    {name}_pad <= {name};"
 
 
-def _instantiate_ibuf(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_ibuf(name: str, pin_row: BufferRow) -> str:
     """Instantiate an IBUF"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
-    inst.append(f"{pin_row['instance']} : IBUF")
+    inst.append(f"{pin_row.instance} : IBUF")
     inst.append("-- generic map (")
     inst.append("-- )")
     inst.append("port map (")
-    if pin_row["is_bus"]:
-        inst.append(f"    O       => {name}({pin_row['index']}),")
-        inst.append(f"    I       => {name}_pad({pin_row['index']})")
+    if pin_row.is_bus:
+        inst.append(f"    O       => {name}({pin_row.index}),")
+        inst.append(f"    I       => {name}_pad({pin_row.index})")
     else:
         inst.append(f"    O       => {name},")
         inst.append(f"    I       => {name}_pad")
@@ -127,16 +184,17 @@ def _instantiate_ibuf(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-def _instantiate_obuf(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_obuf(name: str, pin_row: BufferRow) -> str:
     """Instantiate an OBUF"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
-    inst.append(f"{pin_row['instance']} : OBUF")
+    inst.append(f"{pin_row.instance} : OBUF")
     inst.append("-- generic map (")
     inst.append("-- )")
     inst.append("port map (")
-    if pin_row["is_bus"]:
-        inst.append(f"    O       => {name}_pad({pin_row['index']}),")
-        inst.append(f"    I       => {name}({pin_row['index']})")
+    if pin_row.is_bus:
+        inst.append(f"    O       => {name}_pad({pin_row.index}),")
+        inst.append(f"    I       => {name}({pin_row.index})")
     else:
         inst.append(f"    O       => {name}_pad,")
         inst.append(f"    I       => {name}")
@@ -144,17 +202,18 @@ def _instantiate_obuf(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-def _instantiate_ibufds(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_ibufds(name: str, pin_row: BufferRow) -> str:
     """Instantiate an IBUFDS."""
+    pin_row = get_buffer_row(pin_row)
     inst = []
-    inst.append(f"{pin_row['instance']} : IBUFDS")
+    inst.append(f"{pin_row.instance} : IBUFDS")
     inst.append("-- generic map (")
     inst.append("-- )")
     inst.append("port map (")
-    if pin_row["is_bus"]:
-        inst.append(f"    O       => {name}({pin_row['index']}),")
-        inst.append(f"    I       => {name}_p({pin_row['index']}),")
-        inst.append(f"    IB      => {name}_n({pin_row['index']})")
+    if pin_row.is_bus:
+        inst.append(f"    O       => {name}({pin_row.index}),")
+        inst.append(f"    I       => {name}_p({pin_row.index}),")
+        inst.append(f"    IB      => {name}_n({pin_row.index})")
     else:
         inst.append(f"    O       => {name},")
         inst.append(f"    I       => {name}_p,")
@@ -163,17 +222,18 @@ def _instantiate_ibufds(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-def _instantiate_obufds(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_obufds(name: str, pin_row: BufferRow) -> str:
     """Instantiate an OBUFDS"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
-    inst.append(f"{pin_row['instance']} : OBUFDS")
+    inst.append(f"{pin_row.instance} : OBUFDS")
     inst.append("-- generic map (")
     inst.append("-- )")
     inst.append("port map (")
-    if pin_row["is_bus"]:
-        inst.append(f"    O       => {name}_p({pin_row['index']}),")
-        inst.append(f"    OB      => {name}_n({pin_row['index']}),")
-        inst.append(f"    I       => {name}({pin_row['index']})")
+    if pin_row.is_bus:
+        inst.append(f"    O       => {name}_p({pin_row.index}),")
+        inst.append(f"    OB      => {name}_n({pin_row.index}),")
+        inst.append(f"    I       => {name}({pin_row.index})")
     else:
         inst.append(f"    O       => {name}_p,")
         inst.append(f"    OB      => {name}_n,")
@@ -182,18 +242,19 @@ def _instantiate_obufds(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-def _instantiate_iobuf(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_iobuf(name: str, pin_row: BufferRow) -> str:
     """Instantiate an IOBUF"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
-    inst.append(f"{pin_row['instance']} : IOBUF")
+    inst.append(f"{pin_row.instance} : IOBUF")
     inst.append("-- generic map (")
     inst.append("-- )")
     inst.append("port map (")
-    if pin_row["is_bus"]:
-        inst.append(f"    O       => {name}_i({pin_row['index']}),")
-        inst.append(f"    I       => {name}_o({pin_row['index']}),")
-        inst.append(f"    IO      => {name}_pad({pin_row['index']}),")
-        inst.append(f"    T       => {name}_t({pin_row['index']})")
+    if pin_row.is_bus:
+        inst.append(f"    O       => {name}_i({pin_row.index}),")
+        inst.append(f"    I       => {name}_o({pin_row.index}),")
+        inst.append(f"    IO      => {name}_pad({pin_row.index}),")
+        inst.append(f"    T       => {name}_t({pin_row.index})")
     else:
         inst.append(f"    O       => {name}_i,")
         inst.append(f"    I       => {name}_o,")
@@ -203,19 +264,20 @@ def _instantiate_iobuf(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-def _instantiate_iobufds(name: str, pin_row: dict[str, Any]) -> str:
+def _instantiate_iobufds(name: str, pin_row: BufferRow) -> str:
     """Instantiate an IOBUFDS"""
+    pin_row = get_buffer_row(pin_row)
     inst = []
-    inst.append(f"{pin_row['instance']} : IOBUFDS")
+    inst.append(f"{pin_row.instance} : IOBUFDS")
     inst.append("-- generic map (")
     inst.append("-- )")
     inst.append("port map (")
-    if pin_row["is_bus"]:
-        inst.append(f"    O       => {name}_i({pin_row['index']}),")
-        inst.append(f"    I       => {name}_o({pin_row['index']}),")
-        inst.append(f"    IO      => {name}_p({pin_row['index']}),")
-        inst.append(f"    IOB     => {name}_n({pin_row['index']}),")
-        inst.append(f"    T       => {name}_t({pin_row['index']})")
+    if pin_row.is_bus:
+        inst.append(f"    O       => {name}_i({pin_row.index}),")
+        inst.append(f"    I       => {name}_o({pin_row.index}),")
+        inst.append(f"    IO      => {name}_p({pin_row.index}),")
+        inst.append(f"    IOB     => {name}_n({pin_row.index}),")
+        inst.append(f"    T       => {name}_t({pin_row.index})")
     else:
         inst.append(f"    O       => {name}_i,")
         inst.append(f"    I       => {name}_o,")
@@ -226,16 +288,23 @@ def _instantiate_iobufds(name: str, pin_row: dict[str, Any]) -> str:
     return indent_join(inst, 1)
 
 
-_INFER_BUFFERS = {
-    "ibuf": _infer_ibuf,
-    "obuf": _infer_obuf,
-}
-
-_INSTANTIATE_BUFFERS = {
-    "ibuf": _instantiate_ibuf,
-    "obuf": _instantiate_obuf,
-    "ibufds": _instantiate_ibufds,
-    "obufds": _instantiate_obufds,
-    "iobuf": _instantiate_iobuf,
-    "iobufds": _instantiate_iobufds,
-}
+# Indexed by the code of the buffer
+_INFER_BUFFERS = code_table(
+    Buffer,
+    {
+        Buffer.IBUF: _infer_ibuf,
+        Buffer.OBUF: _infer_obuf,
+    },
+)
+
+_INSTANTIATE_BUFFERS = code_table(
+    Buffer,
+    {
+        Buffer.IBUF: _instantiate_ibuf,
+        Buffer.OBUF: _instantiate_obuf,
+        Buffer.IBUFDS: _instantiate_ibufds,
+        Buffer.OBUFDS: _instantiate_obufds,
+        Buffer.IOBUF: _instantiate_iobuf,
+        Buffer.IOBUFDS: _instantiate_iobufds,
+    },
+)
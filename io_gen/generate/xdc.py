@@ -1,5 +1,9 @@
-from io_gen.tables import PinTable, pin_is_differential
-from io_gen.tables import SignalTable
+import io
+from typing import TextIO
+
+from io_gen.tables import PinRow, PinTable
+from io_gen.tables import SignalRow, SignalTable
+from io_gen.tables import signal_is_differential, signal_is_scalar
 from io_gen.tables import ConstraintsTable
 
 from .common import get_header
@@ -12,17 +16,28 @@ def _port_ref(name: str, suffix: str, index: int, is_bus: bool) -> str:
     return f"{name}_{suffix}"
 
 
+def _port_patterns(sig: SignalRow) -> list[str]:
+    """Returns patterns matching every top level port of a signal, one per leg"""
+    suffixes = ("p", "n") if signal_is_differential(sig) else ("pad",)
+    bits = "" if signal_is_scalar(sig) else "[*]"
+    return [f"{sig.name}_{suffix}{bits}" for suffix in suffixes]
+
+
 def _pin_constraints(
-    pkg_pin: str, port: str, pin: dict, pin_planner: bool
+    pkg_pin: str, port: str, pin: PinRow, pin_planner: bool, compact: bool = False
 ) -> list[str]:
-    """Returns the pin constraints for a port"""
-    lines = [
-        f"set_property PACKAGE_PIN {pkg_pin} [get_ports {port}]",
-        f"set_property IOSTANDARD {pin['iostandard']} [get_ports {port}]",
-    ]
+    """Returns the pin constraints for a port
+
+    Only the package pin is returned when compact, the other properties being
+    grouped by value over every port at the end of the file.
+    """
+    lines = [f"set_property PACKAGE_PIN {pkg_pin} [get_ports {port}]"]
+    if compact:
+        return lines
+    lines.append(f"set_property IOSTANDARD {pin.iostandard} [get_ports {port}]")
     if pin_planner:
         lines.append(
-            f"set_property DIRECTION {pin['direction'].upper()} [get_ports {port}]"
+            f"set_property DIRECTION {pin.direction.xdc} [get_ports {port}]"
         )
     return lines
 
@@ -32,48 +47,98 @@ def generate_xdc(
     pin_table: PinTable,
     constraints_table: ConstraintsTable,
     pin_planner: bool = False,
+    compact: bool = False,
 ) -> str:
-    """Generate XDC constraints from the signal and pin tables"""
+    """Generate XDC constraints from the signal and pin tables as a string"""
+    out = io.StringIO()
+    write_xdc(out, signal_table, pin_table, constraints_table, pin_planner, compact)
+    return out.getvalue()
+
+
+def write_xdc(
+    out: TextIO,
+    signal_table: SignalTable,
+    pin_table: PinTable,
+    constraints_table: ConstraintsTable,
+    pin_planner: bool = False,
+    compact: bool = False,
+) -> None:
+    """Write XDC constraints from the signal and pin tables to out
+
+    The constraints of each signal are written as soon as they are made, so only one
+    signal's worth of text is held at a time.
+
+    When compact, each port only gets its package pin. The IO standards (and in pin
+    planner mode, the directions) follow at the end, as one set_property per
+    distinct value over the ports that share it, with `[*]` standing for every bit
+    of a bus.
+    """
+    # Value -> port patterns, in table order
+    iostandards: dict[str, list[str]] = {}
+    directions: dict[str, list[str]] = {}
 
-    xdc_lines = []
-    header = []
     for line in get_header():
         if line:
-            header.append(f"# {line}")
+            out.write(f"# {line}\n")
         else:
-            header.append("#")
-    xdc_lines.append("\n".join(header))
+            out.write("#\n")
+    out.write("\n")
 
-    constraints = [
-        f"set_property CONFIG_VOLTAGE {constraints_table.config_voltage} [current_design]",
-        f"set_property CFGBVS {constraints_table.cfgbvs} [current_design]",
-    ]
-    xdc_lines.append("\n".join(constraints))
+    out.write(
+        f"set_property CONFIG_VOLTAGE {constraints_table.config_voltage} [current_design]\n"
+        f"set_property CFGBVS {constraints_table.cfgbvs} [current_design]\n"
+    )
 
     for sig in signal_table:
-        name = sig["name"]
-        comment = sig["comment"].get("xdc")
+        name = sig.name
+        comment = sig.comment.get("xdc")
 
-        lines = []
+        # Signals are separated by a blank line
+        lines = [""]
         if comment:
             lines.append(f"# {comment}")
 
+        if compact:
+            ports = _port_patterns(sig)
+            iostandards.setdefault(sig.iostandard, []).extend(ports)
+            directions.setdefault(sig.direction.xdc, []).extend(ports)
+
         for pin in pin_table[name]:
-            index = pin["index"]
-            is_bus = pin["is_bus"]
-            if pin_is_differential(pin):
+            index = pin.index
+            is_bus = pin.is_bus
+            if pin.pinset is not None:
                 port_ref = _port_ref(name, "p", index, is_bus)
                 lines.extend(
-                    _pin_constraints(pin["pinset"]["p"], port_ref, pin, pin_planner)
+                    _pin_constraints(
+                        pin.pinset["p"], port_ref, pin, pin_planner, compact
+                    )
                 )
                 port_ref = _port_ref(name, "n", index, is_bus)
                 lines.extend(
-                    _pin_constraints(pin["pinset"]["n"], port_ref, pin, pin_planner)
+                    _pin_constraints(
+                        pin.pinset["n"], port_ref, pin, pin_planner, compact
+                    )
                 )
-            else:
+            elif pin.pin is not None:
                 port_ref = _port_ref(name, "pad", index, is_bus)
-                lines.extend(_pin_constraints(pin["pin"], port_ref, pin, pin_planner))
+                lines.extend(
+                    _pin_constraints(pin.pin, port_ref, pin, pin_planner, compact)
+                )
+
+        lines.append("")
+        out.write("\n".join(lines))
+
+    if iostandards:
+        lines = [""]
+        for iostandard, ports in iostandards.items():
+            lines.append(_grouped_property("IOSTANDARD", iostandard, ports))
+        if pin_planner:
+            for direction, ports in directions.items():
+                lines.append(_grouped_property("DIRECTION", direction, ports))
+        lines.append("")
+        out.write("\n".join(lines))
 
-        xdc_lines.append("\n".join(lines))
 
-    return "\n\n".join(xdc_lines) + "\n"
+def _grouped_property(name: str, value: str, ports: list[str]) -> str:
+    """Returns one set_property of value over every port in ports"""
+    return f"set_property {name} {value} [get_ports {{{' '.join(ports)}}}]"
@@ -27,3 +27,40 @@ def is_valid_verilog_identifier(name: str) -> bool:
 def is_valid_vhdl_identifier(name: str) -> bool:
     """Returns True if identifier name is a valid basic identifier"""
     return bool(_VHDL_ID.match(name))
+
+
+# Reserved keywords of Verilog (IEEE 1364-2005, Annex B). Verilog is case sensitive,
+# so these are only reserved exactly as written.
+VERILOG_KEYWORDS = frozenset(
+    """
+    always and assign automatic begin buf bufif0 bufif1 case casex casez cell cmos
+    config deassign default defparam design disable edge else end endcase endconfig
+    endfunction endgenerate endmodule endprimitive endspecify endtable endtask event
+    for force forever fork function generate genvar highz0 highz1 if ifnone incdir
+    include initial inout input instance integer join large liblist library localparam
+    macromodule medium module nand negedge nmos nor noshowcancelled not notif0 notif1
+    or output parameter pmos posedge primitive pull0 pull1 pulldown pullup
+    pulsestyle_ondetect pulsestyle_onevent rcmos real realtime reg release repeat
+    rnmos rpmos rtran rtranif0 rtranif1 scalared showcancelled signed small specify
+    specparam strong0 strong1 supply0 supply1 table task time tran tranif0 tranif1
+    tri tri0 tri1 triand trior trireg unsigned use uwire vectored wait wand weak0
+    weak1 while wire wor xnor xor
+    """.split()
+)
+
+# Reserved words of VHDL (IEEE 1076-2008, 15.10). VHDL is case insensitive, so these
+# are stored in lower case and compared against lower cased names.
+VHDL_KEYWORDS = frozenset(
+    """
+    abs access after alias all and architecture array assert assume assume_guarantee
+    attribute begin block body buffer bus case component configuration constant
+    context cover default disconnect downto else elsif end entity exit fairness file
+    for force function generate generic group guarded if impure in inertial inout is
+    label library linkage literal loop map mod nand new next nor not null of on open
+    or others out package parameter port postponed procedure process property
+    protected pure range record register reject release rem report restrict
+    restrict_guarantee return rol ror select sequence severity shared signal sla sll
+    sra srl strong subtype then to transport type unaffected units until use variable
+    vmode vprop vunit wait when while with xnor xor
+    """.split()
+)
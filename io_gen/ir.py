@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any
+
+from .cache import ValidatedDesign
+from .files import create_temporary
+from .tables import ConstraintsTable, MetaTable, SignalRow, SignalTable
+
+# Bump whenever the payload layout changes. An IR file written with a different
+# format is rejected rather than read as something it isn't
+IR_FORMAT = 1
+
+# The first line of an IR file is `io-gen-ir <format> <sha256 of the payload>`
+_MAGIC = b"io-gen-ir"
+
+# The order the fields of a signal row are written in
+_SIGNAL_FIELDS = (
+    "name",
+    "width",
+    "iostandard",
+    "direction",
+    "infer",
+    "bypass",
+    "comment",
+    "buffer",
+    "instance",
+    "pins",
+    "pinset",
+)
+_COMMENT = _SIGNAL_FIELDS.index("comment")
+
+
+def dump_ir(design: ValidatedDesign) -> bytes:
+    """Returns the tables of design as an IR file
+
+    The file is a one line header with the IR format and a SHA-256 digest of the
+    payload, followed by the payload: the meta, constraints and signal tables as
+    zlib compressed JSON, with each signal row written as a list of its fields.
+    The document itself and the pin table are not included, the pin table being
+    rebuilt from the signal table when the IR is loaded.
+    """
+
+    signals = []
+    for sig in design.signal_table:
+        row = [getattr(sig, field) for field in _SIGNAL_FIELDS]
+        row[_COMMENT] = sig.comment.to_dict()
+        if sig.pinset is not None:
+            row[-1] = [sig.pinset.p, sig.pinset.n]
+        signals.append(row)
+
+    meta = design.meta_table
+    constraints = design.constraints_table
+    payload = {
+        "meta": [meta.title, meta.part, meta.architecture],
+        "constraints": [constraints.cfgbvs, constraints.config_voltage],
+        "signals": signals,
+    }
+    body = zlib.compress(
+        json.dumps(payload, separators=(",", ":")).encode("ascii"), level=9
+    )
+    digest = hashlib.sha256(body).hexdigest()
+    return b"%s %d %s\n" % (_MAGIC, IR_FORMAT, digest.encode("ascii")) + body
+
+
+def load_ir(data: bytes) -> ValidatedDesign:
+    """Returns the design in an IR file produced by dump_ir()
+
+    The design has an empty document. Raises ValueError if data isn't an IR file,
+    was written with a different IR format, or doesn't match its digest.
+    """
+
+    header, _, body = data.partition(b"\n")
+    fields = header.split(b" ")
+    if len(fields) != 3 or fields[0] != _MAGIC:
+        raise ValueError("not an io-gen IR file")
+    if fields[1] != str(IR_FORMAT).encode("ascii"):
+        raise ValueError(
+            f"IR format {fields[1].decode('ascii', 'replace')} is not supported "
+            f"(expected {IR_FORMAT}), regenerate it with --emit-ir"
+        )
+    if hashlib.sha256(body).hexdigest().encode("ascii") != fields[2]:
+        raise ValueError("IR file is corrupted (digest mismatch)")
+
+    try:
+        payload: dict[str, Any] = json.loads(zlib.decompress(body))
+        return ValidatedDesign(
+            doc={},
+            meta_table=MetaTable(*payload["meta"]),
+            constraints_table=ConstraintsTable(*payload["constraints"]),
+            signal_table=_load_signal_table(payload["signals"]),
+        )
+    except (ValueError, KeyError, TypeError, zlib.error) as e:
+        # Only reachable if the digest was recomputed over a bad payload
+        raise ValueError(f"IR file is malformed: {e}") from None
+
+
+def _load_signal_table(signals: list[list[Any]]) -> SignalTable:
+    signal_table = SignalTable()
+    for values in signals:
+        fields: dict[str, Any] = dict(zip(_SIGNAL_FIELDS, values, strict=True))
+        if fields["pins"] is None:
+            del fields["pins"]
+        if fields["pinset"] is None:
+            del fields["pinset"]
+        else:
+            p, n = fields["pinset"]
+            fields["pinset"] = {"p": p, "n": n}
+        # Resolves the enums and turns buses back into tuples
+        signal_table.add_row(SignalRow.from_mapping(fields))
+    return signal_table
+
+
+def read_ir(path: str | Path) -> ValidatedDesign:
+    """Returns the design in the IR file at path (see load_ir())"""
+    return load_ir(Path(path).read_bytes())
+
+
+def write_ir(path: str | Path, design: ValidatedDesign) -> None:
+    """Writes the tables of design to an IR file at path, replacing it atomically"""
+
+    path = Path(path)
+    fd, tmp = create_temporary(path)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(dump_ir(design))
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
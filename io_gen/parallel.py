@@ -0,0 +1,164 @@
+from collections.abc import Generator, Mapping
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import jsonschema
+
+# A schema violation as (absolute path into the document, message)
+SchemaError = tuple[tuple, str]
+
+# Below this many signals, starting the workers and sending the signals to them costs
+# more than validating the signals in this process
+PARALLEL_THRESHOLD = 2000
+
+# Each worker gets several chunks, so that one chunk full of invalid signals (which are
+# much slower to check than valid ones) doesn't leave the other workers idle
+CHUNKS_PER_JOB = 4
+
+
+def top_schema(validator: "jsonschema.Draft202012Validator") -> Mapping[str, Any]:
+    """Returns the schema validator checks documents against
+
+    jsonschema also accepts the boolean schemas true and false, which the packaged
+    schema never is.
+    """
+    schema = validator.schema
+    if isinstance(schema, bool):
+        raise TypeError("The top level schema must be an object")
+    return schema
+
+
+def can_split(doc: Any, schema: Mapping[str, Any], jobs: int) -> bool:
+    """Returns True if the signals of doc are worth validating on a process pool
+
+    Besides the size threshold, the signal list has to be something the split can
+    reproduce exactly (see signals_are_independent()).
+    """
+    if jobs < 2 or not isinstance(doc, dict):
+        return False
+    signals = doc.get("signals")
+    if not isinstance(signals, list) or len(signals) < PARALLEL_THRESHOLD:
+        return False
+    return signals_are_independent(schema)
+
+
+def signals_are_independent(schema: Mapping[str, Any]) -> bool:
+    """Returns True if each signal can be validated without looking at the others
+
+    That holds when the schema constrains the signal list only through its items,
+    and is what allows the signals to be validated separately from the rest of the
+    document (in chunks, or one at a time as they are parsed) with the same result.
+    """
+    signals_schema = schema.get("properties", {}).get("signals", {})
+    return set(signals_schema) <= {"type", "items"}
+
+
+def precedes_signals(
+    schema: Mapping[str, Any], error: "jsonschema.ValidationError"
+) -> bool:
+    """Returns True if jsonschema reports error ahead of the errors in the signals
+
+    The validator applies the keywords of a schema in the order they are written,
+    and the properties of the `properties` keyword in the order they are listed, so
+    where a top level error falls relative to the signals is known from the keyword
+    that raised it.
+    """
+    keywords: list[str | int] = list(schema)
+    keyword = error.relative_schema_path[0]
+    if keyword == "properties":
+        properties = list(schema["properties"])
+        return properties.index(error.relative_schema_path[1]) < properties.index(
+            "signals"
+        )
+    return keywords.index(keyword) < keywords.index("properties")
+
+
+def _check_signals(
+    start: int, signals: list, reference: bool, narrow: bool, first_only: bool
+) -> list[SchemaError]:
+    """Validate a chunk of signals against the item subschema (runs in a worker)
+
+    start is the index of the first signal of the chunk in the whole list, so that
+    the paths of the errors returned are the same as validating the whole document.
+    """
+    from jsonschema.exceptions import best_match
+
+    from .validate import get_compiled_validator, get_validator
+
+    compiled = None if reference else get_compiled_validator()
+    validator = get_validator()
+    items_schema = top_schema(validator)["properties"]["signals"]["items"]
+
+    errors: list[SchemaError] = []
+    for index, sig in enumerate(signals, start):
+        if compiled is not None and compiled.is_valid_signal(sig):
+            continue
+        for error in validator.descend(sig, items_schema, path=index):
+            if narrow:
+                error = best_match([error])
+            errors.append((("signals", *error.absolute_path), error.message))
+            if first_only:
+                return errors
+    return errors
+
+
+def iter_split_errors(
+    doc: dict,
+    validator: "jsonschema.Draft202012Validator",
+    jobs: int,
+    reference: bool = False,
+    narrow: bool = False,
+    first_only: bool = False,
+) -> Generator[SchemaError, None, None]:
+    """Yield the schema violations of doc, validating its signals on a process pool
+
+    The rest of the document is validated once in this process with an empty signal
+    list, and the signals are validated in chunks by jobs worker processes. Errors
+    come out in the same order as validating the whole document in one go, and with
+    the same paths, so the first one is the one the validator would have raised.
+    With narrow=True, each error is narrowed down to its most relevant cause. With
+    first_only=True, each chunk stops at its first error.
+
+    Closing the iterator early cancels the chunks that haven't started yet.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from jsonschema.exceptions import best_match
+
+    schema = top_schema(validator)
+    before: list[SchemaError] = []
+    after: list[SchemaError] = []
+    for error in validator.iter_errors({**doc, "signals": []}):
+        group = before if precedes_signals(schema, error) else after
+        if narrow:
+            error = best_match([error])
+        group.append((tuple(error.absolute_path), error.message))
+
+    yield from before
+    if first_only and before:
+        return
+
+    signals = doc["signals"]
+    size = -(-len(signals) // (jobs * CHUNKS_PER_JOB))
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        futures = [
+            pool.submit(
+                _check_signals,
+                start,
+                signals[start : start + size],
+                reference,
+                narrow,
+                first_only,
+            )
+            for start in range(0, len(signals), size)
+        ]
+        for future in futures:
+            chunk_errors = future.result()
+            yield from chunk_errors
+            if first_only and chunk_errors:
+                return
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    yield from after
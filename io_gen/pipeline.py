@@ -1,21 +1,47 @@
+import hashlib
+import os
+import sys
+from collections.abc import Iterable
+from functools import partial
 from pathlib import Path
+from typing import Any, Callable
 
-from io_gen.validate import validate, validate_verilog, validate_vhdl
+from io_gen.cache import ValidatedDesign, ValidationCache
+from io_gen.files import create_temporary
+from io_gen.validate import (
+    validate_bytes,
+    validate_stream,
+    validate_verilog,
+    validate_vhdl,
+)
 
 from io_gen.tables import (
     build_signal_table,
     build_pin_table,
     build_meta_table,
     build_constraints_table,
+    signal_is_scalar,
 )
 
-from io_gen.generate import (
-    generate_xdc,
-    generate_verilog_top,
-    generate_verilog_ioring,
-    generate_vhdl_top,
-    generate_vhdl_ioring,
-)
+# HDL languages io-gen can write, in the order their outputs are generated
+LANGUAGES = ("verilog", "vhdl")
+
+
+def parse_languages(lang: str) -> list[str]:
+    """Return the languages named by a --lang value, in the order of LANGUAGES
+
+    The value is one language, a comma separated list of them, or 'both' for every
+    language. Raises ValueError for an empty list or a language io-gen can't write.
+    """
+    if lang.strip().lower() == "both":
+        return list(LANGUAGES)
+    requested = {name.strip().lower() for name in lang.split(",")}
+    unknown = sorted(requested.difference(LANGUAGES))
+    if unknown:
+        raise ValueError(
+            f"unknown language '{unknown[0]}' (expected {', '.join(LANGUAGES)} or both)"
+        )
+    return [name for name in LANGUAGES if name in requested]
 
 
 def run_pipeline(
@@ -26,6 +52,15 @@ def run_pipeline(
     validate_only: bool,
     rtl_only: bool,
     xdc_only: bool,
+    use_cache: bool = False,
+    cache_dir: str | Path | None = None,
+    max_errors: int | None = None,
+    jobs: int = 1,
+    stream: bool = False,
+    from_ir: bool = False,
+    emit_ir: str | Path | None = None,
+    bus_loops: bool = False,
+    compact_xdc: bool = False,
 ) -> None:
     """Run the full io-gen pipeline from YAML input to output files.
 
@@ -36,11 +71,12 @@ def run_pipeline(
     Parameters
     ----------
     yaml_path:
-        Path to the input YAML pin description file.
+        Path to the input YAML pin description file, or to an IR file if from_ir.
     top:
         HDL module name. Drives output file names and the IO ring module name.
     lang:
-        Output HDL language: 'verilog' or 'vhdl'. Ignored when xdc_only is True.
+        Output HDL language: 'verilog' or 'vhdl', a comma separated list of both, or
+        'both'. Ignored when xdc_only is True.
     output_dir:
         Directory to write output files into.
     validate_only:
@@ -49,6 +85,33 @@ def run_pipeline(
         If True, generate HDL files only. Skip XDC.
     xdc_only:
         If True, generate XDC only. Skip HDL files.
+    use_cache:
+        If True, reuse the validated document and tables from a previous run on
+        identical YAML contents instead of validating again, and cache them if
+        there was no previous run.
+    cache_dir:
+        Directory for the validation cache. Defaults to $XDG_CACHE_HOME/io-gen.
+    max_errors:
+        If given, validation reports up to this many problems (0 for all of them)
+        in the diagnostics of the ValidationError raised, instead of only the first.
+    jobs:
+        Number of worker processes to structurally validate large signal lists on.
+    stream:
+        If True, parse and validate the signals one at a time, building the signal
+        table as they are read, instead of loading the whole document first.
+    from_ir:
+        If True, yaml_path is an IR file written with emit_ir, and its tables are
+        used as they are, without parsing or validating any YAML.
+    emit_ir:
+        If given, write the tables of the design to an IR file at this path.
+    bus_loops:
+        If True, the IO ring instantiates the buffers of each bus in one generate
+        loop instead of one instance per bit. That renames the cells of every
+        looped bus: buses with buffers named in the YAML are rejected, and a
+        warning naming the new cells is printed for each of the others.
+    compact_xdc:
+        If True, the XDC sets the IO standard (and direction) of every port that
+        shares it at once, only giving the package pin port by port.
     """
 
     # Convert to Path objects first
@@ -66,59 +129,355 @@ def run_pipeline(
         # probe.unlink(missing_ok=True)
         probe.unlink()
 
-    # Get the validated data from YAML
-    valid_doc = validate(yaml_path)
-    print(f"Info: Validated YAML at {yaml_path}")
+    # Get the validated data and the tables built from it, either from a previous
+    # run on the same YAML or by validating it now
+    if from_ir:
+        from io_gen.ir import read_ir
 
-    # Create the table of metadata
-    meta_table = build_meta_table(valid_doc)
+        design = read_ir(yaml_path)
+        print(f"Info: Loaded IR from {yaml_path}")
+    else:
+        cache = ValidationCache(cache_dir) if use_cache else None
+        design = _load_design(yaml_path, cache, max_errors, jobs, stream)
+    meta_table = design.meta_table
+    constraints_table = design.constraints_table
+    signal_table = design.signal_table
 
-    # Create the table additional constraints to pass to the XDC generator
-    constraints_table = build_constraints_table(valid_doc)
+    if emit_ir is not None:
+        from io_gen.ir import write_ir
 
-    # Create the table of signals from the validated doc
-    signal_table = build_signal_table(valid_doc)
-    # Now that we know the language and top level module or component names, we validate
-    # the signal table components
-    if lang == "verilog":
-        validate_verilog(signal_table, top)
-    else:
-        validate_vhdl(signal_table, meta_table, top)
+        write_ir(emit_ir, design)
+        print(f"Info: Wrote IR to {Path(emit_ir).resolve()}")
 
-    # Create a mapping between signal names and a list of the pins for that signal
-    pin_table = build_pin_table(signal_table)
+    # Now that we know the languages and top level module or component names, we
+    # validate the signal table components for each of them
+    languages = parse_languages(lang)
+    for language in languages:
+        if language == "verilog":
+            validate_verilog(signal_table, top, bus_loops)
+        else:
+            validate_vhdl(signal_table, meta_table, top, bus_loops)
+    if bus_loops:
+        from io_gen.collisions import bus_loop_warnings
+
+        # Buses with named buffers were rejected above, the others are renamed
+        for warning in bus_loop_warnings(signal_table):
+            print(f"Warning: {warning}", file=sys.stderr)
 
     # If we're only validating the YAML, we're out of here now
     if validate_only:
         return
 
+    # Create a mapping between signal names and a list of the pins for that signal.
+    # Each signal is only flattened into its pins when a generator first asks for them
+    pin_table = build_pin_table(signal_table)
+
+    # Generators are imported as they are needed so that, for example, an XDC only
+    # run never loads the HDL backends. Each one writes straight into a buffered file
+    # as it goes, rather than building the whole file as a string first. The outputs
+    # are listed in the order they are reported in
+    outputs: list[tuple[str, Path, Callable[..., None], tuple[Any, ...]]] = []
     if not rtl_only:
-        with open(output_dir / f"{top}.xdc", "w", encoding="utf-8") as xdc:
-            xdc.write(
-                generate_xdc(
-                    signal_table, pin_table, constraints_table, pin_planner=xdc_only
-                )
+        from io_gen.generate import write_xdc
+
+        outputs.append(
+            (
+                "XDC constraints",
+                output_dir / f"{top}.xdc",
+                write_xdc,
+                (signal_table, pin_table, constraints_table, xdc_only, compact_xdc),
             )
-            print(f"Info: Wrote XDC constraints to {output_dir / f'{top}.xdc'}")
+        )
 
     if not xdc_only:
-        if lang == "verilog":
-            # Write the top level RTL to disk
-            with open(output_dir / f"{top}.v", "w", encoding="utf-8") as top_rtl:
-                top_rtl.write(generate_verilog_top(signal_table, top))
-                print(f"Info: Wrote top level module to {output_dir / f'{top}.v'}")
-            # Write the IO ring RTL to disk
-            with open(output_dir / f"{top}_io.v", "w", encoding="utf-8") as top_rtl:
-                top_rtl.write(generate_verilog_ioring(signal_table, pin_table, top))
-                print(f"Info: Wrote IO ring module to {output_dir / f'{top}_io.v'}")
-        else:
-            # Write the top level RTL to disk
-            with open(output_dir / f"{top}.vhd", "w", encoding="utf-8") as top_rtl:
-                top_rtl.write(generate_vhdl_top(signal_table, meta_table, top))
-                print(f"Info: Wrote top level module to {output_dir / f'{top}.vhd'}")
-            # Write the IO ring RTL to disk
-            with open(output_dir / f"{top}_io.vhd", "w", encoding="utf-8") as top_rtl:
-                top_rtl.write(
-                    generate_vhdl_ioring(signal_table, pin_table, meta_table, top)
+        from io_gen.generate import build_port_table
+
+        # The ports and nets of every signal are derived once for all the HDL files
+        port_table = build_port_table(signal_table)
+
+        for language in languages:
+            if language == "verilog":
+                from io_gen.generate import write_verilog_ioring, write_verilog_top
+
+                outputs.append(
+                    (
+                        "top level module",
+                        output_dir / f"{top}.v",
+                        write_verilog_top,
+                        (signal_table, top, port_table),
+                    )
                 )
-                print(f"Info: Wrote IO ring module to {output_dir / f'{top}_io.vhd'}")
+                outputs.append(
+                    (
+                        "IO ring module",
+                        output_dir / f"{top}_io.v",
+                        write_verilog_ioring,
+                        (signal_table, pin_table, top, port_table, bus_loops),
+                    )
+                )
+            else:
+                from io_gen.generate import write_vhdl_ioring, write_vhdl_top
+
+                outputs.append(
+                    (
+                        "top level module",
+                        output_dir / f"{top}.vhd",
+                        write_vhdl_top,
+                        (signal_table, meta_table, top, port_table),
+                    )
+                )
+                outputs.append(
+                    (
+                        "IO ring module",
+                        output_dir / f"{top}_io.vhd",
+                        write_vhdl_ioring,
+                        (
+                            signal_table,
+                            pin_table,
+                            meta_table,
+                            top,
+                            port_table,
+                            bus_loops,
+                        ),
+                    )
+                )
+
+    _write_outputs(outputs)
+
+
+def _write_output(path: Path, writer: Callable[..., None], args: tuple) -> bool:
+    """Stream writer's output into the file at path, unless it is there already
+
+    The output is written to a temporary file next to path first. If path already
+    has the same contents, going by their SHA-256 digests, it is left alone, and
+    the modification time that build tools go by with it. Otherwise the temporary
+    file atomically replaces it, so path is never left half written, keeping the
+    permissions path had. Returns whether path was written.
+    """
+
+    fd, tmp = create_temporary(path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            writer(out, *args)
+        if _same_contents(path, tmp):
+            tmp.unlink()
+            return False
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def _same_contents(path: Path, tmp: Path) -> bool:
+    """Whether the file at path exists and has the same SHA-256 digest as tmp"""
+
+    try:
+        if path.stat().st_size != tmp.stat().st_size:
+            return False
+        with open(path, "rb") as f:
+            existing = hashlib.file_digest(f, "sha256").digest()
+    except FileNotFoundError:
+        return False
+    with open(tmp, "rb") as f:
+        return hashlib.file_digest(f, "sha256").digest() == existing
+
+
+# The (path, writer, args) of every output of the run, in a worker process of
+# _write_outputs(). Set once by _init_worker(), so tasks only carry an index
+_WORKER_OUTPUTS: list[tuple[Path, Callable[..., None], tuple[Any, ...]]] = []
+
+
+def _init_worker(
+    outputs: list[tuple[Path, Callable[..., None], tuple[Any, ...]]],
+) -> None:
+    _WORKER_OUTPUTS[:] = outputs
+
+
+def _write_worker_output(index: int) -> bool:
+    return _write_output(*_WORKER_OUTPUTS[index])
+
+
+def _write_outputs(
+    outputs: list[tuple[str, Path, Callable[..., None], tuple[Any, ...]]],
+    workers: int | None = None,
+) -> None:
+    """Write each (description, path, writer, args) output, on a process pool when
+    there are several CPUs
+
+    Generating an output is pure Python, so only separate processes render them at
+    the same time. By default there is a worker per output, up to the number of
+    CPUs. The outputs (and so the tables) are handed to each worker once, when it
+    starts, and each task is only the position of an output in the list. With a
+    single worker, the outputs are written in this process one after another.
+
+    Either way, every output is attempted whatever happens to the others, and they
+    are reported in the order given. If any fail, the exception of the first of them
+    in that order is raised once the rest have finished, so a run fails the same way
+    however many workers there are and whichever of them is fastest.
+
+    Outputs whose files already have the contents they would be written with are
+    skipped (see _write_output()), and a summary of how many were written and
+    skipped follows the outputs.
+    """
+    if workers is None:
+        workers = min(len(outputs), os.cpu_count() or 1)
+    tasks = [(path, writer, args) for _, path, writer, args in outputs]
+    if workers < 2:
+        _report_outputs(outputs, (partial(_write_output, *task) for task in tasks))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(tasks,)
+    ) as pool:
+        futures = [
+            pool.submit(_write_worker_output, index) for index in range(len(tasks))
+        ]
+        _report_outputs(outputs, (future.result for future in futures))
+
+
+def _report_outputs(
+    outputs: list[tuple[str, Path, Callable[..., None], tuple[Any, ...]]],
+    results: Iterable[Callable[[], bool]],
+) -> None:
+    """Report each output as its result comes in, and raise the first failure"""
+    written = 0
+    error: BaseException | None = None
+    for (description, path, _, _), result in zip(outputs, results):
+        try:
+            wrote = result()
+        except Exception as e:
+            if error is None:
+                error = e
+            continue
+        if wrote:
+            written += 1
+            print(f"Info: Wrote {description} to {path}")
+        else:
+            print(f"Info: Skipped {description} at {path} (unchanged)")
+    if error is not None:
+        raise error
+
+    files = "file" if written == 1 else "files"
+    print(f"Info: {written} {files} written, {len(outputs) - written} unchanged")
+
+
+def run_query(
+    yaml_path: str | Path,
+    pins: list[str] | None = None,
+    iostandard: str | None = None,
+    direction: str | None = None,
+    use_cache: bool = False,
+    cache_dir: str | Path | None = None,
+) -> list[str]:
+    """Look up package pins in a YAML pin description.
+
+    Returns one line per package pin, `<pin> <signal>[<bit>] <leg>`, with the bit
+    left out for scalar signals and the leg for single-ended ones. Raises
+    ValidationError on validation failure and ValueError for a pin no signal uses.
+
+    Parameters
+    ----------
+    yaml_path:
+        Path to the input YAML pin description file.
+    pins:
+        Package pins to look up, in the order given. Every pin in the design if None.
+    iostandard:
+        If given, only pins of signals with this IO standard.
+    direction:
+        If given, only pins of signals with this direction.
+    use_cache:
+        If True, reuse the tables of a previous run on identical YAML contents.
+    cache_dir:
+        Directory for the validation cache. Defaults to $XDG_CACHE_HOME/io-gen.
+    """
+    cache = ValidationCache(cache_dir) if use_cache else None
+    design = _load_design(Path(yaml_path).resolve(), cache, quiet=True)
+    pin_table = build_pin_table(design.signal_table)
+
+    if pins is None:
+        selected = list(pin_table.index.locations)
+    else:
+        selected = pins
+        for pin in pins:
+            if pin not in pin_table.index.locations:
+                raise ValueError(f"package pin '{pin}' is not used by any signal")
+    if iostandard is not None:
+        matches = set(pin_table.pins_with_iostandard(iostandard))
+        selected = [pin for pin in selected if pin in matches]
+    if direction is not None:
+        matches = set(pin_table.pins_with_direction(direction))
+        selected = [pin for pin in selected if pin in matches]
+
+    width = max((len(pin) for pin in selected), default=0)
+    lines = []
+    for pin in selected:
+        location = pin_table.locate(pin)
+        line = f"{pin:<{width}} {location.signal}"
+        if not signal_is_scalar(pin_table.signals[location.signal]):
+            line += f"[{location.index}]"
+        if location.leg is not None:
+            line += f" {location.leg}"
+        lines.append(line)
+    return lines
+
+
+def _load_design(
+    yaml_path: Path,
+    cache: ValidationCache | None,
+    max_errors: int | None = None,
+    jobs: int = 1,
+    stream: bool = False,
+    quiet: bool = False,
+) -> ValidatedDesign:
+    """Validate the YAML at yaml_path and build its tables, consulting cache if given
+
+    With quiet, nothing is printed on success, so that stdout only carries what the
+    caller prints (e.g., the lines of a query).
+    """
+
+    # Streaming never holds the whole file, so it is hashed a block at a time.
+    # Otherwise, validation and caching both work from the raw contents of the file
+    data = None if stream else yaml_path.read_bytes()
+
+    # The key is computed once, for the lookup and (on a miss) the store
+    key = None
+    if cache is not None:
+        key = cache.key_file(yaml_path) if data is None else cache.key(data)
+        design = cache.load(key)
+        if design is not None:
+            if not quiet:
+                print(f"Info: Validated YAML at {yaml_path} (cached)")
+            return design
+
+    if data is None:
+        # The signals are validated and added to the signal table as they are read,
+        # and the document that comes back doesn't have them
+        valid_doc, signal_table = validate_stream(yaml_path, max_errors)
+    else:
+        # Get the validated data from YAML
+        valid_doc = validate_bytes(data, max_errors, jobs)
+        # Create the table of signals from the validated doc
+        signal_table = build_signal_table(valid_doc)
+    if not quiet:
+        print(f"Info: Validated YAML at {yaml_path}")
+
+    design = ValidatedDesign(
+        doc=valid_doc,
+        # Create the table of metadata
+        meta_table=build_meta_table(valid_doc),
+        # Create the table additional constraints to pass to the XDC generator
+        constraints_table=build_constraints_table(valid_doc),
+        signal_table=signal_table,
+    )
+
+    if cache is not None and key is not None:
+        # A cache that can't be written to shouldn't stop the run
+        try:
+            cache.store(key, design)
+        except OSError as e:
+            print(f"Warning: Unable to write validation cache: {e}", file=sys.stderr)
+
+    return design
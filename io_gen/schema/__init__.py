@@ -0,0 +1,48 @@
+import hashlib
+
+# Top level JSON schema file for validating input YAML stored in schema/
+SCHEMA_TOP = "schema.json"
+# Referenced JSON files stored in schema/defs
+SCHEMA_REFS = [
+    "constraints.json",
+    "direction.json",
+    "buffer.json",
+    "pinset.json",
+    "iostandard.json",
+    "instance.json",
+    "pins.json",
+]
+
+
+def read_schema_sources() -> dict[str, bytes]:
+    """Read the raw bytes of the top level schema and every referenced schema
+
+    Keys are the paths relative to this package (e.g., 'schema.json' and
+    'defs/pins.json'), which are also the '$id' of each schema. The top level
+    schema is always first.
+    """
+    import importlib.resources
+
+    root = importlib.resources.files("io_gen.schema")
+    sources = {SCHEMA_TOP: (root / SCHEMA_TOP).read_bytes()}
+    for ref in SCHEMA_REFS:
+        sources[f"defs/{ref}"] = (root / "defs" / ref).read_bytes()
+    return sources
+
+
+def schema_digest(sources: dict[str, bytes] | None = None) -> str:
+    """Return a SHA-256 digest over the packaged schema files
+
+    Identifies the exact version of the schema that anything derived from it (e.g.,
+    the generated validator) was built from.
+    """
+
+    if sources is None:
+        sources = read_schema_sources()
+    digest = hashlib.sha256()
+    for name, contents in sources.items():
+        digest.update(name.encode("ascii"))
+        digest.update(b"\0")
+        digest.update(contents)
+        digest.update(b"\0")
+    return digest.hexdigest()
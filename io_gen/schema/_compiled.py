@@ -0,0 +1,712 @@
+# Generated by io_gen.schema.compiler - do not edit
+# Regenerate with `python -m io_gen.schema.compiler` after editing the schema
+
+SCHEMA_DIGEST = "4801bacd019f65449ef0b35f6bb59250ba771574c1d1101838bc36ce1860fb49"
+
+_C0 = frozenset(['GND', 'VCCO'])
+_C1 = (1.5, 1.8, 2.5, 3.3)
+_C2 = frozenset(['in', 'inout', 'out'])
+_C3 = frozenset(['ibuf', 'ibufds', 'iobuf', 'iobufds', 'obuf', 'obufds'])
+_C4 = frozenset(['DIFF_HSTL_I', 'LVCMOS12', 'LVCMOS15', 'LVCMOS18', 'LVCMOS25', 'LVCMOS33', 'LVDS', 'LVDS_25', 'SSTL15', 'SSTL18', 'TMDS_33'])
+_C5 = frozenset(['n', 'p'])
+_C6 = frozenset(['n', 'p'])
+_C7 = frozenset(['hdl', 'xdc'])
+_C8 = frozenset(['buffer', 'bypass', 'comment', 'direction', 'generate', 'infer', 'instance', 'iostandard', 'name', 'pins', 'pinset', 'width'])
+
+
+def _is_number(x):
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+def _is_integer(x):
+    if isinstance(x, bool):
+        return False
+    return isinstance(x, int) or (isinstance(x, float) and x.is_integer())
+
+
+def _equal(one, two):
+    # Same notion of equality as jsonschema: booleans never equal numbers, and
+    # containers compare element-wise with the same rule
+    if isinstance(one, bool) or isinstance(two, bool):
+        return isinstance(one, bool) and isinstance(two, bool) and one == two
+    if isinstance(one, list) and isinstance(two, list):
+        return len(one) == len(two) and all(map(_equal, one, two))
+    if isinstance(one, dict) and isinstance(two, dict):
+        return one.keys() == two.keys() and all(_equal(one[k], two[k]) for k in one)
+    if isinstance(one, (list, dict)) or isinstance(two, (list, dict)):
+        return False
+    return one == two
+
+
+def _unique(items):
+    if all(isinstance(item, str) for item in items):
+        return len(set(items)) == len(items)
+    for index, item in enumerate(items):
+        for other in items[index + 1 :]:
+            if _equal(item, other):
+                return False
+    return True
+
+
+def _v1(x):
+    """schema.json#/properties/title"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v2(x):
+    """schema.json#/properties/part"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v5(x):
+    """defs/constraints.json#/properties/cfgbvs"""
+    if not (isinstance(x, str)):
+        return False
+    if not (isinstance(x, str) and x in _C0):
+        return False
+    return True
+
+
+def _v6(x):
+    """defs/constraints.json#/properties/config_voltage"""
+    if not (_is_number(x)):
+        return False
+    if not (any(_equal(x, v) for v in _C1)):
+        return False
+    return True
+
+
+def _v7(x):
+    """defs/constraints.json#/properties/additionalProperties"""
+    return False
+
+
+def _v4(x):
+    """defs/constraints.json#"""
+    if not (isinstance(x, dict)):
+        return False
+    if 'cfgbvs' not in x:
+        return False
+    if 'config_voltage' not in x:
+        return False
+    if 'cfgbvs' in x and not _v5(x['cfgbvs']):
+        return False
+    if 'config_voltage' in x and not _v6(x['config_voltage']):
+        return False
+    if 'additionalProperties' in x and not _v7(x['additionalProperties']):
+        return False
+    return True
+
+
+def _v3(x):
+    """schema.json#/properties/constraints"""
+    if not (_v4(x)):
+        return False
+    return True
+
+
+def _v8(x):
+    """schema.json#/properties/architecture"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v11(x):
+    """schema.json#/properties/signals/items/properties/name"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v13(x):
+    """defs/direction.json#"""
+    if not (isinstance(x, str)):
+        return False
+    if not (isinstance(x, str) and x in _C2):
+        return False
+    return True
+
+
+def _v12(x):
+    """schema.json#/properties/signals/items/properties/direction"""
+    if not (_v13(x)):
+        return False
+    return True
+
+
+def _v15(x):
+    """defs/buffer.json#"""
+    if not (isinstance(x, str)):
+        return False
+    if not (isinstance(x, str) and x in _C3):
+        return False
+    return True
+
+
+def _v14(x):
+    """schema.json#/properties/signals/items/properties/buffer"""
+    if not (_v15(x)):
+        return False
+    return True
+
+
+def _v17(x):
+    """defs/instance.json#"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v16(x):
+    """schema.json#/properties/signals/items/properties/instance"""
+    if not (_v17(x)):
+        return False
+    return True
+
+
+def _v19(x):
+    """defs/iostandard.json#"""
+    if not (isinstance(x, str)):
+        return False
+    if not (isinstance(x, str) and x in _C4):
+        return False
+    return True
+
+
+def _v18(x):
+    """schema.json#/properties/signals/items/properties/iostandard"""
+    if not (_v19(x)):
+        return False
+    return True
+
+
+def _v22(x):
+    """defs/pins.json#/oneOf/0"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v24(x):
+    """defs/pins.json#/oneOf/1/items"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v23(x):
+    """defs/pins.json#/oneOf/1"""
+    if not (isinstance(x, list)):
+        return False
+    if len(x) < 1:
+        return False
+    if not all(map(_v24, x)):
+        return False
+    if not _unique(x):
+        return False
+    return True
+
+
+def _v21(x):
+    """defs/pins.json#"""
+    if not (bool(_v22(x)) + bool(_v23(x)) == 1):
+        return False
+    return True
+
+
+def _v20(x):
+    """schema.json#/properties/signals/items/properties/pins"""
+    if not (_v21(x)):
+        return False
+    return True
+
+
+def _v28(x):
+    """defs/pinset.json#/oneOf/0/properties/p"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v29(x):
+    """defs/pinset.json#/oneOf/0/properties/n"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v27(x):
+    """defs/pinset.json#/oneOf/0"""
+    if isinstance(x, dict):
+        if 'p' not in x:
+            return False
+        if 'n' not in x:
+            return False
+        if 'p' in x and not _v28(x['p']):
+            return False
+        if 'n' in x and not _v29(x['n']):
+            return False
+        if not _C5.issuperset(x):
+            return False
+    return True
+
+
+def _v32(x):
+    """defs/pinset.json#/oneOf/1/properties/p/items"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v31(x):
+    """defs/pinset.json#/oneOf/1/properties/p"""
+    if not (isinstance(x, list)):
+        return False
+    if len(x) < 1:
+        return False
+    if not all(map(_v32, x)):
+        return False
+    if not _unique(x):
+        return False
+    return True
+
+
+def _v34(x):
+    """defs/pinset.json#/oneOf/1/properties/n/items"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v33(x):
+    """defs/pinset.json#/oneOf/1/properties/n"""
+    if not (isinstance(x, list)):
+        return False
+    if len(x) < 1:
+        return False
+    if not all(map(_v34, x)):
+        return False
+    if not _unique(x):
+        return False
+    return True
+
+
+def _v30(x):
+    """defs/pinset.json#/oneOf/1"""
+    if isinstance(x, dict):
+        if 'p' not in x:
+            return False
+        if 'n' not in x:
+            return False
+        if 'p' in x and not _v31(x['p']):
+            return False
+        if 'n' in x and not _v33(x['n']):
+            return False
+        if not _C6.issuperset(x):
+            return False
+    return True
+
+
+def _v26(x):
+    """defs/pinset.json#"""
+    if not (isinstance(x, dict)):
+        return False
+    if not (bool(_v27(x)) + bool(_v30(x)) == 1):
+        return False
+    return True
+
+
+def _v25(x):
+    """schema.json#/properties/signals/items/properties/pinset"""
+    if not (_v26(x)):
+        return False
+    return True
+
+
+def _v35(x):
+    """schema.json#/properties/signals/items/properties/width"""
+    if not (_is_integer(x)):
+        return False
+    if _is_number(x) and x < 1:
+        return False
+    return True
+
+
+def _v36(x):
+    """schema.json#/properties/signals/items/properties/generate"""
+    if not (isinstance(x, bool)):
+        return False
+    return True
+
+
+def _v37(x):
+    """schema.json#/properties/signals/items/properties/infer"""
+    if not (isinstance(x, bool)):
+        return False
+    return True
+
+
+def _v38(x):
+    """schema.json#/properties/signals/items/properties/bypass"""
+    if not (isinstance(x, bool)):
+        return False
+    return True
+
+
+def _v40(x):
+    """schema.json#/properties/signals/items/properties/comment/properties/xdc"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v41(x):
+    """schema.json#/properties/signals/items/properties/comment/properties/hdl"""
+    if not (isinstance(x, str)):
+        return False
+    return True
+
+
+def _v39(x):
+    """schema.json#/properties/signals/items/properties/comment"""
+    if not (isinstance(x, dict)):
+        return False
+    if 'xdc' in x and not _v40(x['xdc']):
+        return False
+    if 'hdl' in x and not _v41(x['hdl']):
+        return False
+    if not _C7.issuperset(x):
+        return False
+    return True
+
+
+def _v44(x):
+    """schema.json#/properties/signals/items/allOf/0/if/properties/generate"""
+    if not (_equal(x, False)):
+        return False
+    return True
+
+
+def _v43(x):
+    """schema.json#/properties/signals/items/allOf/0/if"""
+    if isinstance(x, dict):
+        if 'generate' not in x:
+            return False
+        if 'generate' in x and not _v44(x['generate']):
+            return False
+    return True
+
+
+def _v45(x):
+    """schema.json#/properties/signals/items/allOf/0/then"""
+    if isinstance(x, dict):
+        if 'name' not in x:
+            return False
+    return True
+
+
+def _v48(x):
+    """schema.json#/properties/signals/items/allOf/0/else/if/properties/bypass"""
+    if not (_equal(x, True)):
+        return False
+    return True
+
+
+def _v47(x):
+    """schema.json#/properties/signals/items/allOf/0/else/if"""
+    if isinstance(x, dict):
+        if 'bypass' not in x:
+            return False
+        if 'bypass' in x and not _v48(x['bypass']):
+            return False
+    return True
+
+
+def _v49(x):
+    """schema.json#/properties/signals/items/allOf/0/else/then"""
+    if isinstance(x, dict):
+        if 'name' not in x:
+            return False
+        if 'direction' not in x:
+            return False
+        if 'iostandard' not in x:
+            return False
+    return True
+
+
+def _v50(x):
+    """schema.json#/properties/signals/items/allOf/0/else/else"""
+    if isinstance(x, dict):
+        if 'name' not in x:
+            return False
+        if 'direction' not in x:
+            return False
+        if 'buffer' not in x:
+            return False
+        if 'iostandard' not in x:
+            return False
+    return True
+
+
+def _v46(x):
+    """schema.json#/properties/signals/items/allOf/0/else"""
+    if _v47(x):
+        if not (_v49(x)):
+            return False
+    else:
+        if not (_v50(x)):
+            return False
+    return True
+
+
+def _v42(x):
+    """schema.json#/properties/signals/items/allOf/0"""
+    if _v43(x):
+        if not (_v45(x)):
+            return False
+    else:
+        if not (_v46(x)):
+            return False
+    return True
+
+
+def _v53(x):
+    """schema.json#/properties/signals/items/allOf/1/not/properties/infer"""
+    if not (_equal(x, True)):
+        return False
+    return True
+
+
+def _v54(x):
+    """schema.json#/properties/signals/items/allOf/1/not/properties/bypass"""
+    if not (_equal(x, True)):
+        return False
+    return True
+
+
+def _v52(x):
+    """schema.json#/properties/signals/items/allOf/1/not"""
+    if isinstance(x, dict):
+        if 'infer' not in x:
+            return False
+        if 'bypass' not in x:
+            return False
+        if 'infer' in x and not _v53(x['infer']):
+            return False
+        if 'bypass' in x and not _v54(x['bypass']):
+            return False
+    return True
+
+
+def _v51(x):
+    """schema.json#/properties/signals/items/allOf/1"""
+    if _v52(x):
+        return False
+    return True
+
+
+def _v57(x):
+    """schema.json#/properties/signals/items/allOf/2/not/properties/bypass"""
+    if not (_equal(x, True)):
+        return False
+    return True
+
+
+def _v56(x):
+    """schema.json#/properties/signals/items/allOf/2/not"""
+    if isinstance(x, dict):
+        if 'buffer' not in x:
+            return False
+        if 'bypass' not in x:
+            return False
+        if 'bypass' in x and not _v57(x['bypass']):
+            return False
+    return True
+
+
+def _v55(x):
+    """schema.json#/properties/signals/items/allOf/2"""
+    if _v56(x):
+        return False
+    return True
+
+
+def _v60(x):
+    """schema.json#/properties/signals/items/allOf/3/if/properties/pins"""
+    if not (isinstance(x, list)):
+        return False
+    return True
+
+
+def _v59(x):
+    """schema.json#/properties/signals/items/allOf/3/if"""
+    if isinstance(x, dict):
+        if 'pins' not in x:
+            return False
+        if 'pins' in x and not _v60(x['pins']):
+            return False
+    return True
+
+
+def _v61(x):
+    """schema.json#/properties/signals/items/allOf/3/then"""
+    if isinstance(x, dict):
+        if 'width' not in x:
+            return False
+    return True
+
+
+def _v58(x):
+    """schema.json#/properties/signals/items/allOf/3"""
+    if _v59(x):
+        if not (_v61(x)):
+            return False
+    return True
+
+
+def _v65(x):
+    """schema.json#/properties/signals/items/allOf/4/if/properties/pinset/properties/p"""
+    if not (isinstance(x, list)):
+        return False
+    return True
+
+
+def _v64(x):
+    """schema.json#/properties/signals/items/allOf/4/if/properties/pinset"""
+    if not (isinstance(x, dict)):
+        return False
+    if 'p' not in x:
+        return False
+    if 'p' in x and not _v65(x['p']):
+        return False
+    return True
+
+
+def _v63(x):
+    """schema.json#/properties/signals/items/allOf/4/if"""
+    if isinstance(x, dict):
+        if 'pinset' not in x:
+            return False
+        if 'pinset' in x and not _v64(x['pinset']):
+            return False
+    return True
+
+
+def _v66(x):
+    """schema.json#/properties/signals/items/allOf/4/then"""
+    if isinstance(x, dict):
+        if 'width' not in x:
+            return False
+    return True
+
+
+def _v62(x):
+    """schema.json#/properties/signals/items/allOf/4"""
+    if _v63(x):
+        if not (_v66(x)):
+            return False
+    return True
+
+
+def _v67(x):
+    """schema.json#/properties/signals/items/oneOf/0"""
+    if isinstance(x, dict):
+        if 'pins' not in x:
+            return False
+    return True
+
+
+def _v68(x):
+    """schema.json#/properties/signals/items/oneOf/1"""
+    if isinstance(x, dict):
+        if 'pinset' not in x:
+            return False
+    return True
+
+
+def _v10(x):
+    """schema.json#/properties/signals/items"""
+    if not (isinstance(x, dict)):
+        return False
+    if 'name' in x and not _v11(x['name']):
+        return False
+    if 'direction' in x and not _v12(x['direction']):
+        return False
+    if 'buffer' in x and not _v14(x['buffer']):
+        return False
+    if 'instance' in x and not _v16(x['instance']):
+        return False
+    if 'iostandard' in x and not _v18(x['iostandard']):
+        return False
+    if 'pins' in x and not _v20(x['pins']):
+        return False
+    if 'pinset' in x and not _v25(x['pinset']):
+        return False
+    if 'width' in x and not _v35(x['width']):
+        return False
+    if 'generate' in x and not _v36(x['generate']):
+        return False
+    if 'infer' in x and not _v37(x['infer']):
+        return False
+    if 'bypass' in x and not _v38(x['bypass']):
+        return False
+    if 'comment' in x and not _v39(x['comment']):
+        return False
+    if not _C8.issuperset(x):
+        return False
+    if not (_v42(x)):
+        return False
+    if not (_v51(x)):
+        return False
+    if not (_v55(x)):
+        return False
+    if not (_v58(x)):
+        return False
+    if not (_v62(x)):
+        return False
+    if not (bool(_v67(x)) + bool(_v68(x)) == 1):
+        return False
+    return True
+
+
+def _v9(x):
+    """schema.json#/properties/signals"""
+    if not (isinstance(x, list)):
+        return False
+    if not all(map(_v10, x)):
+        return False
+    return True
+
+
+def _v0(x):
+    """schema.json#"""
+    if not (isinstance(x, dict)):
+        return False
+    if 'title' not in x:
+        return False
+    if 'part' not in x:
+        return False
+    if 'constraints' not in x:
+        return False
+    if 'signals' not in x:
+        return False
+    if 'title' in x and not _v1(x['title']):
+        return False
+    if 'part' in x and not _v2(x['part']):
+        return False
+    if 'constraints' in x and not _v3(x['constraints']):
+        return False
+    if 'architecture' in x and not _v8(x['architecture']):
+        return False
+    if 'signals' in x and not _v9(x['signals']):
+        return False
+    return True
+
+
+is_valid = _v0
+is_valid_signal = _v10
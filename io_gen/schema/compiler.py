@@ -0,0 +1,399 @@
+"""Compile the packaged JSON schema into a specialized Python validation module
+
+The jsonschema interpreter walks the keyword tree of schema.json for every instance
+it validates, which is slow for large signal lists. This module translates the schema
+(and everything it references in defs/) ahead of time into plain Python predicates,
+one function per subschema, and writes them to io_gen/schema/_compiled.py.
+
+Only the subset of Draft 2020-12 that the io-gen schema actually uses is supported.
+Anything else raises a SchemaCompileError, so extending the schema with a new keyword
+fails loudly at build time instead of silently validating less than jsonschema does.
+
+The generated predicates only answer whether an instance is valid. When they say it
+is not, io_gen.validate asks jsonschema to explain why, so error messages are always
+identical to the reference validator.
+
+Regenerate after editing any schema file with:
+
+    python -m io_gen.schema.compiler
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any
+from urllib.parse import urljoin
+
+from . import read_schema_sources, schema_digest
+
+# Generated module, relative to this package
+COMPILED_MODULE = "_compiled.py"
+
+# Named entry points in the generated module and the JSON pointer (relative to the
+# top level schema) of the subschema each one validates
+ENTRY_POINTS = {
+    "is_valid": "",
+    "is_valid_signal": "/properties/signals/items",
+}
+
+# Keywords that carry no validation semantics
+_ANNOTATIONS = {
+    "$schema",
+    "$id",
+    "$comment",
+    "title",
+    "description",
+    "default",
+    "examples",
+}
+
+# Python expression testing the type of 'x' for each JSON type, matching the
+# Draft 2020-12 type checker used by jsonschema (booleans are not numbers and
+# integral floats are integers)
+_TYPE_CHECKS = {
+    "object": "isinstance(x, dict)",
+    "array": "isinstance(x, list)",
+    "string": "isinstance(x, str)",
+    "boolean": "isinstance(x, bool)",
+    "null": "x is None",
+    "number": "_is_number(x)",
+    "integer": "_is_integer(x)",
+}
+
+# Emitted verbatim at the top of every generated module
+_PRELUDE = '''\
+def _is_number(x):
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+def _is_integer(x):
+    if isinstance(x, bool):
+        return False
+    return isinstance(x, int) or (isinstance(x, float) and x.is_integer())
+
+
+def _equal(one, two):
+    # Same notion of equality as jsonschema: booleans never equal numbers, and
+    # containers compare element-wise with the same rule
+    if isinstance(one, bool) or isinstance(two, bool):
+        return isinstance(one, bool) and isinstance(two, bool) and one == two
+    if isinstance(one, list) and isinstance(two, list):
+        return len(one) == len(two) and all(map(_equal, one, two))
+    if isinstance(one, dict) and isinstance(two, dict):
+        return one.keys() == two.keys() and all(_equal(one[k], two[k]) for k in one)
+    if isinstance(one, (list, dict)) or isinstance(two, (list, dict)):
+        return False
+    return one == two
+
+
+def _unique(items):
+    if all(isinstance(item, str) for item in items):
+        return len(set(items)) == len(items)
+    for index, item in enumerate(items):
+        for other in items[index + 1 :]:
+            if _equal(item, other):
+                return False
+    return True
+'''
+
+
+class SchemaCompileError(Exception):
+    """Raised when the schema uses something the compiler does not support."""
+
+
+class _Compiler:
+    """Translates one schema document (plus its references) into Python source"""
+
+    def __init__(self, resources: dict[str, Any]) -> None:
+        self.resources = resources
+        # Generated function names keyed by the id() of the subschema they validate,
+        # so that shared subschemas (e.g., a $ref target) are compiled only once
+        self.names: dict[int, str] = {}
+        self.functions: list[str] = []
+        self.constants: list[str] = []
+
+    def compile(self, schema: Any, base: str, pointer: str) -> str:
+        """Compile a subschema and return the name of the function validating it"""
+        if id(schema) in self.names:
+            return self.names[id(schema)]
+
+        name = f"_v{len(self.names)}"
+        self.names[id(schema)] = name
+
+        if schema is True:
+            body = ["return True"]
+        elif schema is False:
+            body = ["return False"]
+        elif isinstance(schema, dict):
+            body = self._compile_keywords(schema, base, pointer)
+        else:
+            raise SchemaCompileError(f"{pointer or '/'}: not a schema: {schema!r}")
+
+        lines = [f"def {name}(x):", f'    """{base}#{pointer}"""']
+        lines.extend(f"    {line}" if line else "" for line in body)
+        self.functions.append("\n".join(lines))
+        return name
+
+    def _constant(self, value: Any) -> str:
+        """Hoist a literal into a module level constant and return its name"""
+        name = f"_C{len(self.constants)}"
+        if isinstance(value, frozenset):
+            # Sorted so that the generated module is identical from run to run
+            literal = f"frozenset({sorted(value)!r})"
+        else:
+            literal = repr(value)
+        self.constants.append(f"{name} = {literal}")
+        return name
+
+    def _compile_keywords(self, schema: dict, base: str, pointer: str) -> list[str]:
+        base = schema.get("$id", base) if pointer else base
+        for keyword in schema:
+            if keyword in _ANNOTATIONS:
+                continue
+            if keyword not in _KEYWORDS:
+                raise SchemaCompileError(
+                    f"{base}#{pointer}: unsupported keyword '{keyword}'"
+                )
+
+        body: list[str] = []
+
+        # Type first, since it lets us skip the isinstance() guards further down
+        types = schema.get("type")
+        if isinstance(types, str):
+            types = [types]
+        if types is not None:
+            checks = " or ".join(_TYPE_CHECKS[t] for t in types)
+            body.append(f"if not ({checks}):")
+            body.append("    return False")
+
+        if "$ref" in schema:
+            target, target_base = self._resolve(schema["$ref"], base, pointer)
+            func = self.compile(target, target_base, "")
+            body.extend(self._fail_unless(f"{func}(x)"))
+
+        if "enum" in schema:
+            values = schema["enum"]
+            if all(isinstance(v, str) for v in values):
+                const = self._constant(frozenset(values))
+                test = f"isinstance(x, str) and x in {const}"
+            else:
+                const = self._constant(tuple(values))
+                test = f"any(_equal(x, v) for v in {const})"
+            body.extend(self._fail_unless(test))
+
+        if "const" in schema:
+            body.extend(self._fail_unless(f"_equal(x, {schema['const']!r})"))
+
+        if "minimum" in schema:
+            body.append(f"if _is_number(x) and x < {schema['minimum']!r}:")
+            body.append("    return False")
+
+        object_body = self._compile_object(schema, base, pointer)
+        if object_body:
+            body.extend(self._guard("object", types, object_body))
+
+        array_body = self._compile_array(schema, base, pointer)
+        if array_body:
+            body.extend(self._guard("array", types, array_body))
+
+        for index, subschema in enumerate(schema.get("allOf", [])):
+            func = self.compile(subschema, base, f"{pointer}/allOf/{index}")
+            body.extend(self._fail_unless(f"{func}(x)"))
+
+        if "anyOf" in schema:
+            funcs = [
+                self.compile(subschema, base, f"{pointer}/anyOf/{index}")
+                for index, subschema in enumerate(schema["anyOf"])
+            ]
+            body.extend(self._fail_unless(" or ".join(f"{f}(x)" for f in funcs)))
+
+        if "oneOf" in schema:
+            funcs = [
+                self.compile(subschema, base, f"{pointer}/oneOf/{index}")
+                for index, subschema in enumerate(schema["oneOf"])
+            ]
+            matches = " + ".join(f"bool({f}(x))" for f in funcs)
+            body.extend(self._fail_unless(f"{matches} == 1"))
+
+        if "not" in schema:
+            func = self.compile(schema["not"], base, f"{pointer}/not")
+            body.append(f"if {func}(x):")
+            body.append("    return False")
+
+        if "if" in schema:
+            test = self.compile(schema["if"], base, f"{pointer}/if")
+            then = (
+                self.compile(schema["then"], base, f"{pointer}/then")
+                if "then" in schema
+                else None
+            )
+            other = (
+                self.compile(schema["else"], base, f"{pointer}/else")
+                if "else" in schema
+                else None
+            )
+            body.append(f"if {test}(x):")
+            body.extend(f"    {line}" for line in self._fail_unless(f"{then}(x)", then))
+            if other:
+                body.append("else:")
+                body.extend(f"    {line}" for line in self._fail_unless(f"{other}(x)"))
+
+        body.append("return True")
+        return body
+
+    def _compile_object(self, schema: dict, base: str, pointer: str) -> list[str]:
+        body: list[str] = []
+        properties = schema.get("properties", {})
+
+        for key in schema.get("required", []):
+            body.append(f"if {key!r} not in x:")
+            body.append("    return False")
+
+        for key, subschema in properties.items():
+            func = self.compile(subschema, base, f"{pointer}/properties/{key}")
+            body.append(f"if {key!r} in x and not {func}(x[{key!r}]):")
+            body.append("    return False")
+
+        if "additionalProperties" in schema:
+            known = self._constant(frozenset(properties))
+            extra = schema["additionalProperties"]
+            if extra is False:
+                body.append(f"if not {known}.issuperset(x):")
+                body.append("    return False")
+            else:
+                func = self.compile(extra, base, f"{pointer}/additionalProperties")
+                body.append("for key in x:")
+                body.append(f"    if key not in {known} and not {func}(x[key]):")
+                body.append("        return False")
+
+        return body
+
+    def _compile_array(self, schema: dict, base: str, pointer: str) -> list[str]:
+        body: list[str] = []
+
+        if "minItems" in schema:
+            body.append(f"if len(x) < {schema['minItems']!r}:")
+            body.append("    return False")
+
+        if "items" in schema:
+            func = self.compile(schema["items"], base, f"{pointer}/items")
+            body.append(f"if not all(map({func}, x)):")
+            body.append("    return False")
+
+        if schema.get("uniqueItems", False):
+            body.append("if not _unique(x):")
+            body.append("    return False")
+
+        return body
+
+    @staticmethod
+    def _guard(json_type: str, types: list[str] | None, body: list[str]) -> list[str]:
+        """Wrap keywords that only apply to one JSON type in an isinstance() check"""
+        if types == [json_type]:
+            return body
+        guarded = [f"if {_TYPE_CHECKS[json_type]}:"]
+        guarded.extend(f"    {line}" for line in body)
+        return guarded
+
+    @staticmethod
+    def _fail_unless(test: str, enabled: Any = True) -> list[str]:
+        if not enabled:
+            return ["pass"]
+        return [f"if not ({test}):", "    return False"]
+
+    def _resolve(self, ref: str, base: str, pointer: str) -> tuple[Any, str]:
+        """Resolve a $ref against the base URI of the schema that contains it"""
+        uri = urljoin(base, ref)
+        if "#" in uri:
+            raise SchemaCompileError(
+                f"{base}#{pointer}: only whole-document references are supported"
+            )
+        if uri not in self.resources:
+            raise SchemaCompileError(f"{base}#{pointer}: unresolvable $ref '{ref}'")
+        return self.resources[uri], uri
+
+
+# Every keyword the compiler knows how to translate (annotations aside)
+_KEYWORDS = {
+    "type",
+    "$ref",
+    "enum",
+    "const",
+    "minimum",
+    "properties",
+    "required",
+    "additionalProperties",
+    "items",
+    "minItems",
+    "uniqueItems",
+    "allOf",
+    "anyOf",
+    "oneOf",
+    "not",
+    "if",
+    "then",
+    "else",
+}
+
+
+def _lookup(schema: Any, pointer: str) -> Any:
+    """Follow a JSON pointer into a schema"""
+    for token in pointer.split("/")[1:]:
+        schema = schema[token.replace("~1", "/").replace("~0", "~")]
+    return schema
+
+
+def compile_schema(sources: dict[str, bytes]) -> str:
+    """Translate the schema sources into the Python source of a validation module
+
+    Parameters
+    ----------
+    sources:
+        Raw schema files keyed by their '$id', top level schema first (as returned
+        by read_schema_sources()).
+    """
+    resources = {name: json.loads(contents) for name, contents in sources.items()}
+    top = next(iter(resources))
+
+    compiler = _Compiler(resources)
+    entry_points = {
+        name: compiler.compile(_lookup(resources[top], pointer), top, pointer)
+        for name, pointer in ENTRY_POINTS.items()
+    }
+
+    lines = [
+        "# Generated by io_gen.schema.compiler - do not edit",
+        "# Regenerate with `python -m io_gen.schema.compiler` after editing the schema",
+        "",
+        f'SCHEMA_DIGEST = "{schema_digest(sources)}"',
+        "",
+        *compiler.constants,
+        "",
+        "",
+        _PRELUDE,
+    ]
+    for function in compiler.functions:
+        lines.append("")
+        lines.append(function)
+        lines.append("")
+    lines.append("")
+    for name, func in entry_points.items():
+        lines.append(f"{name} = {func}")
+
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    """Regenerate io_gen/schema/_compiled.py from the packaged schema"""
+    output = Path(__file__).with_name(COMPILED_MODULE)
+    try:
+        source = compile_schema(read_schema_sources())
+    except SchemaCompileError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    output.write_text(source, encoding="utf-8")
+    print(f"Info: Wrote compiled schema validator to {output}")
+
+
+if __name__ == "__main__":
+    main()
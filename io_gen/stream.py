@@ -0,0 +1,199 @@
+from collections.abc import Iterator
+from typing import Any, BinaryIO, Protocol
+
+from yaml.composer import ComposerError
+from yaml.events import (
+    AliasEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+
+from .checks import check_non_ascii_bytes
+from .validate import yaml_loader
+
+# The tag the resolver gives a plain string scalar
+_STR_TAG = "tag:yaml.org,2002:str"
+
+
+class ByteReader(Protocol):
+    """Anything SignalStream can parse from: a binary file, or an AsciiReader"""
+
+    def read(self, size: int = -1, /) -> bytes: ...
+
+
+class AsciiReader:
+    """Wraps a binary file, rejecting non-ASCII bytes as they are read
+
+    The streaming equivalent of check_non_ascii_bytes(): each chunk the YAML parser
+    reads is tested on its own, with a running count of the lines before it so that
+    the message gives the same line as checking the whole file would.
+    """
+
+    def __init__(self, f: BinaryIO) -> None:
+        self._file = f
+        self._lines = 0
+        # PyYAML uses this in the location of parse errors
+        self.name = getattr(f, "name", "<file>")
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._file.read(size)
+        check_non_ascii_bytes(chunk, first_line=self._lines + 1)
+        self._lines += chunk.count(b"\n")
+        return chunk
+
+
+class SignalStream:
+    """The signals of a YAML document, parsed one at a time
+
+    Iterating composes and constructs each entry of the top level `signals`
+    sequence only once the parser reaches it, from PyYAML's event API, so only one
+    signal is held in memory at a time. Everything else in the document is built as
+    yaml.load() would, and is available in `doc` (without the signals) once
+    iteration is over.
+
+    Only a plain `signals` sequence in a top level mapping is streamed. Anything
+    else - a document that isn't a mapping, a missing or non-sequence `signals`, or
+    one carrying an anchor - is loaded whole into `doc`, and `streamed` stays
+    False.
+
+    Signals are built from the same loader (libyaml's when available) and the same
+    resolver and constructor as yaml.load(), so they are equal to what it returns.
+    Raises yaml.YAMLError on malformed YAML.
+    """
+
+    def __init__(self, f: ByteReader) -> None:
+        self._loader = yaml_loader()(f)
+        self._anchors: dict[str, Any] = {}
+        self.doc: Any = None
+        self.streamed = False
+
+    def __iter__(self) -> Iterator[Any]:
+        loader = self._loader
+        try:
+            # Drop the STREAM-START event
+            loader.get_event()
+            if loader.check_event(StreamEndEvent):
+                return
+            document_start = loader.get_event()
+            if loader.check_event(MappingStartEvent):
+                yield from self._stream_mapping()
+            else:
+                self.doc = loader.construct_document(self._compose())
+            # Drop the DOCUMENT-END event
+            loader.get_event()
+            self._check_single_document(document_start)
+        finally:
+            loader.dispose()
+
+    def _stream_mapping(self) -> Iterator[Any]:
+        """Stream the signals out of the top level mapping and build the rest"""
+        loader = self._loader
+        start = loader.get_event()
+        # The signals are left out of the node, everything else goes in as composed
+        top = self._collection_node(MappingNode, start)
+        signals_mark = None
+        while not loader.check_event(MappingEndEvent):
+            key = self._compose()
+            is_signals = (
+                isinstance(key, ScalarNode)
+                and key.tag == _STR_TAG
+                and key.value == "signals"
+            )
+            if not is_signals or not loader.check_event(SequenceStartEvent):
+                top.value.append((key, self._compose()))
+                continue
+            sequence_start = loader.peek_event()
+            if sequence_start.anchor is not None:
+                # The list can be referred to again, so it has to be kept
+                top.value.append((key, self._compose()))
+                continue
+            if signals_mark is not None:
+                raise ComposerError(
+                    "while streaming the signals",
+                    signals_mark,
+                    "found another 'signals' key",
+                    key.start_mark,
+                )
+            signals_mark = key.start_mark
+            self.streamed = True
+            loader.get_event()
+            while not loader.check_event(SequenceEndEvent):
+                yield loader.construct_document(self._compose())
+            loader.get_event()
+        top.end_mark = loader.get_event().end_mark
+        self.doc = loader.construct_document(top)
+
+    def _check_single_document(self, document_start: Any) -> None:
+        """Raise the same error as yaml.load() if there is a second document"""
+        loader = self._loader
+        if not loader.check_event(StreamEndEvent):
+            event = loader.get_event()
+            raise ComposerError(
+                "expected a single document in the stream",
+                document_start.start_mark,
+                "but found another document",
+                event.start_mark,
+            )
+
+    def _collection_node(self, node_class: type, event: Any) -> Any:
+        """Start a sequence or mapping node, registering its anchor"""
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = self._loader.resolve(node_class, None, event.implicit)
+        node = node_class(tag, [], event.start_mark, None, flow_style=event.flow_style)
+        self._register(event, node)
+        return node
+
+    def _register(self, event: Any, node: Any) -> None:
+        anchor = event.anchor
+        if anchor is None:
+            return
+        if anchor in self._anchors:
+            raise ComposerError(
+                f"found duplicate anchor {anchor!r}; first occurrence",
+                self._anchors[anchor].start_mark,
+                "second occurrence",
+                event.start_mark,
+            )
+        self._anchors[anchor] = node
+
+    def _compose(self) -> Any:
+        """Compose the next node from the event stream (what yaml's Composer does)"""
+        loader = self._loader
+        event = loader.get_event()
+        if isinstance(event, AliasEvent):
+            if event.anchor not in self._anchors:
+                raise ComposerError(
+                    None,
+                    None,
+                    f"found undefined alias {event.anchor!r}",
+                    event.start_mark,
+                )
+            return self._anchors[event.anchor]
+
+        if isinstance(event, ScalarEvent):
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = loader.resolve(ScalarNode, event.value, event.implicit)
+            node = ScalarNode(
+                tag, event.value, event.start_mark, event.end_mark, style=event.style
+            )
+            self._register(event, node)
+            return node
+
+        if isinstance(event, SequenceStartEvent):
+            node = self._collection_node(SequenceNode, event)
+            while not loader.check_event(SequenceEndEvent):
+                node.value.append(self._compose())
+        else:
+            node = self._collection_node(MappingNode, event)
+            while not loader.check_event(MappingEndEvent):
+                key = self._compose()
+                node.value.append((key, self._compose()))
+        node.end_mark = loader.get_event().end_mark
+        return node
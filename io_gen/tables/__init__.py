@@ -1,10 +1,29 @@
 # Reexport these so that others can import them with `from tables import SignalTable`
 from .meta_table import MetaTable, build_meta_table
 from .constraints_table import ConstraintsTable, build_constraints_table
+from .enums import Buffer, Direction, IOStandard, code_table
 from .signal_table import (
+    TRISTATE_BUFFERS,
+    Comment,
+    Pinset,
+    SignalChange,
+    SignalDiff,
+    SignalRow,
     SignalTable,
     build_signal_table,
+    default_instance,
+    diff_signals,
     signal_is_scalar,
     signal_is_differential,
 )
-from .pin_table import PinTable, build_pin_table, pin_is_differential
+from .pin_table import (
+    FlattenedPins,
+    PinColumns,
+    PinIndex,
+    PinLocation,
+    PinRow,
+    PinTable,
+    buffer_instances,
+    build_pin_table,
+    pin_is_differential,
+)
@@ -0,0 +1,115 @@
+from collections.abc import Mapping
+from enum import StrEnum
+from typing import Any
+
+# The members of each enum are the values of the matching schema enum (defs/*.json),
+# in the same order, and tests/test_enums.py fails if the two ever drift apart. What
+# the schema can't say about a member is kept in the tables below, keyed by schema
+# value. A member is equal to, hashes like and formats as its schema string, so rows
+# built with them still compare equal to dicts of plain strings. The integer code of
+# a member is its position in the schema enum, which lets per-member tables be
+# tuples.
+
+# The keyword each output declares a port of a direction with: Verilog, then VHDL
+_DIRECTION_KEYWORDS = {
+    "in": ("input", "in"),
+    "out": ("output", "out"),
+    "inout": ("inout", "inout"),
+}
+
+# Per buffer primitive: the direction it drives, whether it takes `pins` or a
+# `pinset`, and whether it can be inferred instead of instantiated
+_BUFFER_ATTRIBUTES = {
+    "ibuf": ("in", "pins", True),
+    "obuf": ("out", "pins", True),
+    "ibufds": ("in", "pinset", False),
+    "obufds": ("out", "pinset", False),
+    "iobuf": ("inout", "pins", False),
+    "iobufds": ("inout", "pinset", False),
+}
+
+
+class Direction(StrEnum):
+    """The direction of a signal or port (defs/direction.json)
+
+    Carries the keyword each output declares a port of this direction with.
+    """
+
+    code: int
+    verilog: str
+    vhdl: str
+    xdc: str
+
+    def __new__(cls, value: str) -> "Direction":
+        member = str.__new__(cls, value)
+        member._value_ = value
+        member.verilog, member.vhdl = _DIRECTION_KEYWORDS[value]
+        member.xdc = value.upper()
+        return member
+
+    IN = "in"
+    OUT = "out"
+    INOUT = "inout"
+
+
+class Buffer(StrEnum):
+    """An IO buffer primitive (defs/buffer.json)
+
+    Carries what the semantic checks and generators need to know about the
+    primitive: the direction it drives, whether it takes `pins` or a `pinset`,
+    whether it can be inferred instead of instantiated, and whether it is
+    tristate (and so has `_i`, `_o` and `_t` nets).
+    """
+
+    code: int
+    direction: Direction
+    strategy: str
+    inferable: bool
+    tristate: bool
+
+    def __new__(cls, value: str) -> "Buffer":
+        member = str.__new__(cls, value)
+        member._value_ = value
+        direction, member.strategy, member.inferable = _BUFFER_ATTRIBUTES[value]
+        member.direction = Direction(direction)
+        member.tristate = member.direction is Direction.INOUT
+        return member
+
+    IBUF = "ibuf"
+    OBUF = "obuf"
+    IBUFDS = "ibufds"
+    OBUFDS = "obufds"
+    IOBUF = "iobuf"
+    IOBUFDS = "iobufds"
+
+
+class IOStandard(StrEnum):
+    """An IO standard (defs/iostandard.json)"""
+
+    code: int
+
+    LVCMOS12 = "LVCMOS12"
+    LVCMOS15 = "LVCMOS15"
+    LVCMOS18 = "LVCMOS18"
+    LVCMOS25 = "LVCMOS25"
+    LVCMOS33 = "LVCMOS33"
+    LVDS = "LVDS"
+    LVDS_25 = "LVDS_25"
+    SSTL15 = "SSTL15"
+    SSTL18 = "SSTL18"
+    TMDS_33 = "TMDS_33"
+    DIFF_HSTL_I = "DIFF_HSTL_I"
+
+
+for _enum in (Direction, Buffer, IOStandard):
+    for _code, _member in enumerate(_enum):
+        _member.code = _code
+
+
+def code_table(enum: type[StrEnum], values: Mapping[StrEnum, Any]) -> tuple[Any, ...]:
+    """Returns values as a tuple indexed by member code, None where a member is missing
+
+    Used for dispatch tables, so that looking up a member is indexing a tuple rather
+    than hashing a string.
+    """
+    return tuple(values.get(member) for member in enum)
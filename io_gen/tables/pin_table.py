@@ -1,100 +1,449 @@
-from .signal_table import SignalTable, signal_is_scalar
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
 from typing import Any
 
+from .enums import Buffer, Direction, IOStandard
+from .row import Row
+from .signal_table import (
+    Pins,
+    Pinset,
+    SignalChange,
+    SignalRow,
+    SignalTable,
+    freeze_pinset,
+    signal_is_scalar,
+)
+
+# Pin ids are indexes into a PinNames pool, stored as unsigned 32-bit integers
+_PIN_ID = "I"
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class PinRow(Row):
+    """One package pin (or differential pair) of a signal
+
+    Exactly one of pin and pinset is set. instance is None for inferred and bypassed
+    signals.
+    """
+
+    iostandard: IOStandard
+    direction: Direction
+    buffer: Buffer | None
+    infer: bool
+    instance: str | None
+    is_bus: bool
+    index: int
+    pin: str | None = None
+    pinset: Pinset | None = None
+
+    _optional = ("pin", "pinset")
+
+    @classmethod
+    def from_mapping(cls, row: Mapping[str, Any]) -> "PinRow":
+        """Returns row as a PinRow, if it is a pin row in dict form"""
+        if isinstance(row, cls):
+            return row
+        fields = dict(row)
+        fields["iostandard"] = IOStandard(fields["iostandard"])
+        fields["direction"] = Direction(fields["direction"])
+        if fields["buffer"] is not None:
+            fields["buffer"] = Buffer(fields["buffer"])
+        if "pinset" in fields:
+            fields["pinset"] = freeze_pinset(fields["pinset"])
+        return cls(**fields)
+
+
+class PinNames:
+    """Pool of package pin names, each stored once and referred to by an integer id"""
+
+    __slots__ = ("names", "ids")
 
-class PinTable:
     def __init__(self) -> None:
-        self.table: dict[str, list[dict[str, Any]]] = {}
+        self.names: list[str] = []
+        self.ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        """Returns the id of name, adding it to the pool if it is new"""
+        pin_id = self.ids.get(name)
+        if pin_id is None:
+            pin_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return pin_id
+
+
+class PinColumns:
+    """The pins (or differential pairs) of one signal, stored column-wise
+
+    What every pin of a signal shares is stored once. Per pin, only the id of the
+    package pin (the p leg for differential signals) is kept, in a compact array,
+    along with the id of the n leg for differential signals; the index of a pin is
+    its position in the arrays. Indexing and iterating produce PinRow views, which
+    are built on demand and not retained.
+    """
+
+    __slots__ = (
+        "iostandard",
+        "direction",
+        "buffer",
+        "infer",
+        "stem",
+        "is_bus",
+        "pins",
+        "n_pins",
+        "_names",
+    )
+
+    def __init__(self, sig: SignalRow, names: PinNames) -> None:
+        self.iostandard = sig.iostandard
+        self.direction = sig.direction
+        self.buffer = sig.buffer
+        self.infer = sig.infer
+        self.stem = _instance_stem(sig)
+        self.is_bus = not signal_is_scalar(sig)
+        self._names = names
+
+        # Operate on arrays of pin names (instead of scalars vs buses)
+        if sig.pinset is None:
+            self.pins = array(_PIN_ID, map(names.intern, _listify(sig.pins)))
+            self.n_pins = None
+        else:
+            pairs = list(zip(_listify(sig.pinset.p), _listify(sig.pinset.n)))
+            self.pins = array(_PIN_ID, (names.intern(p) for p, _ in pairs))
+            self.n_pins = array(_PIN_ID, (names.intern(n) for _, n in pairs))
 
-    def add(self, sig: dict[str, Any]) -> None:
-        sig_name = sig["name"]
-        self.table[sig_name] = _flatten_signal(sig)
+    @property
+    def is_differential(self) -> bool:
+        return self.n_pins is not None
 
     def __len__(self) -> int:
-        return len(self.table)
+        return len(self.pins)
 
-    def __getitem__(self, sig_name: str) -> list[dict[str, Any]]:
-        if sig_name in self.table:
-            return self.table[sig_name]
+    def __getitem__(self, index: int) -> PinRow:
+        if index < 0:
+            index += len(self.pins)
+        if not 0 <= index < len(self.pins):
+            raise IndexError("pin index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[PinRow]:
+        return map(self._row, range(len(self.pins)))
+
+    def __eq__(self, other: object) -> bool:
+        # Equal when the rows are, whatever pool the pin ids refer to
+        if isinstance(other, (PinColumns, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def _row(self, index: int) -> PinRow:
+        names = self._names.names
+        # The only thing different between pins and pinsets
+        pin = pinset = None
+        if self.n_pins is None:
+            pin = names[self.pins[index]]
         else:
-            raise KeyError(f"'{sig_name}' not found in pin table")
+            pinset = Pinset(names[self.pins[index]], names[self.n_pins[index]])
+        return PinRow(
+            iostandard=self.iostandard,
+            direction=self.direction,
+            buffer=self.buffer,
+            infer=self.infer,
+            instance=None if self.stem is None else f"{self.stem}_i{index}",
+            is_bus=self.is_bus,
+            index=index,
+            pin=pin,
+            pinset=pinset,
+        )
 
 
-def _flatten_signal(sig: dict[str, Any]) -> list[dict[str, Any]]:
-    """Flattens a signal table row into a list of pin or pinset rows."""
+@dataclass(slots=True, frozen=True)
+class PinLocation:
+    """Where a package pin is used: the signal, the bit of the signal, and the leg
 
-    # Operate on scalars and arrays (instead of pins vs pinsets)
-    if signal_is_scalar(sig):
-        return flatten_scalar(sig)
-    else:
-        return flatten_array(sig)
+    leg is "p" or "n" for differential signals and None for single-ended ones.
+    """
 
+    signal: str
+    index: int
+    leg: str | None = None
 
-def flatten_scalar(sig: dict[str, Any]) -> list[dict[str, Any]]:
-    """Flattens a scalar single-ended or differential signal"""
 
-    row: dict[str, Any] = {}
-    row["iostandard"] = sig["iostandard"]
-    row["direction"] = sig["direction"]
-    row["buffer"] = sig["buffer"]
-    row["infer"] = sig["infer"]
+class PinIndex:
+    """Reverse lookups from package pins, IO standards and directions
 
-    # When we're not inferring or bypassing the buffer , we use the provided name
-    # and the index to set the name of the component or module to be instantiated
-    if not sig["infer"] and not sig["bypass"]:
-        row["instance"] = f"{sig['instance']}_i0"
-    # Otherwise its just None
-    else:
-        row["instance"] = None
-    # Intrinsic to the signal
-    row["is_bus"] = False
-    row["index"] = 0
-    # The only thing different between pins and pinsets
-    if "pins" in sig:
-        row["pin"] = sig["pins"]
-    else:
-        row["pinset"] = {"p": sig["pinset"]["p"], "n": sig["pinset"]["n"]}
+    Package pins are listed in table order: by signal, then by bit, with the p leg
+    of a pair ahead of its n leg. Signals add()ed after the index is built (e.g.,
+    when a SignalDiff is applied) are listed after the others.
+    """
+
+    __slots__ = ("locations", "by_iostandard", "by_direction")
+
+    def __init__(self, signals: Iterable[SignalRow]) -> None:
+        self.locations: dict[str, PinLocation] = {}
+        self.by_iostandard: dict[str, list[str]] = {}
+        self.by_direction: dict[str, list[str]] = {}
+        for sig in signals:
+            self.add(sig)
+
+    def add(self, sig: SignalRow) -> None:
+        """Add the pins of a signal to the index"""
+        iostandard = self.by_iostandard.setdefault(sig.iostandard, [])
+        direction = self.by_direction.setdefault(sig.direction, [])
+        for pin, location in _locations(sig):
+            # Pins are unique in a validated design, the first one wins otherwise
+            self.locations.setdefault(pin, location)
+            iostandard.append(pin)
+            direction.append(pin)
+
+    def remove(self, sig: SignalRow) -> None:
+        """Remove the pins of a signal that was added to the index"""
+        pins = set()
+        for pin, _ in _locations(sig):
+            pins.add(pin)
+            location = self.locations.get(pin)
+            if location is not None and location.signal == sig.name:
+                del self.locations[pin]
+        for lists, key in (
+            (self.by_iostandard, sig.iostandard),
+            (self.by_direction, sig.direction),
+        ):
+            remaining = [pin for pin in lists.get(key, ()) if pin not in pins]
+            if remaining:
+                lists[key] = remaining
+            else:
+                lists.pop(key, None)
+
+
+class FlattenedPins(Mapping[str, PinColumns]):
+    """Read-only view of the pins of each signal of a PinTable, by signal name
+
+    Looking a signal up flattens it like PinTable.columns() does, so the view
+    reads like the dict of flattened signals the table used to keep.
+    """
+
+    __slots__ = ("_pin_table",)
+
+    def __init__(self, pin_table: "PinTable") -> None:
+        self._pin_table = pin_table
+
+    def __getitem__(self, sig_name: str) -> PinColumns:
+        return self._pin_table.columns(sig_name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._pin_table.signals)
+
+    def __len__(self) -> int:
+        return len(self._pin_table.signals)
+
+    def __contains__(self, sig_name: object) -> bool:
+        return sig_name in self._pin_table.signals
+
+
+class PinTable:
+    """The pins of each signal, by signal name
+
+    Signals are flattened into their pin rows the first time they are looked up
+    rather than when they are added, and the result is kept, so signals whose pins
+    are never needed (e.g., inferred buffers in the IO ring) cost nothing. The
+    reverse lookups (locate() and pins_with_*()) share one PinIndex, built from the
+    signal rows on the first query.
+
+    After a SignalDiff is applied to the signal table the pin table was built from,
+    update() brings it up to date, only dropping the flattened pins of the signals
+    that changed and updating the index (if it has been built) in place. The names
+    of the pins they no longer use stay in the pool until they outnumber the names
+    of every pin of the table, when the pool is compacted, so it never holds more
+    than twice as many names as the signals have pins.
+    """
+
+    def __init__(self) -> None:
+        self.names = PinNames()
+        self.signals: dict[str, SignalRow] = {}
+        self._flattened: dict[str, PinColumns] = {}
+        self._index: PinIndex | None = None
+        # Number of package pin names (p and n legs) across all signals
+        self._name_count = 0
+
+    def add(self, sig: Mapping[str, Any]) -> None:
+        # Rows in dict form are still accepted
+        sig = SignalRow.from_mapping(sig)
+        old = self.signals.get(sig.name)
+        if old is not None:
+            self._name_count -= _name_count(old)
+        self._name_count += _name_count(sig)
+        self.signals[sig.name] = sig
+        self._flattened.pop(sig.name, None)
+        self._index = None
+        self._compact_names()
+
+    def update(
+        self, signal_table: SignalTable, changes: Iterable[SignalChange]
+    ) -> None:
+        """Apply changes, as logged by signal_table, to the pin table"""
+        reorder = False
+        for change in changes:
+            if change.kind == "moved":
+                reorder = True
+                continue
+            old = self.signals.get(change.name)
+            self._flattened.pop(change.name, None)
+            if old is not None:
+                self._name_count -= _name_count(old)
+                if self._index is not None:
+                    self._index.remove(old)
+            if change.kind == "removed":
+                self.signals.pop(change.name, None)
+                continue
+            # Modified signals keep their place in the table
+            new = signal_table[change.name]
+            reorder = reorder or old is None
+            self.signals[change.name] = new
+            self._name_count += _name_count(new)
+            if self._index is not None:
+                self._index.add(new)
+        if reorder:
+            # Back into the order of the signal table
+            self.signals = {sig.name: self.signals[sig.name] for sig in signal_table}
+        self._compact_names()
+
+    def _compact_names(self) -> None:
+        """Drop the names of pins no signal uses from the pool, if they outnumber
+        the names of every pin of the table
+
+        The ids of the flattened signals are renumbered in place, so PinColumns
+        already handed out stay valid.
+        """
+        if len(self.names) <= 2 * self._name_count:
+            return
+        old = self.names.names
+        names = PinNames()
+        for columns in self._flattened.values():
+            columns.pins = array(_PIN_ID, (names.intern(old[i]) for i in columns.pins))
+            if columns.n_pins is not None:
+                columns.n_pins = array(
+                    _PIN_ID, (names.intern(old[i]) for i in columns.n_pins)
+                )
+            columns._names = names
+        self.names = names
+
+    def __len__(self) -> int:
+        return len(self.signals)
+
+    def __contains__(self, sig_name: object) -> bool:
+        return sig_name in self.signals
+
+    def __getitem__(self, sig_name: str) -> list[PinRow]:
+        return list(self.columns(sig_name))
+
+    @property
+    def table(self) -> "FlattenedPins":
+        """The pins of each signal by name, as a mapping that flattens on lookup"""
+        return FlattenedPins(self)
+
+    def flattened(self) -> list[str]:
+        """Returns the names of the signals flattened so far, in the order they were"""
+        return list(self._flattened)
+
+    def columns(self, sig_name: str) -> PinColumns:
+        """Returns the pins of a signal, flattening it if it hasn't been already"""
+        columns = self._flattened.get(sig_name)
+        if columns is None:
+            if sig_name not in self.signals:
+                raise KeyError(f"'{sig_name}' not found in pin table")
+            columns = PinColumns(self.signals[sig_name], self.names)
+            self._flattened[sig_name] = columns
+        return columns
+
+    def pin_count(self) -> int:
+        """Returns the number of pins (or differential pairs) across all signals"""
+        return sum(_pin_count(sig) for sig in self.signals.values())
+
+    @property
+    def index(self) -> PinIndex:
+        if self._index is None:
+            self._index = PinIndex(self.signals.values())
+        return self._index
+
+    def locate(self, pin: str) -> PinLocation:
+        """Returns the signal, bit and leg that use a package pin
+
+        Raises KeyError if no signal uses the pin.
+        """
+        location = self.index.locations.get(pin)
+        if location is None:
+            raise KeyError(f"package pin '{pin}' not found in pin table")
+        return location
+
+    def pins_with_iostandard(self, iostandard: str) -> list[str]:
+        """Returns the package pins of every signal with the given IO standard"""
+        return list(self.index.by_iostandard.get(iostandard, []))
+
+    def pins_with_direction(self, direction: str) -> list[str]:
+        """Returns the package pins of every signal with the given direction"""
+        return list(self.index.by_direction.get(direction, []))
+
+
+def _listify(pins: Pins | None) -> Sequence[str]:
     # Scalars need to be list-ified because the PinTable associates signal names with lists of pins
-    return [row]
-
-
-def flatten_array(sig: dict[str, Any]) -> list[dict[str, Any]]:
-    """Flattens single-ended or differential array signal"""
-
-    if "pins" in sig:
-        items = sig["pins"]
-    else:
-        p_pins = sig["pinset"]["p"]
-        n_pins = sig["pinset"]["n"]
-        items = zip(p_pins, n_pins)
-
-    flat_sig = []
-    for index, item in enumerate(items):
-        row: dict[str, Any] = {}
-        row["iostandard"] = sig["iostandard"]
-        row["direction"] = sig["direction"]
-        row["buffer"] = sig["buffer"]
-        row["infer"] = sig["infer"]
-
-        # When we're not inferring or bypassing the buffer , we use the provided name
-        # and the index to set the name of the component or module to be instantiated
-        if not sig["infer"] and not sig["bypass"]:
-            row["instance"] = f"{sig['instance']}_i{index}"
-        # Otherwise its just None
-        else:
-            row["instance"] = None
-        # Intrinsic to the signal
-        row["is_bus"] = True
-        row["index"] = index
+    if pins is None:
+        return ()
+    return [pins] if isinstance(pins, str) else pins
 
-        if "pins" in sig:
-            row["pin"] = item
-        else:
-            p_pin, n_pin = item
-            row["pinset"] = {"p": p_pin, "n": n_pin}
-        flat_sig.append(row)
 
-    return flat_sig
+def _pin_count(sig: SignalRow) -> int:
+    if sig.pinset is None:
+        return len(_listify(sig.pins))
+    return min(len(_listify(sig.pinset.p)), len(_listify(sig.pinset.n)))
+
+
+def _name_count(sig: SignalRow) -> int:
+    """Returns the number of package pin names sig uses, counting both legs of pairs"""
+    return _pin_count(sig) * (1 if sig.pins is not None else 2)
+
+
+def _locations(sig: SignalRow) -> Iterator[tuple[str, PinLocation]]:
+    """Yields each package pin of sig with its location, without flattening sig"""
+    if sig.pinset is None:
+        for index, pin in enumerate(_listify(sig.pins)):
+            yield pin, PinLocation(sig.name, index)
+        return
+    pairs = zip(_listify(sig.pinset.p), _listify(sig.pinset.n))
+    for index, (p_pin, n_pin) in enumerate(pairs):
+        yield p_pin, PinLocation(sig.name, index, "p")
+        yield n_pin, PinLocation(sig.name, index, "n")
+
+
+def _instance_stem(sig: SignalRow) -> str | None:
+    # When we're not inferring or bypassing the buffer, we use the provided name
+    # and the index to set the name of the component or module to be instantiated.
+    # Otherwise its just None
+    return sig.instance if not sig.infer and not sig.bypass else None
+
+
+def buffer_instances(sig: SignalRow, bus_loops: bool = False) -> list[str]:
+    """Returns the names of the buffer cells of sig, one per bit, without flattening it
+
+    These are the `instance` fields of its pin rows, in order, and there are none
+    for inferred and bypassed signals. With bus_loops, the buffers of a bus are
+    instantiated in a generate loop labelled `<instance>_i` that names the buffer
+    of every bit `<instance>`, so bit N is the cell `<instance>_i[N].<instance>`.
+    """
+    stem = _instance_stem(sig)
+    if stem is None:
+        return []
+    if bus_loops and not signal_is_scalar(sig):
+        return [f"{stem}_i[{index}].{stem}" for index in range(_pin_count(sig))]
+    return [f"{stem}_i{index}" for index in range(_pin_count(sig))]
+
+
+def _flatten_signal(sig: Mapping[str, Any]) -> list[PinRow]:
+    """Flattens a signal table row into a list of pin or pinset rows."""
+    return list(PinColumns(SignalRow.from_mapping(sig), PinNames()))
 
 
 def build_pin_table(signal_table: SignalTable) -> PinTable:
@@ -104,6 +453,8 @@ def build_pin_table(signal_table: SignalTable) -> PinTable:
     return pin_table
 
 
-def pin_is_differential(pin: dict[str, Any]) -> bool:
+def pin_is_differential(pin: Mapping[str, Any]) -> bool:
     """Returns true if pin is differential others false"""
+    if isinstance(pin, PinRow):
+        return pin.pinset is not None
     return "pinset" in pin
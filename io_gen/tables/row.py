@@ -0,0 +1,38 @@
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+
+class Row(Mapping):
+    """Read-only dict-style access to the fields of a slotted table row
+
+    Table rows used to be plain dicts. Subclasses are slotted dataclasses, which
+    need a fraction of the memory and are read with attribute access, but rows still
+    support `row["field"]`, `get()`, `in`, `keys()`, and comparison with a dict so
+    that code written against the dicts keeps working while it moves over.
+
+    Fields named in `_optional` that are None read as missing, the same way the key
+    used to be left out of the dict (e.g., a pin row has either `pin` or `pinset`).
+    """
+
+    __slots__ = ()
+    _optional: tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None and key in self._optional:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.__slots__:
+            if key not in self._optional or getattr(self, key) is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the row as the dict it used to be"""
+        return {key: getattr(self, key) for key in self}
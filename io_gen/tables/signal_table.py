@@ -1,72 +1,374 @@
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
 from typing import Any
-from collections.abc import Iterator
-from copy import deepcopy
 
 from ..exceptions import ValidationError
+from .enums import Buffer, Direction, IOStandard
+from .row import Row
+
+
+# Set of tristate buffers that will require '_i', '_o', and '_t' in the signal
+# block and IO ring instances (rows carry this as `sig.buffer.tristate`)
+TRISTATE_BUFFERS = frozenset(buffer for buffer in Buffer if buffer.tristate)
+
+# A package pin name, or the names of the pins of a bus in order
+Pins = str | tuple[str, ...]
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class Pinset(Row):
+    """The p and n legs of a differential pair (or of each pair of a bus)
+
+    Read as `pinset.p` or `pinset["p"]`, and equal to the `{"p": ..., "n": ...}`
+    dict it is built from.
+    """
+
+    p: Pins
+    n: Pins
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class Comment(Row):
+    """The comments of a signal for the XDC and HDL outputs, either of them optional
+
+    Read as `comment.xdc` or `comment.get("xdc")`, and equal to the
+    `{"xdc": ..., "hdl": ...}` dict it is built from.
+    """
+
+    xdc: str | None = None
+    hdl: str | None = None
+
+    _optional = ("xdc", "hdl")
+
+
+# Signals without comments all share this one
+NO_COMMENT = Comment()
+
+
+def freeze_comment(comment: Mapping[str, str]) -> Comment:
+    """Returns comment as a Comment"""
+    if isinstance(comment, Comment):
+        return comment
+    return Comment(**comment) if comment else NO_COMMENT
+
+
+def freeze_pins(pins: str | Sequence[str]) -> Pins:
+    """Returns pins with a bus as a tuple, so that it can be shared without copying"""
+    return pins if isinstance(pins, (str, tuple)) else tuple(pins)
+
+
+def freeze_pinset(pinset: Mapping[str, Any]) -> Pinset:
+    """Returns pinset as a Pinset, with buses as tuples"""
+    if isinstance(pinset, Pinset):
+        return pinset
+    return Pinset(freeze_pins(pinset["p"]), freeze_pins(pinset["n"]))
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class SignalRow(Row):
+    """A signal to generate, with every field resolved
+
+    Exactly one of pins and pinset is set. buffer and instance are None for bypassed
+    signals. Rows are frozen and buses are tuples, so rows and their pins can be
+    shared (e.g., with the pin table or a cache) without defensive copies. The IO
+    standard, direction and buffer are enum members, which are equal to the strings
+    of the schema but carry what the generators need to know about them.
+    """
+
+    name: str
+    width: int
+    iostandard: IOStandard
+    direction: Direction
+    infer: bool
+    bypass: bool
+    comment: Comment
+    buffer: Buffer | None
+    instance: str | None
+    pins: Pins | None = None
+    pinset: Pinset | None = None
+
+    _optional = ("pins", "pinset")
+
+    @classmethod
+    def from_mapping(cls, row: Mapping[str, Any]) -> "SignalRow":
+        """Returns row as a SignalRow, if it is a resolved row in dict form"""
+        if isinstance(row, cls):
+            return row
+        fields = dict(row)
+        fields["iostandard"] = IOStandard(fields["iostandard"])
+        fields["direction"] = Direction(fields["direction"])
+        if fields["buffer"] is not None:
+            fields["buffer"] = Buffer(fields["buffer"])
+        fields["comment"] = freeze_comment(fields["comment"])
+        if "pins" in fields:
+            fields["pins"] = freeze_pins(fields["pins"])
+        if "pinset" in fields:
+            fields["pinset"] = freeze_pinset(fields["pinset"])
+        return cls(**fields)
+
+
+def default_instance(buffer: str, name: str) -> str:
+    """The instance name of the buffers of a signal that isn't given one"""
+    return f"{buffer}_{name}"
+
+
+def _resolve(sig: dict[str, Any]) -> SignalRow | None:
+    """Returns the table row of a validated signal, or None if it isn't generated"""
+
+    # The schema gives this as a default, but can't enforce it
+    if not sig.get("generate", True):
+        return None
+
+    # The philosophy here is that we are building up our row entry, not just
+    # reassigning what came out of the YAML. Start with the common stuff. Buses
+    # become tuples and comments a Comment, so the row doesn't share anything
+    # mutable with the document
+    if "pins" in sig:
+        width = 1 if isinstance(sig["pins"], str) else sig["width"]
+        pins = freeze_pins(sig["pins"])
+        pinset = None
+    else:
+        width = 1 if isinstance(sig["pinset"]["p"], str) else sig["width"]
+        pins = None
+        pinset = freeze_pinset(sig["pinset"])
+
+    # These have default values in the schema but that doesn't guarantee they exist so we normalize here
+    bypass = sig.get("bypass", False)
+
+    # Get the buffer name if we're not bypasing (save for later, to name the
+    # instance), and construct the instance name that everything in the IO ring
+    # will use later
+    if bypass:
+        buffer = None
+        instance = None
+    else:
+        buffer = Buffer(sig["buffer"])
+        instance = sig.get("instance", default_instance(buffer, sig["name"]))
+
+    return SignalRow(
+        name=sig["name"],
+        width=width,
+        # These are required for everybody, and are looked up once here
+        iostandard=IOStandard(sig["iostandard"]),
+        direction=Direction(sig["direction"]),
+        infer=sig.get("infer", False),
+        bypass=bypass,
+        comment=freeze_comment(sig.get("comment", {})),
+        buffer=buffer,
+        instance=instance,
+        pins=pins,
+        pinset=pinset,
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class SignalChange:
+    """One entry of the change log of a SignalTable
+
+    kind is "added", "removed", "modified" or "moved" (the signal is unchanged, but
+    in a different place relative to the others), and name the signal it applies to.
+    """
+
+    kind: str
+    name: str
+
+
+@dataclass
+class SignalDiff:
+    """The signals added, removed and modified between two versions of a document
+
+    added and modified hold signals as they are in the YAML, a modified signal
+    replacing the one of the same name, and removed holds names. order, if given, is
+    the name of every signal to generate in the new document, in order, so that the
+    table ends up in the same order as one built from the new document.
+    """
+
+    added: list[dict[str, Any]] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    modified: list[dict[str, Any]] = field(default_factory=list)
+    order: list[str] | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
 
 
 class SignalTable:
+    """The signals to generate, in document order
+
+    The partitions generators iterate (active(), bypassed(), tristate(),
+    differential() and inferred()) are computed together in a single pass the first
+    time one is asked for, and kept as tuples until a row is added.
+
+    A table can be brought up to date with an edited document by apply()ing the
+    SignalDiff between the two, which only rebuilds the rows of the signals that
+    changed. Each change is recorded in `changes` until take_changes() is called,
+    so that anything derived from the table (e.g., the pin table, or generated
+    output) knows which signals to redo.
+    """
+
     def __init__(self) -> None:
-        self.table: list[dict[str, Any]] = []
+        self.table: list[SignalRow] = []
+        self.changes: list[SignalChange] = []
+        self._partitions: dict[str, tuple[SignalRow, ...]] | None = None
+        # The position of each row by signal name, built on first use
+        self._positions: dict[str, int] | None = None
 
-    def __iter__(self) -> Iterator[dict[str, Any]]:
+    def __iter__(self) -> Iterator[SignalRow]:
         return iter(self.table)
 
     def __len__(self) -> int:
         return len(self.table)
 
+    def __contains__(self, sig_name: object) -> bool:
+        return sig_name in self._position_index()
+
+    def __getitem__(self, sig_name: str) -> SignalRow:
+        position = self._position_index().get(sig_name)
+        if position is None:
+            raise KeyError(f"'{sig_name}' not found in signal table")
+        return self.table[position]
+
+    def _position_index(self) -> dict[str, int]:
+        if self._positions is None:
+            self._positions = {sig.name: i for i, sig in enumerate(self.table)}
+        return self._positions
+
     def add(self, sig: dict[str, Any]) -> None:
         """Add a signal to the signal table, resolving fields as needed"""
+        row = _resolve(sig)
+        if row is not None:
+            self.add_row(row)
 
-        # The schema gives this as a default, but can't enforce it
-        if not sig.get("generate", True):
-            return
-
-        # Row entries are mixed value dicts
-        row: dict[str, Any] = {}
-        # The philosophy here is that we are building up our row entry, not just
-        # reassigning what came out of the YAML. Start with the common stuff
-        row["name"] = sig["name"]
-        if "pins" in sig:
-            row["width"] = 1 if isinstance(sig["pins"], str) else sig["width"]
-            row["pins"] = (
-                sig["pins"] if isinstance(sig["pins"], str) else deepcopy(sig["pins"])
+    def add_row(self, row: SignalRow) -> None:
+        """Add a signal that is already resolved (e.g., read back from an IR file)"""
+        # Any partitions computed so far are missing this row
+        self._partitions = None
+        if self._positions is not None:
+            self._positions[row.name] = len(self.table)
+        self.table.append(row)
+
+    def apply(self, diff: SignalDiff) -> list[SignalChange]:
+        """Apply the changes in diff to the table, and return them as logged
+
+        Only the rows of the signals in diff are rebuilt. A signal modified to
+        generate: false is removed, and one added with it is left out, as add()
+        does. The diff is checked against the table before anything changes:
+        removing or modifying a signal that isn't in the table raises KeyError, and
+        adding one that already is raises ValidationError. Otherwise the diff is
+        trusted to be between two validated documents (see diff_signals()).
+        """
+        positions = self._position_index()
+        for name in [*diff.removed, *(sig["name"] for sig in diff.modified)]:
+            if name not in positions:
+                raise KeyError(f"'{name}' not found in signal table")
+        added_names: set[str] = set()
+        for sig in diff.added:
+            if sig["name"] in positions or sig["name"] in added_names:
+                raise ValidationError(f"signal '{sig['name']}': duplicate names")
+            added_names.add(sig["name"])
+
+        removed = dict.fromkeys(diff.removed)
+        modified = []
+        for sig in diff.modified:
+            row = _resolve(sig)
+            if row is None:
+                removed[sig["name"]] = None
+            else:
+                modified.append(row)
+        added = [row for row in map(_resolve, diff.added) if row is not None]
+        if diff.order is not None:
+            names = {*positions, *(row.name for row in added)}.difference(removed)
+            if len(diff.order) != len(names) or names != set(diff.order):
+                raise ValueError("diff order doesn't list every signal in the table")
+
+        changes = []
+        for row in modified:
+            # Modified rows keep their place, and so their position
+            self.table[positions[row.name]] = row
+            changes.append(SignalChange("modified", row.name))
+        if removed:
+            self.table = [sig for sig in self.table if sig.name not in removed]
+            self._positions = None
+            changes.extend(SignalChange("removed", name) for name in removed)
+        for row in added:
+            self.add_row(row)
+            changes.append(SignalChange("added", row.name))
+
+        # New signals go wherever they are in the document, not at the end
+        if diff.order is not None and [sig.name for sig in self.table] != diff.order:
+            kept = [sig.name for sig in self.table if sig.name not in added_names]
+            placed = [name for name in diff.order if name not in added_names]
+            changes.extend(
+                SignalChange("moved", name)
+                for name, before in zip(placed, kept)
+                if name != before
             )
-        else:
-            row["width"] = 1 if isinstance(sig["pinset"]["p"], str) else sig["width"]
-            row["pinset"] = deepcopy(sig["pinset"])
-
-        # These are required for everybody
-        row["iostandard"] = sig["iostandard"]
-        row["direction"] = sig["direction"]
-
-        # These have default values in the schema but that doesn't guarantee they exist so we normalize here
-        row["infer"] = sig.get("infer", False)
-        row["bypass"] = sig.get("bypass", False)
-        row["comment"] = sig.get("comment", {})
-
-        # Get the buffer name if we're not bypasing (save for later, to name the instance)
-        if row["bypass"]:
-            row["buffer"] = None
-        else:
-            row["buffer"] = sig["buffer"]
-
-        # Construct the instance name that everything in the IO ring will use later, if we're not bypassing
-        if row["bypass"]:
-            row["instance"] = None
-        else:
-            row["instance"] = sig.get("instance", f"{row['buffer']}_{row['name']}")
+            rows = {sig.name: sig for sig in self.table}
+            self.table = [rows[name] for name in diff.order]
+            self._positions = None
 
-        self.table.append(row)
+        self._partitions = None
+        self.changes.extend(changes)
+        return changes
+
+    def take_changes(self) -> list[SignalChange]:
+        """Returns the changes logged since the last call, and clears the log"""
+        changes, self.changes = self.changes, []
+        return changes
 
-    def active(self) -> list[dict[str, Any]]:
+    def _partition(self, name: str) -> tuple[SignalRow, ...]:
+        if self._partitions is None:
+            active, bypassed, tristate, differential, inferred = [], [], [], [], []
+            for sig in self.table:
+                if sig.bypass or sig.buffer is None:
+                    bypassed.append(sig)
+                else:
+                    active.append(sig)
+                    if sig.buffer.tristate:
+                        tristate.append(sig)
+                    if sig.infer:
+                        inferred.append(sig)
+                if sig.pinset is not None:
+                    differential.append(sig)
+            self._partitions = {
+                "active": tuple(active),
+                "bypassed": tuple(bypassed),
+                "tristate": tuple(tristate),
+                "differential": tuple(differential),
+                "inferred": tuple(inferred),
+            }
+        return self._partitions[name]
+
+    def active(self) -> tuple[SignalRow, ...]:
         """Returns the signal table with only active signals (i.e., bypass == False)"""
-        return [sig for sig in self.table if not sig["bypass"]]
+        return self._partition("active")
+
+    def bypassed(self) -> tuple[SignalRow, ...]:
+        """Returns the signals with bypass == True, which have no IO ring ports"""
+        return self._partition("bypassed")
 
+    def tristate(self) -> tuple[SignalRow, ...]:
+        """Returns the active signals with a tristate buffer (iobuf or iobufds)"""
+        return self._partition("tristate")
 
-def signal_is_scalar(sig: dict[str, Any]) -> bool:
+    def differential(self) -> tuple[SignalRow, ...]:
+        """Returns the signals with a pinset, bypassed or not"""
+        return self._partition("differential")
+
+    def inferred(self) -> tuple[SignalRow, ...]:
+        """Returns the active signals whose buffers are inferred (infer == True)"""
+        return self._partition("inferred")
+
+
+def signal_is_scalar(sig: Mapping[str, Any]) -> bool:
     """Returns True if signal is a scalar, otherwise False"""
 
+    if isinstance(sig, SignalRow):
+        # Table rows are validated already
+        if sig.pinset is not None:
+            return isinstance(sig.pinset.p, str)
+        return isinstance(sig.pins, str)
+
     # Depending on when this is called, the signal might not be validated yet
     if "pinset" in sig:
         if not isinstance(sig["pinset"]["p"], type(sig["pinset"]["n"])):
@@ -83,11 +385,38 @@ def signal_is_scalar(sig: dict[str, Any]) -> bool:
     return result
 
 
-def signal_is_differential(sig: dict[str, Any]) -> bool:
+def signal_is_differential(sig: Mapping[str, Any]) -> bool:
     """Returns True if signal is a differential pair, others False"""
+    if isinstance(sig, SignalRow):
+        return sig.pinset is not None
     return "pinset" in sig
 
 
+def diff_signals(
+    old: Iterable[dict[str, Any]], new: Iterable[dict[str, Any]]
+) -> SignalDiff:
+    """Returns the SignalDiff that takes a table built from old to one built from new
+
+    old and new are the signal lists of two validated documents. Signals are matched
+    by name, and those with generate: false count as absent.
+    """
+    before = {sig["name"]: sig for sig in old if sig.get("generate", True)}
+    order: list[str] = []
+    diff = SignalDiff(order=order)
+    for sig in new:
+        if not sig.get("generate", True):
+            continue
+        order.append(sig["name"])
+        previous = before.pop(sig["name"], None)
+        if previous is None:
+            diff.added.append(sig)
+        elif previous != sig:
+            diff.modified.append(sig)
+    # Whatever wasn't matched is gone
+    diff.removed = list(before)
+    return diff
+
+
 def build_signal_table(doc: dict) -> SignalTable:
     """Add signal information from validated input data and build the SignalTable"""
 
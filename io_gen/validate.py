@@ -1,54 +1,56 @@
-import importlib.resources
 import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
 from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
 
-import jsonschema
-import yaml
-
-from referencing import Registry, Resource
-from referencing.jsonschema import DRAFT202012
-
+from .schema import SCHEMA_REFS, SCHEMA_TOP, schema_digest
 from .tables.meta_table import MetaTable
-from .tables.signal_table import SignalTable
+from .tables.signal_table import SignalTable, build_signal_table
 from .exceptions import ValidationError
-from .identifiers import is_valid_verilog_identifier, is_valid_vhdl_identifier
-from .checks import (
-    check_pin_name_format,
-    check_unique_signal_names,
-    check_unique_pins,
-    check_pinset_array_mismatch,
-    check_pins_array_width_match,
-    check_pinset_array_width_match,
-    check_buffer_direction,
-    check_buffer_strategy_match,
-    check_buffer_infer_bypass_mismatch,
-    check_buffer_inferable,
-    check_minimum_ports_generated,
-    check_non_ascii,
+from .identifiers import (
+    VHDL_KEYWORDS,
+    is_valid_verilog_identifier,
+    is_valid_vhdl_identifier,
 )
+from .checks import RuleEngine, check_non_ascii_bytes
+
+# PyYAML, jsonschema and referencing (and, to a lesser extent, the standard library
+# modules only needed to load the schema) take far longer to import than the rest of
+# the package, so they are imported where they are used. This keeps `io-gen --help`
+# fast, and valid documents never need jsonschema at all (see _validate_structural).
+if TYPE_CHECKING:
+    import jsonschema
+    from referencing import Registry, Resource
+
+    from .stream import SignalStream
+
+
+def yaml_loader() -> type:
+    """Return the fastest safe loader PyYAML provides
 
-# Top level JSON schema file for validating input YAML stored in schema/
-SCHEMA_TOP = "schema.json"
-# Referenced JSON files stored in schema/defs
-SCHEMA_REFS = [
-    "constraints.json",
-    "direction.json",
-    "buffer.json",
-    "pinset.json",
-    "iostandard.json",
-    "instance.json",
-    "pins.json",
-]
-
-
-def _build_resource(schema_path: Path) -> Resource:
+    The libyaml based loader is several times faster than the pure Python one and
+    builds the same documents, but is only there when PyYAML was built against
+    libyaml.
+    """
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _build_resource(schema_path: Path) -> "Resource":
     """Create a Resource object from a resolved path to a JSON file"""
+
+    from referencing import Resource
+    from referencing.jsonschema import DRAFT202012
+
     with open(schema_path, "r", encoding="utf-8") as f:
         contents = json.load(f)
     return Resource(contents=contents, specification=DRAFT202012)
 
 
-def _build_registry() -> Registry:
+def _build_registry() -> "Registry":
     """Create a Registry object containing all JSON schema resources
 
     Resolving references in the top level JSON schema requires pairing each discrete JSON object (including the top
@@ -56,6 +58,10 @@ def _build_registry() -> Registry:
     Resource objects is then associated together as a referencing.Registry object.  That Registry object is then passed
     to the jsonschema validator object.
     """
+    import importlib.resources
+
+    from referencing import Registry
+
     # Empty registry
     registry = Registry()
     # Add each file indicated by $ref in the top-level schema to the registry as a resource
@@ -73,8 +79,29 @@ def _build_registry() -> Registry:
     return registry
 
 
-def _validate_structural(doc: dict) -> None:
-    """Validate parsed YAML against the schema"""
+def _schema_signature() -> tuple[tuple[str, int, int], ...]:
+    """Cheap fingerprint of the packaged schema files
+
+    Uses the size and modification time of the top level schema and every referenced
+    file, so a cached validator is rebuilt if anybody edits the schema in place (e.g.,
+    an editable install) without having to re-read and hash the JSON on every call.
+    """
+    import importlib.resources
+
+    signature = []
+    root = importlib.resources.files("io_gen.schema")
+    for name in [SCHEMA_TOP, *(f"defs/{ref}" for ref in SCHEMA_REFS)]:
+        with importlib.resources.as_file(root / name) as schema_path:
+            stat = schema_path.stat()
+            signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _build_validator() -> "jsonschema.Draft202012Validator":
+    """Load the packaged schema and construct a fresh validator for it"""
+    import importlib.resources
+
+    import jsonschema
 
     # Load the schema from wherever it was
     with importlib.resources.as_file(
@@ -86,85 +113,421 @@ def _validate_structural(doc: dict) -> None:
     # Create a registry containing the referenced JSON files in io_gen/schema/defs
     registry = _build_registry()
 
-    validator = jsonschema.Draft202012Validator(schema, registry=registry)
+    return jsonschema.Draft202012Validator(schema, registry=registry)
+
+
+# The validator is built at most once per process and per version of the packaged
+# schema. Maps the schema signature to the validator built from it.
+_VALIDATOR_CACHE: dict[tuple, "jsonschema.Draft202012Validator"] = {}
+
+
+def get_validator() -> "jsonschema.Draft202012Validator":
+    """Return the process-wide validator for the packaged schema
+
+    Reading the schema, building the registry, and constructing the validator is a
+    fixed cost that dominates validation of small and medium sized inputs, so batch
+    callers and long running processes share a single validator. It is rebuilt only
+    if the packaged schema files change on disk.
+    """
+    signature = _schema_signature()
+    validator = _VALIDATOR_CACHE.get(signature)
+    if validator is None:
+        # Only one version of the schema is ever worth keeping around
+        _VALIDATOR_CACHE.clear()
+        validator = _build_validator()
+        _VALIDATOR_CACHE[signature] = validator
+    return validator
+
+
+def clear_validator_cache() -> None:
+    """Discard the cached validators so that the next use rebuilds them"""
+    _VALIDATOR_CACHE.clear()
+    _COMPILED_CACHE.clear()
+
+
+# Same idea for the generated validator - whether or not it is current only changes
+# when the packaged schema does. Maps the schema signature to the module (or None if
+# it is missing or was generated from a different schema).
+_COMPILED_CACHE: dict[tuple, ModuleType | None] = {}
+
+
+def get_compiled_validator() -> ModuleType | None:
+    """Return the generated validation module, if it matches the packaged schema
+
+    The module is produced ahead of time by io_gen.schema.compiler. If it is missing
+    or was generated from a different version of the schema (i.e., someone edited the
+    schema without regenerating it) this returns None and callers fall back to the
+    jsonschema validator.
+    """
+    signature = _schema_signature()
+    if signature not in _COMPILED_CACHE:
+        _COMPILED_CACHE.clear()
+        try:
+            from .schema import _compiled
+        except ImportError:
+            compiled = None
+        else:
+            compiled = _compiled if _compiled.SCHEMA_DIGEST == schema_digest() else None
+        _COMPILED_CACHE[signature] = compiled
+    return _COMPILED_CACHE[signature]
+
+
+def _validate_structural(doc: dict, reference: bool = False, jobs: int = 1) -> None:
+    """Validate parsed YAML against the schema
+
+    By default the document is checked with the validator generated ahead of time
+    from the schema, which is much faster than interpreting the schema. That only
+    answers whether the document is valid, so when it isn't (or when reference is
+    True, or the generated validator is unavailable) the jsonschema validator runs
+    and its error is the one reported. Both paths produce identical messages.
+
+    With jobs > 1, a long enough signal list is checked in chunks on that many worker
+    processes, again reporting the same error as checking it here.
+    """
+    if not reference:
+        compiled = get_compiled_validator()
+        if compiled is not None and compiled.is_valid(doc):
+            return
+
+    import jsonschema
+
+    from .parallel import can_split, top_schema
+
+    validator = get_validator()
+    if can_split(doc, top_schema(validator), jobs):
+        from .parallel import iter_split_errors
+
+        errors = iter_split_errors(doc, validator, jobs, reference, first_only=True)
+        try:
+            error = next(errors, None)
+        finally:
+            errors.close()
+        if error is not None:
+            raise ValidationError(_describe_schema_error(doc, *error))
+        return
+
     # This returns None if successful and raises an exception if not
     try:
         validator.validate(doc)
     except jsonschema.ValidationError as e:
-        # This exception gives almost no information as to what the offending
-        # portion of the JSON is, so we're going to extract it and craft a better
-        # message, since users will undoubtedly have to debug their YAML and without
-        # knowing the offending signal, they'll be lost.
-
-        # The exception itself has a ton of information in it so grab part of it and convert
-        # the deque to a list (set a breakpoint() here if needed to examine this thing in the
-        # future)
-        path = list(e.absolute_path)
-
-        # If the reason for the exception was a signal (and in this JSON it almost
-        # certainly is, since the signals is where all the stuff is at
-        if path and path[0] == "signals" and len(path) >= 2:
-            # Now we can get the index of the offender
-            idx = path[1]
-            signals = doc["signals"]
-            # Now extract the name of the signal entry that is causing the problem
-            # (if there is no name yet, return the index of the offender in the signals list)
-            offender = signals[idx].get("name", f"signals[{idx}]")
-            raise ValidationError(f"{offender}: {e.message}")
-
-        # If it wasn't a signal that caused the validator to fail, just raise
-        raise ValidationError(e.message)
+        raise ValidationError(_describe_schema_error(doc, e.absolute_path, e.message))
+
+
+def _describe_schema_error(doc: Any, path: Iterable, message: str) -> str:
+    """Build the message reported for a schema violation at path in doc"""
+
+    # The exception jsonschema raises gives almost no information as to what the
+    # offending portion of the JSON is, so we're going to extract it and craft a
+    # better message, since users will undoubtedly have to debug their YAML and
+    # without knowing the offending signal, they'll be lost.
+
+    # The exception itself has a ton of information in it, the path is the part we
+    # need (set a breakpoint() here if needed to examine this thing in the future)
+    path = list(path)
+
+    # If the reason for the exception was a signal (and in this JSON it almost
+    # certainly is, since the signals is where all the stuff is at
+    if path and path[0] == "signals" and len(path) >= 2:
+        # Now we can get the index of the offender
+        idx = path[1]
+        return _describe_signal_error(doc["signals"][idx], idx, message)
+
+    # If it wasn't a signal that caused the validator to fail, just use its message
+    return message
+
+
+def _describe_signal_error(sig: Any, idx: int, message: str) -> str:
+    """Build the message reported for a schema violation in signals[idx]"""
+    # Extract the name of the signal entry that is causing the problem (if there is
+    # no name yet, use the index of the offender in the signals list)
+    offender = f"signals[{idx}]"
+    if isinstance(sig, dict):
+        offender = sig.get("name", offender)
+    return f"{offender}: {message}"
 
 
 def _validate_semantic(doc: dict) -> None:
     """Validate parsed YAML for domain consistency"""
 
-    # Explicitly assuming that structural validation was successful
-    signals = doc["signals"]
+    # Explicitly assuming that structural validation was successful. Every semantic
+    # rule runs in the same traversal of the signals
+    RuleEngine().run(doc["signals"])
 
-    check_pin_name_format(signals)
-    check_unique_signal_names(signals)
-    check_unique_pins(signals)
-    check_minimum_ports_generated(signals)
 
-    # Now validate each signal individually
-    for sig in signals:
-        check_pinset_array_mismatch(sig)
-        check_pins_array_width_match(sig)
-        check_pinset_array_width_match(sig)
-        check_buffer_direction(sig)
-        check_buffer_strategy_match(sig)
-        check_buffer_infer_bypass_mismatch(sig)
-        check_buffer_inferable(sig)
+def iter_diagnostics(doc: Any, jobs: int = 1) -> Iterator[str]:
+    """Yield a message for every structural and semantic problem in a parsed document
 
+    Unlike validate(), this doesn't stop at the first problem. Schema violations come
+    first, each annotated with the offending signal like the errors validate()
+    raises, followed by the semantic problems. The semantic checks only look at the
+    signals that are structurally valid, since nothing else can be safely
+    interpreted.
 
-def validate(yaml_file: Path) -> dict:
-    """Validate a YAML file for structural and semantical accuracy"""
+    Problems are found as they are yielded, so a caller that stops after a few of
+    them neither pays for finding the rest nor holds them in memory. With jobs > 1,
+    the schema violations of a long enough signal list are found on that many
+    worker processes, a chunk of signals at a time.
+    """
+    # Indices of the signals with schema violations
+    broken: set[int] = set()
+
+    compiled = get_compiled_validator()
+    if compiled is None or not compiled.is_valid(doc):
+        from jsonschema.exceptions import best_match
+
+        from .parallel import can_split, iter_split_errors, top_schema
+
+        validator = get_validator()
+        if can_split(doc, top_schema(validator), jobs):
+            errors = iter_split_errors(doc, validator, jobs, narrow=True)
+        else:
+            # Narrow each error down to its most relevant cause
+            errors = (
+                (error.absolute_path, error.message)
+                for error in map(best_match, ([e] for e in validator.iter_errors(doc)))
+            )
+        for path, message in errors:
+            if len(path) >= 2 and path[0] == "signals":
+                broken.add(path[1])
+            yield _describe_schema_error(doc, path, message)
+
+    signals = doc.get("signals") if isinstance(doc, dict) else None
+    if not isinstance(signals, list):
+        return
+    valid_signals = (
+        sig
+        for index, sig in enumerate(signals)
+        if index not in broken and isinstance(sig, dict)
+    )
+    for error in RuleEngine().check(valid_signals, finish=not broken):
+        yield str(error)
+
+
+def _collect_diagnostics(doc: Any, max_errors: int, jobs: int = 1) -> None:
+    """Raise a ValidationError carrying up to max_errors problems (0 for no limit)"""
+    # One problem more than reported tells whether the limit left any out
+    limit = max_errors + 1 if max_errors else None
+    _raise_diagnostics(list(islice(iter_diagnostics(doc, jobs), limit)), max_errors)
+
+
+def _raise_diagnostics(diagnostics: list[str], max_errors: int) -> None:
+    """Raise a ValidationError carrying diagnostics, if there are any
+
+    diagnostics may hold one problem beyond max_errors, which is dropped, to say
+    that the limit stopped validation before every problem was found.
+    """
+    if not diagnostics:
+        return
+    stopped = bool(max_errors) and len(diagnostics) > max_errors
+    if stopped:
+        diagnostics = diagnostics[:max_errors]
+    count = len(diagnostics)
+    plural = "s" if count > 1 else ""
+    if stopped:
+        message = f"stopped after {count} error{plural}"
+    else:
+        message = f"found {count} error{plural}"
+    raise ValidationError(message, diagnostics)
+
+
+def validate(
+    yaml_file: Path, max_errors: int | None = None, jobs: int = 1
+) -> dict:
+    """Validate a YAML file for structural and semantical accuracy
+
+    By default, the first problem found raises ValidationError. With max_errors,
+    validation carries on and the ValidationError raised lists up to max_errors
+    problems in its diagnostics (every problem if max_errors is 0). With jobs > 1,
+    large signal lists are structurally validated on that many worker processes.
+    """
+
+    # Read the YAML from the provided path - this can fail and raise an exception
+    # if the file is missing or the user doesn't have read permissions
+    return validate_bytes(Path(yaml_file).read_bytes(), max_errors, jobs)
+
+
+def validate_bytes(
+    data: bytes, max_errors: int | None = None, jobs: int = 1
+) -> dict:
+    """Validate the raw contents of a YAML file for structural and semantical accuracy"""
 
     # Before doing anything, we check the YAML for non-ascii encoded unicode
-    check_non_ascii(yaml_file)
+    check_non_ascii_bytes(data)
 
-    # Load the YAML from the provided path - this can fail and raise and
-    # exception if the file is missing or the user doesn't have read permissions
-    with open(yaml_file, "r", encoding="utf-8") as f:
-        try:
-            doc = yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            raise ValidationError(str(e))
+    import yaml
+
+    # Parse from the buffer we were given rather than reading the file again
+    try:
+        doc = yaml.load(data, Loader=yaml_loader())
+    except yaml.YAMLError as e:
+        raise ValidationError(str(e))
+
+    if max_errors is not None:
+        _collect_diagnostics(doc, max_errors, jobs)
+        return doc
 
     # Each of these can raise a ValidationError
-    _validate_structural(doc)
+    _validate_structural(doc, jobs=jobs)
     _validate_semantic(doc)
 
     return doc
 
 
-def validate_verilog(signal_table: SignalTable, top: str) -> None:
+def validate_stream(
+    yaml_file: Path, max_errors: int | None = None
+) -> tuple[dict, SignalTable]:
+    """Validate a YAML file one signal at a time, building its signal table as it goes
+
+    The streaming counterpart of validate() for very large files. Signals are parsed
+    from PyYAML's event stream, and each one is structurally validated, fed to the
+    semantic rules, and added to the signal table before the next one is parsed, so
+    peak memory is the signal table and the rules' name and pin indexes rather than
+    the whole document. The problems reported (and max_errors) are the same as
+    validate().
+
+    Returns the document without its signals, and the signal table.
+    """
+    import yaml
+
+    from .parallel import signals_are_independent, top_schema
+    from .stream import AsciiReader, SignalStream
+
+    if not signals_are_independent(top_schema(get_validator())):
+        # The schema can't be checked one signal at a time
+        doc = validate(yaml_file, max_errors)
+        return _without_signals(doc), build_signal_table(doc)
+
+    table = SignalTable()
+    with open(yaml_file, "rb") as f:
+        stream = SignalStream(AsciiReader(f))
+        try:
+            if max_errors is None:
+                _validate_streamed(stream, table)
+            else:
+                _collect_streamed(stream, table, max_errors)
+        except yaml.YAMLError as e:
+            raise ValidationError(str(e))
+
+    if stream.streamed:
+        return stream.doc, table
+
+    # Without a signal list to stream, the whole document was loaded, and it's
+    # validated like any other
+    doc = stream.doc
+    if max_errors is not None:
+        _collect_diagnostics(doc, max_errors)
+    else:
+        _validate_structural(doc)
+        _validate_semantic(doc)
+    return _without_signals(doc), build_signal_table(doc)
+
+
+def _without_signals(doc: dict) -> dict:
+    return {key: value for key, value in doc.items() if key != "signals"}
+
+
+def _validate_streamed(stream: "SignalStream", table: SignalTable) -> None:
+    """Raise the error validate() would raise for the document being streamed
+
+    Structural errors are only raised once the stream has been read to the end, since
+    an error in the rest of the document may be the one jsonschema reports first.
+    """
+    from .parallel import precedes_signals, top_schema
+
+    compiled = get_compiled_validator()
+    validator = get_validator()
+    schema = top_schema(validator)
+    items_schema = schema["properties"]["signals"]["items"]
+    engine = RuleEngine()
+    signal_error = None
+    for index, sig in enumerate(stream):
+        if signal_error is not None:
+            continue
+        if compiled is None or not compiled.is_valid_signal(sig):
+            error = next(validator.descend(sig, items_schema, path=index), None)
+            if error is not None:
+                signal_error = _describe_signal_error(sig, index, error.message)
+                continue
+        engine.feed(sig)
+        table.add(sig)
+    if not stream.streamed:
+        return
+
+    # Check the rest of the document
+    for error in validator.iter_errors({**stream.doc, "signals": []}):
+        if signal_error is None or precedes_signals(schema, error):
+            raise ValidationError(error.message)
+        break
+    if signal_error is not None:
+        raise ValidationError(signal_error)
+
+    engine.end()
+
+
+def _collect_streamed(
+    stream: "SignalStream", table: SignalTable, max_errors: int
+) -> None:
+    """Raise the diagnostics iter_diagnostics() would give for the document being
+    streamed, up to max_errors of them (0 for no limit)
+
+    No more than max_errors problems of each kind, and one more to tell whether the
+    limit left any out, are kept while streaming.
+    """
+    from jsonschema.exceptions import best_match
+
+    from .parallel import precedes_signals, top_schema
+
+    limit = max_errors + 1 if max_errors else None
+    compiled = get_compiled_validator()
+    validator = get_validator()
+    schema = top_schema(validator)
+    items_schema = schema["properties"]["signals"]["items"]
+    engine = RuleEngine()
+    schema_errors: list[str] = []
+    semantic_errors: list[str] = []
+    broken = False
+    for index, sig in enumerate(stream):
+        if compiled is None or not compiled.is_valid_signal(sig):
+            errors = [
+                _describe_signal_error(sig, index, best_match([error]).message)
+                for error in validator.descend(sig, items_schema, path=index)
+            ]
+            if errors:
+                broken = True
+                schema_errors.extend(errors)
+                if limit is not None:
+                    del schema_errors[limit:]
+                continue
+        semantic_errors.extend(map(str, engine.check_signal(sig)))
+        if limit is not None:
+            del semantic_errors[limit:]
+        table.add(sig)
+    if not stream.streamed:
+        return
+
+    # The errors in the rest of the document go before or after the signal errors
+    before: list[str] = []
+    after: list[str] = []
+    for error in validator.iter_errors({**stream.doc, "signals": []}):
+        group = before if precedes_signals(schema, error) else after
+        group.append(best_match([error]).message)
+    if not broken:
+        semantic_errors.extend(map(str, engine.check_finish()))
+
+    diagnostics = before + schema_errors + after + semantic_errors
+    _raise_diagnostics(diagnostics[:limit], max_errors)
+
+
+def validate_verilog(
+    signal_table: SignalTable, top: str, bus_loops: bool = False
+) -> None:
     """Validate signal names, instance names, and the top module name as legal Verilog identifiers.
 
     Checks that every signal name and resolved instance name in the signal table is
     a valid Verilog simple identifier, and that the top module name is also valid.
-    Raises ValidationError on the first invalid name encountered.
+    Raises ValidationError on the first invalid name encountered. Then checks that
+    none of the identifiers the generators will derive from them collide with each
+    other or with a Verilog keyword, raising ValidationError listing every collision.
 
     Parameters
     ----------
@@ -172,6 +535,10 @@ def validate_verilog(signal_table: SignalTable, top: str) -> None:
         Constructed signal table to validate.
     top:
         Top-level module name supplied at runtime.
+    bus_loops:
+        Whether the IO ring will instantiate the buffers of buses in generate loops,
+        which declare their own identifiers. Buses whose buffers are named in
+        the YAML are rejected then, as looping them would rename their cells.
     """
     # Check the top level name
     if not is_valid_verilog_identifier(top):
@@ -180,20 +547,30 @@ def validate_verilog(signal_table: SignalTable, top: str) -> None:
         )
     # Check all the signal names
     for sig in signal_table:
-        if not is_valid_verilog_identifier(sig["name"]):
-            raise ValidationError(f"{sig['name']} is not a valid Verilog identifier")
-        if not sig["bypass"] and not is_valid_verilog_identifier(sig["instance"]):
+        if not is_valid_verilog_identifier(sig.name):
+            raise ValidationError(f"{sig.name} is not a valid Verilog identifier")
+        # Only bypassed signals have no instance
+        if sig.instance is not None and not is_valid_verilog_identifier(sig.instance):
             raise ValidationError(
-                f"{sig['instance']} is not a valid Verilog identifier"
+                f"{sig.instance} is not a valid Verilog identifier"
             )
+    _check_collisions(signal_table, top, "verilog", bus_loops)
 
 
-def validate_vhdl(signal_table: SignalTable, meta_table: MetaTable, top: str) -> None:
+def validate_vhdl(
+    signal_table: SignalTable,
+    meta_table: MetaTable,
+    top: str,
+    bus_loops: bool = False,
+) -> None:
     """Validate signal names, instance names, and the top entity name as legal VHDL identifiers.
 
     Checks that every signal name and resolved instance name in the signal table is
     a valid VHDL basic identifier, and that the top entity name is also valid.
-    Raises ValidationError on the first invalid name encountered.
+    Raises ValidationError on the first invalid name encountered. Then checks that
+    none of the identifiers the generators will derive from them collide with each
+    other (ignoring case) or with a VHDL reserved word, raising ValidationError
+    listing every collision.
 
     Parameters
     ----------
@@ -203,6 +580,11 @@ def validate_vhdl(signal_table: SignalTable, meta_table: MetaTable, top: str) ->
         Constructed meta table to validate.
     top:
         Top-level entity name supplied at runtime.
+    bus_loops:
+        Whether the IO ring will instantiate the buffers of buses in for ...
+        generate statements, which declare their own labels. Buses whose buffers
+        are named in the YAML are rejected then, as looping them would rename their
+        cells.
     """
     # Check the architecture value
     if meta_table.architecture is None:
@@ -211,6 +593,10 @@ def validate_vhdl(signal_table: SignalTable, meta_table: MetaTable, top: str) ->
         raise ValidationError(
             f"Specified architecture '{meta_table.architecture}' is not a valid VHDL identifier"
         )
+    if meta_table.architecture.lower() in VHDL_KEYWORDS:
+        raise ValidationError(
+            f"Specified architecture '{meta_table.architecture}' is a VHDL keyword"
+        )
     # Check the top level name
     if not is_valid_vhdl_identifier(top):
         raise ValidationError(
@@ -218,7 +604,24 @@ def validate_vhdl(signal_table: SignalTable, meta_table: MetaTable, top: str) ->
         )
     # Check all the signal names
     for sig in signal_table:
-        if not is_valid_vhdl_identifier(sig["name"]):
-            raise ValidationError(f"{sig['name']} is not a valid VHDL identifier")
-        if not sig["bypass"] and not is_valid_vhdl_identifier(sig["instance"]):
-            raise ValidationError(f"{sig['instance']} is not a valid VHDL identifier")
+        if not is_valid_vhdl_identifier(sig.name):
+            raise ValidationError(f"{sig.name} is not a valid VHDL identifier")
+        # Only bypassed signals have no instance
+        if sig.instance is not None and not is_valid_vhdl_identifier(sig.instance):
+            raise ValidationError(f"{sig.instance} is not a valid VHDL identifier")
+    _check_collisions(signal_table, top, "vhdl", bus_loops)
+
+
+def _check_collisions(
+    signal_table: SignalTable, top: str, lang: str, bus_loops: bool = False
+) -> None:
+    """Check the identifiers generated for lang for collisions, and that bus loops
+    keep the names of named buffers
+    """
+    # The index borrows the generators' naming helpers, which the CLI shouldn't have
+    # to import just to start up
+    from .collisions import check_bus_loops, check_identifier_collisions
+
+    if bus_loops:
+        check_bus_loops(signal_table)
+    check_identifier_collisions(signal_table, top, lang, bus_loops)
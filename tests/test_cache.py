@@ -0,0 +1,213 @@
+import importlib
+import os
+from pathlib import Path
+
+import pytest
+
+import io_gen.cache as cache_module
+from io_gen.cache import ValidatedDesign, ValidationCache
+from io_gen.exceptions import ValidationError
+from io_gen.pipeline import _load_design, run_pipeline
+
+from tests.test_pipeline import INVALID_YAML, VALID_YAML, write_yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The package re-exports the validate() function under the same name as its module
+validate_module = importlib.import_module("io_gen.validate")
+
+
+def _run(yaml_path: Path, out: Path, cache_dir: Path, **kwargs) -> None:
+    run_pipeline(
+        yaml_path,
+        "top",
+        "verilog",
+        out,
+        validate_only=False,
+        rtl_only=False,
+        xdc_only=False,
+        use_cache=True,
+        cache_dir=cache_dir,
+        **kwargs,
+    )
+
+
+def _count_validations(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Records every call to the structural and semantic validation stages"""
+    calls: list[str] = []
+    structural = validate_module._validate_structural
+    semantic = validate_module._validate_semantic
+
+    def record_structural(doc, *args, **kwargs):
+        calls.append("structural")
+        return structural(doc, *args, **kwargs)
+
+    def record_semantic(doc):
+        calls.append("semantic")
+        return semantic(doc)
+
+    monkeypatch.setattr(validate_module, "_validate_structural", record_structural)
+    monkeypatch.setattr(validate_module, "_validate_semantic", record_semantic)
+    return calls
+
+
+def _entries(cache_dir: Path) -> list[Path]:
+    return sorted(cache_dir.glob("*.pickle"))
+
+
+# ---------------------------------------------------------------------------
+# Pipeline integration
+# ---------------------------------------------------------------------------
+
+
+def test_unchanged_yaml_skips_validation(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    cache_dir = tmp_path / "cache"
+    calls = _count_validations(monkeypatch)
+
+    _run(yaml_path, tmp_path / "first", cache_dir)
+    assert calls == ["structural", "semantic"]
+    assert len(_entries(cache_dir)) == 1
+
+    _run(yaml_path, tmp_path / "second", cache_dir)
+    assert calls == ["structural", "semantic"]
+    for name in ("top.xdc", "top.v", "top_io.v"):
+        first = (tmp_path / "first" / name).read_text(encoding="utf-8")
+        assert (tmp_path / "second" / name).read_text(encoding="utf-8") == first
+
+
+def test_changed_yaml_is_validated(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    cache_dir = tmp_path / "cache"
+    _run(yaml_path, tmp_path / "out", cache_dir)
+
+    calls = _count_validations(monkeypatch)
+    write_yaml(tmp_path, VALID_YAML.replace("G22", "G23"))
+    _run(yaml_path, tmp_path / "out", cache_dir)
+    assert calls == ["structural", "semantic"]
+    assert "G23" in (tmp_path / "out" / "top.xdc").read_text(encoding="utf-8")
+    assert len(_entries(cache_dir)) == 2
+
+
+def test_invalid_yaml_not_cached(tmp_path: Path) -> None:
+    yaml_path = write_yaml(tmp_path, INVALID_YAML)
+    cache_dir = tmp_path / "cache"
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            _run(yaml_path, tmp_path / "out", cache_dir)
+    assert _entries(cache_dir) == []
+
+
+def test_cache_disabled_by_default(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    run_pipeline(yaml_path, "top", "verilog", tmp_path / "out", False, False, False)
+    assert not (tmp_path / "xdg").exists()
+
+
+def test_identifiers_checked_on_cache_hit(tmp_path: Path) -> None:
+    """Language specific checks depend on --top, so they are never cached."""
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    cache_dir = tmp_path / "cache"
+    _run(yaml_path, tmp_path / "out", cache_dir)
+    with pytest.raises(ValidationError):
+        run_pipeline(
+            yaml_path, "123bad", "verilog", tmp_path / "out", False, False, False,
+            use_cache=True, cache_dir=cache_dir,
+        )
+
+
+def test_unwritable_cache_warns_on_stderr(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def store(self, key, design):
+        raise PermissionError("read-only cache")
+
+    monkeypatch.setattr(ValidationCache, "store", store)
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    _run(yaml_path, tmp_path / "out", tmp_path / "cache")
+    captured = capsys.readouterr()
+    assert "Warning: Unable to write validation cache" in captured.err
+    assert "Warning" not in captured.out
+
+
+# ---------------------------------------------------------------------------
+# ValidationCache
+# ---------------------------------------------------------------------------
+
+
+def _design() -> ValidatedDesign:
+    return _load_design(REPO_ROOT / "examples" / "example.yaml", None)
+
+
+def test_default_directory_follows_xdg(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert ValidationCache().directory == tmp_path / "io-gen"
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    assert ValidationCache().directory == Path.home() / ".cache" / "io-gen"
+
+
+def test_key_depends_on_schema(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    before = ValidationCache(tmp_path).key(b"title: x\n")
+    monkeypatch.setattr(cache_module, "schema_digest", lambda: "0" * 64)
+    assert ValidationCache(tmp_path).key(b"title: x\n") != before
+
+
+def test_key_file_matches_key(tmp_path: Path) -> None:
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    cache = ValidationCache(tmp_path)
+    assert cache.key_file(yaml_path) == cache.key(yaml_path.read_bytes())
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    cache = ValidationCache(tmp_path)
+    design = _design()
+    cache.store("k", design)
+    loaded = cache.load("k")
+    assert loaded is not None
+    assert loaded.doc == design.doc
+    assert list(loaded.signal_table) == list(design.signal_table)
+    assert cache.load("missing") is None
+
+
+def test_corrupt_entry_dropped(tmp_path: Path) -> None:
+    cache = ValidationCache(tmp_path)
+    (tmp_path / "k.pickle").write_bytes(b"not a pickle")
+    assert cache.load("k") is None
+    assert not (tmp_path / "k.pickle").exists()
+
+
+def test_lru_eviction_by_count(tmp_path: Path) -> None:
+    cache = ValidationCache(tmp_path, max_entries=2)
+    design = _design()
+    for index, key in enumerate(("a", "b")):
+        cache.store(key, design)
+        os.utime(tmp_path / f"{key}.pickle", (index, index))
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.load("a") is not None
+    cache.store("c", design)
+    assert [p.stem for p in _entries(tmp_path)] == ["a", "c"]
+
+
+def test_lru_eviction_by_size(tmp_path: Path) -> None:
+    cache = ValidationCache(tmp_path)
+    design = _design()
+    cache.store("a", design)
+    os.utime(tmp_path / "a.pickle", (0, 0))
+    cache.max_bytes = (tmp_path / "a.pickle").stat().st_size
+    cache.store("b", design)
+    assert [p.stem for p in _entries(tmp_path)] == ["b"]
+
+
+def test_clear(tmp_path: Path) -> None:
+    cache = ValidationCache(tmp_path / "cache")
+    assert cache.clear() == 0
+    cache.store("a", _design())
+    cache.store("b", _design())
+    (tmp_path / "cache" / "keep.txt").write_text("x")
+    assert cache.clear() == 2
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == ["keep.txt"]
@@ -15,7 +15,13 @@ from io_gen.checks import (
     check_buffer_inferable,
     check_minimum_ports_generated,
     check_non_ascii,
+    check_non_ascii_bytes,
+    default_rules,
+    PinNameFormat,
+    RuleEngine,
+    UniquePins,
 )
+import io_gen.checks as checks_module
 
 
 # ---------------------------------------------------------------------------
@@ -704,3 +710,175 @@ def test_check_non_ascii_raises(tmp_path: Path) -> None:
     with pytest.raises(ValidationError):
         check_non_ascii(p)
 
+
+def test_check_non_ascii_reports_first_line() -> None:
+    """The line number of the first non-ASCII byte is reported."""
+    data = b"title: Test\npart: xc7k325tffg900-2\nname: caf\xc3\xa9\nname: na\xc3\xafve\n"
+    with pytest.raises(ValidationError, match="at line 3$"):
+        check_non_ascii_bytes(data)
+
+
+def test_check_non_ascii_first_line() -> None:
+    with pytest.raises(ValidationError, match="at line 1$"):
+        check_non_ascii_bytes(b"\xc3\xa9")
+
+
+def test_check_non_ascii_invalid_utf8() -> None:
+    """Bytes that are not valid UTF-8 are reported rather than failing to decode."""
+    with pytest.raises(ValidationError, match="at line 2$"):
+        check_non_ascii_bytes(b"title: Test\npart: \xff\n")
+
+
+def test_check_non_ascii_bytes_clean() -> None:
+    check_non_ascii_bytes(b"")
+    check_non_ascii_bytes(b"title: Test\n\tpart: x\r\n")
+
+
+
+# ---------------------------------------------------------------------------
+# RuleEngine
+# ---------------------------------------------------------------------------
+
+
+def _sig(name: str, pins: object, **extra: object) -> dict:
+    sig = {
+        "name": name,
+        "pins": pins,
+        "direction": "out",
+        "buffer": "obuf",
+        "iostandard": "LVCMOS18",
+    }
+    if isinstance(pins, list):
+        sig["width"] = len(pins)
+    sig.update(extra)
+    return sig
+
+
+def test_engine_passes_valid_design() -> None:
+    RuleEngine().run([_sig("a", "A1"), _sig("b", ["B1", "B2"])])
+
+
+def test_engine_derives_facts_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Pin names are flattened once per signal even though two rules need them."""
+    calls = []
+    derive = checks_module._DERIVE_FACT["pins"]
+    monkeypatch.setitem(
+        checks_module._DERIVE_FACT, "pins", lambda sig: calls.append(1) or derive(sig)
+    )
+    RuleEngine().run([_sig("a", "A1"), _sig("b", ["B1", "B2"])])
+    assert len(calls) == 2
+
+
+def test_engine_only_derives_needed_facts() -> None:
+    """A rule that doesn't need buffer information never looks for it."""
+    RuleEngine([PinNameFormat(), UniquePins()]).run([{"name": "a", "pins": "A1"}])
+
+
+# Each case is (name, signals, expected message). Every design has more than one
+# problem, and the message is the one the individual passes report first.
+ENGINE_PRECEDENCE_CASES = [
+    (
+        "design_rule_beats_earlier_signal_rule",
+        [_sig("a", ["A1", "A2"], width=3), _sig("b", "b2")],
+        "signal 'b' has pin 'b2': is malformed",
+    ),
+    (
+        "earlier_design_rule_wins",
+        [_sig("a", "A1"), _sig("a", "A1")],
+        "signal 'a': duplicate names",
+    ),
+    (
+        "first_signal_wins_among_signal_rules",
+        [_sig("a", "A1", direction="in"), _sig("b", ["B1"], width=2)],
+        "signal 'a': buffer obuf direction is in",
+    ),
+    (
+        "signal_order_before_rule_order",
+        [_sig("a", ["A1"], width=2), _sig("b", "B1", direction="in")],
+        "signal 'a': pins array width mismatch",
+    ),
+    (
+        "minimum_ports_before_signal_rules",
+        [_sig("a", ["A1"], width=2, generate=False)],
+        "no signals with generate: true - nothing to generate",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "signals, message",
+    [pytest.param(s, m, id=n) for n, s, m in ENGINE_PRECEDENCE_CASES],
+)
+def test_engine_error_precedence(signals: list[dict], message: str) -> None:
+    with pytest.raises(ValidationError) as exc_info:
+        RuleEngine().run(signals)
+    assert str(exc_info.value) == message
+
+
+def test_engine_timings() -> None:
+    engine = RuleEngine(timed=True)
+    engine.run([_sig("a", "A1"), _sig("b", "B1")])
+    assert set(engine.timings) == {rule.name for rule in default_rules()}
+    assert all(t >= 0.0 for t in engine.timings.values())
+    assert all(count == 2 for count in engine.visits.values())
+
+
+def test_engine_untimed_by_default() -> None:
+    engine = RuleEngine()
+    engine.run([_sig("a", "A1")])
+    assert all(t == 0.0 for t in engine.timings.values())
+
+
+def test_engine_incremental_feed() -> None:
+    """Feeding signals one at a time behaves like run()."""
+    engine = RuleEngine()
+    engine.begin()
+    engine.feed(_sig("a", "A1"))
+    engine.feed(_sig("b", "A1"))
+    with pytest.raises(ValidationError, match="duplicate pins"):
+        engine.end()
+
+
+def test_engine_reusable() -> None:
+    """State from one run doesn't leak into the next."""
+    engine = RuleEngine()
+    engine.run([_sig("a", "A1")])
+    engine.run([_sig("a", "A1")])
+
+
+def test_engine_check_yields_every_error() -> None:
+    signals = [
+        _sig("a", "A1"),
+        _sig("a", "A1"),
+        _sig("c", "bad"),
+        _sig("d", "D1", direction="in"),
+    ]
+    messages = [str(e) for e in RuleEngine().check(signals)]
+    assert messages == [
+        "signal 'a': duplicate names",
+        "signal 'a' has pin 'A1': duplicate pins",
+        "signal 'c' has pin 'bad': is malformed",
+        "signal 'd': buffer obuf direction is in",
+    ]
+
+
+def test_engine_check_is_lazy() -> None:
+    """Signals after the errors a caller asked for are never visited."""
+    consumed = []
+
+    def signals():
+        for index in range(100):
+            consumed.append(index)
+            yield _sig(f"s{index}", "bad")
+
+    errors = RuleEngine().check(signals())
+    assert "s0" in str(next(errors))
+    assert consumed == [0]
+
+
+def test_engine_check_finish() -> None:
+    signals = [_sig("a", "A1", generate=False)]
+    assert [str(e) for e in RuleEngine().check(signals)] == [
+        "no signals with generate: true - nothing to generate"
+    ]
+    assert list(RuleEngine().check(signals, finish=False)) == []
@@ -26,6 +26,14 @@ def test_args_forwarded_correctly(monkeypatch: pytest.MonkeyPatch) -> None:
         validate_only=False,
         rtl_only=False,
         xdc_only=False,
+        use_cache=True,
+        max_errors=None,
+        jobs=1,
+        stream=False,
+        from_ir=False,
+        emit_ir=None,
+        bus_loops=False,
+        compact_xdc=False,
     )
 
 
@@ -43,6 +51,23 @@ def test_default_output_is_dot(monkeypatch: pytest.MonkeyPatch) -> None:
     assert mock_run.call_args.kwargs["output_dir"] == "."
 
 
+@pytest.mark.parametrize("lang", ["both", "verilog,vhdl", "VHDL"])
+def test_several_languages_forwarded(monkeypatch: pytest.MonkeyPatch, lang: str) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "--top", "top", "--lang", lang, "input.yaml"])
+    with patch("io_gen.cli.run_pipeline") as mock_run:
+        main()
+    assert mock_run.call_args.kwargs["lang"] == lang.lower()
+
+
+def test_unknown_language_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        sys, "argv", ["io-gen", "--top", "top", "--lang", "verilog,systemc", "input.yaml"]
+    )
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+    assert exc_info.value.code == 2
+
+
 # ---------------------------------------------------------------------------
 # Mutual exclusion
 # ---------------------------------------------------------------------------
@@ -87,4 +112,185 @@ def test_permission_error_exits_1(monkeypatch: pytest.MonkeyPatch, capsys: pytes
         with pytest.raises(SystemExit) as exc_info:
             main()
     assert exc_info.value.code == 1
-    assert "Permission denied" in capsys.readouterr().err
\ No newline at end of file
+    assert "Permission denied" in capsys.readouterr().err
+
+# ---------------------------------------------------------------------------
+# Validation cache
+# ---------------------------------------------------------------------------
+
+
+def test_no_cache_disables_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "--top", "top", "--no-cache", "input.yaml"])
+    with patch("io_gen.cli.run_pipeline") as mock_run:
+        main()
+    assert mock_run.call_args.kwargs["use_cache"] is False
+
+
+def test_cache_clear(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture, tmp_path
+) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    cache_dir = tmp_path / "io-gen"
+    cache_dir.mkdir()
+    (cache_dir / "a.pickle").write_bytes(b"")
+    (cache_dir / "b.pickle").write_bytes(b"")
+    monkeypatch.setattr(sys, "argv", ["io-gen", "cache", "clear"])
+    with patch("io_gen.cli.run_pipeline") as mock_run:
+        main()
+    mock_run.assert_not_called()
+    assert list(cache_dir.iterdir()) == []
+    assert "Removed 2 cached entries" in capsys.readouterr().out
+
+
+def test_cache_unknown_command_exits_2(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "cache", "purge"])
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+    assert exc_info.value.code == 2
+
+
+# ---------------------------------------------------------------------------
+# Collecting errors
+# ---------------------------------------------------------------------------
+
+
+def test_max_errors_forwarded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "--top", "top", "--max-errors", "25", "input.yaml"])
+    with patch("io_gen.cli.run_pipeline") as mock_run:
+        main()
+    assert mock_run.call_args.kwargs["max_errors"] == 25
+
+
+def test_negative_max_errors_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "--top", "top", "--max-errors", "-1", "input.yaml"])
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+    assert exc_info.value.code == 2
+
+
+def test_every_diagnostic_printed(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "--top", "top", "--max-errors", "0", "input.yaml"])
+    err = ValidationError("found 2 errors", ["a: first", "b: second"])
+    with patch("io_gen.cli.run_pipeline", side_effect=err):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+    assert exc_info.value.code == 1
+    assert capsys.readouterr().err.splitlines() == [
+        "Error: a: first",
+        "Error: b: second",
+        "Error: found 2 errors",
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Parallel validation
+# ---------------------------------------------------------------------------
+
+
+def test_jobs_forwarded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "--top", "top", "-j", "4", "input.yaml"])
+    with patch("io_gen.cli.run_pipeline") as mock_run:
+        main()
+    assert mock_run.call_args.kwargs["jobs"] == 4
+
+
+def test_zero_jobs_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "--top", "top", "--jobs", "0", "input.yaml"])
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+    assert exc_info.value.code == 2
+
+
+def test_stream_forwarded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "--top", "top", "--stream", "input.yaml"])
+    with patch("io_gen.cli.run_pipeline") as mock_run:
+        main()
+    assert mock_run.call_args.kwargs["stream"] is True
+
+
+def test_bus_loops_forwarded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "--top", "top", "--bus-loops", "input.yaml"])
+    with patch("io_gen.cli.run_pipeline") as mock_run:
+        main()
+    assert mock_run.call_args.kwargs["bus_loops"] is True
+
+
+def test_compact_xdc_forwarded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        sys, "argv", ["io-gen", "--top", "top", "--compact-xdc", "input.yaml"]
+    )
+    with patch("io_gen.cli.run_pipeline") as mock_run:
+        main()
+    assert mock_run.call_args.kwargs["compact_xdc"] is True
+
+
+def test_ir_flags_forwarded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", [
+        "io-gen", "--top", "top", "--from-ir", "--emit-ir", "copy.ir", "design.ir"
+    ])
+    with patch("io_gen.cli.run_pipeline") as mock_run:
+        main()
+    assert mock_run.call_args.kwargs["yaml_path"] == "design.ir"
+    assert mock_run.call_args.kwargs["from_ir"] is True
+    assert mock_run.call_args.kwargs["emit_ir"] == "copy.ir"
+
+
+def test_bad_ir_exits_1(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "--top", "top", "--from-ir", "design.ir"])
+    error = ValueError("IR file is corrupted (digest mismatch)")
+    with patch("io_gen.cli.run_pipeline", side_effect=error):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+    assert exc_info.value.code == 1
+    assert "Error: IR file is corrupted" in capsys.readouterr().err
+
+
+# ---------------------------------------------------------------------------
+# Pin queries
+# ---------------------------------------------------------------------------
+
+
+def test_query_forwarded(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    monkeypatch.setattr(sys, "argv", [
+        "io-gen", "query", "--pin", "A1", "--pin", "B2", "--iostandard", "LVDS",
+        "--direction", "IN", "--no-cache", "input.yaml",
+    ])
+    with patch("io_gen.cli.run_query", return_value=["A1 a", "B2 b[0] p"]) as mock_query:
+        with patch("io_gen.cli.run_pipeline") as mock_run:
+            main()
+    mock_run.assert_not_called()
+    mock_query.assert_called_once_with(
+        yaml_path="input.yaml",
+        pins=["A1", "B2"],
+        iostandard="LVDS",
+        direction="in",
+        use_cache=False,
+    )
+    assert capsys.readouterr().out == "A1 a\nB2 b[0] p\n"
+
+
+def test_query_iostandard_normalized(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "query", "--iostandard", "lvds_25", "input.yaml"])
+    with patch("io_gen.cli.run_query", return_value=[]) as mock_query:
+        main()
+    assert mock_query.call_args.kwargs["iostandard"] == "LVDS_25"
+
+
+def test_query_unknown_iostandard_rejected(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "query", "--iostandard", "LVTTL", "input.yaml"])
+    with patch("io_gen.cli.run_query") as mock_query:
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+    mock_query.assert_not_called()
+    assert exc_info.value.code == 2
+    assert "invalid choice: 'LVTTL'" in capsys.readouterr().err
+
+
+def test_query_unknown_pin_exits_1(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture) -> None:
+    monkeypatch.setattr(sys, "argv", ["io-gen", "query", "--pin", "Z9", "input.yaml"])
+    error = ValueError("package pin 'Z9' is not used by any signal")
+    with patch("io_gen.cli.run_query", side_effect=error):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+    assert exc_info.value.code == 1
+    assert "Error: package pin 'Z9'" in capsys.readouterr().err
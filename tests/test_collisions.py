@@ -0,0 +1,293 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from io_gen import ValidationError
+from io_gen.collisions import (
+    build_identifier_index,
+    bus_loop_warnings,
+    check_bus_loops,
+    check_identifier_collisions,
+)
+from io_gen.tables import MetaTable, build_signal_table
+from io_gen.tables.signal_table import SignalTable
+from io_gen.validate import validate_verilog, validate_vhdl
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+META = MetaTable("Test", "xc7k325tffg900-2", "rtl")
+
+
+def _make_signal_table(signals: list) -> SignalTable:
+    doc = {"title": "Test", "part": "xc7k325tffg900-2", "signals": signals}
+    return build_signal_table(doc)
+
+
+def _sig(
+    name: str, pins: str | list[str], buffer: str = "ibuf", **extra: object
+) -> dict:
+    direction = {"ibuf": "in", "obuf": "out", "iobuf": "inout"}[buffer]
+    sig: dict[str, object] = {
+        "name": name,
+        "pins": pins,
+        "direction": direction,
+        "buffer": buffer,
+        "iostandard": "LVCMOS18",
+    }
+    sig.update(extra)
+    return sig
+
+
+def _collisions(signals: list, lang: str, top: str = "top") -> list[str]:
+    st = _make_signal_table(signals)
+    return build_identifier_index(st, top, lang).collisions
+
+
+# ---------------------------------------------------------------------------
+# No collisions
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("lang", ["verilog", "vhdl"])
+@pytest.mark.parametrize(
+    "path", ["examples/example.yaml", "validation/basys3/basys3.yaml"]
+)
+def test_examples_have_no_collisions(path: str, lang: str) -> None:
+    with open(REPO_ROOT / path, "r", encoding="utf-8") as f:
+        st = build_signal_table(yaml.safe_load(f))
+    assert build_identifier_index(st, "top", lang).collisions == []
+
+
+def test_case_only_differences_allowed_in_verilog() -> None:
+    assert _collisions([_sig("led", "A1"), _sig("LED", "A2")], "verilog") == []
+
+
+# ---------------------------------------------------------------------------
+# Collisions
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("lang", ["verilog", "vhdl"])
+def test_tristate_suffix_collides_with_signal(lang: str) -> None:
+    """An iobuf expands to foo_i/foo_o/foo_t, which a signal foo_i also produces."""
+    collisions = _collisions([_sig("foo", "A1", "iobuf"), _sig("foo_i", "A2")], lang)
+    unit = "module" if lang == "verilog" else "entity"
+    assert (
+        f"{unit} 'top': 'foo_i' from signal 'foo_i' (net) collides with 'foo_i' "
+        "from signal 'foo' (net)"
+    ) in collisions
+    assert (
+        f"{unit} 'top_io': 'foo_i' from signal 'foo_i' (IO ring port) collides "
+        "with 'foo_i' from signal 'foo' (IO ring port)"
+    ) in collisions
+
+
+def test_pad_suffix_collides_with_signal() -> None:
+    collisions = _collisions([_sig("a", "A1"), _sig("a_pad", "A2", "obuf")], "verilog")
+    assert collisions == [
+        "module 'top': 'a_pad' from signal 'a_pad' (net) collides with 'a_pad' "
+        "from signal 'a' (port)",
+        "module 'top_io': 'a_pad' from signal 'a_pad' (IO ring port) collides with "
+        "'a_pad' from signal 'a' (IO ring port)",
+    ]
+
+
+def test_vhdl_collisions_ignore_case() -> None:
+    collisions = _collisions([_sig("led", "A1"), _sig("LED", "A2")], "vhdl")
+    assert (
+        "entity 'top': 'LED_pad' from signal 'LED' (port) collides with 'led_pad' "
+        "from signal 'led' (port)"
+    ) in collisions
+
+
+def test_instance_names_collide() -> None:
+    signals = [_sig("a", "A1", instance="u"), _sig("b", "A2", instance="u")]
+    assert _collisions(signals, "verilog") == [
+        "module 'top_io': 'u_i0' from signal 'b' (buffer instance) collides with "
+        "'u_i0' from signal 'a' (buffer instance)"
+    ]
+
+
+def test_inferred_buffers_have_no_instances() -> None:
+    signals = [_sig("a", "A1", instance="u"), _sig("b", "A2", instance="u", infer=True)]
+    assert _collisions(signals, "verilog") == []
+
+
+def test_signal_collides_with_ioring_instance() -> None:
+    collisions = _collisions([_sig("top_io_i0", "A1")], "verilog")
+    assert collisions == [
+        "module 'top': 'top_io_i0' from signal 'top_io_i0' (net) collides with "
+        "'top_io_i0' from the IO ring instance"
+    ]
+
+
+@pytest.mark.parametrize(
+    "lang,name,expected",
+    [
+        ("verilog", "wire", "a Verilog keyword"),
+        ("vhdl", "signal", "a VHDL keyword"),
+        ("vhdl", "Signal", "a VHDL keyword"),
+        ("vhdl", "std_logic", "std_logic"),
+    ],
+)
+def test_keywords(lang: str, name: str, expected: str) -> None:
+    collisions = _collisions([_sig(name, "A1")], lang)
+    assert collisions
+    assert expected in collisions[0]
+
+
+def test_keyword_differing_in_case_allowed_in_verilog() -> None:
+    assert _collisions([_sig("Wire", "A1")], "verilog") == []
+
+
+@pytest.mark.parametrize("lang,top", [("verilog", "IBUF"), ("vhdl", "ibufds")])
+def test_top_collides_with_primitive(lang: str, top: str) -> None:
+    collisions = _collisions([_sig("a", "A1")], lang, top=top)
+    assert collisions[0].startswith(f"design units: '{top}' from the top level")
+
+
+def test_vhdl_port_hides_primitive() -> None:
+    collisions = _collisions([_sig("obuf", "A1")], "vhdl")
+    assert collisions == [
+        "entity 'top_io': 'obuf' from signal 'obuf' (IO ring port) collides with "
+        "'OBUF' from the unisim library"
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+
+def test_single_collision_raises() -> None:
+    st = _make_signal_table([_sig("a", "A1", instance="u"), _sig("b", "A2", instance="u")])
+    with pytest.raises(ValidationError, match="'u_i0' from signal 'b'") as exc_info:
+        check_identifier_collisions(st, "top", "verilog")
+    assert exc_info.value.diagnostics == []
+
+
+def test_every_collision_reported() -> None:
+    st = _make_signal_table(
+        [_sig("a", "A1"), _sig("a_pad", "A2", "obuf"), _sig("wire", "A3")]
+    )
+    with pytest.raises(ValidationError, match="found 4 identifier collisions") as exc_info:
+        validate_verilog(st, "top")
+    # a_pad collides in both modules, and so does the keyword
+    assert len(exc_info.value.diagnostics) == 4
+
+
+def test_validate_vhdl_checks_collisions() -> None:
+    st = _make_signal_table([_sig("led", "A1"), _sig("LED", "A2")])
+    with pytest.raises(ValidationError, match="identifier collisions"):
+        validate_vhdl(st, META, "top")
+
+
+def test_vhdl_architecture_keyword() -> None:
+    st = _make_signal_table([_sig("a", "A1")])
+    with pytest.raises(ValidationError, match="is a VHDL keyword"):
+        validate_vhdl(st, MetaTable("Test", "xc7k325tffg900-2", "Begin"), "top")
+
+
+# ---------------------------------------------------------------------------
+# Bus loops
+# ---------------------------------------------------------------------------
+
+
+def _bus(name: str, pins: list[str], buffer: str = "obuf") -> dict:
+    return _sig(name, pins, buffer, width=len(pins))
+
+
+@pytest.mark.parametrize("lang", ["verilog", "vhdl"])
+def test_bus_loops_replace_bit_instances(lang: str) -> None:
+    """A looped bus declares its loop label rather than an instance per bit."""
+    st = _make_signal_table([_bus("led", ["A1", "A2"]), _sig("obuf_led_i0", "A3")])
+    assert build_identifier_index(st, "top", lang).collisions != []
+    index = build_identifier_index(st, "top", lang, bus_loops=True)
+    assert index.collisions == []
+    ring = next(scope for scope in index.scopes.values() if "obuf_led_i" in scope)
+    assert "obuf_led_i1" not in ring
+    assert ("obuf_led_n" in ring) == (lang == "verilog")
+
+
+def test_bus_loop_label_collides() -> None:
+    signals = [_bus("led", ["A1", "A2"]), _sig("obuf_led", "A3", "iobuf")]
+    st = _make_signal_table(signals)
+    assert build_identifier_index(st, "top", "vhdl", bus_loops=True).collisions == [
+        "entity 'top_io': 'obuf_led_i' from signal 'obuf_led' (IO ring port) "
+        "collides with 'obuf_led_i' from signal 'led' (generate loop)"
+    ]
+
+
+def test_bus_loop_genvar_collides() -> None:
+    """Verilog genvars are declared in the module, VHDL loop parameters aren't."""
+    signals = [_bus("led", ["A1", "A2"]), _sig("obuf_led_n", "A3")]
+    with pytest.raises(ValidationError, match="'obuf_led_n' from signal 'obuf_led_n'"):
+        validate_verilog(_make_signal_table(signals), "top", bus_loops=True)
+    validate_vhdl(_make_signal_table(signals), META, "top", bus_loops=True)
+
+
+def test_bus_loop_instance_is_checked() -> None:
+    """The buffer named inside a loop can't be a keyword either."""
+    signals = [_bus("led", ["A1", "A2"]) | {"instance": "Process"}]
+    index = build_identifier_index(_make_signal_table(signals), "top", "vhdl", True)
+    assert index.collisions == [
+        "generate loop 'Process_i': 'Process' from signal 'led' (buffer instance) "
+        "is a VHDL keyword"
+    ]
+
+
+def test_bus_loops_keep_default_names() -> None:
+    """Buses whose buffers io-gen names itself can be looped."""
+    signals = [_bus("led", ["A1", "A2"]), _sig("rx", "B1", instance="rx_buf")]
+    st = _make_signal_table(signals)
+    check_bus_loops(st)
+    validate_verilog(st, "top", bus_loops=True)
+
+
+def test_bus_loop_warnings() -> None:
+    """Every bus with default names is reported, since looping renames its cells."""
+    signals = [
+        _bus("led", ["A1", "A2"]),
+        _bus("key", ["B1", "B2"], "ibuf"),
+        _bus("named", ["C1", "C2"]) | {"instance": "named_buf"},
+        _sig("rx", "D1"),
+        _bus("inferred", ["E1", "E2"], "ibuf") | {"infer": True},
+    ]
+    assert bus_loop_warnings(_make_signal_table(signals)) == [
+        "signal 'led': bus loops rename its buffers "
+        "('obuf_led_i0' is now 'obuf_led_i[0].obuf_led')",
+        "signal 'key': bus loops rename its buffers "
+        "('ibuf_key_i0' is now 'ibuf_key_i[0].ibuf_key')",
+    ]
+
+
+@pytest.mark.parametrize("lang", ["verilog", "vhdl"])
+def test_bus_loops_reject_named_buffers(lang: str) -> None:
+    """Looping a bus with buffers named in the YAML would rename its cells."""
+    signals = [_bus("led", ["A1", "A2"]) | {"instance": "led_buf"}]
+    st = _make_signal_table(signals)
+    message = (
+        "signal 'led': bus loops would rename its named buffers "
+        r"\('led_buf_i0' would become 'led_buf_i\[0\].led_buf'\)"
+    )
+    with pytest.raises(ValidationError, match=message):
+        if lang == "verilog":
+            validate_verilog(st, "top", bus_loops=True)
+        else:
+            validate_vhdl(st, META, "top", bus_loops=True)
+    # Without the loops, the cells keep their names
+    validate_verilog(st, "top")
+
+
+def test_bus_loops_reject_every_named_bus() -> None:
+    signals = [
+        _bus("led", ["A1", "A2"]) | {"instance": "led_buf"},
+        _bus("key", ["B1", "B2"], "ibuf") | {"instance": "key_buf"},
+    ]
+    with pytest.raises(ValidationError) as excinfo:
+        check_bus_loops(_make_signal_table(signals))
+    assert str(excinfo.value).startswith(
+        "bus loops would rename the named buffers of 2 signals"
+    )
+    assert len(excinfo.value.diagnostics) == 2
@@ -1,9 +1,15 @@
 import pytest
 
 from io_gen.tables import SignalTable
-from io_gen.tables.signal_table import build_signal_table
+from io_gen.tables.signal_table import SignalRow, build_signal_table
 
-from io_gen.generate.common import get_signal_top_ports, get_signal_ioring_ports, get_signal_nets
+from io_gen.generate.common import (
+    BusLoop,
+    get_signal_bus_loop,
+    get_signal_ioring_ports,
+    get_signal_nets,
+    get_signal_top_ports,
+)
 
 
 def _make_signal_table(signals: list) -> SignalTable:
@@ -11,7 +17,7 @@ def _make_signal_table(signals: list) -> SignalTable:
     return build_signal_table(doc)
 
 
-def _make_sig_row(sig: dict) -> dict:
+def _make_sig_row(sig: dict) -> SignalRow:
     """Build a normalized signal table row from a raw signal dict."""
     return list(_make_signal_table([sig]))[0]
 
@@ -445,3 +451,48 @@ def test_get_signal_nets(sig: dict, expected: list[dict]) -> None:
     """Each signal type produces the correct fabric-side net entries."""
     row = _make_sig_row(sig)
     assert get_signal_nets(row) == expected
+
+
+# ---- get_signal_bus_loop -----------------------------------------------------
+
+
+def test_bus_loop_named_after_instance() -> None:
+    """The loop of a bus is labelled and indexed after the instance of its buffers."""
+    row = _make_sig_row(
+        {
+            "name": "led",
+            "pins": ["A1", "A2", "A3"],
+            "width": 3,
+            "direction": "out",
+            "buffer": "obuf",
+            "iostandard": "LVCMOS18",
+        }
+    )
+    loop = get_signal_bus_loop(row)
+    assert loop == BusLoop(
+        label="obuf_led_i", variable="obuf_led_n", width=3, instance="obuf_led"
+    )
+    # Read like the pin row of bit <variable>
+    assert loop is not None
+    assert loop.index == "obuf_led_n" and loop.is_bus
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [
+        pytest.param({"pins": "A1"}, id="scalar"),
+        pytest.param({"infer": True}, id="inferred"),
+        pytest.param({"bypass": True}, id="bypass"),
+    ],
+)
+def test_no_bus_loop(extra: dict) -> None:
+    """Scalars, inferred and bypassed buses have no loop."""
+    sig = {
+        "name": "led",
+        "pins": ["A1", "A2"],
+        "width": 2,
+        "direction": "out",
+        "buffer": "obuf",
+        "iostandard": "LVCMOS18",
+    }
+    assert get_signal_bus_loop(_make_sig_row({**sig, **extra})) is None
@@ -0,0 +1,151 @@
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from io_gen.cache import ValidatedDesign
+from io_gen.checks import BUFFER_DIRECTIONS, BUFFER_INFERABLE, BUFFER_STRATEGIES
+from io_gen.ir import dump_ir, load_ir
+from io_gen.tables import (
+    TRISTATE_BUFFERS,
+    Buffer,
+    ConstraintsTable,
+    Direction,
+    IOStandard,
+    MetaTable,
+    SignalRow,
+    build_pin_table,
+    code_table,
+)
+from io_gen.tables import enums
+from io_gen.tables.signal_table import build_signal_table
+
+SCHEMA_DEFS = Path(__file__).resolve().parent.parent / "io_gen" / "schema" / "defs"
+
+_DOC = {
+    "title": "Test",
+    "part": "xc7k325tffg900-2",
+    "signals": [
+        {
+            "name": "gpio",
+            "pins": ["A1", "A2"],
+            "width": 2,
+            "direction": "inout",
+            "buffer": "iobuf",
+            "iostandard": "LVCMOS18",
+        },
+        {
+            "name": "spare",
+            "pins": "B1",
+            "direction": "out",
+            "buffer": "obuf",
+            "iostandard": "LVCMOS33",
+            "bypass": True,
+        },
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "enum,schema",
+    [
+        (Direction, "direction.json"),
+        (Buffer, "buffer.json"),
+        (IOStandard, "iostandard.json"),
+    ],
+)
+def test_members_match_schema(
+    enum: type[Direction] | type[Buffer] | type[IOStandard], schema: str
+) -> None:
+    """The schema enums stay the source of truth, in order, for the codes."""
+    values = json.loads((SCHEMA_DEFS / schema).read_text())["enum"]
+    assert [member.value for member in enum] == values
+    assert [member.code for member in enum] == list(range(len(values)))
+
+
+def test_attribute_tables_match_members() -> None:
+    """The Python-side tables cover exactly the schema values, nothing stale."""
+    assert list(enums._DIRECTION_KEYWORDS) == list(Direction)
+    assert list(enums._BUFFER_ATTRIBUTES) == list(Buffer)
+
+
+def test_members_pickle() -> None:
+    for member in (Direction.INOUT, Buffer.OBUFDS, IOStandard.TMDS_33):
+        assert pickle.loads(pickle.dumps(member)) is member
+
+
+def test_members_behave_as_strings() -> None:
+    assert Buffer("iobuf") is Buffer.IOBUF
+    assert Buffer.IOBUF == "iobuf"
+    assert {"iobuf": 1}[Buffer.IOBUF] == 1
+    assert f"{Direction.OUT:<5}|" == "out  |"
+    assert json.dumps([IOStandard.LVDS]) == '["LVDS"]'
+
+
+def test_buffer_attributes() -> None:
+    assert {b for b in Buffer if b.tristate} == TRISTATE_BUFFERS == {"iobuf", "iobufds"}
+    assert {b for b in Buffer if b.inferable} == BUFFER_INFERABLE == {"ibuf", "obuf"}
+    assert BUFFER_DIRECTIONS == {
+        "ibuf": "in",
+        "obuf": "out",
+        "ibufds": "in",
+        "obufds": "out",
+        "iobuf": "inout",
+        "iobufds": "inout",
+    }
+    assert {b for b, s in BUFFER_STRATEGIES.items() if s == "pinset"} == {
+        "ibufds",
+        "obufds",
+        "iobufds",
+    }
+
+
+def test_direction_keywords() -> None:
+    assert [d.verilog for d in Direction] == ["input", "output", "inout"]
+    assert [d.vhdl for d in Direction] == ["in", "out", "inout"]
+    assert [d.xdc for d in Direction] == ["IN", "OUT", "INOUT"]
+
+
+def test_code_table() -> None:
+    table = code_table(Buffer, {Buffer.OBUF: "o", Buffer.IOBUFDS: "iods"})
+    assert len(table) == len(Buffer)
+    assert table[Buffer.OBUF.code] == "o"
+    assert table[Buffer.IOBUFDS.code] == "iods"
+    assert table[Buffer.IBUF.code] is None
+
+
+def test_rows_hold_members() -> None:
+    """Strings are resolved to members once, when the row is built."""
+    signal_table = build_signal_table(_DOC)
+    gpio, spare = signal_table
+    assert gpio.buffer is Buffer.IOBUF
+    assert gpio.direction is Direction.INOUT
+    assert gpio.iostandard is IOStandard.LVCMOS18
+    assert spare.buffer is None
+    assert spare.direction is Direction.OUT
+    assert signal_table.tristate() == (gpio,)
+    pin = build_pin_table(signal_table)["gpio"][0]
+    assert pin.buffer is Buffer.IOBUF and pin.direction is Direction.INOUT
+
+
+def test_from_mapping_resolves_members() -> None:
+    row = build_signal_table(_DOC).table[0].to_dict()
+    row = {**row, "buffer": "iobuf", "direction": "inout", "iostandard": "LVCMOS18"}
+    resolved = SignalRow.from_mapping(row)
+    assert resolved.buffer is Buffer.IOBUF
+    assert resolved.direction is Direction.INOUT
+    assert resolved.iostandard is IOStandard.LVCMOS18
+
+
+def test_ir_round_trip_resolves_members() -> None:
+    design = ValidatedDesign(
+        doc={},
+        meta_table=MetaTable("Test", "xc7k325tffg900-2", None),
+        constraints_table=ConstraintsTable("GND", 1.8),
+        signal_table=build_signal_table(_DOC),
+    )
+    gpio = next(iter(load_ir(dump_ir(design)).signal_table))
+    assert gpio.buffer is Buffer.IOBUF
+    assert gpio.direction is Direction.INOUT
+    assert gpio.iostandard is IOStandard.LVCMOS18
@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from io_gen.files import create_temporary, new_file_mode, output_mode
+
+
+@pytest.fixture
+def umask_022():
+    umask = os.umask(0o022)
+    new_file_mode.cache_clear()
+    yield
+    os.umask(umask)
+    new_file_mode.cache_clear()
+
+
+def test_new_file_mode_follows_umask(umask_022: None) -> None:
+    assert new_file_mode() == 0o644
+
+
+def test_new_file_mode_leaves_umask_alone(
+    umask_022: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def umask(mask: int) -> int:
+        raise AssertionError("the umask was changed")
+
+    monkeypatch.setattr(os, "umask", umask)
+    assert new_file_mode() == 0o644
+
+
+def test_output_mode_of_existing_file(tmp_path: Path, umask_022: None) -> None:
+    path = tmp_path / "out.txt"
+    path.touch()
+    path.chmod(0o660)
+    assert output_mode(path) == 0o660
+    assert output_mode(tmp_path / "missing.txt") == 0o644
+
+
+def test_create_temporary(tmp_path: Path) -> None:
+    path = tmp_path / "out.txt"
+    path.touch()
+    path.chmod(0o640)
+    fd, tmp = create_temporary(path)
+    os.close(fd)
+    assert tmp.parent == tmp_path
+    assert tmp.stat().st_mode & 0o777 == 0o640
@@ -0,0 +1,171 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import io_gen.pipeline as pipeline
+from io_gen.exceptions import ValidationError
+from io_gen.files import new_file_mode
+from io_gen.ir import IR_FORMAT, dump_ir, load_ir, read_ir, write_ir
+from io_gen.pipeline import _load_design, run_pipeline
+
+from tests.test_pipeline import VALID_YAML, write_yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+EXAMPLE_YAML = REPO_ROOT / "examples" / "example.yaml"
+
+
+def _design():
+    return _load_design(EXAMPLE_YAML, None)
+
+
+# ---------------------------------------------------------------------------
+# Round trip
+# ---------------------------------------------------------------------------
+
+
+def test_round_trip() -> None:
+    design = _design()
+    loaded = load_ir(dump_ir(design))
+    assert loaded.doc == {}
+    assert loaded.meta_table == design.meta_table
+    assert loaded.constraints_table == design.constraints_table
+    assert list(loaded.signal_table) == list(design.signal_table)
+
+
+def test_round_trip_rows_frozen() -> None:
+    """Buses come back as tuples, the same as a table built from YAML."""
+    loaded = load_ir(dump_ir(_design()))
+    for sig in loaded.signal_table:
+        if sig.pinset is None:
+            assert isinstance(sig.pins, (str, tuple))
+        else:
+            assert isinstance(sig.pinset.p, (str, tuple))
+            assert isinstance(sig.pinset.n, (str, tuple))
+
+
+def test_ir_is_deterministic() -> None:
+    assert dump_ir(_design()) == dump_ir(_design())
+
+
+def test_ir_smaller_than_yaml() -> None:
+    assert len(dump_ir(_design())) < EXAMPLE_YAML.stat().st_size
+
+
+def test_write_and_read(tmp_path: Path) -> None:
+    path = tmp_path / "design.ir"
+    write_ir(path, _design())
+    assert read_ir(path).meta_table == _design().meta_table
+    # Only the IR file is left behind
+    assert [p.name for p in tmp_path.iterdir()] == ["design.ir"]
+
+
+def test_written_ir_follows_umask(tmp_path: Path) -> None:
+    umask = os.umask(0o022)
+    new_file_mode.cache_clear()
+    try:
+        write_ir(tmp_path / "design.ir", _design())
+    finally:
+        os.umask(umask)
+        new_file_mode.cache_clear()
+    assert (tmp_path / "design.ir").stat().st_mode & 0o777 == 0o644
+
+
+def test_rewritten_ir_keeps_mode(tmp_path: Path) -> None:
+    path = tmp_path / "design.ir"
+    write_ir(path, _design())
+    path.chmod(0o640)
+    write_ir(path, _design())
+    assert path.stat().st_mode & 0o777 == 0o640
+
+
+# ---------------------------------------------------------------------------
+# Rejected files
+# ---------------------------------------------------------------------------
+
+
+def test_not_an_ir_file() -> None:
+    with pytest.raises(ValueError, match="not an io-gen IR file"):
+        load_ir(EXAMPLE_YAML.read_bytes())
+    with pytest.raises(ValueError, match="not an io-gen IR file"):
+        load_ir(b"")
+
+
+def test_other_format_rejected() -> None:
+    data = dump_ir(_design())
+    stale = data.replace(b" %d " % IR_FORMAT, b" %d " % (IR_FORMAT + 1), 1)
+    with pytest.raises(ValueError, match=f"IR format {IR_FORMAT + 1} is not supported"):
+        load_ir(stale)
+
+
+@pytest.mark.parametrize("position", [-1, -100, 80])
+def test_corrupted_payload_rejected(position: int) -> None:
+    data = bytearray(dump_ir(_design()))
+    data[position] ^= 0xFF
+    with pytest.raises(ValueError, match="digest mismatch"):
+        load_ir(bytes(data))
+
+
+def test_truncated_rejected() -> None:
+    data = dump_ir(_design())
+    with pytest.raises(ValueError, match="digest mismatch"):
+        load_ir(data[: len(data) // 2])
+
+
+def test_malformed_payload_rejected() -> None:
+    import hashlib
+    import zlib
+
+    body = zlib.compress(b'{"meta": []}')
+    data = b"io-gen-ir %d %s\n" % (IR_FORMAT, hashlib.sha256(body).hexdigest().encode())
+    with pytest.raises(ValueError, match="IR file is malformed"):
+        load_ir(data + body)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("lang", ["verilog", "vhdl"])
+def test_pipeline_from_ir_output_identical(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, lang: str
+) -> None:
+    ir_path = tmp_path / "example.ir"
+    run_pipeline(
+        EXAMPLE_YAML, "example", lang, tmp_path / "yaml",
+        validate_only=False, rtl_only=False, xdc_only=False, emit_ir=ir_path,
+    )
+
+    # Loading the IR never reads or validates YAML
+    def no_yaml(*args, **kwargs):
+        raise AssertionError("YAML loaded")
+
+    monkeypatch.setattr(pipeline, "_load_design", no_yaml)
+    run_pipeline(
+        ir_path, "example", lang, tmp_path / "ir",
+        validate_only=False, rtl_only=False, xdc_only=False, from_ir=True,
+    )
+    for path in (tmp_path / "yaml").iterdir():
+        assert (tmp_path / "ir" / path.name).read_text() == path.read_text()
+
+
+def test_validate_only_emits_ir(tmp_path: Path) -> None:
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    ir_path = tmp_path / "design.ir"
+    run_pipeline(
+        yaml_path, "top", "verilog", tmp_path / "out",
+        validate_only=True, rtl_only=False, xdc_only=False, emit_ir=ir_path,
+    )
+    assert not (tmp_path / "out").exists()
+    assert [sig.name for sig in read_ir(ir_path).signal_table] == ["sys_clk"]
+
+
+def test_from_ir_still_checks_top(tmp_path: Path) -> None:
+    ir_path = tmp_path / "design.ir"
+    write_ir(ir_path, _design())
+    with pytest.raises(ValidationError):
+        run_pipeline(
+            ir_path, "1bad", "verilog", tmp_path,
+            validate_only=True, rtl_only=False, xdc_only=False, from_ir=True,
+        )
@@ -0,0 +1,193 @@
+import importlib
+from typing import Any
+
+import pytest
+import yaml
+
+from io_gen import ValidationError, iter_diagnostics
+from io_gen import parallel
+from io_gen.validate import _validate_structural, clear_validator_cache, get_validator
+
+from tests.test_validate import (
+    INVALID_STRUCTURAL_CASES,
+    VALID_STRUCTURAL_CASES,
+    load_yaml,
+)
+
+# The package re-exports the validate() function under the same name as its module
+validate_module = importlib.import_module("io_gen.validate")
+
+
+@pytest.fixture
+def split_everything(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Send even the tiny test documents to the process pool"""
+    monkeypatch.setattr(parallel, "PARALLEL_THRESHOLD", 1)
+
+
+def _large_doc(count: int) -> dict:
+    """A valid document with count signals of mixed shapes on unique pins"""
+    signals: list[dict] = []
+    for index in range(count):
+        if index % 3 == 0:
+            signals.append(
+                {
+                    "name": f"clk_{index}",
+                    "pins": f"A{index}",
+                    "direction": "in",
+                    "buffer": "ibuf",
+                    "iostandard": "LVCMOS18",
+                }
+            )
+        elif index % 3 == 1:
+            signals.append(
+                {
+                    "name": f"led_{index}",
+                    "pins": [f"B{index * 4 + bit}" for bit in range(4)],
+                    "width": 4,
+                    "direction": "out",
+                    "buffer": "obuf",
+                    "iostandard": "LVCMOS33",
+                }
+            )
+        else:
+            signals.append(
+                {
+                    "name": f"lvds_{index}",
+                    "pinset": {"p": f"C{index}", "n": f"D{index}"},
+                    "direction": "in",
+                    "buffer": "ibufds",
+                    "iostandard": "LVDS_25",
+                }
+            )
+    return {
+        "title": "Test",
+        "part": "xc7k325tffg900-2",
+        "constraints": {"config_voltage": 3.3, "cfgbvs": "VCCO"},
+        "signals": signals,
+    }
+
+
+def _outcome(doc: Any, jobs: int, reference: bool = False) -> str | None:
+    try:
+        _validate_structural(doc, reference=reference, jobs=jobs)
+    except ValidationError as e:
+        return str(e)
+    return None
+
+
+def _broken_doc() -> dict:
+    """A large document with errors in several chunks and at the top level"""
+    doc = _large_doc(100)
+    doc["title"] = 42
+    doc["constraints"]["extra"] = 1
+    doc["signals"][3]["direction"] = "input"
+    doc["signals"][3]["slew"] = "fast"
+    doc["signals"][len(doc["signals"]) // 2] = "not_a_signal"
+    doc["signals"][-1]["width"] = 0
+    return doc
+
+
+# ---------------------------------------------------------------------------
+# Splitting
+# ---------------------------------------------------------------------------
+
+
+def test_small_documents_not_split(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Below the threshold no worker processes are started."""
+
+    def fail(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr("concurrent.futures.ProcessPoolExecutor", fail)
+    doc = load_yaml(INVALID_STRUCTURAL_CASES[0][1])
+    with pytest.raises(ValidationError):
+        _validate_structural(doc, reference=True, jobs=4)
+    assert list(iter_diagnostics(doc, jobs=4))
+
+
+def test_can_split() -> None:
+    schema = parallel.top_schema(get_validator())
+    doc = _large_doc(parallel.PARALLEL_THRESHOLD)
+    assert parallel.can_split(doc, schema, 2)
+    assert not parallel.can_split(doc, schema, 1)
+    assert not parallel.can_split({"signals": doc["signals"][:1]}, schema, 2)
+    assert not parallel.can_split({"signals": "x"}, schema, 2)
+    assert not parallel.can_split([], schema, 2)
+    constrained = {"properties": {"signals": {"type": "array", "minItems": 1}}}
+    assert not parallel.can_split(doc, constrained, 2)
+
+
+# ---------------------------------------------------------------------------
+# Differential testing against the serial path
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("reference", [False, True], ids=["compiled", "reference"])
+@pytest.mark.parametrize(
+    "yaml_text",
+    [pytest.param(y, id=n) for n, y in INVALID_STRUCTURAL_CASES + VALID_STRUCTURAL_CASES],
+)
+def test_split_matches_serial(
+    split_everything: None, yaml_text: str, reference: bool
+) -> None:
+    doc = load_yaml(yaml_text)
+    assert _outcome(doc, 2, reference) == _outcome(doc, 1, reference)
+
+
+@pytest.mark.parametrize("reference", [False, True], ids=["compiled", "reference"])
+def test_split_matches_serial_large(split_everything: None, reference: bool) -> None:
+    doc = _broken_doc()
+    expected = _outcome(doc, 1, reference)
+    assert expected is not None
+    assert _outcome(doc, 3, reference) == expected
+    # Without the top level errors, the first signal error is reported
+    del doc["constraints"]["extra"]
+    doc["title"] = "Test"
+    expected = _outcome(doc, 1, reference)
+    assert expected is not None
+    assert expected.startswith("clk_3: ")
+    assert _outcome(doc, 3, reference) == expected
+
+
+def test_split_diagnostics_match_serial(split_everything: None) -> None:
+    doc = _broken_doc()
+    expected = list(iter_diagnostics(doc))
+    assert len(expected) > 4
+    assert list(iter_diagnostics(doc, jobs=3)) == expected
+
+
+def test_split_diagnostics_stale_compiled(
+    split_everything: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Workers fall back to jsonschema for every signal without the compiled validator."""
+    doc = _broken_doc()
+    expected = list(iter_diagnostics(doc))
+    monkeypatch.setattr(validate_module, "get_compiled_validator", lambda: None)
+    assert list(iter_diagnostics(doc, jobs=2)) == expected
+
+
+def test_split_valid_document(split_everything: None) -> None:
+    doc = _large_doc(100)
+    assert _outcome(doc, 2, reference=True) is None
+    assert list(iter_diagnostics(doc, jobs=2)) == []
+
+
+def test_collect_limit(split_everything: None) -> None:
+    doc = _broken_doc()
+    with pytest.raises(ValidationError) as exc_info:
+        validate_module._collect_diagnostics(doc, 2, jobs=2)
+    assert exc_info.value.diagnostics == list(iter_diagnostics(doc))[:2]
+
+
+def test_validate_bytes_jobs(split_everything: None) -> None:
+    clear_validator_cache()
+    data = yaml.safe_dump(_large_doc(50), sort_keys=False).encode()
+    assert validate_module.validate_bytes(data, jobs=2)["title"]
+
+
+def test_top_schema_rejects_boolean_schemas() -> None:
+    import jsonschema
+
+    assert parallel.top_schema(get_validator())["type"] == "object"
+    with pytest.raises(TypeError):
+        parallel.top_schema(jsonschema.Draft202012Validator(True))
@@ -1,7 +1,24 @@
+import pickle
+from array import array
+
 import pytest
 
-from io_gen.tables.pin_table import PinTable, build_pin_table
-from io_gen.tables.signal_table import SignalTable, build_signal_table
+from io_gen.tables import Direction
+from io_gen.tables.pin_table import (
+    PinColumns,
+    PinLocation,
+    PinRow,
+    PinTable,
+    buffer_instances,
+    build_pin_table,
+    pin_is_differential,
+)
+from io_gen.tables.signal_table import (
+    SignalDiff,
+    SignalTable,
+    build_signal_table,
+    diff_signals,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -438,3 +455,344 @@ def test_getitem_differential_scalar_row_contents() -> None:
     assert rows[0]["iostandard"] == "LVDS"
     assert rows[0]["is_bus"] is False
     assert rows[0]["instance"] == "ibufds_ref_clk_i0"
+
+
+def test_rows_are_slotted() -> None:
+    """Pin rows are PinRow objects that still compare equal to their dict form."""
+    table = PinTable()
+    table.add(
+        {
+            "name": "ref_clk",
+            "pinset": {"p": "H22", "n": "H23"},
+            "width": 1,
+            "direction": "in",
+            "buffer": "ibufds",
+            "iostandard": "LVDS",
+            "infer": False,
+            "bypass": False,
+            "comment": {},
+            "instance": "ibufds_ref_clk",
+        }
+    )
+    row = table["ref_clk"][0]
+    assert isinstance(row, PinRow)
+    assert not hasattr(row, "__dict__")
+    assert row.pinset == {"p": "H22", "n": "H23"}
+    assert row.pin is None
+    assert "pin" not in row
+    assert pin_is_differential(row)
+    assert row == {
+        "pinset": {"p": "H22", "n": "H23"},
+        "iostandard": "LVDS",
+        "direction": "in",
+        "buffer": "ibufds",
+        "infer": False,
+        "instance": "ibufds_ref_clk_i0",
+        "is_bus": False,
+        "index": 0,
+    }
+
+
+def test_pin_row_from_mapping() -> None:
+    """A pin row in dict form converts to the PinRow it compares equal to."""
+    row = {
+        "pinset": {"p": "H22", "n": "H23"},
+        "iostandard": "LVDS",
+        "direction": "in",
+        "buffer": "ibufds",
+        "infer": False,
+        "instance": "ibufds_ref_clk_i0",
+        "is_bus": False,
+        "index": 0,
+    }
+    pin_row = PinRow.from_mapping(row)
+    assert isinstance(pin_row, PinRow)
+    assert pin_row == row
+    assert pin_row.pinset is not None
+    assert pin_row.pinset.p == "H22"
+    assert pin_row.direction is Direction.IN
+    assert PinRow.from_mapping(pin_row) is pin_row
+
+
+def test_table_view_flattens_on_lookup() -> None:
+    """pt.table reads like a dict of pins by signal, flattening only what is looked up."""
+    pin_table = build_pin_table(build_signal_table(_INTEGRATION_DOC))
+    assert list(pin_table.table) == ["sys_clk", "led", "ref_clk"]
+    assert len(pin_table.table) == 3
+    assert "led" in pin_table.table
+    assert pin_table.flattened() == []
+    assert pin_table.table["led"] is pin_table.columns("led")
+    assert pin_table.flattened() == ["led"]
+    with pytest.raises(KeyError):
+        pin_table.table["nope"]
+
+
+# ---------------------------------------------------------------------------
+# Columnar storage
+# ---------------------------------------------------------------------------
+
+
+def test_pins_stored_as_ids() -> None:
+    """Each pin name is pooled once and referred to by id from compact arrays."""
+    signal_table = build_signal_table(_INTEGRATION_DOC)
+    pin_table = build_pin_table(signal_table)
+    columns = pin_table.columns("led")
+    assert isinstance(columns, PinColumns)
+    assert isinstance(columns.pins, array)
+    assert [pin_table.names.names[i] for i in columns.pins] == ["A22", "B22", "C22", "D22"]
+    assert columns.n_pins is None
+    pin_table.columns("sys_clk")
+    assert pin_table.columns("ref_clk").is_differential
+    assert len(pin_table.names) == pin_table.pin_count() + 1 == 7
+
+
+def test_columns_index_like_a_list() -> None:
+    """Indexing the columns produces the same rows as the list from pt[name]."""
+    signal_table = build_signal_table(_INTEGRATION_DOC)
+    pin_table = build_pin_table(signal_table)
+    columns = pin_table.columns("led")
+    rows = pin_table["led"]
+    assert columns[1] == rows[1]
+    assert columns[-1] == rows[-1]
+    assert columns == rows
+    with pytest.raises(IndexError):
+        columns[4]
+
+
+def test_columns_pickle_round_trip() -> None:
+    """A pickled pin table unpickles with the same rows."""
+    signal_table = build_signal_table(_INTEGRATION_DOC)
+    pin_table = build_pin_table(signal_table)
+    pin_table.columns("ref_clk")
+    loaded = pickle.loads(pickle.dumps(pin_table))
+    assert loaded.table == pin_table.table
+    assert loaded["led"] == pin_table["led"]
+    assert loaded["ref_clk"][0].pinset == {"p": "H22", "n": "H23"}
+
+
+# ---------------------------------------------------------------------------
+# Lazy flattening
+# ---------------------------------------------------------------------------
+
+
+def test_signals_flattened_on_first_access() -> None:
+    """Signals are flattened when first looked up, and only once."""
+    signal_table = build_signal_table(_INTEGRATION_DOC)
+    pin_table = build_pin_table(signal_table)
+    assert pin_table.flattened() == []
+    assert len(pin_table) == 3
+    assert pin_table.pin_count() == 6
+    pin_table["led"]
+    assert pin_table.flattened() == ["led"]
+    assert pin_table.columns("led") is pin_table.columns("led")
+
+
+def test_add_replaces_flattened_signal() -> None:
+    """Adding a signal again drops the pins flattened for the previous one."""
+    table = PinTable()
+    sig = {
+        "name": "sys_clk",
+        "pins": "G22",
+        "width": 1,
+        "direction": "in",
+        "buffer": "ibuf",
+        "iostandard": "LVCMOS18",
+        "infer": False,
+        "bypass": False,
+        "comment": {},
+        "instance": "ibuf_sys_clk",
+    }
+    table.add(sig)
+    assert table["sys_clk"][0].pin == "G22"
+    table.add({**sig, "pins": "G23"})
+    assert table["sys_clk"][0].pin == "G23"
+
+
+def test_missing_signal_not_flattened() -> None:
+    """Looking up a missing signal raises KeyError and caches nothing."""
+    table = PinTable()
+    with pytest.raises(KeyError, match="'nope' not found in pin table"):
+        table.columns("nope")
+    assert table.flattened() == []
+
+
+@pytest.mark.parametrize("infer, bypass", [(False, False), (True, False), (False, True)])
+def test_buffer_instances_match_pin_rows(infer: bool, bypass: bool) -> None:
+    """buffer_instances() gives the instance names of the pin rows without flattening."""
+    doc = {
+        "title": "Test",
+        "part": "xc7k325tffg900-2",
+        "signals": [
+            {
+                "name": "lvds",
+                "pinset": {"p": ["A1", "B1"], "n": ["A2", "B2"]},
+                "width": 2,
+                "direction": "in",
+                "buffer": "ibufds",
+                "iostandard": "LVDS",
+                "infer": infer,
+                "bypass": bypass,
+            }
+        ],
+    }
+    signal_table = build_signal_table(doc)
+    pin_table = build_pin_table(signal_table)
+    sig = next(iter(signal_table))
+    expected = [row.instance for row in pin_table["lvds"] if row.instance is not None]
+    assert buffer_instances(sig) == expected
+
+
+def test_buffer_instances_in_bus_loops() -> None:
+    """Each bit of a looped bus is named inside the loop; scalars aren't looped."""
+    signal_table = build_signal_table(_INTEGRATION_DOC)
+    sys_clk, led, _ = signal_table
+    assert buffer_instances(led, bus_loops=True) == [
+        f"obuf_led_i[{index}].obuf_led" for index in range(4)
+    ]
+    assert buffer_instances(sys_clk, bus_loops=True) == buffer_instances(sys_clk)
+
+
+# ---------------------------------------------------------------------------
+# Reverse indexes
+# ---------------------------------------------------------------------------
+
+
+def test_locate_pins() -> None:
+    """locate() gives the signal, bit and leg that use a package pin."""
+    pin_table = build_pin_table(build_signal_table(_INTEGRATION_DOC))
+    assert pin_table.locate("G22") == PinLocation("sys_clk", 0)
+    assert pin_table.locate("C22") == PinLocation("led", 2)
+    assert pin_table.locate("H23") == PinLocation("ref_clk", 0, "n")
+    with pytest.raises(KeyError, match="'H24' not found"):
+        pin_table.locate("H24")
+    # The index is built from the signal rows, without flattening them
+    assert pin_table.flattened() == []
+
+
+def test_pins_by_iostandard_and_direction() -> None:
+    """The package pins of every signal with an IO standard or direction, in order."""
+    pin_table = build_pin_table(build_signal_table(_INTEGRATION_DOC))
+    assert pin_table.pins_with_iostandard("LVDS") == ["H22", "H23"]
+    assert pin_table.pins_with_iostandard("LVCMOS18") == ["G22", "A22", "B22", "C22", "D22"]
+    assert pin_table.pins_with_direction("in") == ["G22", "H22", "H23"]
+    assert pin_table.pins_with_direction("inout") == []
+    # Callers get their own list
+    pin_table.pins_with_direction("in").clear()
+    assert pin_table.pins_with_direction("in") == ["G22", "H22", "H23"]
+
+
+def test_index_rebuilt_after_add() -> None:
+    """Adding a signal invalidates the index."""
+    pin_table = build_pin_table(build_signal_table(_INTEGRATION_DOC))
+    assert pin_table.index is pin_table.index
+    pin_table.add(
+        {
+            "name": "spare",
+            "pins": "J24",
+            "width": 1,
+            "direction": "out",
+            "buffer": None,
+            "iostandard": "LVCMOS33",
+            "infer": False,
+            "bypass": True,
+            "comment": {},
+            "instance": None,
+        }
+    )
+    assert pin_table.locate("J24") == PinLocation("spare", 0)
+    assert pin_table.pins_with_iostandard("LVCMOS33") == ["J24"]
+
+
+# ---------------------------------------------------------------------------
+# Incremental updates
+# ---------------------------------------------------------------------------
+
+_EDITED_SIGNALS = [
+    {
+        "name": "spare",
+        "pins": "J24",
+        "direction": "out",
+        "buffer": "obuf",
+        "iostandard": "LVCMOS33",
+    },
+    _INTEGRATION_DOC["signals"][0],
+    {**_INTEGRATION_DOC["signals"][1], "pins": ["A23", "B23"], "width": 2},
+    {
+        **_INTEGRATION_DOC["signals"][3],
+        "generate": True,
+        "direction": "in",
+        "buffer": "ibuf",
+        "iostandard": "LVCMOS18",
+    },
+]
+
+
+def _updated_pin_table(build_index: bool) -> tuple[PinTable, PinTable]:
+    old = _INTEGRATION_DOC["signals"]
+    signal_table = build_signal_table(_INTEGRATION_DOC)
+    pin_table = build_pin_table(signal_table)
+    pin_table.columns("sys_clk")
+    if build_index:
+        pin_table.locate("G22")
+    signal_table.apply(diff_signals(old, _EDITED_SIGNALS))
+    pin_table.update(signal_table, signal_table.take_changes())
+    return pin_table, build_pin_table(signal_table)
+
+
+@pytest.mark.parametrize("build_index", [False, True])
+def test_update_matches_rebuild(build_index: bool) -> None:
+    """Updating a pin table gives the same pins as rebuilding it."""
+    pin_table, rebuilt = _updated_pin_table(build_index)
+    assert list(pin_table.signals) == list(rebuilt.signals)
+    for name in rebuilt.signals:
+        assert pin_table[name] == rebuilt[name]
+    assert "ref_clk" not in pin_table
+    for pin in ("H22", "A22"):
+        with pytest.raises(KeyError):
+            pin_table.locate(pin)
+    for pin in ("J24", "G22", "A23", "B23", "H24"):
+        assert pin_table.locate(pin) == rebuilt.locate(pin)
+    # Pins of the signals that changed are listed after the others
+    assert sorted(pin_table.pins_with_iostandard("LVCMOS18")) == sorted(
+        rebuilt.pins_with_iostandard("LVCMOS18")
+    )
+    assert pin_table.pins_with_iostandard("LVDS") == []
+    assert sorted(pin_table.pins_with_direction("out")) == ["A23", "B23", "J24"]
+
+
+def test_update_keeps_unchanged_signals_flattened() -> None:
+    """Only the flattened pins of the signals that changed are dropped."""
+    signal_table = build_signal_table(_INTEGRATION_DOC)
+    pin_table = build_pin_table(signal_table)
+    columns = pin_table.columns("sys_clk")
+    pin_table.columns("led")
+    signal_table.apply(SignalDiff(removed=["led"]))
+    pin_table.update(signal_table, signal_table.take_changes())
+    assert pin_table.columns("sys_clk") is columns
+    assert "led" not in pin_table.table and "led" not in pin_table
+
+
+def test_update_bounds_pin_name_pool() -> None:
+    """Names of pins no longer used are dropped once they outnumber the rest."""
+    signals = [dict(sig) for sig in _INTEGRATION_DOC["signals"]]
+    signal_table = build_signal_table(_INTEGRATION_DOC)
+    pin_table = build_pin_table(signal_table)
+    for name in pin_table.signals:
+        pin_table.columns(name)
+    sys_clk = pin_table.columns("sys_clk")
+    # Every name in the pool of a freshly flattened table is in use
+    live = len(pin_table.names)
+    for round in range(50):
+        edited = [dict(sig) for sig in signals]
+        edited[1] = {**edited[1], "pins": [f"X{round}", f"Y{round}"]}
+        signal_table.apply(diff_signals(signals, edited))
+        pin_table.update(signal_table, signal_table.take_changes())
+        signals = edited
+        for name in pin_table.signals:
+            pin_table.columns(name)
+        assert len(pin_table.names) <= 2 * live
+    rebuilt = build_pin_table(signal_table)
+    for name in rebuilt.signals:
+        assert pin_table[name] == rebuilt[name]
+    # Flattened pins handed out before the pool was compacted still read correctly
+    assert list(sys_clk) == rebuilt["sys_clk"]
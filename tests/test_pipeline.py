@@ -1,10 +1,19 @@
+import os
+import time
 from pathlib import Path
 from textwrap import dedent
 
 import pytest
 
 from io_gen.exceptions import ValidationError
-from io_gen.pipeline import run_pipeline
+from io_gen.files import new_file_mode
+from io_gen.pipeline import (
+    _write_output,
+    _write_outputs,
+    parse_languages,
+    run_pipeline,
+    run_query,
+)
 
 
 VALID_YAML = dedent("""\
@@ -55,6 +64,20 @@ def test_validate_only_no_files_written(tmp_path: Path) -> None:
     assert list(out.iterdir()) == []
 
 
+def test_validate_only_no_pin_table(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def build_pin_table(signal_table):
+        raise AssertionError("the pin table was built")
+
+    monkeypatch.setattr("io_gen.pipeline.build_pin_table", build_pin_table)
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    for lang in ("verilog", "vhdl"):
+        run_pipeline(
+            yaml_path, "top", lang, tmp_path, validate_only=True, rtl_only=False, xdc_only=False
+        )
+
+
 def test_validate_only_invalid_yaml_raises(tmp_path: Path) -> None:
     yaml_path = write_yaml(tmp_path, INVALID_YAML)
     out = tmp_path / "out"
@@ -109,6 +132,285 @@ def test_xdc_only_no_rtl(tmp_path: Path) -> None:
     assert not (out / "top_io.v").exists()
 
 
+@pytest.mark.parametrize("lang, ext, loop, instance", [
+    ("verilog", "v", "begin : obuf_led_i\n", "\n            obuf_led (\n"),
+    (
+        "vhdl",
+        "vhd",
+        "obuf_led_i : for obuf_led_n in 0 to 1 generate\n",
+        "\n        obuf_led : OBUF\n",
+    ),
+])
+def test_bus_loops(
+    tmp_path: Path, capsys: pytest.CaptureFixture, lang: str, ext: str, loop: str,
+    instance: str,
+) -> None:
+    bus_yaml = VALID_YAML + (
+        "  - name: led\n"
+        "    pins: [A1, A2]\n"
+        "    width: 2\n"
+        "    iostandard: LVCMOS18\n"
+        "    direction: out\n"
+        "    buffer: obuf\n"
+    )
+    yaml_path = write_yaml(tmp_path, bus_yaml)
+    out = tmp_path / "out"
+    run_pipeline(
+        yaml_path, "top", lang, out, validate_only=False, rtl_only=True, xdc_only=False,
+        bus_loops=True,
+    )
+    ioring = (out / f"top_io.{ext}").read_text(encoding="utf-8")
+    # Bit N of the bus is the cell obuf_led_i[N].obuf_led
+    assert loop in ioring
+    assert instance in ioring
+    assert "obuf_led_i0" not in ioring
+    # Scalars are still instantiated on their own
+    assert "ibuf_sys_clk_i0" in ioring
+    # The renamed cells are reported
+    assert capsys.readouterr().err == (
+        "Warning: signal 'led': bus loops rename its buffers "
+        "('obuf_led_i0' is now 'obuf_led_i[0].obuf_led')\n"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Several languages
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("lang, expected", [
+    ("verilog", ["verilog"]),
+    ("VHDL", ["vhdl"]),
+    ("both", ["verilog", "vhdl"]),
+    ("vhdl,verilog", ["verilog", "vhdl"]),
+    ("verilog, vhdl, verilog", ["verilog", "vhdl"]),
+])
+def test_parse_languages(lang: str, expected: list[str]) -> None:
+    assert parse_languages(lang) == expected
+
+
+@pytest.mark.parametrize("lang", ["", "verilog,", "systemc", "verilog,vhd"])
+def test_parse_languages_rejects_unknown(lang: str) -> None:
+    with pytest.raises(ValueError, match="unknown language"):
+        parse_languages(lang)
+
+
+def test_both_languages_written(tmp_path: Path) -> None:
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    single = tmp_path / "single"
+    for lang in ("verilog", "vhdl"):
+        run_pipeline(
+            yaml_path, "top", lang, single, validate_only=False, rtl_only=False,
+            xdc_only=False,
+        )
+    out = tmp_path / "out"
+    run_pipeline(
+        yaml_path, "top", "both", out, validate_only=False, rtl_only=False,
+        xdc_only=False,
+    )
+    names = ["top.xdc", "top.v", "top_io.v", "top.vhd", "top_io.vhd"]
+    assert sorted(p.name for p in out.iterdir()) == sorted(names)
+    for name in names:
+        assert (out / name).read_text(encoding="utf-8") == (single / name).read_text(
+            encoding="utf-8"
+        )
+
+
+def test_outputs_reported_in_order(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    out = tmp_path / "out"
+    run_pipeline(
+        yaml_path, "top", "vhdl,verilog", out, validate_only=False, rtl_only=False,
+        xdc_only=False,
+    )
+    written = [
+        Path(line.rsplit(" ", 1)[1]).name
+        for line in capsys.readouterr().out.splitlines()
+        if line.startswith("Info: Wrote")
+    ]
+    assert written == ["top.xdc", "top.v", "top_io.v", "top.vhd", "top_io.vhd"]
+
+
+def test_first_failing_output_raises(tmp_path: Path) -> None:
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    out = tmp_path / "out"
+    # Directories in the way of two of the outputs make writing them fail
+    (out / "top_io.vhd").mkdir(parents=True)
+    (out / "top.v").mkdir()
+    with pytest.raises(IsADirectoryError) as exc_info:
+        run_pipeline(
+            yaml_path, "top", "both", out, validate_only=False, rtl_only=False,
+            xdc_only=False,
+        )
+    # Outputs are moved into place from a temporary file
+    assert Path(exc_info.value.filename2).name == "top.v"
+    # The outputs that could be written still are
+    for name in ("top.xdc", "top_io.v", "top.vhd"):
+        assert (out / name).is_file()
+
+
+def _outputs(tmp_path: Path, failing: set[int]) -> list:
+    """Five outputs, the first of them slowest, and those in failing raising"""
+
+    def writer(out, index: int) -> None:
+        if index == 0:
+            time.sleep(0.05)
+        if index in failing:
+            raise RuntimeError(f"output {index} failed")
+        out.write(f"output {index}\n")
+
+    return [
+        (f"output {index}", tmp_path / f"{index}.txt", writer, (index,))
+        for index in range(5)
+    ]
+
+
+@pytest.mark.parametrize("failing", [set(), {3, 1}], ids=["pass", "fail"])
+def test_pool_matches_serial(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], failing: set[int]
+) -> None:
+    """However many workers, the same files, messages and error come out."""
+    results = []
+    for workers in (1, 5):
+        out = tmp_path / str(workers)
+        out.mkdir()
+        try:
+            _write_outputs(_outputs(out, failing), workers)
+            error = None
+        except RuntimeError as e:
+            error = str(e)
+        stdout = capsys.readouterr().out.replace(str(out), "OUT")
+        files = {p.name: p.read_text(encoding="utf-8") for p in out.iterdir()}
+        results.append((error, stdout, files))
+    assert results[0] == results[1]
+    error, stdout, files = results[0]
+    assert error == ("output 1 failed" if failing else None)
+    assert sorted(files) == [f"{i}.txt" for i in range(5) if i not in failing]
+    assert stdout.splitlines()[0] == "Info: Wrote output 0 to OUT/0.txt"
+
+
+def test_single_cpu_writes_in_process(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Without a second CPU to render on, no worker processes are started."""
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    monkeypatch.setattr("concurrent.futures.ProcessPoolExecutor", fail)
+    _write_outputs(_outputs(tmp_path, set()))
+    assert len(list(tmp_path.iterdir())) == 5
+
+
+def test_both_languages_validated(tmp_path: Path) -> None:
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    out = tmp_path / "out"
+    # A reserved word in VHDL only
+    with pytest.raises(ValidationError):
+        run_pipeline(
+            yaml_path, "entity", "both", out, validate_only=False, rtl_only=False,
+            xdc_only=False,
+        )
+    assert not list(out.iterdir())
+
+
+# ---------------------------------------------------------------------------
+# Unchanged outputs
+# ---------------------------------------------------------------------------
+
+
+def _age(out: Path) -> dict[str, int]:
+    """Backdate every file in out, returning their new modification times"""
+    for path in out.iterdir():
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    return {path.name: path.stat().st_mtime_ns for path in out.iterdir()}
+
+
+def test_unchanged_outputs_not_rewritten(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    out = tmp_path / "out"
+    run_pipeline(
+        yaml_path, "top", "verilog", out, validate_only=False, rtl_only=False,
+        xdc_only=False,
+    )
+    assert "Info: 3 files written, 0 unchanged" in capsys.readouterr().out
+    mtimes = _age(out)
+    run_pipeline(
+        yaml_path, "top", "verilog", out, validate_only=False, rtl_only=False,
+        xdc_only=False,
+    )
+    stdout = capsys.readouterr().out
+    assert "Info: Wrote" not in stdout
+    assert "Info: 0 files written, 3 unchanged" in stdout
+    assert {path.name: path.stat().st_mtime_ns for path in out.iterdir()} == mtimes
+
+
+def test_only_changed_outputs_rewritten(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    yaml_path = write_yaml(tmp_path, VALID_YAML)
+    out = tmp_path / "out"
+    run_pipeline(
+        yaml_path, "top", "verilog", out, validate_only=False, rtl_only=False,
+        xdc_only=False,
+    )
+    mtimes = _age(out)
+    # Moving the pin only changes the XDC
+    yaml_path.write_text(VALID_YAML.replace("G22", "H22"), encoding="utf-8")
+    capsys.readouterr()
+    run_pipeline(
+        yaml_path, "top", "verilog", out, validate_only=False, rtl_only=False,
+        xdc_only=False,
+    )
+    assert "Info: 1 file written, 2 unchanged" in capsys.readouterr().out
+    assert "H22" in (out / "top.xdc").read_text(encoding="utf-8")
+    assert (out / "top.xdc").stat().st_mtime_ns != mtimes["top.xdc"]
+    assert (out / "top.v").stat().st_mtime_ns == mtimes["top.v"]
+    assert (out / "top_io.v").stat().st_mtime_ns == mtimes["top_io.v"]
+    assert sorted(p.name for p in out.iterdir()) == ["top.v", "top.xdc", "top_io.v"]
+
+
+def test_write_output_permissions(tmp_path: Path) -> None:
+    path = tmp_path / "out.txt"
+    umask = os.umask(0o022)
+    new_file_mode.cache_clear()
+    try:
+        assert _write_output(path, lambda out, text: out.write(text), ("new\n",))
+    finally:
+        os.umask(umask)
+        new_file_mode.cache_clear()
+    assert path.stat().st_mode & 0o777 == 0o644
+
+
+@pytest.mark.parametrize("mode", [0o640, 0o664, 0o600])
+def test_replaced_output_keeps_mode(tmp_path: Path, mode: int) -> None:
+    path = tmp_path / "out.txt"
+    path.write_text("old\n", encoding="utf-8")
+    path.chmod(mode)
+    assert _write_output(path, lambda out, text: out.write(text), ("new\n",))
+    assert path.read_text(encoding="utf-8") == "new\n"
+    assert path.stat().st_mode & 0o777 == mode
+
+
+def test_failed_write_keeps_previous_output(tmp_path: Path) -> None:
+    path = tmp_path / "out.txt"
+    path.write_text("old\n", encoding="utf-8")
+
+    def writer(out, text):
+        out.write(text)
+        raise RuntimeError("generator failed")
+
+    with pytest.raises(RuntimeError):
+        _write_output(path, writer, ("new\n",))
+    assert path.read_text(encoding="utf-8") == "old\n"
+    assert list(tmp_path.iterdir()) == [path]
+
+
 # ---------------------------------------------------------------------------
 # Output directory
 # ---------------------------------------------------------------------------
@@ -132,3 +434,44 @@ def test_invalid_top_identifier_raises(tmp_path: Path) -> None:
     out = tmp_path / "out"
     with pytest.raises(ValidationError):
         run_pipeline(yaml_path, "123bad", "verilog", out, validate_only=False, rtl_only=False, xdc_only=False)
+
+
+# ---------------------------------------------------------------------------
+# Pin queries
+# ---------------------------------------------------------------------------
+
+EXAMPLE_YAML = Path(__file__).resolve().parent.parent / "examples" / "example.yaml"
+
+
+def test_query_pins() -> None:
+    assert run_query(EXAMPLE_YAML, pins=["H23", "B22", "G22"]) == [
+        "H23 ref_clk n",
+        "B22 led[1]",
+        "G22 sys_clk",
+    ]
+
+
+def test_query_filters() -> None:
+    lines = run_query(EXAMPLE_YAML, iostandard="LVDS", direction="out")
+    assert lines[:2] == ["AA1 lvds_data[0] p", "AA2 lvds_data[0] n"]
+    assert all("lvds_data" in line for line in lines)
+    assert run_query(EXAMPLE_YAML, pins=["G22"], direction="out") == []
+
+
+def test_query_prints_nothing(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Only the caller writes to stdout, cached or not, so query output can be piped."""
+    run_query(EXAMPLE_YAML, pins=["G22"], use_cache=True, cache_dir=tmp_path)
+    run_query(EXAMPLE_YAML, pins=["G22"], use_cache=True, cache_dir=tmp_path)
+    assert capsys.readouterr().out == ""
+
+
+def test_query_every_pin() -> None:
+    lines = run_query(EXAMPLE_YAML)
+    assert lines[0].split() == ["G22", "sys_clk"]
+    # Pins are padded to a common width
+    assert len({line.index(" ") for line in lines}) == 1
+
+
+def test_query_unknown_pin_raises() -> None:
+    with pytest.raises(ValueError, match="'ZZ9' is not used by any signal"):
+        run_query(EXAMPLE_YAML, pins=["ZZ9"])
@@ -0,0 +1,152 @@
+from pathlib import Path
+
+import pytest
+
+from io_gen import validate
+from io_gen.tables import MetaTable, SignalTable, diff_signals
+from io_gen.tables.pin_table import build_pin_table
+from io_gen.tables.signal_table import build_signal_table
+
+from io_gen.generate import (
+    generate_verilog_ioring,
+    generate_verilog_top,
+    generate_vhdl_ioring,
+    generate_vhdl_top,
+)
+from io_gen.generate.common import (
+    get_signal_ioring_ports,
+    get_signal_nets,
+    get_signal_top_ports,
+)
+from io_gen.generate.port_table import PortTable, build_port_table
+
+EXAMPLE_YAML = Path(__file__).resolve().parent.parent / "examples" / "example.yaml"
+
+_TEST_META = MetaTable(title="Test", part="xc7k325tffg900-2", architecture="rtl")
+
+_SIGNALS = [
+    {
+        "name": "sys_clk",
+        "pinset": {"p": "H22", "n": "H23"},
+        "direction": "in",
+        "buffer": "ibufds",
+        "iostandard": "LVDS",
+    },
+    {
+        "name": "gpio",
+        "pins": ["A22", "B22", "C22"],
+        "width": 3,
+        "direction": "inout",
+        "buffer": "iobuf",
+        "iostandard": "LVCMOS18",
+    },
+    {
+        "name": "spare_long_name",
+        "pins": "D22",
+        "direction": "out",
+        "buffer": "obuf",
+        "iostandard": "LVCMOS18",
+        "bypass": True,
+    },
+]
+
+
+def _make_signal_table(signals: list) -> SignalTable:
+    doc = {"title": "Test", "part": "xc7k325tffg900-2", "signals": signals}
+    return build_signal_table(doc)
+
+
+def test_rows_match_common_helpers() -> None:
+    st = _make_signal_table(_SIGNALS)
+    pt = build_port_table(st)
+    assert len(pt) == len(st)
+    for sig in st:
+        ports = pt[sig.name]
+        assert list(ports.top_ports) == get_signal_top_ports(sig)
+        assert list(ports.nets) == get_signal_nets(sig)
+        assert list(ports.ioring_ports) == get_signal_ioring_ports(sig)
+
+
+def test_flat_lists_in_table_order() -> None:
+    st = _make_signal_table(_SIGNALS)
+    pt = build_port_table(st)
+    assert pt.nets == [net for sig in st for net in get_signal_nets(sig)]
+    assert pt.ioring_ports == [
+        port for sig in st for port in get_signal_ioring_ports(sig)
+    ]
+
+
+def test_bypass_has_no_nets_or_ioring_ports() -> None:
+    pt = build_port_table(_make_signal_table(_SIGNALS))
+    ports = pt["spare_long_name"]
+    assert [p["name"] for p in ports.top_ports] == ["spare_long_name_pad"]
+    assert ports.nets == ()
+    assert ports.ioring_ports == ()
+
+
+def test_longest_names() -> None:
+    pt = build_port_table(_make_signal_table(_SIGNALS))
+    # The bypassed signal only counts towards the top level ports
+    assert pt.max_top_port_len == len("spare_long_name_pad")
+    assert pt.max_net_len == len("sys_clk")
+    assert pt.max_ioring_port_len == len("sys_clk_p")
+
+
+def test_empty_table() -> None:
+    pt = PortTable()
+    assert len(pt) == 0
+    assert pt.nets == [] and pt.ioring_ports == []
+    assert pt.max_top_port_len == pt.max_net_len == pt.max_ioring_port_len == 0
+
+
+def test_missing_signal() -> None:
+    pt = build_port_table(_make_signal_table(_SIGNALS))
+    with pytest.raises(KeyError, match="'nope' not found in port table"):
+        pt["nope"]
+
+
+@pytest.mark.parametrize(
+    "signals",
+    [
+        pytest.param(_SIGNALS, id="mixed"),
+        pytest.param(validate(EXAMPLE_YAML)["signals"], id="example"),
+    ],
+)
+def test_generators_share_port_table(signals: list) -> None:
+    """Passing a prebuilt port table gives the same output as building one."""
+    st = _make_signal_table(signals)
+    pt = build_pin_table(st)
+    ports = build_port_table(st)
+    assert generate_verilog_top(st, "test", ports) == generate_verilog_top(st, "test")
+    assert generate_vhdl_top(st, _TEST_META, "test", ports) == generate_vhdl_top(
+        st, _TEST_META, "test"
+    )
+    assert generate_verilog_ioring(
+        st, pt, "test", ports
+    ) == generate_verilog_ioring(st, pt, "test")
+    assert generate_vhdl_ioring(
+        st, pt, _TEST_META, "test", ports
+    ) == generate_vhdl_ioring(st, pt, _TEST_META, "test")
+
+
+def test_update_matches_rebuild() -> None:
+    """Updating a port table after an edit gives the same ports as rebuilding it."""
+    st = _make_signal_table(_SIGNALS)
+    ports = build_port_table(st)
+    gpio = ports["gpio"]
+    edited = [
+        {**_SIGNALS[2], "name": "spare", "bypass": False},
+        _SIGNALS[1],
+        {**_SIGNALS[0], "name": "ref_clk"},
+    ]
+    st.apply(diff_signals(_SIGNALS, edited))
+    ports.update(st, st.take_changes())
+    rebuilt = build_port_table(st)
+    assert ports.table == rebuilt.table
+    assert ports.nets == rebuilt.nets
+    assert ports.ioring_ports == rebuilt.ioring_ports
+    assert ports.max_top_port_len == rebuilt.max_top_port_len == len("spare_pad")
+    assert ports.max_net_len == rebuilt.max_net_len
+    assert ports.max_ioring_port_len == rebuilt.max_ioring_port_len
+    # Signals that didn't change keep their ports
+    assert ports["gpio"] is gpio
@@ -0,0 +1,214 @@
+import copy
+import importlib
+import importlib.resources
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+import yaml
+
+from io_gen import ValidationError
+from io_gen.schema import read_schema_sources
+from io_gen.schema.compiler import SchemaCompileError, compile_schema
+from io_gen.schema import _compiled
+from io_gen.validate import (
+    _validate_structural,
+    clear_validator_cache,
+    get_compiled_validator,
+    get_validator,
+)
+
+from tests.test_validate import (
+    INVALID_STRUCTURAL_CASES,
+    VALID_STRUCTURAL_CASES,
+    load_yaml,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The package re-exports the validate() function under the same name as its module
+validate_module = importlib.import_module("io_gen.validate")
+
+
+# ---------------------------------------------------------------------------
+# Generated module
+# ---------------------------------------------------------------------------
+
+
+def test_compiled_module_is_current() -> None:
+    """The checked in module matches what the compiler produces for the schema."""
+    expected = compile_schema(read_schema_sources())
+    actual = (importlib.resources.files("io_gen.schema") / "_compiled.py").read_text(
+        encoding="utf-8"
+    )
+    assert actual == expected, "run `python -m io_gen.schema.compiler` to regenerate"
+
+
+def test_compiled_validator_used_by_default() -> None:
+    clear_validator_cache()
+    assert get_compiled_validator() is _compiled
+
+
+def test_stale_compiled_validator_ignored(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A module generated from a different schema is not used."""
+    clear_validator_cache()
+    monkeypatch.setattr(_compiled, "SCHEMA_DIGEST", "0" * 64)
+    assert get_compiled_validator() is None
+    # Falls back to jsonschema transparently
+    _validate_structural(load_yaml(VALID_STRUCTURAL_CASES[0][1]))
+    with pytest.raises(ValidationError):
+        _validate_structural(load_yaml(INVALID_STRUCTURAL_CASES[0][1]))
+    clear_validator_cache()
+
+
+def test_unsupported_keyword_rejected() -> None:
+    sources = {
+        "schema.json": b'{"$id": "schema.json", "type": "object", "maxProperties": 2}'
+    }
+    with pytest.raises(SchemaCompileError, match="maxProperties"):
+        compile_schema(sources)
+
+
+def test_unresolvable_ref_rejected() -> None:
+    sources = {"schema.json": b'{"$id": "schema.json", "$ref": "defs/missing.json"}'}
+    with pytest.raises(SchemaCompileError, match="missing.json"):
+        compile_schema(sources)
+
+
+# ---------------------------------------------------------------------------
+# Differential testing against jsonschema
+# ---------------------------------------------------------------------------
+
+
+def _load_file(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+BASE_DOC = _load_file(REPO_ROOT / "examples" / "example.yaml")
+
+
+def _mutate(mutation: Callable[[dict], Any]) -> dict:
+    doc = copy.deepcopy(BASE_DOC)
+    mutation(doc)
+    return doc
+
+
+def _set(path: list, value: Any) -> Callable[[dict], None]:
+    def apply(doc: dict) -> None:
+        target = doc
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+
+    return apply
+
+
+def _delete(path: list) -> Callable[[dict], None]:
+    def apply(doc: dict) -> None:
+        target = doc
+        for key in path[:-1]:
+            target = target[key]
+        del target[path[-1]]
+
+    return apply
+
+
+def _signal(index: int) -> dict:
+    return BASE_DOC["signals"][index]
+
+
+def _find(predicate: Callable[[dict], bool]) -> int:
+    return next(i for i, sig in enumerate(BASE_DOC["signals"]) if predicate(sig))
+
+
+SCALAR = _find(lambda s: isinstance(s.get("pins"), str))
+BUS = _find(lambda s: isinstance(s.get("pins"), list))
+DIFF = _find(lambda s: "pinset" in s)
+
+MUTATIONS = [
+    ("doc_not_object", lambda doc: doc.clear() or doc.update({"signals": 3})),
+    ("missing_part", _delete(["part"])),
+    ("title_not_string", _set(["title"], 42)),
+    ("architecture_not_string", _set(["architecture"], ["rtl"])),
+    ("signals_not_array", _set(["signals"], {"name": "x"})),
+    ("signal_not_object", _set(["signals", 0], "sys_clk")),
+    ("constraints_not_object", _set(["constraints"], "GND")),
+    ("config_voltage_bool", _set(["constraints", "config_voltage"], True)),
+    ("config_voltage_int", _set(["constraints", "config_voltage"], 3)),
+    ("config_voltage_string", _set(["constraints", "config_voltage"], "3.3")),
+    ("constraints_extra_key", _set(["constraints", "additionalProperties"], 1)),
+    ("unknown_signal_key", _set(["signals", SCALAR, "slew"], "fast")),
+    ("name_not_string", _set(["signals", SCALAR, "name"], 7)),
+    ("direction_enum", _set(["signals", SCALAR, "direction"], "input")),
+    ("iostandard_enum", _set(["signals", SCALAR, "iostandard"], "lvcmos18")),
+    ("instance_not_string", _set(["signals", SCALAR, "instance"], None)),
+    ("width_zero", _set(["signals", BUS, "width"], 0)),
+    ("width_float_integral", _set(["signals", BUS, "width"], float(len(_signal(BUS)["pins"])))),
+    ("width_float", _set(["signals", BUS, "width"], 1.5)),
+    ("width_bool", _set(["signals", BUS, "width"], True)),
+    ("bus_missing_width", _delete(["signals", BUS, "width"])),
+    ("bus_empty", _set(["signals", BUS, "pins"], [])),
+    ("bus_duplicate_pins", _set(["signals", BUS, "pins"], ["A1", "A1"])),
+    ("bus_pin_not_string", _set(["signals", BUS, "pins"], ["A1", 2])),
+    ("pins_number", _set(["signals", SCALAR, "pins"], 22)),
+    ("generate_string", _set(["signals", SCALAR, "generate"], "no")),
+    ("generate_false_minimal", _set(["signals", SCALAR], {"name": "nc", "pins": "A1", "generate": False})),
+    ("generate_false_no_name", _set(["signals", SCALAR], {"pins": "A1", "generate": False})),
+    ("bypass_without_buffer", _set(["signals", SCALAR], {"name": "b", "pins": "A1", "direction": "in", "iostandard": "LVCMOS18", "bypass": True})),
+    ("bypass_with_buffer", _set(["signals", SCALAR, "bypass"], True)),
+    ("bypass_and_infer", _set(["signals", SCALAR], {"name": "b", "pins": "A1", "direction": "in", "iostandard": "LVCMOS18", "bypass": True, "infer": True})),
+    ("infer_not_bool", _set(["signals", SCALAR, "infer"], 1)),
+    ("comment_extra_key", _set(["signals", SCALAR, "comment"], {"vhdl": "x"})),
+    ("comment_not_string", _set(["signals", SCALAR, "comment"], {"xdc": 1})),
+    ("pins_and_pinset", _set(["signals", SCALAR, "pinset"], {"p": "A1", "n": "A2"})),
+    ("neither_pins_nor_pinset", _delete(["signals", SCALAR, "pins"])),
+    ("pinset_mixed_types", _set(["signals", DIFF, "pinset"], {"p": "A1", "n": ["A2"]})),
+    ("pinset_missing_leg", _set(["signals", DIFF, "pinset"], {"p": "A1"})),
+    ("pinset_extra_leg", _set(["signals", DIFF, "pinset"], {"p": "A1", "n": "A2", "x": "A3"})),
+    ("pinset_array_missing_width", _set(["signals", DIFF], {"name": "d", "pinset": {"p": ["A1"], "n": ["A2"]}, "direction": "in", "buffer": "ibufds", "iostandard": "LVDS"})),
+    ("pinset_not_object", _set(["signals", DIFF, "pinset"], ["A1", "A2"])),
+]
+
+
+def _corpus() -> list[tuple[str, Any]]:
+    corpus: list[tuple[str, Any]] = []
+    corpus.extend((f"valid_{n}", load_yaml(y)) for n, y in VALID_STRUCTURAL_CASES)
+    corpus.extend((f"invalid_{n}", load_yaml(y)) for n, y in INVALID_STRUCTURAL_CASES)
+    corpus.append(("example", BASE_DOC))
+    corpus.append(
+        ("basys3", _load_file(REPO_ROOT / "validation" / "basys3" / "basys3.yaml"))
+    )
+    corpus.extend((f"mutation_{n}", _mutate(m)) for n, m in MUTATIONS)
+    return corpus
+
+
+def _outcome(doc: Any, reference: bool) -> str | None:
+    try:
+        _validate_structural(doc, reference=reference)
+    except ValidationError as e:
+        return str(e)
+    return None
+
+
+@pytest.mark.parametrize("doc", [pytest.param(d, id=n) for n, d in _corpus()])
+def test_compiled_matches_reference(doc: Any) -> None:
+    """Both validators agree on validity and report the same message."""
+    assert _compiled.is_valid(doc) == get_validator().is_valid(doc)
+    assert _outcome(doc, reference=False) == _outcome(doc, reference=True)
+
+
+@pytest.mark.parametrize("doc", [pytest.param(d, id=n) for n, d in _corpus()])
+def test_compiled_signal_matches_reference(doc: Any) -> None:
+    """The per-signal entry point agrees with the item subschema."""
+    signals = doc.get("signals") if isinstance(doc, dict) else None
+    if not isinstance(signals, list):
+        pytest.skip("no signal list")
+    validator = get_validator()
+    # The top level schema is an object (jsonschema also allows true and false)
+    assert isinstance(validator.schema, Mapping)
+    items_schema = validator.schema["properties"]["signals"]["items"]
+    for sig in signals:
+        expected = not any(validator.descend(sig, items_schema))
+        assert _compiled.is_valid_signal(sig) == expected
@@ -1,7 +1,19 @@
+from dataclasses import FrozenInstanceError
+
 import pytest
 
 from io_gen.exceptions import ValidationError
-from io_gen.tables.signal_table import SignalTable, build_signal_table, signal_is_scalar
+from io_gen.tables.signal_table import (
+    Comment,
+    Pinset,
+    SignalChange,
+    SignalDiff,
+    SignalRow,
+    SignalTable,
+    build_signal_table,
+    diff_signals,
+    signal_is_scalar,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -112,7 +124,7 @@ GENERATE_TRUE_SHAPE_CASES = [
             "buffer": "obuf",
             "iostandard": "LVCMOS18",
             "width": 4,
-            "pins": ["A22", "B22", "C22", "D22"],
+            "pins": ("A22", "B22", "C22", "D22"),
             "infer": False,
             "bypass": False,
             "comment": {},
@@ -160,7 +172,7 @@ GENERATE_TRUE_SHAPE_CASES = [
             "buffer": "obufds",
             "iostandard": "LVDS",
             "width": 3,
-            "pinset": {"p": ["AA1", "AB1", "AC1"], "n": ["AA2", "AB2", "AC2"]},
+            "pinset": {"p": ("AA1", "AB1", "AC1"), "n": ("AA2", "AB2", "AC2")},
             "infer": False,
             "bypass": False,
             "comment": {},
@@ -434,3 +446,326 @@ def test_signal_is_scalar_mixed_pinset_raises() -> None:
     sig = {"pinset": {"p": "H22", "n": ["H23"]}}
     with pytest.raises(ValidationError):
         signal_is_scalar(sig)
+
+
+# ---------------------------------------------------------------------------
+# SignalRow
+# ---------------------------------------------------------------------------
+
+
+def _diff_row() -> SignalRow:
+    table = SignalTable()
+    table.add(
+        {
+            "name": "ref_clk",
+            "pinset": {"p": "H22", "n": "H23"},
+            "direction": "in",
+            "buffer": "ibufds",
+            "iostandard": "LVDS",
+        }
+    )
+    return list(table)[0]
+
+
+def test_row_is_slotted() -> None:
+    """Rows carry no per-instance dict."""
+    row = _diff_row()
+    assert isinstance(row, SignalRow)
+    assert not hasattr(row, "__dict__")
+    assert row.name == "ref_clk"
+    assert row.pins is None
+
+
+def test_row_dict_access() -> None:
+    """Rows read like the dicts they replace, with the unused pin field missing."""
+    row = _diff_row()
+    assert row["pinset"] == {"p": "H22", "n": "H23"}
+    assert "pinset" in row
+    assert "pins" not in row
+    assert row.get("pins") is None
+    assert row.get("pins", "none") == "none"
+    with pytest.raises(KeyError):
+        row["pins"]
+    with pytest.raises(KeyError):
+        row["to_dict"]
+    assert set(row) == set(row.keys()) == {
+        "name", "width", "iostandard", "direction", "infer", "bypass", "comment",
+        "buffer", "instance", "pinset",
+    }
+    assert len(row) == 10
+    assert dict(row) == row.to_dict()
+    assert row == row.to_dict()
+    assert row != {**row.to_dict(), "width": 2}
+
+
+def test_row_from_mapping() -> None:
+    row = _diff_row()
+    assert SignalRow.from_mapping(row) is row
+    copy = SignalRow.from_mapping(row.to_dict())
+    assert isinstance(copy, SignalRow)
+    assert copy == row
+
+
+def test_row_pickles() -> None:
+    import pickle
+
+    row = _diff_row()
+    assert pickle.loads(pickle.dumps(row)) == row
+
+
+def test_row_is_immutable() -> None:
+    """Rows, their pinsets, and their buses can't be modified."""
+    row = _diff_row()
+    assert isinstance(row.pinset, Pinset)
+    assert row.pinset.p == row["pinset"]["p"] == "H22"
+    with pytest.raises(FrozenInstanceError):
+        row.name = "other"  # type: ignore[misc]
+    with pytest.raises(FrozenInstanceError):
+        row.pinset.p = "H24"  # type: ignore[misc]
+
+
+def test_buses_not_shared_with_document() -> None:
+    """Buses are stored as tuples, so changing the document doesn't change the table."""
+    sig = {
+        "name": "lvds_data",
+        "pinset": {"p": ["AA1", "AB1"], "n": ["AA2", "AB2"]},
+        "width": 2,
+        "direction": "out",
+        "buffer": "obufds",
+        "iostandard": "LVDS",
+    }
+    led = {
+        "name": "led",
+        "pins": ["A22", "B22"],
+        "width": 2,
+        "direction": "out",
+        "buffer": "obuf",
+        "iostandard": "LVCMOS18",
+    }
+    table = SignalTable()
+    table.add(sig)
+    table.add(led)
+    sig["pinset"]["p"].append("AC1")
+    led["pins"][0] = "C22"
+    diff_row, led_row = table
+    assert diff_row.pinset is not None
+    assert diff_row.pinset.p == ("AA1", "AB1")
+    assert led_row.pins == ("A22", "B22")
+    assert led_row["pins"][1] == "B22"
+
+
+def test_comments_not_shared_with_document() -> None:
+    """Comments are frozen, so neither the document nor other rows see changes."""
+    import pickle
+
+    comment = {"xdc": "125 MHz clock", "hdl": "system clock"}
+    table = SignalTable()
+    for name in ("clk_a", "clk_b"):
+        table.add(
+            {
+                "name": name,
+                "pins": "G22" if name == "clk_a" else "G23",
+                "direction": "in",
+                "buffer": "ibuf",
+                "iostandard": "LVCMOS18",
+                "comment": comment,
+            }
+        )
+    comment["xdc"] = "changed"
+    clk_a, clk_b = table
+    assert isinstance(clk_a.comment, Comment)
+    assert clk_a.comment.xdc == clk_b.comment.get("xdc") == "125 MHz clock"
+    with pytest.raises(FrozenInstanceError):
+        clk_a.comment.xdc = "other"  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        clk_a.comment["xdc"] = "other"  # type: ignore[index]
+    copy = pickle.loads(pickle.dumps(clk_a))
+    assert copy.comment == {"xdc": "125 MHz clock", "hdl": "system clock"}
+
+
+def test_comment_optional_keys() -> None:
+    """A missing comment reads as an empty mapping, and a partial one as a dict."""
+    assert Comment() == {}
+    assert "hdl" not in Comment(xdc="pin")
+    assert Comment(hdl="port").get("xdc") is None
+    row = SignalRow.from_mapping({**_diff_row().to_dict(), "comment": {"hdl": "x"}})
+    assert isinstance(row.comment, Comment)
+    assert row["comment"] == {"hdl": "x"}
+
+
+# ---------------------------------------------------------------------------
+# Partitions
+# ---------------------------------------------------------------------------
+
+_PARTITION_SIGNALS = [
+    {"name": "clk", "pins": "A1", "direction": "in", "buffer": "ibuf", "iostandard": "LVCMOS18"},
+    {"name": "spare", "pins": "A2", "direction": "inout", "iostandard": "LVCMOS18", "bypass": True},
+    {"name": "gpio", "pins": "A3", "direction": "inout", "buffer": "iobuf", "iostandard": "LVCMOS18"},
+    {"name": "led", "pins": "A4", "direction": "out", "buffer": "obuf", "iostandard": "LVCMOS18", "infer": True},
+    {"name": "lvds", "pinset": {"p": "B1", "n": "B2"}, "direction": "inout", "buffer": "iobufds", "iostandard": "LVDS"},
+    {"name": "lvds_nc", "pinset": {"p": "B3", "n": "B4"}, "direction": "in", "iostandard": "LVDS", "bypass": True},
+]
+
+
+def _names(rows: tuple) -> list[str]:
+    return [row.name for row in rows]
+
+
+def test_partitions() -> None:
+    """Each partition holds the matching rows in table order."""
+    table = build_signal_table({"signals": _PARTITION_SIGNALS})
+    assert _names(table.active()) == ["clk", "gpio", "led", "lvds"]
+    assert _names(table.bypassed()) == ["spare", "lvds_nc"]
+    assert _names(table.tristate()) == ["gpio", "lvds"]
+    assert _names(table.differential()) == ["lvds", "lvds_nc"]
+    assert _names(table.inferred()) == ["led"]
+
+
+def test_partitions_cached_and_read_only() -> None:
+    """Partitions are computed once and returned as tuples."""
+    table = build_signal_table({"signals": _PARTITION_SIGNALS})
+    active = table.active()
+    assert isinstance(active, tuple)
+    assert table.active() is active
+
+
+def test_partitions_invalidated_on_add() -> None:
+    """Adding a row recomputes the partitions on the next call."""
+    table = build_signal_table({"signals": _PARTITION_SIGNALS[:2]})
+    assert _names(table.active()) == ["clk"]
+    table.add(_PARTITION_SIGNALS[2])
+    assert _names(table.active()) == ["clk", "gpio"]
+    assert _names(table.tristate()) == ["gpio"]
+    # A signal that isn't generated leaves them as they were
+    active = table.active()
+    table.add({**_PARTITION_SIGNALS[3], "generate": False})
+    assert table.active() is active
+
+
+# ---------------------------------------------------------------------------
+# Incremental updates
+# ---------------------------------------------------------------------------
+
+
+_IRQ = {"name": "irq", "pins": "C1", "direction": "in", "buffer": "ibuf", "iostandard": "LVCMOS18"}
+
+
+def _apply_edit(old: list, new: list) -> tuple[SignalTable, list[SignalChange]]:
+    table = build_signal_table({"signals": old})
+    changes = table.apply(diff_signals(old, new))
+    assert list(table) == list(build_signal_table({"signals": new}))
+    return table, changes
+
+
+def test_apply_matches_rebuild() -> None:
+    """Applying the diff between two documents gives the table of the new one."""
+    new = [
+        {**_PARTITION_SIGNALS[0], "pins": "A9"},
+        *_PARTITION_SIGNALS[2:5],
+        _IRQ,
+    ]
+    table, changes = _apply_edit(_PARTITION_SIGNALS, new)
+    assert changes == [
+        SignalChange("modified", "clk"),
+        SignalChange("removed", "spare"),
+        SignalChange("removed", "lvds_nc"),
+        SignalChange("added", "irq"),
+    ]
+    assert table["clk"].pins == "A9"
+    assert "spare" not in table and "irq" in table
+
+
+def test_apply_places_added_signals_in_document_order() -> None:
+    """A signal added mid-document goes in the same place, not at the end."""
+    new = [_PARTITION_SIGNALS[0], _IRQ, *_PARTITION_SIGNALS[1:]]
+    table, changes = _apply_edit(_PARTITION_SIGNALS, new)
+    assert changes == [SignalChange("added", "irq")]
+    assert table["spare"] is list(table)[2]
+
+
+def test_apply_logs_moved_signals() -> None:
+    """Reordering signals logs them as moved, without rebuilding their rows."""
+    old = _PARTITION_SIGNALS
+    new = [old[1], old[0], *old[2:]]
+    table = build_signal_table({"signals": old})
+    clk = table["clk"]
+    table.apply(diff_signals(old, new))
+    assert table["clk"] is clk
+    assert table.take_changes() == [
+        SignalChange("moved", "spare"),
+        SignalChange("moved", "clk"),
+    ]
+    assert table.changes == []
+
+
+def test_apply_generate_false() -> None:
+    """Turning generate off removes a signal, turning it on adds it back."""
+    old = _PARTITION_SIGNALS
+    off = [{**old[0], "generate": False}, *old[1:]]
+    table, changes = _apply_edit(old, off)
+    assert changes == [SignalChange("removed", "clk")]
+    # The same edit given as a modification also removes it
+    table = build_signal_table({"signals": old})
+    assert table.apply(SignalDiff(modified=[off[0]])) == [SignalChange("removed", "clk")]
+    table, changes = _apply_edit(off, old)
+    assert changes == [SignalChange("added", "clk")]
+
+
+def test_apply_empty_diff() -> None:
+    """Diffing a document with itself changes nothing."""
+    diff = diff_signals(_PARTITION_SIGNALS, _PARTITION_SIGNALS)
+    assert not diff
+    table = build_signal_table({"signals": _PARTITION_SIGNALS})
+    assert table.apply(diff) == []
+    assert table.changes == []
+
+
+def test_changes_accumulate_until_taken() -> None:
+    """The change log covers every apply() since it was last taken."""
+    table = build_signal_table({"signals": _PARTITION_SIGNALS})
+    table.apply(SignalDiff(removed=["spare"]))
+    table.apply(SignalDiff(modified=[{**_PARTITION_SIGNALS[0], "pins": "A9"}]))
+    assert table.take_changes() == [
+        SignalChange("removed", "spare"),
+        SignalChange("modified", "clk"),
+    ]
+    assert table.take_changes() == []
+
+
+@pytest.mark.parametrize(
+    "diff, error, match",
+    [
+        (SignalDiff(removed=["nope"]), KeyError, "'nope' not found in signal table"),
+        (SignalDiff(modified=[{**_IRQ, "name": "nope"}]), KeyError, "'nope' not found"),
+        (SignalDiff(added=[_PARTITION_SIGNALS[0]]), ValidationError, "'clk': duplicate"),
+        (SignalDiff(removed=["clk"], order=["clk"]), ValueError, "doesn't list every signal"),
+    ],
+)
+def test_apply_rejected_diff_leaves_table_unchanged(
+    diff: SignalDiff, error: type, match: str
+) -> None:
+    """A diff that doesn't fit the table is rejected before anything changes."""
+    table = build_signal_table({"signals": _PARTITION_SIGNALS})
+    rows = list(table)
+    with pytest.raises(error, match=match):
+        table.apply(diff)
+    assert list(table) == rows
+    assert table.changes == []
+
+
+def test_partitions_invalidated_on_apply() -> None:
+    """Applying a diff recomputes the partitions on the next call."""
+    table = build_signal_table({"signals": _PARTITION_SIGNALS})
+    assert _names(table.tristate()) == ["gpio", "lvds"]
+    table.apply(SignalDiff(modified=[{**_PARTITION_SIGNALS[2], "bypass": True}]))
+    assert _names(table.tristate()) == ["lvds"]
+    assert _names(table.bypassed()) == ["spare", "gpio", "lvds_nc"]
+
+
+def test_getitem_and_contains() -> None:
+    """Rows can be looked up by signal name."""
+    table = build_signal_table({"signals": _PARTITION_SIGNALS})
+    assert table["lvds"].pinset == Pinset("B1", "B2")
+    assert "lvds" in table and "nope" not in table
+    with pytest.raises(KeyError, match="'nope' not found in signal table"):
+        table["nope"]
@@ -0,0 +1,82 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+EXAMPLE_YAML = REPO_ROOT / "examples" / "example.yaml"
+
+HEAVY_MODULES = ["jsonschema", "referencing", "yaml"]
+
+
+def _imported_after(code: str) -> set[str]:
+    """Runs code in a fresh interpreter and returns the modules it ended up importing"""
+    script = f"{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def _generators(modules: set[str]) -> set[str]:
+    return {name for name in modules if name.startswith("io_gen.generate.")}
+
+
+def test_cli_import_is_light() -> None:
+    """Importing the entry point doesn't load third party packages or generators."""
+    modules = _imported_after("import io_gen.cli")
+    assert modules.isdisjoint(HEAVY_MODULES)
+    assert _generators(modules) == set()
+
+
+def test_generate_exports_every_lazy_generator() -> None:
+    import io_gen.generate
+
+    assert io_gen.generate.__all__ == list(io_gen.generate._GENERATORS)
+
+
+def test_package_import_is_light() -> None:
+    modules = _imported_after("import io_gen; from io_gen import validate")
+    assert modules.isdisjoint(HEAVY_MODULES)
+
+
+@pytest.mark.parametrize(
+    "flags,expected",
+    [
+        ("rtl_only=False, xdc_only=True", {"io_gen.generate.xdc", "io_gen.generate.common"}),
+        (
+            "rtl_only=True, xdc_only=False",
+            {
+                "io_gen.generate.verilog_top",
+                "io_gen.generate.verilog_ioring",
+                "io_gen.generate.common",
+                "io_gen.generate.formatting",
+                "io_gen.generate.port_table",
+            },
+        ),
+    ],
+)
+def test_only_selected_generators_imported(
+    tmp_path: Path, flags: str, expected: set[str]
+) -> None:
+    code = (
+        "from io_gen.pipeline import run_pipeline\n"
+        f"run_pipeline(r'{EXAMPLE_YAML}', 'top', 'verilog', r'{tmp_path}', "
+        f"validate_only=False, {flags})"
+    )
+    assert _generators(_imported_after(code)) == expected
+
+
+def test_valid_yaml_does_not_need_jsonschema() -> None:
+    """With the generated validator current, jsonschema is only loaded for errors."""
+    code = f"from io_gen import validate\nvalidate(r'{EXAMPLE_YAML}')"
+    modules = _imported_after(code)
+    assert "yaml" in modules
+    assert modules.isdisjoint(["jsonschema", "referencing"])
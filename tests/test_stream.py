@@ -0,0 +1,270 @@
+import importlib
+import io
+from pathlib import Path
+from textwrap import dedent
+from typing import Any
+
+import pytest
+import yaml
+
+from io_gen import ValidationError, validate, validate_stream
+from io_gen.checks import check_non_ascii_bytes
+from io_gen.pipeline import run_pipeline
+from io_gen.stream import AsciiReader, SignalStream
+from io_gen.tables import build_signal_table
+
+from tests.test_validate import (
+    INVALID_STRUCTURAL_CASES,
+    MANY_ERRORS_YAML,
+    VALID_INTEGRATION_CASES,
+    VALID_STRUCTURAL_CASES,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The package re-exports the validate() function under the same name as its module
+validate_module = importlib.import_module("io_gen.validate")
+
+
+def _stream(data: bytes) -> tuple[SignalStream, list]:
+    stream = SignalStream(AsciiReader(io.BytesIO(data)))
+    signals = list(stream)
+    return stream, signals
+
+
+def _streamed_doc(data: bytes) -> Any:
+    """What SignalStream parses data into, put back together"""
+    stream, signals = _stream(data)
+    if not stream.streamed:
+        assert signals == []
+        return stream.doc
+    return {**stream.doc, "signals": signals}
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+PARSE_CASES = [
+    ("empty", b""),
+    ("scalar_document", b"42\n"),
+    ("sequence_document", b"[1, 2]\n"),
+    ("no_signals", b"title: x\npart: y\n"),
+    ("signals_not_sequence", b"signals: {name: x}\n"),
+    ("signals_first", b"signals:\n  - {name: a, pins: A1}\ntitle: x\n"),
+    ("signals_empty", b"title: x\nsignals: []\n"),
+    ("anchored_signals", b"signals: &s [{name: a}]\ncopy: *s\n"),
+    (
+        "aliases_across_signals",
+        b"base: &b {direction: in, buffer: ibuf}\n"
+        b"signals:\n  - {name: a, <<: *b}\n  - &c {name: c, pins: [A1, A2]}\n  - *c\n",
+    ),
+    ("merge_into_top", b"defaults: &d {title: x}\n<<: *d\nsignals: [1, two, 3.0]\n"),
+    ("non_string_keys", b"1: one\ntrue: yes\nsignals: [null]\n"),
+    ("explicit_tags", b"title: !!str 12\nsignals: [!!float 1]\n"),
+]
+
+
+def _files() -> list[tuple[str, bytes]]:
+    paths = [REPO_ROOT / "examples" / "example.yaml"]
+    paths.extend(sorted((REPO_ROOT / "validation").rglob("*.yaml")))
+    return [(path.name, path.read_bytes()) for path in paths]
+
+
+@pytest.mark.parametrize(
+    "data", [pytest.param(d, id=n) for n, d in PARSE_CASES + _files()]
+)
+def test_parse_matches_yaml_load(data: bytes) -> None:
+    assert _streamed_doc(data) == yaml.safe_load(data)
+
+
+def test_only_plain_signal_sequences_streamed() -> None:
+    assert _stream(b"title: x\nsignals: [1]\n")[0].streamed
+    assert not _stream(b"title: x\n")[0].streamed
+    assert not _stream(b"signals: {a: 1}\n")[0].streamed
+    assert not _stream(b"signals: &s [1]\n")[0].streamed
+    assert not _stream(b"[1]\n")[0].streamed
+
+
+def test_pure_python_loader(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delattr(yaml, "CSafeLoader")
+    data = _files()[0][1]
+    assert _streamed_doc(data) == yaml.safe_load(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(b"a: 1\n---\nb: 2\n", id="two_documents"),
+        pytest.param(b"signals: [*nowhere]\n", id="undefined_alias"),
+        pytest.param(b"a: &x 1\nb: &x 2\n", id="duplicate_anchor"),
+        pytest.param(b"signals: [1]\nsignals: [2]\n", id="two_signal_lists"),
+        pytest.param(b"signals:\n  - name: [unclosed\n", id="malformed"),
+    ],
+)
+def test_parse_errors(data: bytes) -> None:
+    with pytest.raises(yaml.YAMLError):
+        _stream(data)
+
+
+def test_signals_parsed_as_read() -> None:
+    """The first signal is produced long before the end of a large file."""
+    signals = "".join(f"  - {{name: s{i}, pins: A{i}}}\n" for i in range(20000))
+    data = f"title: x\nsignals:\n{signals}".encode()
+    f = io.BytesIO(data)
+    next(iter(SignalStream(AsciiReader(f))))
+    assert f.tell() < len(data) // 10
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_ascii_reader_line(size: int) -> None:
+    data = b"a: 1\n" * 50 + b"b: caf\xc3\xa9\n" + b"c: 2\n"
+    with pytest.raises(ValidationError) as expected:
+        check_non_ascii_bytes(data)
+    reader = AsciiReader(io.BytesIO(data))
+    with pytest.raises(ValidationError) as actual:
+        while reader.read(size):
+            pass
+    assert str(actual.value) == str(expected.value) == (
+        "found non-ASCII encoded string at line 51"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Differential testing against validate()
+# ---------------------------------------------------------------------------
+
+
+def _large_yaml(count: int = 300, **errors: Any) -> str:
+    """A large design with errors injected at the indices given by errors"""
+    lines = [
+        "title: Test",
+        "part: xc7k325tffg900-2",
+        "constraints:",
+        "  config_voltage: 3.3",
+        "  cfgbvs: VCCO",
+        "signals:",
+    ]
+    for index in range(count):
+        direction, buffer = ("in", "ibuf") if index % 2 else ("out", "obuf")
+        pin = f"A{index}"
+        if index == errors.get("duplicate_pin"):
+            pin = "A0"
+        if index == errors.get("bad_direction"):
+            direction = "input"
+        if index == errors.get("buffer_mismatch"):
+            direction = "inout"
+        lines.append(
+            f"  - {{name: s{index}, pins: {pin}, direction: {direction},"
+            f" buffer: {buffer}, iostandard: LVCMOS18}}"
+        )
+    if errors.get("no_title"):
+        del lines[0]
+    return "\n".join(lines) + "\n"
+
+
+DIFFERENTIAL_CASES = [
+    *((n, dedent(y)) for n, y in VALID_STRUCTURAL_CASES + INVALID_STRUCTURAL_CASES),
+    *((n, dedent(y)) for n, y, _ in VALID_INTEGRATION_CASES),
+    ("many_errors", dedent(MANY_ERRORS_YAML)),
+    ("large_valid", _large_yaml()),
+    ("large_duplicate_pin", _large_yaml(duplicate_pin=250)),
+    ("large_bad_direction", _large_yaml(bad_direction=120)),
+    ("large_no_title", _large_yaml(bad_direction=120, no_title=True)),
+    (
+        "large_mixed",
+        _large_yaml(duplicate_pin=40, bad_direction=120, buffer_mismatch=200),
+    ),
+    ("all_not_generated", "title: x\npart: y\nconstraints: {config_voltage: 3.3, cfgbvs: VCCO}\nsignals:\n  - {name: a, pins: A1, generate: false}\n"),
+    ("signals_not_list", "title: x\npart: y\nconstraints: {config_voltage: 3.3, cfgbvs: VCCO}\nsignals: 3\n"),
+    ("not_a_mapping", "- 1\n"),
+]
+
+
+def _outcome(func: Any, path: Path, max_errors: int | None) -> Any:
+    try:
+        func(path, max_errors)
+    except ValidationError as e:
+        return str(e), e.diagnostics
+    return None
+
+
+@pytest.mark.parametrize(
+    "max_errors", [None, 0, 2, 4], ids=["first", "all", "two", "four"]
+)
+@pytest.mark.parametrize(
+    "yaml_text", [pytest.param(y, id=n) for n, y in DIFFERENTIAL_CASES]
+)
+def test_stream_matches_validate(
+    tmp_path: Path, yaml_text: str, max_errors: int | None
+) -> None:
+    path = tmp_path / "input.yaml"
+    path.write_text(yaml_text, encoding="utf-8")
+    expected = _outcome(validate, path, max_errors)
+    assert _outcome(validate_stream, path, max_errors) == expected
+
+
+def test_stream_matches_validate_reference(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Every signal is checked with jsonschema without the generated validator."""
+    path = tmp_path / "input.yaml"
+    path.write_text(
+        _large_yaml(duplicate_pin=40, bad_direction=120), encoding="utf-8"
+    )
+    expected = [_outcome(validate, path, limit) for limit in (None, 0)]
+    monkeypatch.setattr(validate_module, "get_compiled_validator", lambda: None)
+    assert [_outcome(validate_stream, path, limit) for limit in (None, 0)] == expected
+
+
+@pytest.mark.parametrize(
+    "yaml_text",
+    [pytest.param(dedent(y), id=n) for n, y, _ in VALID_INTEGRATION_CASES]
+    + [pytest.param(_large_yaml(), id="large")],
+)
+def test_stream_builds_signal_table(tmp_path: Path, yaml_text: str) -> None:
+    path = tmp_path / "input.yaml"
+    path.write_text(yaml_text, encoding="utf-8")
+    expected = validate(path)
+    doc, signal_table = validate_stream(path)
+    assert doc == {k: v for k, v in expected.items() if k != "signals"}
+    assert list(signal_table) == list(build_signal_table(expected))
+
+
+def test_stream_non_ascii(tmp_path: Path) -> None:
+    path = tmp_path / "input.yaml"
+    path.write_bytes(_large_yaml().encode() + b"# caf\xc3\xa9\n")
+    with pytest.raises(ValidationError, match="non-ASCII"):
+        validate_stream(path)
+
+
+def test_stream_malformed_yaml(tmp_path: Path) -> None:
+    path = tmp_path / "input.yaml"
+    path.write_text(_large_yaml() + "  - name: [unclosed\n", encoding="utf-8")
+    with pytest.raises(ValidationError):
+        validate_stream(path)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("lang", ["verilog", "vhdl"])
+def test_pipeline_stream_output_identical(tmp_path: Path, lang: str) -> None:
+    yaml_path = REPO_ROOT / "examples" / "example.yaml"
+    outputs = {}
+    for stream in (False, True):
+        out = tmp_path / str(stream)
+        run_pipeline(
+            yaml_path,
+            "example",
+            lang,
+            out,
+            validate_only=False,
+            rtl_only=False,
+            xdc_only=False,
+            stream=stream,
+        )
+        outputs[stream] = {p.name: p.read_text() for p in sorted(out.iterdir())}
+    assert outputs[True] == outputs[False]
@@ -1,10 +1,19 @@
+import importlib
 from textwrap import dedent
 import pytest
 import yaml
 from pathlib import Path
 
 from io_gen import validate, ValidationError
-from io_gen.validate import _validate_structural
+from io_gen.validate import (
+    _validate_structural,
+    clear_validator_cache,
+    get_validator,
+    yaml_loader,
+)
+
+# The package re-exports the validate() function under the same name as its module
+validate_module = importlib.import_module("io_gen.validate")
 
 TMP_YAML = "input.yaml"
 
@@ -397,5 +406,157 @@ def test_non_ascii_yaml_raises(tmp_path: Path) -> None:
     p = tmp_path / TMP_YAML
     # Write bytes directly to avoid non-ASCII in source - \xc3\xa9 is UTF-8 for e with acute accent
     p.write_bytes(b"title: Test\npart: xc7k325tffg900-2\nsignals:\n  - name: caf\xc3\xa9\n")
+    with pytest.raises(ValidationError, match="at line 4"):
+        validate(p)
+
+
+def test_yaml_loader_uses_libyaml() -> None:
+    """The C loader is used whenever PyYAML provides it."""
+    expected = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    assert yaml_loader() is expected
+
+
+@pytest.mark.parametrize(
+    "yaml_text,expected",
+    [pytest.param(y, e, id=n) for n, y, e in VALID_INTEGRATION_CASES],
+)
+def test_pure_python_loader_fallback(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, yaml_text: str, expected: dict
+) -> None:
+    """Without libyaml the pure Python loader produces the same documents."""
+    monkeypatch.setattr(validate_module, "yaml_loader", lambda: yaml.SafeLoader)
+    assert validate(write_yaml(tmp_path, yaml_text)) == expected
+
+
+def test_malformed_yaml_raises_pure_python(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(validate_module, "yaml_loader", lambda: yaml.SafeLoader)
+    p = tmp_path / TMP_YAML
+    p.write_text("title: Test\n  bad_indent:\npart: [unclosed", encoding="utf-8")
     with pytest.raises(ValidationError):
         validate(p)
+
+
+# ---------------------------------------------------------------------------
+# Validator cache
+# ---------------------------------------------------------------------------
+
+
+def test_validator_is_reused() -> None:
+    """Repeated calls share one validator instead of rebuilding it."""
+    clear_validator_cache()
+    assert get_validator() is get_validator()
+
+
+def test_validator_rebuilt_when_schema_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A different schema fingerprint forces a fresh validator."""
+    clear_validator_cache()
+    first = get_validator()
+    monkeypatch.setattr(
+        validate_module, "_schema_signature", lambda: (("schema.json", 0, 0),)
+    )
+    second = get_validator()
+    assert second is not first
+    assert get_validator() is second
+
+
+def test_clear_validator_cache() -> None:
+    """Clearing the cache discards the current validator."""
+    first = get_validator()
+    clear_validator_cache()
+    assert get_validator() is not first
+
+
+# ---------------------------------------------------------------------------
+# Collecting every error
+# ---------------------------------------------------------------------------
+
+MANY_ERRORS_YAML = """
+title: Test
+part: xc7k325tffg900-2
+constraints:
+  config_voltage: 3.3
+  cfgbvs: VCCO
+signals:
+  - name: clk
+    pins: A1
+    direction: in
+    buffer: ibuf
+    iostandard: LVCMOS33
+  - name: led
+    pins: A1
+    direction: in
+    buffer: obuf
+    iostandard: LVCMOS33
+  - name: btn
+    pins: B1
+    direction: sideways
+    buffer: ibuf
+    iostandard: LVCMOS33
+  - pins: C1
+    direction: in
+    buffer: ibuf
+    iostandard: LVCMOS33
+"""
+
+
+def test_max_errors_reports_every_problem(tmp_path: Path) -> None:
+    with pytest.raises(ValidationError) as exc_info:
+        validate(write_yaml(tmp_path, MANY_ERRORS_YAML), max_errors=0)
+    assert exc_info.value.diagnostics == [
+        "btn: 'sideways' is not one of ['in', 'out', 'inout']",
+        "signals[3]: 'name' is a required property",
+        "signal 'led' has pin 'A1': duplicate pins",
+        "signal 'led': buffer obuf direction is in",
+    ]
+    assert str(exc_info.value) == "found 4 errors"
+
+
+def test_max_errors_limit(tmp_path: Path) -> None:
+    with pytest.raises(ValidationError) as exc_info:
+        validate(write_yaml(tmp_path, MANY_ERRORS_YAML), max_errors=3)
+    assert len(exc_info.value.diagnostics) == 3
+    assert str(exc_info.value) == "stopped after 3 errors"
+
+
+def test_max_errors_limit_reached_exactly(tmp_path: Path) -> None:
+    """A limit equal to the number of problems found doesn't say it stopped."""
+    with pytest.raises(ValidationError) as exc_info:
+        validate(write_yaml(tmp_path, MANY_ERRORS_YAML), max_errors=4)
+    assert len(exc_info.value.diagnostics) == 4
+    assert str(exc_info.value) == "found 4 errors"
+
+
+def test_max_errors_valid_document(tmp_path: Path) -> None:
+    yaml_text = VALID_INTEGRATION_CASES[0][1]
+    assert validate(write_yaml(tmp_path, yaml_text), max_errors=0) == validate(
+        write_yaml(tmp_path, yaml_text)
+    )
+
+
+def test_first_error_mode_unchanged(tmp_path: Path) -> None:
+    """Without max_errors only the first problem is reported."""
+    with pytest.raises(ValidationError) as exc_info:
+        validate(write_yaml(tmp_path, MANY_ERRORS_YAML))
+    assert exc_info.value.diagnostics == []
+
+
+@pytest.mark.parametrize(
+    "yaml_text", [pytest.param(y, id=n) for n, y in INVALID_STRUCTURAL_CASES]
+)
+def test_diagnostics_include_first_error(yaml_text: str) -> None:
+    """Whatever validate() would report is among the collected problems."""
+    doc = load_yaml(yaml_text)
+    with pytest.raises(ValidationError) as exc_info:
+        _validate_structural(doc)
+    assert str(exc_info.value) in list(validate_module.iter_diagnostics(doc))
+
+
+def test_diagnostics_skip_broken_document() -> None:
+    """No semantic checks run when the signal list itself is unusable."""
+    assert list(validate_module.iter_diagnostics({"title": "x"})) == [
+        "'part' is a required property",
+        "'constraints' is a required property",
+        "'signals' is a required property",
+    ]
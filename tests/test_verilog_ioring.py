@@ -1,8 +1,11 @@
+import io
+
 import pytest
 
-from io_gen.tables import SignalTable, PinTable
+from io_gen.tables import PinRow, SignalTable, PinTable
 from io_gen.tables.signal_table import build_signal_table
 from io_gen.tables.pin_table import build_pin_table
+from io_gen.generate.port_table import build_port_table
 
 from io_gen.generate.verilog_ioring import (
     _infer_ibuf,
@@ -16,6 +19,7 @@ from io_gen.generate.verilog_ioring import (
     _generate_verilog_ioring_ports,
     _generate_verilog_ioring_body,
     generate_verilog_ioring,
+    write_verilog_ioring,
 )
 
 
@@ -481,6 +485,50 @@ def test_instantiate_iobufds_bus() -> None:
     assert _instantiate_iobufds("diff_io", row) == expected
 
 
+# ---- PinRow rows ------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "instantiate, row",
+    [
+        (_instantiate_ibuf, _scalar_ibuf_row("sys_clk", "ibuf_sys_clk_i0")),
+        (_instantiate_ibuf, _bus_ibuf_row("data", "ibuf_data_i2", 2)),
+        (_instantiate_obuf, _bus_obuf_row("led", "obuf_led_i3", 3)),
+        (_instantiate_ibufds, _scalar_ibufds_row("ibufds_clk_i0")),
+        (_instantiate_obufds, _bus_obufds_row("obufds_tx_i1", 1)),
+        (_instantiate_iobuf, _bus_iobuf_row("iobuf_sda_i0", 0)),
+        (_instantiate_iobufds, _scalar_iobufds_row("iobufds_dq_i0")),
+    ],
+)
+def test_instantiate_pin_row_matches_dict(instantiate, row: dict) -> None:
+    """PinRow objects, as the pin table produces, instantiate like their dict form."""
+    pin_row = PinRow.from_mapping(row)
+    assert isinstance(pin_row, PinRow)
+    assert pin_row == row
+    assert instantiate("sig", pin_row) == instantiate("sig", row)
+
+
+def test_instantiate_pin_table_rows() -> None:
+    """Rows looked up in a pin table are PinRow objects the instantiators accept."""
+    _, pt = _make_tables(
+        [
+            {
+                "name": "data",
+                "pins": ["G22", "G23"],
+                "width": 2,
+                "direction": "in",
+                "buffer": "ibuf",
+                "iostandard": "LVCMOS18",
+            }
+        ]
+    )
+    row = pt["data"][1]
+    assert isinstance(row, PinRow)
+    assert _instantiate_ibuf("data", row) == _instantiate_ibuf(
+        "data", _bus_ibuf_row("data", "ibuf_data_i1", 1)
+    )
+
+
 # ---- _generate_verilog_ioring_ports ----------------------------------------
 
 # Reuse the integration signal set from test_verilog_top
@@ -793,7 +841,7 @@ def test_generate_verilog_ioring_ports_returns_str() -> None:
             }
         ]
     )
-    assert isinstance(_generate_verilog_ioring_ports(st), str)
+    assert isinstance(_generate_verilog_ioring_ports(build_port_table(st)), str)
 
 
 @pytest.mark.parametrize(
@@ -803,7 +851,7 @@ def test_generate_verilog_ioring_ports_returns_str() -> None:
 def test_ioring_port_decl_in_output(sig: dict, expected_decl: str) -> None:
     """The correct port declaration appears in the output for each signal type."""
     st = _make_signal_table([sig])
-    assert expected_decl in _generate_verilog_ioring_ports(st)
+    assert expected_decl in _generate_verilog_ioring_ports(build_port_table(st))
 
 
 def test_ioring_ports_all_bypass() -> None:
@@ -826,7 +874,7 @@ def test_ioring_ports_all_bypass() -> None:
             },
         ]
     )
-    assert _generate_verilog_ioring_ports(st) == ""
+    assert _generate_verilog_ioring_ports(build_port_table(st)) == ""
 
 
 def test_ioring_ports_bypass_excluded() -> None:
@@ -849,7 +897,7 @@ def test_ioring_ports_bypass_excluded() -> None:
             },
         ]
     )
-    assert "spare" not in _generate_verilog_ioring_ports(st)
+    assert "spare" not in _generate_verilog_ioring_ports(build_port_table(st))
 
 
 def test_ioring_ports_no_trailing_comma_on_last_port() -> None:
@@ -873,7 +921,7 @@ def test_ioring_ports_no_trailing_comma_on_last_port() -> None:
             },
         ]
     )
-    output = _generate_verilog_ioring_ports(st)
+    output = _generate_verilog_ioring_ports(build_port_table(st))
     last_line = [ln for ln in output.splitlines() if ln.strip()][-1]
     assert not last_line.endswith(",")
 
@@ -898,7 +946,7 @@ def test_ioring_ports_no_trailing_comma_when_last_signal_is_bypass() -> None:
             },
         ]
     )
-    output = _generate_verilog_ioring_ports(st)
+    output = _generate_verilog_ioring_ports(build_port_table(st))
     last_line = [ln for ln in output.splitlines() if ln.strip()][-1]
     assert not last_line.endswith(",")
 
@@ -929,7 +977,7 @@ _EXPECTED_IORING_PORTS = (
 def test_ioring_ports_integration() -> None:
     """Full signal set produces the expected IO ring port list. spare is bypass:true and excluded."""
     st = _make_signal_table(_IORING_INTEGRATION_SIGNALS)
-    assert _generate_verilog_ioring_ports(st) == _EXPECTED_IORING_PORTS
+    assert _generate_verilog_ioring_ports(build_port_table(st)) == _EXPECTED_IORING_PORTS
 
 
 # ---- _generate_verilog_ioring_body -----------------------------------------
@@ -1030,6 +1078,8 @@ def test_ioring_body_infer_ibuf() -> None:
     output = _generate_verilog_ioring_body(st, pt)
     assert "assign sys_clk = sys_clk_pad;" in output
     assert "IBUF" not in output
+    # Inferred signals are never flattened into pins
+    assert pt.flattened() == []
 
 
 def test_ioring_body_infer_obuf() -> None:
@@ -1339,3 +1389,99 @@ def test_generate_verilog_ioring_integration() -> None:
     assert "obufds_lvds_data_i2" in output
     assert "iobuf_gpio_i4" in output
     assert "iobufds_diff_io_i0" in output
+
+
+class _Recorder(io.StringIO):
+    """Keeps every chunk written to it"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunks: list[str] = []
+
+    def write(self, s: str) -> int:
+        self.chunks.append(s)
+        return super().write(s)
+
+
+def test_write_verilog_ioring_streams() -> None:
+    """write_verilog_ioring writes generate_verilog_ioring's output a buffer at a time."""
+    st, pt = _make_tables(_IORING_INTEGRATION_SIGNALS)
+    out = _Recorder()
+    write_verilog_ioring(out, st, pt, "example")
+    assert out.getvalue() == generate_verilog_ioring(st, pt, "example")
+    assert all(chunk.count(" //#(") <= 1 for chunk in out.chunks)
+
+
+# ---- bus loops ---------------------------------------------------------------
+
+_LOOP_SIGNALS = [
+    {
+        "name": "led",
+        "pins": ["A1", "A2", "A3", "A4"],
+        "width": 4,
+        "direction": "out",
+        "buffer": "obuf",
+        "iostandard": "LVCMOS18",
+    },
+    {
+        "name": "rx",
+        "pinset": {"p": ["B1", "B2"], "n": ["C1", "C2"]},
+        "width": 2,
+        "direction": "in",
+        "buffer": "ibufds",
+        "iostandard": "LVDS",
+        "instance": "rx_buf",
+    },
+]
+
+
+def test_bus_loops_body() -> None:
+    """Each bus is instantiated by one generate loop over its bits."""
+    st, pt = _make_tables(_LOOP_SIGNALS)
+    assert _generate_verilog_ioring_body(st, pt, bus_loops=True) == (
+        "    genvar obuf_led_n;\n"
+        "    generate\n"
+        "        for (obuf_led_n = 0; obuf_led_n < 4; obuf_led_n = obuf_led_n + 1)"
+        " begin : obuf_led_i\n"
+        "            OBUF //#(\n"
+        "            //)\n"
+        "            obuf_led (\n"
+        "                .O      (led_pad[obuf_led_n]),\n"
+        "                .I      (led[obuf_led_n])\n"
+        "            );\n"
+        "        end\n"
+        "    endgenerate\n"
+        "\n"
+        "    genvar rx_buf_n;\n"
+        "    generate\n"
+        "        for (rx_buf_n = 0; rx_buf_n < 2; rx_buf_n = rx_buf_n + 1)"
+        " begin : rx_buf_i\n"
+        "            IBUFDS //#(\n"
+        "            //)\n"
+        "            rx_buf (\n"
+        "                .O      (rx[rx_buf_n]),\n"
+        "                .I      (rx_p[rx_buf_n]),\n"
+        "                .IB     (rx_n[rx_buf_n])\n"
+        "            );\n"
+        "        end\n"
+        "    endgenerate"
+    )
+
+
+def test_bus_loops_leave_scalars_and_inferred_buses() -> None:
+    """Scalars and inferred buses come out the same with or without loops."""
+    signals = [s for s in _IORING_INTEGRATION_SIGNALS if "width" not in s]
+    signals.append({**_LOOP_SIGNALS[0], "infer": True})
+    st, pt = _make_tables(signals)
+    assert _generate_verilog_ioring_body(
+        st, pt, bus_loops=True
+    ) == _generate_verilog_ioring_body(st, pt)
+
+
+def test_bus_loops_shrink_output() -> None:
+    """A wide bus takes about one bit's worth of output."""
+    wide = {**_LOOP_SIGNALS[0], "pins": [f"A{i}" for i in range(64)], "width": 64}
+    st, pt = _make_tables([wide])
+    per_bit = generate_verilog_ioring(st, pt, "top")
+    looped = generate_verilog_ioring(st, pt, "top", bus_loops=True)
+    assert len(looped.splitlines()) * 8 < len(per_bit.splitlines())
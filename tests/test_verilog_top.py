@@ -1,3 +1,5 @@
+import io
+
 import pytest
 
 from io_gen.tables import SignalTable
@@ -7,8 +9,10 @@ from io_gen.generate.verilog_top import (
     _generate_verilog_wires,
     _generate_verilog_ioring_inst,
     generate_verilog_top,
+    write_verilog_top,
 )
 from io_gen.tables.signal_table import build_signal_table
+from io_gen.generate.port_table import build_port_table
 
 
 def _make_signal_table(signals: list) -> SignalTable:
@@ -31,7 +35,7 @@ def test_generate_verilog_ports_returns_str() -> None:
             },
         ]
     )
-    assert isinstance(_generate_verilog_ports(st), str)
+    assert isinstance(_generate_verilog_ports(st, build_port_table(st)), str)
 
 
 PORT_DECL_CASES = [
@@ -149,7 +153,7 @@ PORT_DECL_CASES = [
 def test_port_decl_in_output(sig: dict, expected_decl: str) -> None:
     """The correct port declaration appears in the output for each signal type."""
     st = _make_signal_table([sig])
-    assert expected_decl in _generate_verilog_ports(st)
+    assert expected_decl in _generate_verilog_ports(st, build_port_table(st))
 
 
 def test_hdl_comment_emitted() -> None:
@@ -166,7 +170,7 @@ def test_hdl_comment_emitted() -> None:
             },
         ]
     )
-    assert "// 125 MHz system clock input" in _generate_verilog_ports(st)
+    assert "// 125 MHz system clock input" in _generate_verilog_ports(st, build_port_table(st))
 
 
 def test_no_hdl_comment_no_slash_line() -> None:
@@ -182,7 +186,7 @@ def test_no_hdl_comment_no_slash_line() -> None:
             },
         ]
     )
-    assert "//" not in _generate_verilog_ports(st)
+    assert "//" not in _generate_verilog_ports(st, build_port_table(st))
 
 
 def test_no_trailing_comma_on_last_port() -> None:
@@ -206,7 +210,7 @@ def test_no_trailing_comma_on_last_port() -> None:
             },
         ]
     )
-    output = _generate_verilog_ports(st)
+    output = _generate_verilog_ports(st, build_port_table(st))
     last_line = [ln for ln in output.splitlines() if ln.strip()][-1]
     assert not last_line.endswith(",")
 
@@ -288,7 +292,7 @@ _EXPECTED_PORTS = (
 def test_integration_output() -> None:
     """Full signal set produces the expected port list string."""
     st = _make_signal_table(_INTEGRATION_SIGNALS)
-    assert _generate_verilog_ports(st) == _EXPECTED_PORTS
+    assert _generate_verilog_ports(st, build_port_table(st)) == _EXPECTED_PORTS
 
 
 # ---- _generate_verilog_wires -----------------------------------------------
@@ -438,7 +442,7 @@ WIRE_DECL_CASES = [
 def test_wire_decl_in_output(sig: dict, expected_lines: list[str]) -> None:
     """The correct wire declaration(s) appear in the output for each signal type."""
     st = _make_signal_table([sig])
-    output = _generate_verilog_wires(st)
+    output = _generate_verilog_wires(build_port_table(st))
     for line in expected_lines:
         assert line in output
 
@@ -456,7 +460,7 @@ def test_bypass_excluded_from_wires() -> None:
             },
         ]
     )
-    assert "spare" not in _generate_verilog_wires(st)
+    assert "spare" not in _generate_verilog_wires(build_port_table(st))
 
 
 _EXPECTED_WIRES = (
@@ -473,7 +477,7 @@ _EXPECTED_WIRES = (
 def test_wires_integration_output() -> None:
     """Full signal set produces the expected wire block string."""
     st = _make_signal_table(_INTEGRATION_SIGNALS)
-    assert _generate_verilog_wires(st) == _EXPECTED_WIRES
+    assert _generate_verilog_wires(build_port_table(st)) == _EXPECTED_WIRES
 
 
 # ---- _generate_verilog_ioring_inst -----------------------------------------
@@ -492,7 +496,7 @@ def test_ioring_inst_returns_str() -> None:
             },
         ]
     )
-    assert isinstance(_generate_verilog_ioring_inst(st, "test"), str)
+    assert isinstance(_generate_verilog_ioring_inst(build_port_table(st), "test"), str)
 
 
 def test_ioring_inst_header() -> None:
@@ -508,7 +512,7 @@ def test_ioring_inst_header() -> None:
             },
         ]
     )
-    output = _generate_verilog_ioring_inst(st, "test")
+    output = _generate_verilog_ioring_inst(build_port_table(st), "test")
     lines = output.splitlines()
     assert lines[0] == "    test_io //#("
     assert lines[1] == "    //)"
@@ -528,7 +532,7 @@ def test_ioring_inst_closing() -> None:
             },
         ]
     )
-    output = _generate_verilog_ioring_inst(st, "test")
+    output = _generate_verilog_ioring_inst(build_port_table(st), "test")
     assert output.splitlines()[-1] == "    );"
 
 
@@ -553,7 +557,7 @@ def test_ioring_inst_last_port_no_comma() -> None:
             },
         ]
     )
-    output = _generate_verilog_ioring_inst(st, "test")
+    output = _generate_verilog_ioring_inst(build_port_table(st), "test")
     port_lines = [ln for ln in output.splitlines() if ln.strip().startswith(".")]
     assert not port_lines[-1].endswith(",")
 
@@ -578,7 +582,7 @@ def test_ioring_inst_bypass_excluded() -> None:
             },
         ]
     )
-    output = _generate_verilog_ioring_inst(st, "test")
+    output = _generate_verilog_ioring_inst(build_port_table(st), "test")
     assert "spare" not in output
 
 
@@ -595,7 +599,7 @@ def test_ioring_inst_all_bypass_returns_empty_string() -> None:
             },
         ]
     )
-    assert _generate_verilog_ioring_inst(st, "test") == ""
+    assert _generate_verilog_ioring_inst(build_port_table(st), "test") == ""
 
 
 def test_ioring_inst_alignment_tab_stop() -> None:
@@ -616,7 +620,7 @@ def test_ioring_inst_alignment_tab_stop() -> None:
             },
         ]
     )
-    output = _generate_verilog_ioring_inst(st, "test")
+    output = _generate_verilog_ioring_inst(build_port_table(st), "test")
     # led_pad is the IO ring pad port; led is the fabric-facing port (last, no comma)
     assert "        .led_pad    (led_pad)," in output
     assert "        .led        (led)" in output
@@ -652,7 +656,7 @@ def test_ioring_inst_integration() -> None:
     a multiple of 4, so the '(' lands at the next tab stop giving a 4-space gap.
     """
     st = _make_signal_table(_INTEGRATION_SIGNALS)
-    assert _generate_verilog_ioring_inst(st, "example") == _EXPECTED_IORING_INST
+    assert _generate_verilog_ioring_inst(build_port_table(st), "example") == _EXPECTED_IORING_INST
 
 
 # ---- generate_verilog_top --------------------------------------------------
@@ -750,3 +754,24 @@ def test_generate_verilog_top_integration() -> None:
     """Full signal set produces output matching example.v."""
     st = _make_signal_table(_INTEGRATION_SIGNALS)
     assert generate_verilog_top(st, "example") == _EXPECTED_TOP
+
+
+class _Recorder(io.StringIO):
+    """Keeps every chunk written to it"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunks: list[str] = []
+
+    def write(self, s: str) -> int:
+        self.chunks.append(s)
+        return super().write(s)
+
+
+def test_write_verilog_top_streams() -> None:
+    """write_verilog_top writes generate_verilog_top's output a line at a time."""
+    st = _make_signal_table(_INTEGRATION_SIGNALS)
+    out = _Recorder()
+    write_verilog_top(out, st, "example")
+    assert out.getvalue() == generate_verilog_top(st, "example")
+    assert all(chunk.count("\n") <= 1 for chunk in out.chunks)
@@ -1,7 +1,10 @@
+import io
+
 import pytest
 
 from io_gen.tables import SignalTable
 from io_gen.tables.signal_table import build_signal_table
+from io_gen.generate.port_table import build_port_table
 from io_gen.tables.meta_table import MetaTable
 
 from io_gen.generate.vhdl_top import (
@@ -9,6 +12,7 @@ from io_gen.generate.vhdl_top import (
     _generate_vhdl_signals,
     _generate_vhdl_ioring_inst,
     generate_vhdl_top,
+    write_vhdl_top,
 )
 
 _TEST_META = MetaTable(title="Test", part="xc7k325tffg900-2", architecture="rtl")
@@ -34,7 +38,7 @@ def test_generate_vhdl_ports_returns_str() -> None:
             },
         ]
     )
-    assert isinstance(_generate_vhdl_ports(st), str)
+    assert isinstance(_generate_vhdl_ports(st, build_port_table(st)), str)
 
 
 # Each case builds a single-signal table and asserts the complete output string.
@@ -143,7 +147,7 @@ PORT_DECL_CASES = [
 def test_port_decl_output(sig: dict, expected: str) -> None:
     """Complete port declaration output for each signal type."""
     st = _make_signal_table([sig])
-    assert _generate_vhdl_ports(st) == expected
+    assert _generate_vhdl_ports(st, build_port_table(st)) == expected
 
 
 def test_hdl_comment_emitted() -> None:
@@ -165,7 +169,7 @@ def test_hdl_comment_emitted() -> None:
         "        -- 125 MHz system clock input\n"
         "        sys_clk_pad : in    std_logic"
     )
-    assert _generate_vhdl_ports(st) == expected
+    assert _generate_vhdl_ports(st, build_port_table(st)) == expected
 
 
 def test_no_hdl_comment_no_dash_line() -> None:
@@ -181,7 +185,7 @@ def test_no_hdl_comment_no_dash_line() -> None:
             },
         ]
     )
-    assert "--" not in _generate_vhdl_ports(st)
+    assert "--" not in _generate_vhdl_ports(st, build_port_table(st))
 
 
 def test_no_trailing_semicolon_on_last_port() -> None:
@@ -210,7 +214,7 @@ def test_no_trailing_semicolon_on_last_port() -> None:
         "        sys_clk_pad : in    std_logic;\n"
         "        led_pad     : out   std_logic_vector(1 downto 0)"
     )
-    assert _generate_vhdl_ports(st) == expected
+    assert _generate_vhdl_ports(st, build_port_table(st)) == expected
 
 
 # ---- integration -----------------------------------------------------------
@@ -302,7 +306,7 @@ _EXPECTED_PORTS = (
 def test_ports_integration_output() -> None:
     """Full signal set produces the expected port list string."""
     st = _make_signal_table(_INTEGRATION_SIGNALS)
-    assert _generate_vhdl_ports(st) == _EXPECTED_PORTS
+    assert _generate_vhdl_ports(st, build_port_table(st)) == _EXPECTED_PORTS
 
 
 # ---- _generate_vhdl_signals ------------------------------------------------
@@ -457,7 +461,7 @@ SIGNAL_DECL_CASES = [
 def test_signal_decl_output(sig: dict, expected: str) -> None:
     """Complete signal declaration output for each signal type."""
     st = _make_signal_table([sig])
-    assert _generate_vhdl_signals(st) == expected
+    assert _generate_vhdl_signals(build_port_table(st)) == expected
 
 
 def test_bypass_excluded_from_signals() -> None:
@@ -473,7 +477,7 @@ def test_bypass_excluded_from_signals() -> None:
             },
         ]
     )
-    assert "spare" not in _generate_vhdl_signals(st)
+    assert "spare" not in _generate_vhdl_signals(build_port_table(st))
 
 
 def test_signals_all_bypass_returns_empty_string() -> None:
@@ -489,7 +493,7 @@ def test_signals_all_bypass_returns_empty_string() -> None:
             },
         ]
     )
-    assert _generate_vhdl_signals(st) == ""
+    assert _generate_vhdl_signals(build_port_table(st)) == ""
 
 
 # lhs = "signal lvds_data" (16), name_len = 20
@@ -508,7 +512,7 @@ _EXPECTED_SIGNALS = (
 def test_signals_integration_output() -> None:
     """Full signal set produces the expected signal declaration block."""
     st = _make_signal_table(_INTEGRATION_SIGNALS)
-    assert _generate_vhdl_signals(st) == _EXPECTED_SIGNALS
+    assert _generate_vhdl_signals(build_port_table(st)) == _EXPECTED_SIGNALS
 
 
 # ---- _generate_vhdl_ioring_inst --------------------------------------------
@@ -527,7 +531,7 @@ def test_ioring_inst_returns_str() -> None:
             },
         ]
     )
-    assert isinstance(_generate_vhdl_ioring_inst(st, "test"), str)
+    assert isinstance(_generate_vhdl_ioring_inst(build_port_table(st), "test"), str)
 
 
 def test_ioring_inst_header() -> None:
@@ -543,7 +547,7 @@ def test_ioring_inst_header() -> None:
             },
         ]
     )
-    output = _generate_vhdl_ioring_inst(st, "test")
+    output = _generate_vhdl_ioring_inst(build_port_table(st), "test")
     lines = output.splitlines()
     assert lines[0] == "    test_io_i0 : entity work.test_io"
     assert lines[1] == "    -- generic map ("
@@ -564,7 +568,7 @@ def test_ioring_inst_closing() -> None:
             },
         ]
     )
-    output = _generate_vhdl_ioring_inst(st, "test")
+    output = _generate_vhdl_ioring_inst(build_port_table(st), "test")
     assert output.splitlines()[-1] == "    );"
 
 
@@ -589,7 +593,7 @@ def test_ioring_inst_last_port_no_comma() -> None:
             },
         ]
     )
-    output = _generate_vhdl_ioring_inst(st, "test")
+    output = _generate_vhdl_ioring_inst(build_port_table(st), "test")
     port_lines = [ln for ln in output.splitlines() if "=>" in ln]
     assert not port_lines[-1].endswith(",")
 
@@ -614,7 +618,7 @@ def test_ioring_inst_bypass_excluded() -> None:
             },
         ]
     )
-    output = _generate_vhdl_ioring_inst(st, "test")
+    output = _generate_vhdl_ioring_inst(build_port_table(st), "test")
     assert "spare" not in output
 
 
@@ -631,7 +635,7 @@ def test_ioring_inst_all_bypass_returns_empty_string() -> None:
             },
         ]
     )
-    assert _generate_vhdl_ioring_inst(st, "test") == ""
+    assert _generate_vhdl_ioring_inst(build_port_table(st), "test") == ""
 
 
 def test_ioring_inst_alignment_tab_stop() -> None:
@@ -652,7 +656,7 @@ def test_ioring_inst_alignment_tab_stop() -> None:
             },
         ]
     )
-    output = _generate_vhdl_ioring_inst(st, "test")
+    output = _generate_vhdl_ioring_inst(build_port_table(st), "test")
     # led_pad is the IO ring pad port; led is the fabric-facing port (last, no comma)
     assert "        led_pad => led_pad," in output
     assert "        led     => led" in output
@@ -691,7 +695,7 @@ def test_ioring_inst_integration() -> None:
     ioring port name is user_led_pad (12); ((12 // 4) + 1) * 4 = 16.
     """
     st = _make_signal_table(_INTEGRATION_SIGNALS)
-    assert _generate_vhdl_ioring_inst(st, "example") == _EXPECTED_IORING_INST
+    assert _generate_vhdl_ioring_inst(build_port_table(st), "example") == _EXPECTED_IORING_INST
 
 
 # ---- generate_vhdl_top -----------------------------------------------------
@@ -833,3 +837,24 @@ def test_generate_vhdl_top_integration() -> None:
     """Full signal set produces the expected complete output."""
     st = _make_signal_table(_INTEGRATION_SIGNALS)
     assert generate_vhdl_top(st, _TEST_META, "example") == _EXPECTED_TOP
+
+
+class _Recorder(io.StringIO):
+    """Keeps every chunk written to it"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunks: list[str] = []
+
+    def write(self, s: str) -> int:
+        self.chunks.append(s)
+        return super().write(s)
+
+
+def test_write_vhdl_top_streams() -> None:
+    """write_vhdl_top writes generate_vhdl_top's output a line at a time."""
+    st = _make_signal_table(_INTEGRATION_SIGNALS)
+    out = _Recorder()
+    write_vhdl_top(out, st, _TEST_META, "example")
+    assert out.getvalue() == generate_vhdl_top(st, _TEST_META, "example")
+    assert all(chunk.count("\n") <= 1 for chunk in out.chunks)
@@ -1,6 +1,8 @@
+import io
+
 import pytest
 
-from io_gen.generate.xdc import generate_xdc
+from io_gen.generate.xdc import generate_xdc, write_xdc
 from io_gen.tables.constraints_table import build_constraints_table
 from io_gen.tables.pin_table import build_pin_table
 from io_gen.tables.signal_table import build_signal_table
@@ -569,3 +571,179 @@ def test_generate_xdc_ends_with_newline() -> None:
         ]
     )
     assert generate_xdc(st, pt, ct).endswith("\n")
+
+
+class _Recorder(io.StringIO):
+    """Keeps every chunk written to it"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.chunks: list[str] = []
+
+    def write(self, s: str) -> int:
+        self.chunks.append(s)
+        return super().write(s)
+
+
+def test_write_xdc_streams() -> None:
+    """write_xdc writes generate_xdc's output a signal at a time."""
+    st = build_signal_table(_INTEGRATION_DOC)
+    pt = build_pin_table(st)
+    ct = build_constraints_table(_INTEGRATION_DOC)
+    out = _Recorder()
+    write_xdc(out, st, pt, ct, pin_planner=True)
+    assert out.getvalue() == _EXPECTED_XDC_PIN_PLANNER
+    assert len(out.chunks) > len(st)
+    assert all(chunk.count("PACKAGE_PIN") <= 8 for chunk in out.chunks)
+
+
+_EXPECTED_XDC_COMPACT_PIN_PLANNER = """\
+#
+# Generated by io-gen - do not edit
+# Regenerate from source YAML using io-gen
+#
+
+set_property CONFIG_VOLTAGE 3.3 [current_design]
+set_property CFGBVS VCCO [current_design]
+
+# 125 MHz system clock
+set_property PACKAGE_PIN G22 [get_ports sys_clk_pad]
+
+# User LEDs
+set_property PACKAGE_PIN A22 [get_ports {led_pad[0]}]
+set_property PACKAGE_PIN B22 [get_ports {led_pad[1]}]
+
+# 200 MHz reference clock
+set_property PACKAGE_PIN H22 [get_ports ref_clk_p]
+set_property PACKAGE_PIN H23 [get_ports ref_clk_n]
+
+# LVDS data outputs
+set_property PACKAGE_PIN AA1 [get_ports {lvds_data_p[0]}]
+set_property PACKAGE_PIN AA2 [get_ports {lvds_data_n[0]}]
+set_property PACKAGE_PIN AB1 [get_ports {lvds_data_p[1]}]
+set_property PACKAGE_PIN AB2 [get_ports {lvds_data_n[1]}]
+
+# Chip select
+set_property PACKAGE_PIN E22 [get_ports {cs_n_pad[0]}]
+
+# Sync clock
+set_property PACKAGE_PIN F22 [get_ports {sync_clk_p[0]}]
+set_property PACKAGE_PIN F23 [get_ports {sync_clk_n[0]}]
+
+# Spare output pin
+set_property PACKAGE_PIN J24 [get_ports spare_pad]
+
+set_property IOSTANDARD LVCMOS18 [get_ports {sys_clk_pad led_pad[*] cs_n_pad[*] spare_pad}]
+set_property IOSTANDARD LVDS [get_ports {ref_clk_p ref_clk_n lvds_data_p[*] lvds_data_n[*] sync_clk_p[*] sync_clk_n[*]}]
+set_property DIRECTION IN [get_ports {sys_clk_pad ref_clk_p ref_clk_n}]
+set_property DIRECTION OUT [get_ports {led_pad[*] lvds_data_p[*] lvds_data_n[*] cs_n_pad[*] sync_clk_p[*] sync_clk_n[*] spare_pad}]
+"""
+
+_EXPECTED_XDC_COMPACT_RTL = """\
+#
+# Generated by io-gen - do not edit
+# Regenerate from source YAML using io-gen
+#
+
+set_property CONFIG_VOLTAGE 3.3 [current_design]
+set_property CFGBVS VCCO [current_design]
+
+# 125 MHz system clock
+set_property PACKAGE_PIN G22 [get_ports sys_clk_pad]
+
+# User LEDs
+set_property PACKAGE_PIN A22 [get_ports {led_pad[0]}]
+set_property PACKAGE_PIN B22 [get_ports {led_pad[1]}]
+
+# 200 MHz reference clock
+set_property PACKAGE_PIN H22 [get_ports ref_clk_p]
+set_property PACKAGE_PIN H23 [get_ports ref_clk_n]
+
+# LVDS data outputs
+set_property PACKAGE_PIN AA1 [get_ports {lvds_data_p[0]}]
+set_property PACKAGE_PIN AA2 [get_ports {lvds_data_n[0]}]
+set_property PACKAGE_PIN AB1 [get_ports {lvds_data_p[1]}]
+set_property PACKAGE_PIN AB2 [get_ports {lvds_data_n[1]}]
+
+# Chip select
+set_property PACKAGE_PIN E22 [get_ports {cs_n_pad[0]}]
+
+# Sync clock
+set_property PACKAGE_PIN F22 [get_ports {sync_clk_p[0]}]
+set_property PACKAGE_PIN F23 [get_ports {sync_clk_n[0]}]
+
+# Spare output pin
+set_property PACKAGE_PIN J24 [get_ports spare_pad]
+
+set_property IOSTANDARD LVCMOS18 [get_ports {sys_clk_pad led_pad[*] cs_n_pad[*] spare_pad}]
+set_property IOSTANDARD LVDS [get_ports {ref_clk_p ref_clk_n lvds_data_p[*] lvds_data_n[*] sync_clk_p[*] sync_clk_n[*]}]
+"""
+
+
+def test_integration_output_compact_pin_planner() -> None:
+    """Compact mode groups IO standards and directions after the package pins."""
+    st = build_signal_table(_INTEGRATION_DOC)
+    pt = build_pin_table(st)
+    ct = build_constraints_table(_INTEGRATION_DOC)
+    xdc = generate_xdc(st, pt, ct, pin_planner=True, compact=True)
+    assert xdc == _EXPECTED_XDC_COMPACT_PIN_PLANNER
+
+
+def test_integration_output_compact_rtl() -> None:
+    """Compact mode in RTL mode groups IO standards only."""
+    st = build_signal_table(_INTEGRATION_DOC)
+    pt = build_pin_table(st)
+    ct = build_constraints_table(_INTEGRATION_DOC)
+    assert generate_xdc(st, pt, ct, compact=True) == _EXPECTED_XDC_COMPACT_RTL
+
+
+def test_compact_keeps_package_pins_per_bit() -> None:
+    """Compact mode gives every pin its PACKAGE_PIN, and nothing else per pin."""
+    st = build_signal_table(_INTEGRATION_DOC)
+    pt = build_pin_table(st)
+    ct = build_constraints_table(_INTEGRATION_DOC)
+    full = generate_xdc(st, pt, ct, pin_planner=True).splitlines()
+    compact = generate_xdc(st, pt, ct, pin_planner=True, compact=True).splitlines()
+    package_pins = [line for line in full if "PACKAGE_PIN" in line]
+    assert [line for line in compact if "PACKAGE_PIN" in line] == package_pins
+    grouped = [line for line in compact if "IOSTANDARD" in line or "DIRECTION" in line]
+    assert len(grouped) == 4
+
+
+def test_compact_uses_wildcard_for_buses() -> None:
+    """A bus is covered by one wildcard pattern, a scalar by its port name."""
+    st, pt, ct = _make_tables(
+        [
+            {
+                "name": "sys_clk",
+                "pins": "G22",
+                "direction": "in",
+                "buffer": "ibuf",
+                "iostandard": "LVCMOS18",
+            },
+            {
+                "name": "led",
+                "pins": ["A22", "B22", "C22"],
+                "width": 3,
+                "direction": "out",
+                "buffer": "obuf",
+                "iostandard": "LVCMOS18",
+            },
+        ]
+    )
+    xdc = generate_xdc(st, pt, ct, compact=True)
+    assert (
+        "set_property IOSTANDARD LVCMOS18 [get_ports {sys_clk_pad led_pad[*]}]"
+        in xdc
+    )
+    assert xdc.count("IOSTANDARD") == 1
+
+
+def test_compact_is_smaller() -> None:
+    """Compact output is shorter than the per-pin form."""
+    st = build_signal_table(_INTEGRATION_DOC)
+    pt = build_pin_table(st)
+    ct = build_constraints_table(_INTEGRATION_DOC)
+    full = generate_xdc(st, pt, ct, pin_planner=True)
+    compact = generate_xdc(st, pt, ct, pin_planner=True, compact=True)
+    assert len(compact) < len(full)